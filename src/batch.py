@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Headless entry point replaying a recorded pipeline on all the datasets of a directory.
+Usage: python batch.py pipeline.json data_directory output_directory [--jobs N]
+"""
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+import argparse
+import csv
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.file_path_search import find_dataset_files
+from utils.model.pipeline import processingPipeline
+from utils.model.pipeline_runner import pipelineRunner
+
+
+def run_dataset(pipeline_path, file_path, output_directory):
+    """
+    Replays the pipeline on a single dataset, in a worker process.
+    :param pipeline_path: The path of the pipeline file.
+    :type pipeline_path: str
+    :param file_path: The path of the dataset.
+    :type file_path: str
+    :param output_directory: The directory in which the results are written.
+    :type output_directory: str
+    :return: The duration of each step, in seconds, and the error message if a step failed.
+    :rtype: (list of (str, float), str)
+    """
+    runner = pipelineRunner(processingPipeline.load(pipeline_path), file_path, output_directory)
+    try:
+        runner.run()
+        return runner.get_timings(), None
+    except Exception as error:
+        return runner.get_timings(), str(error)
+
+
+def write_timings(file_path, results):
+    """
+    Writes the duration of each step of each dataset in a CSV file.
+    :param file_path: The path of the file.
+    :type file_path: str
+    :param results: The timings and the error of each dataset.
+    :type results: dict
+    """
+    with open(file_path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Dataset", "Step", "Operation", "Duration (s)"])
+        for dataset_path, (timings, error) in sorted(results.items()):
+            for i, (operation, duration) in enumerate(timings):
+                writer.writerow([os.path.basename(dataset_path), i, operation, "{:.3f}".format(duration)])
+            if error is not None:
+                writer.writerow([os.path.basename(dataset_path), len(timings), "error", error])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a pipeline recorded by MNE Vision on a directory of datasets.")
+    parser.add_argument("pipeline", help="Pipeline file exported from the application.")
+    parser.add_argument("data_directory", help="Directory containing the datasets (.set, .fif, .cnt).")
+    parser.add_argument("output_directory", help="Directory in which the processed datasets and results are written.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Number of datasets processed in parallel.")
+    arguments = parser.parse_args()
+
+    processingPipeline.load(arguments.pipeline)     # Check the pipeline before starting the workers
+    datasets = find_dataset_files(arguments.data_directory)
+    os.makedirs(arguments.output_directory, exist_ok=True)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=max(arguments.jobs, 1)) as executor:
+        futures = {executor.submit(run_dataset, arguments.pipeline, dataset, arguments.output_directory): dataset
+                   for dataset in datasets}
+        for future in as_completed(futures):
+            dataset = futures[future]
+            timings, error = future.result()
+            results[dataset] = (timings, error)
+            total = sum(duration for _, duration in timings)
+            status = "done" if error is None else "failed (" + error + ")"
+            print(os.path.basename(dataset) + ": " + status + " in " + "{:.2f}".format(total) + " s")
+            for operation, duration in timings:
+                print("    " + operation.ljust(24) + "{:.2f}".format(duration) + " s")
+
+    write_timings(os.path.join(arguments.output_directory, "pipeline-timings.csv"), results)
+    sys.exit(0 if all(error is None for _, error in results.values()) else 1)
@@ -11,6 +11,8 @@ from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.pipeline import make_pipeline
 from sklearn.linear_model import LogisticRegression
 
+from classification.applePy import classification_metrics
+
 
 class ElectrodeSelection(BaseEstimator, TransformerMixin):
     """Channel selection based on a Riemannian geometry criterion. \n
@@ -124,13 +126,8 @@ class ElectrodeSelection(BaseEstimator, TransformerMixin):
 
     def score(self, estimator, x_test, y_test):
         x_test = self.transform(x_test)
-        score = 0
         predictions = self.pipeline.predict(x_test)
-        for i in range(y_test.shape[0]):
-            if predictions[i] == y_test[i]:
-                score += 1
-        score = score/y_test.shape[0]
-        return score
+        return classification_metrics.accuracy(y_test, predictions)
 
 
 class ElectrodeSelectionRaw(BaseEstimator, TransformerMixin):
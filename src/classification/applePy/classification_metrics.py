@@ -0,0 +1,126 @@
+"""Vectorized metrics computed for all the pipelines at once."""
+
+import numpy as np
+
+
+def accuracy(expected, predictions):
+    """
+    Computes the proportion of correctly classified samples. \n
+    Parameters \n
+    ---------- \n
+    expected : array of shape (samples,); the correct answers \n
+    predictions : array of shape (samples,) or (pipelines, samples); the predictions \n
+    """
+    return np.mean(np.asarray(predictions) == np.asarray(expected), axis=-1)
+
+
+def confusion_matrices(expected, predictions, nb_classes):
+    """
+    Computes the confusion matrices of all the pipelines with a single bincount. \n
+    Parameters \n
+    ---------- \n
+    expected : array of shape (samples,); the correct answers \n
+    predictions : array of shape (pipelines, samples); the predictions of each pipeline \n
+    nb_classes : int; the number of classes \n
+    Returns \n
+    ---------- \n
+    confusion : array of shape (pipelines, classes, classes); confusion[p, i, j] is the number of samples of class i
+    predicted as class j by the pipeline p \n
+    """
+    expected = np.asarray(expected, dtype=np.int64)
+    predictions = np.atleast_2d(np.asarray(predictions, dtype=np.int64))
+    nb_pipelines = predictions.shape[0]
+    flat_indexes = (np.arange(nb_pipelines)[:, np.newaxis] * nb_classes + expected) * nb_classes + predictions
+    confusion = np.bincount(flat_indexes.ravel(), minlength=nb_pipelines * nb_classes * nb_classes)
+    return confusion.reshape(nb_pipelines, nb_classes, nb_classes)
+
+
+def accuracies_from_confusion(confusion):
+    """
+    Computes the accuracy of each pipeline from its confusion matrix. \n
+    Parameters \n
+    ---------- \n
+    confusion : array of shape (pipelines, classes, classes) \n
+    """
+    totals = confusion.sum(axis=(1, 2))
+    return _safe_divide(np.trace(confusion, axis1=1, axis2=2), totals)
+
+
+def precisions_recalls(confusion):
+    """
+    Computes the precision and the recall of each class for each pipeline. A class never predicted (or never present)
+    has a precision (or a recall) of 0. \n
+    Parameters \n
+    ---------- \n
+    confusion : array of shape (pipelines, classes, classes) \n
+    Returns \n
+    ---------- \n
+    precisions, recalls : arrays of shape (pipelines, classes) \n
+    """
+    true_positives = np.diagonal(confusion, axis1=1, axis2=2)
+    precisions = _safe_divide(true_positives, confusion.sum(axis=1))
+    recalls = _safe_divide(true_positives, confusion.sum(axis=2))
+    return precisions, recalls
+
+
+def roc_curve(expected_binary, scores):
+    """
+    Computes the ROC curve of binary answers from the scores of the positive class, by sorting the scores once and
+    accumulating the true and false positives. \n
+    Parameters \n
+    ---------- \n
+    expected_binary : array of shape (samples,); 1 for the positive samples, 0 otherwise \n
+    scores : array of shape (samples,); the score (probability) of the positive class \n
+    Returns \n
+    ---------- \n
+    fpr, tpr : arrays; the false and true positive rates for each distinct threshold, starting at (0, 0) \n
+    auc : float; the area under the curve \n
+    """
+    order = np.argsort(-np.asarray(scores), kind="mergesort")
+    sorted_scores = np.asarray(scores)[order]
+    sorted_expected = np.asarray(expected_binary)[order]
+
+    threshold_indexes = np.r_[np.flatnonzero(np.diff(sorted_scores)), sorted_expected.shape[0] - 1]
+    true_positives = np.cumsum(sorted_expected)[threshold_indexes]
+    false_positives = threshold_indexes + 1 - true_positives
+
+    tpr = _safe_divide(np.r_[0, true_positives], true_positives[-1])
+    fpr = _safe_divide(np.r_[0, false_positives], false_positives[-1])
+    auc = np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2)
+    return fpr, tpr, auc
+
+
+def roc_curves(expected, probabilities):
+    """
+    Computes the ROC curves of all the pipelines. With two classes, the curve of the positive class (1) is returned.
+    With more classes, the one-vs-rest curve of each class is returned, with the mean of their AUC. \n
+    Parameters \n
+    ---------- \n
+    expected : array of shape (samples,); the correct answers \n
+    probabilities : array of shape (pipelines, samples, classes); the probabilities predicted by each pipeline \n
+    Returns \n
+    ---------- \n
+    roc_infos : list; for each pipeline, [fpr, tpr, auc] with two classes, [list of fpr, list of tpr, mean auc]
+    otherwise \n
+    """
+    expected = np.asarray(expected)
+    probabilities = np.asarray(probabilities)
+    nb_classes = probabilities.shape[2]
+    if nb_classes == 2:
+        return [list(roc_curve(expected == 1, pipeline_probabilities[:, 1]))
+                for pipeline_probabilities in probabilities]
+
+    roc_infos = []
+    for pipeline_probabilities in probabilities:
+        curves = [roc_curve(expected == class_idx, pipeline_probabilities[:, class_idx])
+                  for class_idx in range(nb_classes)]
+        roc_infos.append([[curve[0] for curve in curves], [curve[1] for curve in curves],
+                          np.mean([curve[2] for curve in curves])])
+    return roc_infos
+
+
+def _safe_divide(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator != 0)
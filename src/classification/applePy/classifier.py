@@ -15,21 +15,24 @@ from mne.io import read_raw_eeglab, read_epochs_eeglab
 from mne.channels import make_standard_montage
 from mne.event import find_events
 
-from sklearn import metrics
 from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.model_selection import KFold, LeaveOneOut, GroupKFold
 
-from pyriemann.estimation import Covariances
+from pyriemann.estimation import Covariances, CospCovariances
 
+from classification.applePy import classification_metrics
 from classification.applePy.channel_selection import ElectrodeSelection
 from classification.applePy.pipeline_catalogue import Pipeline_catalogue
 from classification.applePy.sources_estimator import Sources_estimator
 from classification.applePy.cnn import CNN
+from classification.applePy.model_store import ModelStore
+from classification.applePy.subject_dataset import SubjectMemmapDataset
 
 CONST_MAX_1by1_ELECTRODES = 30
 CONST_MAX_5by5_ELECTRODES = 50
 CONST_DEFAULT_RANDOMIZEDSEARCH_NBITER = 10
+CONST_DEFAULT_BATCH_SIZE = 64
 
 
 class ApplePyClassifier(BaseEstimator, TransformerMixin):
@@ -45,8 +48,9 @@ class ApplePyClassifier(BaseEstimator, TransformerMixin):
         - The eventual test dataset, labels and groups \n
     """
 
-    def __init__(self, used_pipelines=None):
+    def __init__(self, used_pipelines=None, model_store=None):
         self.classifier_log = []
+        self.model_store = model_store
 
         self.pipeline_catalogue = Pipeline_catalogue(used_pipelines)
         self.catalogue = self.pipeline_catalogue.catalogue
@@ -154,6 +158,32 @@ class ApplePyClassifier(BaseEstimator, TransformerMixin):
         self.recalls = {key: [] for key in list(self.catalogue.keys())}
         self.roc_infos = {key: [] for key in list(self.catalogue.keys())}
 
+    def load_fitted_pipelines(self, directory, fingerprint=None):
+        """
+        Reloads the fitted pipelines saved by a previous classification, so that new sessions can be scored without
+        fitting again. The pipelines of the catalogue that were not saved are removed. \n
+        Parameters \n
+        ---------- \n
+        directory : string; path of the folder of the model store \n
+        fingerprint : string or None; fingerprint of the dataset used for the classification. If None, the most recent
+        classification is reloaded. \n
+        """
+        if self.model_store is None or self.model_store.directory != directory:
+            self.model_store = ModelStore(directory)
+        content = self.model_store.load_catalogue(fingerprint)
+        fitted_catalogue = content["catalogue"]
+
+        self.delete_pipelines([name for name in list(self.catalogue.keys()) if name not in fitted_catalogue])
+        for name in fitted_catalogue:
+            if name not in self.catalogue:
+                self.modify_add_pipeline(name, fitted_catalogue[name], [0])
+            self.catalogue[name] = fitted_catalogue[name]
+        self.event_names = content["event_names"]
+        self.electrodes = content["electrodes"]
+        if self.event_names is not None:
+            self.nb_paradigms = len(self.event_names)
+        self.restore()
+
     """
     File reading
     """
@@ -671,6 +701,82 @@ class ApplePyClassifier(BaseEstimator, TransformerMixin):
         occurences = dict(zip(unique, counts))
         self.classifier_log.append(("occurences from each class : ", occurences))
 
+    def prepare_memmap_dataset(self, directory, cache_directory, nb_subj=None, tmin=0, tmax=0.5, picks=None,
+                               filtering=[None, None], event_ids=[None, None], reference=None):
+        """
+        Create a   subjects x epochs x channels x times     dataset kept on disk from epoched files (one file per
+        subject). Each subject is read, processed and saved in its own memory-mapped files before the next one is read,
+        so only one subject is in memory at a time. \n
+        Parameters \n
+        ---------- \n
+        directory : the path to the directory containing the dataset \n
+        cache_directory : the path to the directory where the memory-mapped subjects are saved \n
+        nb_subj : the number of subjects to be considered. If None, all the subjects are considered. \n
+        tmin, tmax : tmin, tmax for delimiting the epochs in time \n
+        picks : list of electrodes to be worked on \n
+        filtering : tuple containing the higher and lower frequencies to filter the data \n
+        event_ids : The id of the event to consider \n
+        reference : the name of the reference to be applied to the data \n
+        """
+        self.classifier_log.extend(
+            [("directory", directory), ("nb_subj", nb_subj), ("tmin", tmin), ("tmax", tmax), ("picks", picks),
+             ("filtering", filtering), ('pre_epoched', True), ('out_of_core', cache_directory),
+             ('event_ids', event_ids), ('reference', reference)])
+        self.nb_paradigms = len(event_ids)
+        self.event_names = [str(event_id) for event_id in event_ids]
+        filtering = list(filtering)
+
+        list_of_files = []
+        for raw_eeg_file in os.listdir(directory):
+            if (".set" in raw_eeg_file) or ("-epo.fif" in raw_eeg_file):
+                list_of_files.append(raw_eeg_file)
+        list_of_files.sort()
+        if nb_subj is not None:
+            list_of_files = list_of_files[:nb_subj]
+
+        dataset = SubjectMemmapDataset(cache_directory)
+        for raw_eeg_file in list_of_files:
+            raw_file_path = os.path.join(directory, raw_eeg_file)
+            subject_data = []
+            subject_labels = []
+            for label in range(len(event_ids)):
+                if "-epo.fif" in raw_eeg_file:
+                    epoched_eeg = read_epochs(raw_file_path)[event_ids[label]]
+                else:
+                    epoched_eeg = read_epochs_eeglab(raw_file_path, event_id=event_ids[label])
+                if reference is not None:
+                    epoched_eeg.set_eeg_reference(reference, projection=False)
+                if filtering[0] is None:
+                    filtering[0] = epoched_eeg.info['highpass']
+                if filtering[1] is None:
+                    filtering[1] = epoched_eeg.info['lowpass']
+                epoched_eeg.filter(filtering[0], filtering[1])
+                if picks is not None:
+                    epoched_eeg.pick_channels(picks)
+                epoched_eeg.crop(tmin=tmin, tmax=tmax)
+                self.electrodes = epoched_eeg.info['ch_names']
+
+                epoched_data = epoched_eeg.get_data()
+                subject_data.append(epoched_data)
+                subject_labels.append(np.zeros(epoched_data.shape[0], dtype=int) + label)
+
+            if self.nb_paradigms == 2:
+                minimum = min([subject_data[0].shape[0], subject_data[1].shape[0]])
+                subject_data = [data[:minimum] for data in subject_data]
+                subject_labels = [labels[:minimum] for labels in subject_labels]
+            dataset.add_subject(os.path.splitext(raw_eeg_file)[0], np.concatenate(subject_data, axis=0),
+                                np.concatenate(subject_labels, axis=0))
+            del subject_data
+
+        self.nb_subj = dataset.get_nb_subjects()
+        self.labels = dataset.labels_per_subject
+        self.groups = dataset.get_groups()
+
+        unique, counts = np.unique(dataset.get_labels(), return_counts=True)
+        occurences = dict(zip(unique, counts))
+        self.classifier_log.append(("occurences from each class : ", occurences))
+        return dataset
+
     def prepare_nonepoched_dataset_oneFilePerSubj(self, directory, nb_subj, tmin, tmax, bads=None, picks=None,
                                                   filtering=[None, None], ICA=False, resample=False, baseline=None,
                                                   event_ids=[None, None]):
@@ -973,16 +1079,66 @@ class ApplePyClassifier(BaseEstimator, TransformerMixin):
         """
         pipelines = list(self.catalogue.keys())
         pipelines.sort()
+        fingerprint = None
+        if self.model_store is not None:
+            fingerprint = self.model_store.fingerprint(x_train, y_train)
 
         for pipeline_name in pipelines:
             pipeline = self.catalogue[pipeline_name]
             try:
-                pipeline.fit(x_train, y_train)
+                if self.model_store is not None:
+                    self.catalogue[pipeline_name] = self.model_store.fit_or_load(pipeline_name, pipeline, x_train,
+                                                                                 y_train, fingerprint)
+                else:
+                    pipeline.fit(x_train, y_train)
             except:
                 print("Errors encountered with pipeline " + pipeline_name + ". This pipeline will be removed.")
                 self.delete_pipelines([pipeline_name])
         return self
 
+    def fit_subjects(self, dataset, subject_indexes):
+        """
+        Fits all the pipelines to some subjects of a dataset kept on disk, loading one subject at a time. \n
+        The pipelines start with a covariance estimation, which does not need to be fitted (see supports_out_of_core):
+        the covariance matrices are estimated subject by subject and only they are kept in memory to fit the rest of the
+        pipeline. The matrices are shared by the pipelines using the same estimation. \n
+        Parameters \n
+        ---------- \n
+        dataset : SubjectMemmapDataset; the dataset \n
+        subject_indexes : list of int; indexes of the training subjects \n
+        """
+        pipelines = list(self.catalogue.keys())
+        pipelines.sort()
+        y_train = np.concatenate([dataset.labels_per_subject[i] for i in subject_indexes])
+        covariances = {}
+
+        for pipeline_name in pipelines:
+            pipeline = self.catalogue[pipeline_name]
+            try:
+                first_step = pipeline.steps[0][1]
+                estimation = repr(first_step)
+                if estimation not in covariances:
+                    covariances[estimation] = np.concatenate(
+                        [first_step.transform(subject_data)
+                         for _, subject_data, _ in dataset.iter_subjects(subject_indexes)])
+                pipeline[1:].fit(covariances[estimation], y_train)
+            except:
+                print("Errors encountered with pipeline " + pipeline_name + ". This pipeline will be removed.")
+                self.delete_pipelines([pipeline_name])
+        return self
+
+    @staticmethod
+    def supports_out_of_core(pipeline):
+        """
+        Checks if a pipeline can be fitted on a dataset kept on disk without gathering its epochs in memory: its first
+        step must be a covariance estimation, which does not need to be fitted. \n
+        Parameters \n
+        ---------- \n
+        pipeline : the sklearn estimator or pipeline \n
+        """
+        first_step = pipeline.steps[0][1] if hasattr(pipeline, "steps") else None
+        return isinstance(first_step, (Covariances, CospCovariances)) and len(pipeline.steps) > 1
+
     def fit_transform(self, x, y):
         self.fit(x, y)
 
@@ -1031,6 +1187,47 @@ class ApplePyClassifier(BaseEstimator, TransformerMixin):
             pipeline_counter += 1
         return round_predictions
 
+    def predict_proba_batches(self, x, batch_size=CONST_DEFAULT_BATCH_SIZE, pipeline_names=None):
+        """
+        Predicts with probabilities the values for a new dataset with already fitted pipelines, without touching the
+        predictions stored by the classification. The samples are streamed through the pipelines in fixed-size batches. \n
+        Parameters \n
+        ---------- \n
+        x : the samples, or MNE Epochs whose channels are picked in the order used for the fitting \n
+        batch_size : int; number of samples given to the pipelines at once \n
+        pipeline_names : list or None; names of the pipelines to use. If None, all the pipelines are used. \n
+        Returns \n
+        ---------- \n
+        probabilities : array of shape (pipelines, samples, classes), the pipelines being sorted by name \n
+        pipeline_names : list; names of the pipelines, in the order of the first axis of probabilities \n
+        throughput : float; number of samples predicted per second, for all the pipelines \n
+        """
+        if hasattr(x, "get_data"):
+            x = x.get_data(picks=self.electrodes)
+        x = np.asarray(x)
+        if pipeline_names is None:
+            pipeline_names = list(self.catalogue.keys())
+        pipeline_names = sorted(pipeline_names)
+        nb_samples = x.shape[0]
+
+        start_time = time.perf_counter()
+        probabilities = None
+        for pipeline_idx, pipeline_name in enumerate(pipeline_names):
+            pipeline = self.catalogue[pipeline_name]
+            for batch_start in range(0, nb_samples, batch_size):
+                batch_end = min(batch_start + batch_size, nb_samples)
+                preds = pipeline.predict_proba(x[batch_start:batch_end])
+                if probabilities is None:
+                    nb_classes = self.nb_paradigms if self.nb_paradigms is not None else preds.shape[1]
+                    probabilities = np.zeros((len(pipeline_names), nb_samples, nb_classes))
+                probabilities[pipeline_idx, batch_start:batch_end, :preds.shape[1]] = preds
+        elapsed_time = time.perf_counter() - start_time
+
+        if probabilities is None:
+            probabilities = np.zeros((len(pipeline_names), nb_samples, 0))
+        throughput = nb_samples / elapsed_time if elapsed_time > 0 else float("inf")
+        return probabilities, pipeline_names, throughput
+
     """
     Scores
     """
@@ -1041,55 +1238,39 @@ class ApplePyClassifier(BaseEstimator, TransformerMixin):
         labels = self.labels
         pipelines = list(self.catalogue.keys())
         pipelines.sort()
-        expected = self.expected_answers
+        expected = np.asarray(self.expected_answers)
 
         try:
             if self.nb_subj != 1:
                 labels = np.concatenate(labels)
-            for pipeline_name in pipelines:
-                predictions_pipeline = self.predictions[pipeline_name]
-                score = 0
-                precision = 0
-                recall = 0
-
-                confusion_matrix = [[0 for _ in range(self.nb_paradigms)] for _ in range(self.nb_paradigms)]
-                for pred_idx in range(len(predictions_pipeline)):
-                    confusion_matrix[expected[pred_idx]][predictions_pipeline[pred_idx]] += 1
-                corrects = np.sum([confusion_matrix[i][i] for i in range(self.nb_paradigms)])
-                score = corrects / np.sum(confusion_matrix)
+            predictions = np.asarray([self.predictions[pipeline_name] for pipeline_name in pipelines])
+            confusion = classification_metrics.confusion_matrices(expected, predictions, self.nb_paradigms)
+            scores = classification_metrics.accuracies_from_confusion(confusion)
+            precisions, recalls = classification_metrics.precisions_recalls(confusion)
+
+            probabilities = np.asarray([self.predictions_proba[pipeline_name] for pipeline_name in pipelines])
+            roc_available = probabilities.ndim == 3 and probabilities.shape[1] == expected.shape[0]
+            if roc_available:
+                roc_infos = classification_metrics.roc_curves(expected, probabilities)
+
+            for pipeline_idx, pipeline_name in enumerate(pipelines):
+                self.scores[pipeline_name] = scores[pipeline_idx]
+                self.confusion_matrices[pipeline_name] = confusion[pipeline_idx]
+                if roc_available:
+                    self.roc_infos[pipeline_name] = roc_infos[pipeline_idx]
                 if self.nb_paradigms == 2:
-                    if confusion_matrix[1][1] + confusion_matrix[0][1] != 0:
-                        precision = confusion_matrix[1][1] / (confusion_matrix[1][1] + confusion_matrix[0][1])
-                    else:
-                        precision = 0
-                    if confusion_matrix[1][1] + confusion_matrix[1][0] != 0:
-                        recall = confusion_matrix[1][1] / (confusion_matrix[1][1] + confusion_matrix[1][0])
-                    else:
-                        recall = 0
+                    self.precisions[pipeline_name] = precisions[pipeline_idx][1]
+                    self.recalls[pipeline_name] = recalls[pipeline_idx][1]
+                else:
+                    self.precisions[pipeline_name] = precisions[pipeline_idx]
+                    self.recalls[pipeline_name] = recalls[pipeline_idx]
 
-                    self.precisions[pipeline_name] = precision
-                    self.recalls[pipeline_name] = recall
-
-                self.scores[pipeline_name] = score
-                self.confusion_matrices[pipeline_name] = confusion_matrix
-
-                if self.nb_paradigms == 2:
-                    # ROC curve
-                    preds_proba = self.predictions_proba[pipeline_name]
-                    positive_proba = []
-                    for j in range(len(preds_proba)):
-                        positive_proba.append(preds_proba[j][1])
-                    fpr, tpr, threshold = metrics.roc_curve(expected, positive_proba)
-                    roc_auc = metrics.auc(fpr, tpr)
-                    self.roc_infos[pipeline_name] = [fpr, tpr, roc_auc]
-            if self.nb_paradigms == 2:
-                auc_scores = deepcopy(self.roc_infos)
-                for pipeline in self.roc_infos:
-                    auc_scores[pipeline] = auc_scores[pipeline][2]
             self.classifier_log.append(('pipelines : ', list(self.catalogue.keys())))
             self.classifier_log.append(("scores", self.scores))
-            if self.nb_paradigms == 2:
+            if roc_available:
+                auc_scores = {pipeline_name: self.roc_infos[pipeline_name][2] for pipeline_name in pipelines}
                 self.classifier_log.append(("scores auc", auc_scores))
+            if self.nb_paradigms == 2:
                 self.classifier_log.append(("recalls", self.recalls))
                 self.classifier_log.append(("precisions", self.precisions))
         except Exception as e:
@@ -1162,14 +1343,9 @@ class ApplePyClassifier(BaseEstimator, TransformerMixin):
         y_test : the correct answers to the dataset \n
         """
         x_test = estimator.transform(x_test)
-        score = 0
         pipeline = estimator.pipeline
         predictions = pipeline.predict(x_test)
-        for i in range(y_test.shape[0]):
-            if predictions[i] == y_test[i]:
-                score += 1
-        score = score / y_test.shape[0]
-        return score
+        return classification_metrics.accuracy(y_test, predictions)
 
     def score_func(self, estimator, x_test, y_test):
         """
@@ -1188,13 +1364,8 @@ class ApplePyClassifier(BaseEstimator, TransformerMixin):
             if i == len(estimator_steps):
                 break
             x_test = estimator.named_steps[step].transform(x_test)
-        score = 0
         predictions = estimator.named_steps[step].predict(x_test)
-        for i in range(y_test.shape[0]):
-            if predictions[i] == y_test[i]:
-                score += 1
-        score = score / y_test.shape[0]
-        return score
+        return classification_metrics.accuracy(y_test, predictions)
 
     """
     Plot
@@ -1416,6 +1587,17 @@ class ApplePyClassifier(BaseEstimator, TransformerMixin):
         self.classifier_log.append(('Predictions', "see 'predictions.npy' in dataset folder"))
         np.save(os.path.join(dataset_path, "predictions.npy"), self.predictions)
 
+        if self.model_store is not None:
+            # The pipelines of the last fold were fitted on a part of the dataset only, they are fitted on all of it
+            self.fit(dataset, labels)
+            try:
+                self.model_store.save_catalogue(self.model_store.fingerprint(dataset, labels), self.catalogue,
+                                                self.event_names, self.electrodes)
+                self.classifier_log.append(('Fitted pipelines', "see '" + self.model_store.directory + "'"))
+            except Exception as e:
+                print("Fitted pipelines could not be saved")
+                print(e)
+
         self.save_program_log(dataset_path)
 
         if classify_test:
@@ -1424,6 +1606,52 @@ class ApplePyClassifier(BaseEstimator, TransformerMixin):
                 raise Exception(text)
             self.predict_test_dataset()
 
+    def classify_out_of_core(self, dataset, dataset_path=None, cv_value=5):
+        """
+        Inter-subjects classification of a dataset kept on disk. The subjects are split between the folds, and each
+        subject is only loaded when it is needed, so the memory used does not depend on the number of subjects. \n
+        Only the pipelines starting with a covariance estimation are used (see supports_out_of_core), the other ones
+        would need all the training epochs in memory and are removed. \n
+        Parameters \n
+        ---------- \n
+        dataset : SubjectMemmapDataset; the dataset, see prepare_memmap_dataset \n
+        dataset_path : string; the path where the predictions and the program log are saved \n
+        cv_value : int; the number of folds for cross validation. If None, the number of subjects will be used (Leave
+        one out) \n
+        """
+        unsupported_pipelines = sorted(name for name, pipeline in self.catalogue.items()
+                                       if not self.supports_out_of_core(pipeline))
+        if unsupported_pipelines:
+            print("Pipelines " + str(unsupported_pipelines) + " can not be fitted out of core, they are removed.")
+            self.classifier_log.append(('Pipelines removed (not out of core)', unsupported_pipelines))
+            self.delete_pipelines(unsupported_pipelines)
+        if len(self.catalogue) == 0:
+            raise Exception("None of the pipelines selected can be fitted out of core, select a pipeline starting with "
+                            "a covariance estimation (cov, MDM, FgMDM).")
+
+        self.nb_subj = dataset.get_nb_subjects()
+        self.labels = dataset.labels_per_subject
+        if self.nb_paradigms is None:
+            self.nb_paradigms = len(np.unique(dataset.get_labels()))
+        if cv_value is None:
+            cv_value = self.nb_subj
+
+        subjects = np.arange(self.nb_subj)
+        cv = GroupKFold(cv_value)
+        for train_subjects, test_subjects in cv.split(subjects, groups=subjects):
+            self.fit_subjects(dataset, train_subjects)
+            for _, subject_data, subject_labels in dataset.iter_subjects(test_subjects):
+                self.predict_proba(subject_data)
+                self.expected_answers.extend(subject_labels)
+
+        self.final_score()
+        print(self.classifier_log)
+
+        if dataset_path is not None:
+            self.classifier_log.append(('Predictions', "see 'predictions.npy' in dataset folder"))
+            np.save(os.path.join(dataset_path, "predictions.npy"), self.predictions)
+            self.save_program_log(dataset_path)
+
     def classify_intraSubject(self, dataset, divided_dataset=True, nb_subj=None, test_dataset_size=5, pre_epoched=True,
                               tmin=-0.2, tmax=0.5, bads=None, picks=None, filtering=[None, None], ICA=False,
                               resample=False, baseline=None, event_ids=[None, None], reference=None,
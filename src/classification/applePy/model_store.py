@@ -0,0 +1,215 @@
+import os
+import hashlib
+
+import numpy as np
+
+from joblib import dump, load
+
+CONST_MODEL_EXTENSION = ".joblib"
+CONST_CATALOGUE_PREFIX = "catalogue_"
+CONST_MAXIMUM_SIZE = 2 * 1024 ** 3     # 2 GB of fitted pipelines, the catalogues are not removed
+CONST_FINGERPRINT_SAMPLES = 64         # Samples of the training data hashed in the fingerprint
+
+
+class ModelStore:
+    """
+    Persistent registry of fitted pipelines. \n
+    Each fitted pipeline is serialized with joblib (uncompressed, so its numpy arrays can be memory-mapped on reload)
+    under a key made of the fingerprint of the training data, the name of the pipeline and its hyperparameters. \n
+    A fit whose key is already in the store is reloaded instead of being computed again. When the fitted pipelines
+    exceed the maximum size, the least recently used ones are removed.
+    """
+
+    def __init__(self, directory, mmap_mode='r', maximum_size=CONST_MAXIMUM_SIZE):
+        """
+        Parameters \n
+        ---------- \n
+        directory : string; path of the folder where the fitted pipelines are stored \n
+        mmap_mode : None or string; memory-map mode used by joblib when the pipelines are reloaded \n
+        maximum_size : int; maximum size of the fitted pipelines, in bytes \n
+        """
+        self.directory = directory
+        self.mmap_mode = mmap_mode
+        self.maximum_size = maximum_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    """
+    Keys
+    """
+    @staticmethod
+    def fingerprint(x, y=None):
+        """
+        Computes the fingerprint of a dataset from its shape, its data type, evenly spaced samples and all the labels,
+        so that it is cheap compared to a fit even when it is computed on every fold. \n
+        Parameters \n
+        ---------- \n
+        x : the samples \n
+        y : the labels of the samples \n
+        """
+        sha = hashlib.sha1()
+        for array in (x, y):
+            if array is None:
+                continue
+            array = np.asarray(array)
+            sha.update(str(array.shape).encode())
+            sha.update(str(array.dtype).encode())
+            if array is not y and array.ndim > 0 and len(array) > CONST_FINGERPRINT_SAMPLES:
+                array = array[np.linspace(0, len(array) - 1, CONST_FINGERPRINT_SAMPLES).astype(int)]
+            sha.update(np.ascontiguousarray(array).view(np.uint8).reshape(-1))
+        return sha.hexdigest()
+
+    @staticmethod
+    def hyperparameters_signature(pipeline):
+        """
+        Creates a stable textual signature of the hyperparameters of a pipeline. Nested estimators are only represented
+        by their class name, their own parameters being already part of the deep parameters. \n
+        Parameters \n
+        ---------- \n
+        pipeline : the sklearn estimator or pipeline \n
+        """
+        def describe(value):
+            if hasattr(value, "get_params"):
+                return type(value).__name__
+            if isinstance(value, (list, tuple)):
+                return [describe(v) for v in value]
+            return value
+
+        params = pipeline.get_params(deep=True)
+        signature = [type(pipeline).__name__]
+        for name in sorted(params.keys()):
+            signature.append(name + "=" + repr(describe(params[name])))
+        return ";".join(signature)
+
+    def make_key(self, fingerprint, pipeline_name, pipeline):
+        """
+        Creates the key under which a fitted pipeline is stored. \n
+        Parameters \n
+        ---------- \n
+        fingerprint : string; fingerprint of the training data \n
+        pipeline_name : string; name of the pipeline in the catalogue \n
+        pipeline : the sklearn estimator or pipeline \n
+        """
+        sha = hashlib.sha1()
+        sha.update(fingerprint.encode())
+        sha.update(pipeline_name.encode())
+        sha.update(self.hyperparameters_signature(pipeline).encode())
+        return pipeline_name + "_" + sha.hexdigest()
+
+    """
+    Fitted pipelines
+    """
+    def contains(self, key):
+        return os.path.isfile(self.get_path(key))
+
+    def save(self, key, pipeline):
+        """
+        Saves a fitted pipeline. \n
+        Parameters \n
+        ---------- \n
+        key : string; the key of the pipeline \n
+        pipeline : the fitted sklearn estimator or pipeline \n
+        """
+        dump(pipeline, self.get_path(key))
+        self.evict()
+
+    def load(self, key):
+        """
+        Loads a fitted pipeline, its arrays being memory-mapped when possible. \n
+        Parameters \n
+        ---------- \n
+        key : string; the key of the pipeline \n
+        """
+        pipeline = load(self.get_path(key), mmap_mode=self.mmap_mode)
+        os.utime(self.get_path(key))     # Most recently used
+        return pipeline
+
+    def evict(self):
+        """
+        Removes the least recently used fitted pipelines until their size is below the maximum size. The catalogues are
+        kept, they are what is reloaded to score new sessions.
+        """
+        files = []
+        for file in os.listdir(self.directory):
+            if file.endswith(CONST_MODEL_EXTENSION) and not file.startswith(CONST_CATALOGUE_PREFIX):
+                path = os.path.join(self.directory, file)
+                files.append((os.path.getmtime(path), os.path.getsize(path), path))
+        total_size = 0
+        for _, size, path in sorted(files, reverse=True):
+            total_size += size
+            if total_size > self.maximum_size:
+                try:
+                    os.remove(path)
+                except OSError:     # Memory-mapped by a pipeline in use on some platforms
+                    pass
+
+    def fit_or_load(self, pipeline_name, pipeline, x_train, y_train, fingerprint=None):
+        """
+        Returns the fitted pipeline, reloaded from the store if the same pipeline with the same hyperparameters has
+        already been fitted on the same data, fitted and saved otherwise. \n
+        Parameters \n
+        ---------- \n
+        pipeline_name : string; name of the pipeline in the catalogue \n
+        pipeline : the sklearn estimator or pipeline \n
+        x_train : the training samples \n
+        y_train : the correct answers to the training samples \n
+        fingerprint : string; fingerprint of the training data, computed if not given \n
+        """
+        if fingerprint is None:
+            fingerprint = self.fingerprint(x_train, y_train)
+        key = self.make_key(fingerprint, pipeline_name, pipeline)
+        if self.contains(key):
+            try:
+                return self.load(key)
+            except Exception as e:
+                print("Stored pipeline " + pipeline_name + " could not be reloaded, it will be fitted again.")
+                print(e)
+        pipeline.fit(x_train, y_train)
+        try:
+            self.save(key, pipeline)
+        except Exception as e:
+            print("Fitted pipeline " + pipeline_name + " could not be saved, it is kept in memory only.")
+            print(e)
+        return pipeline
+
+    """
+    Fitted catalogues
+    """
+    def save_catalogue(self, fingerprint, catalogue, event_names=None, electrodes=None):
+        """
+        Saves all the fitted pipelines of a classification, with what is needed to score new sessions. \n
+        Parameters \n
+        ---------- \n
+        fingerprint : string; fingerprint of the dataset used for the classification \n
+        catalogue : dict; the fitted pipelines, by name \n
+        event_names : list; names of the categories, in the order of the labels \n
+        electrodes : list; names of the channels used for the classification \n
+        """
+        content = {"catalogue": catalogue, "event_names": event_names, "electrodes": electrodes}
+        dump(content, self.get_path(CONST_CATALOGUE_PREFIX + fingerprint))
+
+    def load_catalogue(self, fingerprint=None):
+        """
+        Loads the fitted pipelines of a classification. \n
+        Parameters \n
+        ---------- \n
+        fingerprint : string or None; fingerprint of the dataset used for the classification. If None, the most recently
+        saved catalogue is loaded. \n
+        """
+        if fingerprint is None:
+            fingerprints = self.get_catalogue_fingerprints()
+            if len(fingerprints) == 0:
+                raise FileNotFoundError("No fitted catalogue found in " + self.directory)
+            fingerprint = fingerprints[-1]
+        return load(self.get_path(CONST_CATALOGUE_PREFIX + fingerprint), mmap_mode=self.mmap_mode)
+
+    def get_catalogue_fingerprints(self):
+        """
+        Returns the fingerprints of the saved catalogues, from the oldest to the most recent.
+        """
+        files = [file for file in os.listdir(self.directory)
+                 if file.startswith(CONST_CATALOGUE_PREFIX) and file.endswith(CONST_MODEL_EXTENSION)]
+        files.sort(key=lambda file: os.path.getmtime(os.path.join(self.directory, file)))
+        return [file[len(CONST_CATALOGUE_PREFIX):-len(CONST_MODEL_EXTENSION)] for file in files]
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key + CONST_MODEL_EXTENSION)
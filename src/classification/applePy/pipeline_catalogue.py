@@ -79,7 +79,7 @@ class Pipeline_catalogue:
                     self.parameters_to_fit["cov"] = [0]
             elif pipeline == 'Cosp':
                 self.catalogue['Cosp'] = make_pipeline(CospCovariances(fs=512, window=32, overlap=0.75, fmax=300, fmin=1),
-                                                       CospBoostingClassifier(self.catalogue['cov']))
+                                                       CospBoostingClassifier(self.catalogue['cov'], n_jobs=-1))
                 self.parameters_to_fit["Cosp"] = [0]
             elif pipeline == 'HankelCov':
                 self.catalogue['HankelCov'] = make_pipeline(DownSampler(2),
@@ -0,0 +1,127 @@
+import os
+import json
+
+import numpy as np
+
+CONST_DATASET_INDEX_FILE = "subjects.json"
+
+
+class SubjectMemmapDataset:
+    """
+    Multi-subject dataset kept on disk. \n
+    Each subject is stored in its own .npy files (epochs x channels x times data and labels) and is only opened,
+    memory-mapped, when its epochs are needed. Only the labels and the groups of all the subjects are kept in memory,
+    so a cross-validation over many subjects works with one subject at a time in memory.
+    """
+
+    def __init__(self, directory):
+        """
+        Parameters \n
+        ---------- \n
+        directory : string; path of the folder containing the files of the subjects. The subjects already saved in this
+        folder are reloaded. \n
+        """
+        self.directory = directory
+        self.subject_names = []
+        self.subject_sizes = []
+        self.labels_per_subject = []
+        os.makedirs(self.directory, exist_ok=True)
+
+        index_path = os.path.join(self.directory, CONST_DATASET_INDEX_FILE)
+        if os.path.isfile(index_path):
+            with open(index_path, "r") as file:
+                self.subject_names = json.load(file)
+            for subject_name in self.subject_names:
+                labels = np.load(self.get_labels_path(subject_name))
+                self.labels_per_subject.append(labels)
+                self.subject_sizes.append(labels.shape[0])
+
+    """
+    Subjects
+    """
+    def add_subject(self, subject_name, data, labels):
+        """
+        Saves the epochs of a subject on disk. The data given can be freed once saved. \n
+        Parameters \n
+        ---------- \n
+        subject_name : string; name of the subject, used for the names of the files \n
+        data : array of shape (epochs, channels, times); the epochs of the subject \n
+        labels : array of shape (epochs,); the labels of the epochs \n
+        """
+        labels = np.asarray(labels)
+        np.save(self.get_data_path(subject_name), np.asarray(data))
+        np.save(self.get_labels_path(subject_name), labels)
+        if subject_name in self.subject_names:
+            subject_idx = self.subject_names.index(subject_name)
+            self.labels_per_subject[subject_idx] = labels
+            self.subject_sizes[subject_idx] = labels.shape[0]
+        else:
+            self.subject_names.append(subject_name)
+            self.labels_per_subject.append(labels)
+            self.subject_sizes.append(labels.shape[0])
+        with open(os.path.join(self.directory, CONST_DATASET_INDEX_FILE), "w") as file:
+            json.dump(self.subject_names, file)
+
+    def load_subject(self, subject_idx):
+        """
+        Returns the memory-mapped epochs of a subject. \n
+        Parameters \n
+        ---------- \n
+        subject_idx : int; index of the subject \n
+        """
+        return np.load(self.get_data_path(self.subject_names[subject_idx]), mmap_mode='r')
+
+    def iter_subjects(self, subject_indexes=None):
+        """
+        Iterates over the subjects, yielding for each one its index, its memory-mapped epochs and its labels. \n
+        Parameters \n
+        ---------- \n
+        subject_indexes : list or None; indexes of the subjects to iterate over. If None, all the subjects are used. \n
+        """
+        if subject_indexes is None:
+            subject_indexes = range(len(self.subject_names))
+        for subject_idx in subject_indexes:
+            yield subject_idx, self.load_subject(subject_idx), self.labels_per_subject[subject_idx]
+
+    def get_samples(self, indexes):
+        """
+        Gathers in memory the epochs at the given indexes of the whole dataset, only opening the subjects concerned. \n
+        Parameters \n
+        ---------- \n
+        indexes : array of int; indexes of the epochs in the whole dataset \n
+        """
+        indexes = np.asarray(indexes)
+        offsets = self.get_offsets()
+        subjects = np.searchsorted(offsets, indexes, side='right') - 1
+        samples = None
+        for subject_idx in np.unique(subjects):
+            subject_mask = subjects == subject_idx
+            subject_data = self.load_subject(subject_idx)
+            if samples is None:
+                samples = np.empty((indexes.shape[0],) + subject_data.shape[1:], dtype=subject_data.dtype)
+            samples[subject_mask] = subject_data[indexes[subject_mask] - offsets[subject_idx]]
+        return samples
+
+    """
+    Getters
+    """
+    def get_offsets(self):
+        return np.concatenate([[0], np.cumsum(self.subject_sizes)])
+
+    def get_labels(self):
+        return np.concatenate(self.labels_per_subject)
+
+    def get_groups(self):
+        return np.repeat(np.arange(len(self.subject_sizes)), self.subject_sizes)
+
+    def get_nb_subjects(self):
+        return len(self.subject_names)
+
+    def get_data_path(self, subject_name):
+        return os.path.join(self.directory, subject_name + "_data.npy")
+
+    def get_labels_path(self, subject_name):
+        return os.path.join(self.directory, subject_name + "_labels.npy")
+
+    def __len__(self):
+        return int(np.sum(self.subject_sizes))
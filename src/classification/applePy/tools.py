@@ -2,6 +2,8 @@ import numpy as np
 
 from copy import deepcopy
 
+from joblib import Parallel, delayed
+
 from sklearn.base import BaseEstimator, TransformerMixin
 
 from scipy.signal import welch
@@ -42,30 +44,45 @@ class CospBoostingClassifier(BaseEstimator, TransformerMixin):
     """
     Co-spectral matrix bagging.
     Source from Cédric Simar.
+    One copy of the base classifier is fitted per frequency bin, the bins being processed in parallel by n_jobs workers.
+    Only one bin out of bin_step is used, which trades accuracy for speed.
     """
-    def __init__(self, baseclf):
+    def __init__(self, baseclf, n_jobs=1, bin_step=1):
         self.baseclf = baseclf
+        self.n_jobs = n_jobs
+        self.bin_step = bin_step
         self.clfs_ = []
 
     def fit(self, X, y):
-        for i in range(X.shape[-1]):
-            clf = deepcopy(self.baseclf)
-            self.clfs_.append(clf.fit(X[:, :, :, i], y))
+        self.bins_ = np.arange(0, X.shape[-1], self.bin_step)
+        self.clfs_ = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_bin)(deepcopy(self.baseclf), X[:, :, :, i], y) for i in self.bins_)
         return self
 
-    def predict_proba(self, X):
-        proba = []
-        for i in range(X.shape[-1]):
-            proba.append(self.clfs_[i].predict_proba(X[:, :, :, i]))
-        proba = np.mean(proba, axis=0)
+    def _predict_proba_bins(self, X):
+        """
+        Returns the probabilities predicted for each frequency bin, in an array of shape (bins, samples, classes).
+        """
+        first_proba = self.clfs_[0].predict_proba(X[:, :, :, self.bins_[0]])
+        proba = np.empty((len(self.bins_),) + first_proba.shape)
+        proba[0] = first_proba
+
+        def predict_bin(idx):
+            proba[idx] = self.clfs_[idx].predict_proba(X[:, :, :, self.bins_[idx]])
+
+        Parallel(n_jobs=self.n_jobs, require="sharedmem")(delayed(predict_bin)(idx) for idx in range(1, len(self.bins_)))
         return proba
 
+    def predict_proba(self, X):
+        return self._predict_proba_bins(X).mean(axis=0)
+
     def transform(self, X):
-        proba = []
-        for i in range(X.shape[-1]):
-            proba.append(self.clfs_[i].predict_proba(X[:, :, :, i]))
-        proba = np.concatenate(proba, 1)
-        return proba
+        proba = self._predict_proba_bins(X)
+        return proba.transpose(1, 0, 2).reshape(X.shape[0], -1)
+
+
+def _fit_bin(clf, X, y):
+    return clf.fit(X, y)
 
 
 class PSDfiltering(BaseEstimator, TransformerMixin):
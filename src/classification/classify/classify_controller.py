@@ -20,9 +20,9 @@ __status__ = "Dev"
 
 
 class classifyController(classifyListener):
-    def __init__(self, number_of_channels, event_values, event_ids):
+    def __init__(self, number_of_channels, event_values, event_ids, directory=None):
         """
-        Controller for computing the classification on the dataset.
+        Controller for computing the classification on the dataset, or on a directory of subjects out of core.
         Create a new window for specifying some parameters.
         :param number_of_channels: The number of channels in the dataset.
         :type number_of_channels: int
@@ -30,9 +30,12 @@ class classifyController(classifyListener):
         :type event_values: list of, list of int
         :param event_ids: Name of the events associated to their id.
         :type event_ids: dict
+        :param directory: The directory of the subjects classified out of core. If None, the dataset is classified.
+        :type directory: str
         """
         self.main_listener = None
-        self.classify_view = classifyView(number_of_channels, event_values, event_ids)
+        self.directory = directory
+        self.classify_view = classifyView(number_of_channels, event_values, event_ids, directory)
         self.classify_view.set_listener(self)
 
         self.classify_view.show()
@@ -63,8 +66,12 @@ class classifyController(classifyListener):
         :type trials_selected: list of int
         """
         self.classify_view.close()
-        self.main_listener.classify_information(pipeline_selected, feature_selection, number_of_channels_to_select, hyper_tuning,
-                                                cross_val_number, trials_selected)
+        if self.directory is None:
+            self.main_listener.classify_information(pipeline_selected, feature_selection, number_of_channels_to_select,
+                                                    hyper_tuning, cross_val_number, trials_selected)
+        else:
+            self.main_listener.classify_directory_information(self.directory, pipeline_selected, cross_val_number,
+                                                              self.classify_view.get_events_selected())
 
     def plot_results(self, classifier):
         """
@@ -21,28 +21,37 @@ __status__ = "Dev"
 
 
 class classifyView(QWidget):
-    def __init__(self, number_of_channels, event_values, event_ids):
+    def __init__(self, number_of_channels, event_values, event_ids, directory=None):
         """
         Window displaying the parameters for performing the classification.
+        For the classification of a directory of subjects, only the pipelines, the number of folds and the events
+        classified are asked.
         :param number_of_channels: The number of channels in the dataset.
         :type number_of_channels: int
         :param event_values: Event_id associated to each epoch/trial.
         :type event_values: list of, list of int
         :param event_ids: Name of the events associated to their id.
         :type event_ids: dict
+        :param directory: The directory of the subjects classified out of core. If None, the dataset is classified.
+        :type directory: str
         """
         super().__init__()
         self.classify_listener = None
         self.number_of_channels = number_of_channels
         self.event_values = event_values
         self.event_ids = event_ids
+        self.directory = directory
 
         self.pipeline_selector_controller = None
         self.pipeline_selected = None
         self.events_selector_controller = None
         self.trials_selected = None
+        self.events_selected = list(self.event_ids.keys())
 
-        self.setWindowTitle("Classification")
+        if self.directory is None:
+            self.setWindowTitle("Classification")
+        else:
+            self.setWindowTitle("Classification of the subjects of " + self.directory)
 
         self.vertical_layout = QVBoxLayout()
         self.setLayout(self.vertical_layout)
@@ -90,6 +99,13 @@ class classifyView(QWidget):
         self.trial_selection_layout.addWidget(self.trial_selection_events, 1, 1)
         self.trial_selection_widget.setLayout(self.trial_selection_layout)
 
+        if self.directory is not None:     # Not available out of core, the epochs of the subjects are not in memory
+            self.feature_selection.setEnabled(False)
+            self.number_of_features.setEnabled(False)
+            self.hyper_tuning.setEnabled(False)
+            self.trial_selection_label.setText("Events classified (default : all) :")
+            self.trial_selection_indexes.hide()
+
         # Cancel Confirm
         self.cancel_confirm_widget = QWidget()
         self.cancel_confirm_layout = QHBoxLayout()
@@ -207,6 +223,8 @@ class classifyView(QWidget):
         :type element_type: str
         """
         trials_to_use = []
+        if element_type == "events":
+            self.events_selected = elements_selected
         if element_type == "indexes":
             for trial in elements_selected:
                 trials_to_use.append(int(trial)-1)  # -1 To get index in the list, not "position"
@@ -228,3 +246,14 @@ class classifyView(QWidget):
         :type pipeline: list of str
         """
         self.pipeline_selected = pipeline
+
+    """
+    Getters
+    """
+    def get_events_selected(self):
+        """
+        Get the events selected, classified in the directory of subjects.
+        :return: The names of the events selected.
+        :rtype: list of str
+        """
+        return self.events_selected
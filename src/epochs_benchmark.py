@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the extraction of the epochs: time of the extraction from the strided view of the raw data and of the
+extraction of MNE, on synthetic raw data, and check that both give the same epochs, for events near the edges of the
+recording and for tmin and tmax that are not multiples of the sampling period.
+Usage: python epochs_benchmark.py [--channels N] [--events N] [--tmin T] [--tmax T] [--repeat N]
+"""
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+import argparse
+import sys
+
+from time import perf_counter
+
+import numpy as np
+
+from mne import create_info, Epochs
+from mne.io import RawArray
+
+from utils.model.epochs_extraction import extract_epochs
+from utils.model.performance_profiler import get_median
+
+CONST_SAMPLING_FREQUENCY = 250.0
+CONST_FIRST_SAMPLE = 1000
+CONST_EVENT_IDS = {"left": 1, "right": 2}
+# Maximum difference with MNE, relative to the largest amplitude of the epochs
+CONST_TOLERANCE = 1e-10
+
+
+def create_data(number_of_channels, number_of_events, tmin, tmax):
+    """
+    Creates random raw data, with a stimulation channel and a first sample that is not 0, and its events. Some events
+    are placed so that their epochs start or end exactly at the edges of the data, or one sample outside of it.
+    :param number_of_channels: Number of EEG channels.
+    :type number_of_channels: int
+    :param number_of_events: Number of events placed regularly in the data, before the events near the edges.
+    :type number_of_events: int
+    :param tmin: Start time of the epochs.
+    :type tmin: float
+    :param tmax: End time of the epochs.
+    :type tmax: float
+    :return: The raw data and the events.
+    :rtype: (MNE.Raw, numpy.ndarray)
+    """
+    random_generator = np.random.default_rng(0)
+    channel_names = ["EEG " + str(i) for i in range(number_of_channels)] + ["STI"]
+    channel_types = ["eeg"] * number_of_channels + ["stim"]
+    info = create_info(channel_names, CONST_SAMPLING_FREQUENCY, channel_types)
+    start_index = int(round(tmin * CONST_SAMPLING_FREQUENCY))
+    stop_index = int(round(tmax * CONST_SAMPLING_FREQUENCY))
+    spacing = stop_index - start_index + 10
+    number_of_times = (number_of_events + 2) * spacing
+    data = random_generator.standard_normal((len(channel_names), number_of_times)) * 1e-5
+    data[-1, :] = 0
+    raw = RawArray(data, info, first_samp=CONST_FIRST_SAMPLE, verbose=False)
+
+    samples = list(np.arange(1, number_of_events + 1) * spacing)
+    # First and last epochs fully inside the data, then the ones starting or ending one sample outside of it
+    samples += [-start_index, number_of_times - 1 - stop_index, -start_index - 1, number_of_times - stop_index]
+    samples = np.array(sorted(set(samples))) + CONST_FIRST_SAMPLE
+    events = np.column_stack([samples, np.zeros(len(samples), dtype=int),
+                              random_generator.integers(1, 3, len(samples))])
+    return raw, events
+
+
+def measure_extraction(raw, events, tmin, tmax, repeat):
+    """
+    Extracts the epochs with the strided view and with MNE, and measures the time of each extraction.
+    :param raw: MNE data of the dataset.
+    :type raw: MNE.Raw
+    :param events: The events from which the epochs will be extracted.
+    :type events: numpy.ndarray
+    :param tmin: Start time of the epochs.
+    :type tmin: float
+    :param tmax: End time of the epochs.
+    :type tmax: float
+    :param repeat: Number of extractions measured.
+    :type repeat: int
+    :return: The epochs extracted with the strided view and by MNE, and the median time of each extraction, in seconds.
+    :rtype: (MNE.Epochs, MNE.Epochs, float, float)
+    """
+    strided_durations = []
+    mne_durations = []
+    strided_epochs = mne_epochs = None
+    for _ in range(repeat):
+        start = perf_counter()
+        strided_epochs = extract_epochs(raw, events, CONST_EVENT_IDS, tmin, tmax)
+        strided_durations.append(perf_counter() - start)
+
+        start = perf_counter()
+        mne_epochs = Epochs(raw, events=events, event_id=CONST_EVENT_IDS, tmin=tmin, tmax=tmax, baseline=(None, 0),
+                            preload=True, verbose=False)
+        mne_durations.append(perf_counter() - start)
+    return strided_epochs, mne_epochs, get_median(strided_durations), get_median(mne_durations)
+
+
+def get_differences(strided_epochs, mne_epochs):
+    """
+    Compares the epochs extracted with the strided view with the ones extracted by MNE.
+    :param strided_epochs: The epochs extracted with the strided view.
+    :type strided_epochs: MNE.Epochs
+    :param mne_epochs: The epochs extracted by MNE.
+    :type mne_epochs: MNE.Epochs
+    :return: The description of each difference, empty if the epochs are the same.
+    :rtype: list of str
+    """
+    differences = []
+    if not np.array_equal(strided_epochs.events, mne_epochs.events):
+        differences.append("Events kept: " + str(strided_epochs.events[:, 0].tolist()) + " instead of "
+                           + str(mne_epochs.events[:, 0].tolist()))
+        return differences
+    if not np.allclose(strided_epochs.times, mne_epochs.times, rtol=0, atol=0.5 / CONST_SAMPLING_FREQUENCY):
+        differences.append("Times from " + str(strided_epochs.times[0]) + " to " + str(strided_epochs.times[-1])
+                           + " s instead of " + str(mne_epochs.times[0]) + " to " + str(mne_epochs.times[-1]) + " s")
+        return differences
+    strided_data = strided_epochs.get_data()
+    mne_data = mne_epochs.get_data()
+    error = np.max(np.abs(strided_data - mne_data)) / max(np.max(np.abs(mne_data)), np.finfo(float).tiny)
+    if error > CONST_TOLERANCE:
+        differences.append("Largest difference of the data " + "{:.2e}".format(error))
+    return differences
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the extraction of the epochs with the one of MNE.")
+    parser.add_argument("--channels", type=int, default=64, help="Number of EEG channels.")
+    parser.add_argument("--events", type=int, default=500, help="Number of events inside the data.")
+    parser.add_argument("--tmin", type=float, default=-0.2013, help="Start time of the epochs.")
+    parser.add_argument("--tmax", type=float, default=0.7987, help="End time of the epochs.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of extractions measured.")
+    arguments = parser.parse_args()
+
+    raw, events = create_data(arguments.channels, arguments.events, arguments.tmin, arguments.tmax)
+    strided_epochs, mne_epochs, strided_time, mne_time = measure_extraction(raw, events, arguments.tmin,
+                                                                            arguments.tmax, arguments.repeat)
+    print("Strided view " + "{:.3f}".format(strided_time) + " s, MNE " + "{:.3f}".format(mne_time) + " s, "
+          + str(len(strided_epochs)) + " epochs")
+    differences = get_differences(strided_epochs, mne_epochs)
+    for difference in differences:
+        print("    " + difference)
+    sys.exit(1 if differences else 0)
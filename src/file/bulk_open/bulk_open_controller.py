@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Bulk Open Controller
+"""
+
+from file.bulk_open.bulk_open_listener import bulkOpenListener
+from file.bulk_open.bulk_open_view import bulkOpenView
+from file.study_creation.study_creation_controller import studyCreationController
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class bulkOpenController(bulkOpenListener):
+    def __init__(self, headers):
+        """
+        Controller for the opening of all the files of a directory.
+        Create a new window displaying the headers of the files and the progress of their opening.
+        The study can be created from the headers, before all the files are opened.
+        :param headers: The header of each file.
+        :type headers: list of dict
+        """
+        self.main_listener = None
+        self.study_creation_controller = None
+
+        self.headers = headers
+
+        self.bulk_open_view = bulkOpenView(headers)
+        self.bulk_open_view.set_listener(self)
+
+        self.bulk_open_view.show()
+
+    def close_button_clicked(self):
+        """
+        Close the window. The files continue to be opened.
+        """
+        self.bulk_open_view.close()
+
+    def create_study_button_clicked(self):
+        """
+        Create the controller for the creation of the study, filled with the names of the files and the information
+        given by their BIDS entities.
+        """
+        dataset_names = [header["name"] for header in self.headers]
+        self.study_creation_controller = studyCreationController(dataset_names, self.headers)
+        self.study_creation_controller.set_listener(self)
+
+    def create_study_information(self, study_name, task_name, dataset_names, dataset_indexes, subjects, sessions, runs,
+                                 conditions, groups):
+        """
+        Send the information of the study to the main controller, with the files selected instead of the indexes of
+        their datasets, which are not known until the files are opened.
+        :param study_name: The name of the study
+        :type study_name: str
+        :param task_name: The name of the task linked to the study
+        :type task_name: str
+        :param dataset_names: The name of the datasets linked to the study
+        :type dataset_names: list of str
+        :param dataset_indexes: The indexes of the files selected to be in the study
+        :type dataset_indexes: list of int
+        :param subjects: The subjects assigned to each dataset in the study
+        :type subjects: list of str
+        :param sessions: The sessions assigned to each dataset in the study
+        :type sessions: list of str
+        :param runs: The runs assigned to each dataset in the study
+        :type runs: list of str
+        :param conditions: The conditions assigned to each dataset in the study
+        :type conditions: list of str
+        :param groups: The groups assigned to each dataset in the study
+        :type groups: list of str
+        """
+        paths_to_files = [self.headers[i]["path"] for i in dataset_indexes]
+        self.main_listener.bulk_open_create_study(study_name, task_name, dataset_names, paths_to_files, subjects,
+                                                  sessions, runs, conditions, groups)
+
+    def file_opened(self, path_to_file):
+        """
+        Display that a file has been opened.
+        :param path_to_file: The path to the file.
+        :type path_to_file: str
+        """
+        self.bulk_open_view.set_file_opened(path_to_file)
+
+    def file_error(self, path_to_file, error_message):
+        """
+        Display that a file could not be opened.
+        :param path_to_file: The path to the file.
+        :type path_to_file: str
+        :param error_message: The error that occurred.
+        :type error_message: str
+        """
+        self.bulk_open_view.set_file_error(path_to_file, error_message)
+
+    def study_pending(self):
+        """
+        Display that the study will be created once all the files are opened.
+        """
+        self.bulk_open_view.set_study_pending()
+
+    """
+    Setters
+    """
+    def set_listener(self, listener):
+        """
+        Set the main listener so that the controller is able to communicate with the main controller.
+        :param listener: main listener
+        :type listener: mainController
+        """
+        self.main_listener = listener
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Bulk Open Listener
+"""
+
+from abc import ABC, abstractmethod
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class bulkOpenListener(ABC):
+    """
+    Listener doing the connection between the controller and the view for the opening of the files of a directory.
+    It retrieves the information from the view to send it to the controller.
+    """
+
+    @abstractmethod
+    def close_button_clicked(self):
+        pass
+
+    @abstractmethod
+    def create_study_button_clicked(self):
+        pass
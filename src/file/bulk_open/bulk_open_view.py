@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Bulk Open View
+"""
+
+from os.path import basename
+
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, \
+    QHeaderView, QLabel, QProgressBar
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_COLUMNS = ["File", "Type", "Channels", "Sampling frequency (Hz)", "Length", "Events", "Size (MB)", "Subject",
+                 "Status"]
+
+
+class bulkOpenView(QWidget):
+    def __init__(self, headers):
+        """
+        Window displaying the files of a directory opened at once, with the information read from their headers, and
+        the progress of the opening of each file.
+        :param headers: The header of each file.
+        :type headers: list of dict
+        """
+        super().__init__()
+        self.bulk_open_listener = None
+
+        self.rows = {header["path"]: i for i, header in enumerate(headers)}
+
+        self.setWindowTitle("Open Directory")
+        self.resize(900, 500)
+
+        self.vertical_layout = QVBoxLayout()
+        self.setLayout(self.vertical_layout)
+
+        self.table = QTableWidget(len(headers), len(CONST_COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(CONST_COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        for row, header in enumerate(headers):
+            self.display_header(row, header)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, len(headers))
+        self.progress_bar.setValue(0)
+        self.progress_label = QLabel("Opening the files, please wait.", self)
+
+        self.buttons_widget = QWidget()
+        self.buttons_layout = QHBoxLayout()
+        self.buttons_widget.setLayout(self.buttons_layout)
+        self.create_study_button = QPushButton("Create &study", self)
+        self.create_study_button.clicked.connect(self.create_study_trigger)
+        self.close_button = QPushButton("&Close", self)
+        self.close_button.clicked.connect(self.close_trigger)
+        self.buttons_layout.addWidget(self.create_study_button)
+        self.buttons_layout.addWidget(self.close_button)
+
+        self.vertical_layout.addWidget(self.table)
+        self.vertical_layout.addWidget(self.progress_bar)
+        self.vertical_layout.addWidget(self.progress_label)
+        self.vertical_layout.addWidget(self.buttons_widget)
+
+        for header in headers:
+            if header["error"] is not None:
+                self.set_file_error(header["path"], header["error"])
+
+    """
+    Plots
+    """
+    def display_header(self, row, header):
+        """
+        Displays the information read from the header of a file.
+        :param row: The row of the file in the table.
+        :type row: int
+        :param header: The header of the file.
+        :type header: dict
+        """
+        if header["duration"] is not None:
+            length = "{:.1f}".format(header["duration"]) + " s"
+        elif header["epochs"] is not None:
+            length = str(header["epochs"]) + " epochs"
+        else:
+            length = ""
+        size = None if header["size"] is None else "{:.1f}".format(header["size"] / 1024 ** 2)
+        values = [basename(header["path"]), header["file_type"], header["channels"], header["sfreq"], length,
+                  header["events"], size, header["subject"], "Waiting"]
+        for column, value in enumerate(values):
+            self.table.setItem(row, column, QTableWidgetItem("" if value is None else str(value)))
+
+    def set_file_opened(self, path_to_file):
+        """
+        Displays that a file has been opened.
+        :param path_to_file: The path to the file.
+        :type path_to_file: str
+        """
+        self.set_file_status(path_to_file, "Opened")
+
+    def set_file_error(self, path_to_file, error_message):
+        """
+        Displays that a file could not be opened.
+        :param path_to_file: The path to the file.
+        :type path_to_file: str
+        :param error_message: The error that occurred.
+        :type error_message: str
+        """
+        self.set_file_status(path_to_file, "Error: " + str(error_message))
+
+    def set_file_status(self, path_to_file, status):
+        """
+        Displays the status of a file whose opening is finished, and updates the progress bar.
+        :param path_to_file: The path to the file.
+        :type path_to_file: str
+        :param status: The status of the file.
+        :type status: str
+        """
+        self.table.setItem(self.rows[path_to_file], len(CONST_COLUMNS) - 1, QTableWidgetItem(status))
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+        if self.progress_bar.value() == self.progress_bar.maximum():
+            self.progress_label.setText("All the files have been processed.")
+        else:
+            self.progress_label.setText(str(self.progress_bar.value()) + " of " + str(self.progress_bar.maximum()) +
+                                        " files processed, please wait.")
+
+    def set_study_pending(self):
+        """
+        Displays that the study will be created once all the files are opened.
+        """
+        self.create_study_button.setEnabled(False)
+        self.progress_label.setText(self.progress_label.text() + " The study will be created once all the files are "
+                                                                  "opened.")
+
+    """
+    Triggers
+    """
+    def create_study_trigger(self):
+        """
+        Send the information to the controller that a study must be created with the files.
+        """
+        self.bulk_open_listener.create_study_button_clicked()
+
+    def close_trigger(self):
+        """
+        Send the information to the controller that the window is closed.
+        """
+        self.bulk_open_listener.close_button_clicked()
+
+    """
+    Setters
+    """
+    def set_listener(self, listener):
+        """
+        Set the listener to the controller.
+        :param listener: Listener to the controller.
+        :type listener: bulkOpenController
+        """
+        self.bulk_open_listener = listener
@@ -18,15 +18,18 @@ __status__ = "Dev"
 
 
 class studyCreationController(studyCreationListener):
-    def __init__(self, dataset_names):
+    def __init__(self, dataset_names, dataset_information=None):
         """
         Controller for creating the study_creation with the chosen dataset that are loaded.
         Create a new window for displaying the information.
         :param dataset_names: All the dataset names
         :type dataset_names: list of str
+        :param dataset_information: The subject, session, task, run and condition already known for each dataset, read
+        from the BIDS entities of the file names for example.
+        :type dataset_information: list of dict
         """
         self.main_listener = None
-        self.study_view = studyCreationView(dataset_names)
+        self.study_view = studyCreationView(dataset_names, dataset_information)
         self.study_view.set_listener(self)
 
         self.study_view.show()
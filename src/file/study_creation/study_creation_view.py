@@ -7,6 +7,7 @@ Study View
 
 from PyQt5.QtWidgets import QWidget, QPushButton, QLabel, QLineEdit, QHBoxLayout, QVBoxLayout, QGridLayout, QCheckBox
 
+from utils.model.file_header import format_file_header
 from utils.view.separator import create_layout_separator
 
 __author__ = "Lemahieu Antoine"
@@ -19,16 +20,20 @@ __status__ = "Dev"
 
 
 class studyCreationView(QWidget):
-    def __init__(self, dataset_names):
+    def __init__(self, dataset_names, dataset_information=None):
         """
         Window displaying the parameters for loading additional data information.
         :param dataset_names: All the dataset names
         :type dataset_names: list of str
+        :param dataset_information: The subject, session, task, run and condition already known for each dataset.
+        :type dataset_information: list of dict
         """
         super().__init__()
         self.study_listener = None
 
         self.dataset_names = dataset_names
+        if dataset_information is None:
+            dataset_information = [{} for _ in dataset_names]
 
         self.setWindowTitle("Create Study")
 
@@ -47,6 +52,9 @@ class studyCreationView(QWidget):
         self.task_name_widget = QWidget()
         self.task_name_layout = QHBoxLayout()
         self.task_name_line = QLineEdit()
+        tasks = set(information.get("task", "") for information in dataset_information)
+        if len(tasks) == 1:     # All the datasets are recordings of the same task
+            self.task_name_line.setText(tasks.pop())
         self.task_name_layout.addWidget(QLabel("Task name : "))
         self.task_name_layout.addWidget(self.task_name_line)
         self.task_name_widget.setLayout(self.task_name_layout)
@@ -61,18 +69,20 @@ class studyCreationView(QWidget):
         for i in range(len(dataset_names)):
             self.all_dataset_lines.append([])
             dataset_line = QLineEdit(dataset_names[i])
+            if dataset_information[i].get("file_type") is not None:     # Header of the file read before its data
+                dataset_line.setToolTip(format_file_header(dataset_information[i]))
             self.datasets_layout.addWidget(dataset_line, i+1, 0)
             self.all_dataset_lines[i].append(dataset_line)
-            subject_line = QLineEdit()
+            subject_line = QLineEdit(dataset_information[i].get("subject", ""))
             self.datasets_layout.addWidget(subject_line, i+1, 1)
             self.all_dataset_lines[i].append(subject_line)
-            session_line = QLineEdit()
+            session_line = QLineEdit(dataset_information[i].get("session", ""))
             self.datasets_layout.addWidget(session_line, i+1, 2)
             self.all_dataset_lines[i].append(session_line)
-            run_line = QLineEdit()
+            run_line = QLineEdit(dataset_information[i].get("run", ""))
             self.datasets_layout.addWidget(run_line, i+1, 3)
             self.all_dataset_lines[i].append(run_line)
-            condition_line = QLineEdit()
+            condition_line = QLineEdit(dataset_information[i].get("condition", ""))
             self.datasets_layout.addWidget(condition_line, i+1, 4)
             self.all_dataset_lines[i].append(condition_line)
             group_line = QLineEdit()
@@ -97,6 +107,7 @@ class studyCreationView(QWidget):
 
         # Layout
         self.global_layout.addWidget(self.study_name_widget)
+        self.global_layout.addWidget(self.task_name_widget)
         self.global_layout.addWidget(create_layout_separator())
         self.global_layout.addWidget(self.datasets_widget)
         self.global_layout.addWidget(create_layout_separator())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the filter engine: time of the filtering by blocks of channels and of the filtering of MNE, on synthetic
+raw and epoched data, and check that each data channel is filtered exactly once like MNE does, and that the other
+channels are not modified.
+Usage: python filter_benchmark.py [--channels N] [--epochs N] [--method fir|iir] [--jobs N] [--repeat N]
+"""
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+import argparse
+import sys
+
+from time import perf_counter
+
+import numpy as np
+
+from mne import create_info, EpochsArray
+from mne.io import RawArray
+
+from utils.model.filter_engine import filter_data, get_iir_params
+from utils.model.performance_profiler import get_median
+
+CONST_SAMPLING_FREQUENCY = 250.0
+CONST_LOW_FREQUENCY = 1.0
+CONST_HIGH_FREQUENCY = 40.0
+# Maximum difference with MNE, relative to the largest amplitude of the channel
+CONST_TOLERANCE = 1e-6
+
+
+def create_data(number_of_channels, number_of_epochs):
+    """
+    Creates random raw data and epochs, with a stimulation channel and a channel that is not selected for the filtering.
+    :param number_of_channels: Number of EEG channels.
+    :type number_of_channels: int
+    :param number_of_epochs: Number of epochs, of 2 seconds each. The raw data has the same length.
+    :type number_of_epochs: int
+    :return: The raw data and the epochs.
+    :rtype: (MNE.Raw, MNE.Epochs)
+    """
+    random_generator = np.random.default_rng(0)
+    channel_names = ["EEG " + str(i) for i in range(number_of_channels)] + ["EOG", "STI"]
+    channel_types = ["eeg"] * number_of_channels + ["eog", "stim"]
+    info = create_info(channel_names, CONST_SAMPLING_FREQUENCY, channel_types)
+    number_of_times = int(2 * CONST_SAMPLING_FREQUENCY)
+    epochs_data = random_generator.standard_normal((number_of_epochs, len(channel_names), number_of_times)) * 1e-5
+    epochs_data[:, -1, :] = 0
+    epochs_data[:, -1, 10] = 1
+    events = np.column_stack([np.arange(number_of_epochs) * number_of_times, np.zeros(number_of_epochs, dtype=int),
+                              np.ones(number_of_epochs, dtype=int)])
+    epochs = EpochsArray(epochs_data, info, events=events, verbose=False)
+    raw = RawArray(np.hstack(epochs_data), info, verbose=False)
+    return raw, epochs
+
+
+def measure_filter(file_data, method, n_jobs, repeat):
+    """
+    Filters copies of the data with the filter engine and with MNE, and measures the time of each filtering.
+    :param file_data: MNE data of the dataset.
+    :type file_data: MNE.Epochs/MNE.Raw
+    :param method: Method used for the filtering, either FIR or IIR.
+    :type method: str
+    :param n_jobs: Number of threads filtering the blocks of channels.
+    :type n_jobs: int
+    :param repeat: Number of filterings measured.
+    :type repeat: int
+    :return: The data filtered by the engine and by MNE, and the median time of each filtering, in seconds.
+    :rtype: (numpy.ndarray, numpy.ndarray, float, float)
+    """
+    engine_durations = []
+    mne_durations = []
+    engine_data = mne_data = None
+    for _ in range(repeat):
+        engine_copy = file_data.copy()
+        start = perf_counter()
+        filter_data(engine_copy, CONST_LOW_FREQUENCY, CONST_HIGH_FREQUENCY, filter_method=method, n_jobs=n_jobs)
+        engine_durations.append(perf_counter() - start)
+        engine_data = engine_copy.get_data()
+
+        mne_copy = file_data.copy()
+        start = perf_counter()
+        mne_copy.filter(CONST_LOW_FREQUENCY, CONST_HIGH_FREQUENCY, picks="eeg", method=method,
+                        iir_params=get_iir_params(method), verbose=False)
+        mne_durations.append(perf_counter() - start)
+        mne_data = mne_copy.get_data()
+    return engine_data, mne_data, get_median(engine_durations), get_median(mne_durations)
+
+
+def get_channel_errors(engine_data, mne_data):
+    """
+    Computes the difference between the filterings of each channel, relative to the largest amplitude of the channel.
+    :param engine_data: The data filtered by the engine.
+    :type engine_data: numpy.ndarray
+    :param mne_data: The data filtered by MNE.
+    :type mne_data: numpy.ndarray
+    :return: The difference of each channel.
+    :rtype: numpy.ndarray
+    """
+    axes = tuple(axis for axis in range(engine_data.ndim) if axis != engine_data.ndim - 2)
+    scale = np.maximum(np.max(np.abs(mne_data), axis=axes), np.finfo(float).tiny)
+    return np.max(np.abs(engine_data - mne_data), axis=axes) / scale
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the filter engine with the filtering of MNE.")
+    parser.add_argument("--channels", type=int, default=64, help="Number of EEG channels.")
+    parser.add_argument("--epochs", type=int, default=200, help="Number of epochs of 2 seconds.")
+    parser.add_argument("--method", default="fir", choices=["fir", "iir"], help="Method of the filtering.")
+    parser.add_argument("--jobs", type=int, default=4, help="Number of threads of the filter engine.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of filterings measured.")
+    arguments = parser.parse_args()
+
+    raw, epochs = create_data(arguments.channels, arguments.epochs)
+    failed = False
+    for name, file_data in [("Raw", raw), ("Epochs", epochs)]:
+        engine_data, mne_data, engine_time, mne_time = measure_filter(file_data, arguments.method, arguments.jobs,
+                                                                      arguments.repeat)
+        errors = get_channel_errors(engine_data, mne_data)
+        print(name + ": engine " + "{:.3f}".format(engine_time) + " s, MNE " + "{:.3f}".format(mne_time) + " s, "
+              "largest difference " + "{:.2e}".format(np.max(errors)))
+        wrong_channels = [file_data.ch_names[i] for i in np.flatnonzero(errors > CONST_TOLERANCE)]
+        if wrong_channels:     # Filtered more than once, or a channel that is not selected was filtered
+            print("    Channels not filtered as MNE does: " + ", ".join(wrong_channels))
+            failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the fast fit of the ICA decomposition: time of the fit on the whole data and of the fast fit on a reduced
+copy of the data, and similarity of the sources obtained, measured by the mean over the sources of the full fit of the
+best absolute correlation with a source of the fast fit.
+Usage: python ica_benchmark.py FILE [--method METHOD] [--n-components N] [--decim N] [--high-pass F]
+    [--epochs-fraction F] [--repeat N]
+"""
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+import argparse
+
+from time import perf_counter
+
+import numpy as np
+
+from utils.model.ica_operator import fit_ica
+from utils.model.performance_profiler import get_median
+from utils.model.pipeline_runner import pipelineRunner
+
+
+def measure_fit(file_data, ica_method, repeat, **ica_parameters):
+    """
+    Fits the ICA decomposition several times and measures the time of each fit.
+    :param file_data: MNE data of the dataset.
+    :type file_data: MNE.Epochs/MNE.Raw
+    :param ica_method: Method used for performing the ICA decomposition
+    :type ica_method: str
+    :param repeat: Number of fits measured.
+    :type repeat: int
+    :param ica_parameters: The number of components and the parameters of the fast fit, see "fit_ica".
+    :type ica_parameters: dict
+    :return: The last fitted ICA and the median time of the fits, in seconds.
+    :rtype: (MNE.preprocessing.ICA, float)
+    """
+    durations = []
+    ica = None
+    for _ in range(repeat):
+        start = perf_counter()
+        ica = fit_ica(file_data, ica_method, **ica_parameters)
+        durations.append(perf_counter() - start)
+    return ica, get_median(durations)
+
+
+def compute_sources_similarity(full_ica, fast_ica, file_data):
+    """
+    Compares the sources of two decompositions of the same data. The order and the sign of the sources are arbitrary,
+    each source of the first decomposition is thus matched with the source of the second one it is the most correlated
+    with.
+    :param full_ica: The ICA fitted on the whole data.
+    :type full_ica: MNE.preprocessing.ICA
+    :param fast_ica: The ICA fitted on the reduced copy of the data.
+    :type fast_ica: MNE.preprocessing.ICA
+    :param file_data: MNE data of the dataset.
+    :type file_data: MNE.Epochs/MNE.Raw
+    :return: The mean of the best absolute correlation of each source of the full fit.
+    :rtype: float
+    """
+    full_sources = full_ica.get_sources(file_data).get_data()
+    fast_sources = fast_ica.get_sources(file_data).get_data()
+    if full_sources.ndim == 3:      # Epochs, the epochs are concatenated
+        full_sources = np.hstack(full_sources)
+        fast_sources = np.hstack(fast_sources)
+    number_of_sources = full_sources.shape[0]
+    correlations = np.corrcoef(full_sources, fast_sources)[:number_of_sources, number_of_sources:]
+    return float(np.mean(np.max(np.abs(correlations), axis=1)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the fit of the ICA on the whole data and the fast fit.")
+    parser.add_argument("file", help="Path to the SET, FIF or CNT dataset.")
+    parser.add_argument("--method", default="fastica", choices=["fastica", "infomax", "picard"],
+                        help="Method of the ICA decomposition.")
+    parser.add_argument("--n-components", type=int, default=None, help="Number of components, all if not given.")
+    parser.add_argument("--decim", type=int, default=3, help="Decimation of the fast fit.")
+    parser.add_argument("--high-pass", type=float, default=1.0, help="High-pass of the fast fit, in Hz.")
+    parser.add_argument("--epochs-fraction", type=float, default=None, help="Fraction of the epochs of the fast fit.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of fits measured for each mode.")
+    arguments = parser.parse_args()
+
+    runner = pipelineRunner(None, arguments.file, None)     # Only used for reading the dataset as the application does
+    runner.open_file()
+    data = runner.file_data
+    print("Dataset: " + arguments.file + ", " + str(len(data.ch_names)) + " channels, method " + arguments.method)
+
+    full_fit, full_time = measure_fit(data, arguments.method, arguments.repeat, n_components=arguments.n_components)
+    fast_fit, fast_time = measure_fit(data, arguments.method, arguments.repeat, n_components=arguments.n_components,
+                                      decim=arguments.decim, high_pass=arguments.high_pass,
+                                      epochs_fraction=arguments.epochs_fraction)
+
+    print("Time of the fit (median of " + str(arguments.repeat) + " fits):")
+    print("    " + "full".ljust(10) + "{:.3f}".format(full_time) + " s, " + str(full_fit.n_iter_) + " iterations")
+    print("    " + "fast".ljust(10) + "{:.3f}".format(fast_time) + " s, " + str(fast_fit.n_iter_) + " iterations")
+    print("Speed-up: " + "{:.1f}".format(full_time / fast_time) + "x")
+    print("Similarity of the sources: " + "{:.3f}".format(compute_sources_similarity(full_fit, fast_fit, data)))
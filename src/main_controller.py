@@ -16,6 +16,7 @@ from menubar.menubar_controller import menubarController
 from file.load_data_info.load_data_info_controller import loadDataInfoController
 from file.find_events_from_channel.find_events_from_channel_controller import findEventsFromChannelController
 from file.study_creation.study_creation_controller import studyCreationController
+from file.bulk_open.bulk_open_controller import bulkOpenController
 
 from edit.dataset_info.dataset_info_controller import datasetInfoController
 from edit.event_values.event_values_controller import eventValuesController
@@ -25,29 +26,19 @@ from tools.filter.filter_controller import filterController
 from tools.resampling.resampling_controller import resamplingController
 from tools.re_referencing.re_referencing_controller import reReferencingController
 from tools.ICA_decomposition.ICA_decomposition_controller import icaDecompositionController
+from tools.ICA_components.ICA_components_controller import icaComponentsController
 from tools.extract_epochs.extract_epochs_controller import extractEpochsController
-from tools.signal_to_noise_ratio.signal_to_noise_ratio_controller import signalToNoiseRatioController
-from tools.source_estimation.source_estimation_controller import sourceEstimationController
+from tools.artifact_rejection.artifact_rejection_controller import artifactRejectionController
 
 from plots.power_spectral_density.power_spectral_density_controller import powerSpectralDensityController
 from plots.topographies.topographies_controller import topographiesController
 from plots.erp_image.erp_image_controller import erpImageController
 from plots.erp.erp_controller import erpController
 from plots.time_frequency_ersp_itc.time_frequency_ersp_itc_controller import timeFrequencyErspItcController
+from plots.data_browser.data_browser_view import dataBrowserView
 
-from connectivity.envelope_correlation.envelope_correlation_controller import envelopeCorrelationController
-from connectivity.source_space_connectivity.source_space_connectivity_controller import sourceSpaceConnectivityController
-from connectivity.sensor_space_connectivity.sensor_space_connectivity_controller import sensorSpaceConnectivityController
-from connectivity.spectro_temporal_connectivity.spectro_temporal_connectivity_controller import \
-    spectroTemporalConnectivityController
-
-from classification.classify.classify_controller import classifyController
-
-from statistics.statistics_snr.statistics_snr_controller import statisticsSnrController
-from statistics.statistics_erp.statistics_erp_controller import statisticsErpController
-from statistics.statistics_connectivity.statistics_connectivity_controller import statisticsConnectivityController
-from statistics.statistics_ersp_itc.statistics_ersp_itc_controller import statisticsErspItcController
-from statistics.statistics_psd.statistics_psd_controller import statisticsPsdController
+# The controllers of the source estimation, connectivity, classification and statistics windows are imported when
+# they are first opened, their views and runnables load heavy libraries (mne_connectivity, TensorFlow, pyriemann, ...).
 
 from study.study_edit_info.study_edit_info_controller import studyEditInfoController
 from study.study_plots.study_plots_controller import studyPlotsController
@@ -56,6 +47,7 @@ from utils.download_fsaverage_mne_data.download_fsaverage_mne_data_controller im
 from utils.waiting_while_processing.waiting_while_processing_controller import waitingWhileProcessingController
 from utils.view.error_window import errorWindow
 from utils.view.warning_window import warningWindow
+from utils.view.performance_view import performanceView
 from utils.file_path_search import get_project_freesurfer_path
 
 __author__ = "Lemahieu Antoine"
@@ -94,6 +86,8 @@ class mainController(mainListener):
         self.load_data_info_controller = None
         self.find_events_from_channel_controller = None
         self.study_creation_controller = None
+        self.bulk_open_controller = None
+        self.bulk_open_study_information = None     # Study created once all the files of the directory are opened
 
         # Edit
         self.dataset_info_controller = None
@@ -105,12 +99,15 @@ class mainController(mainListener):
         self.resampling_controller = None
         self.re_referencing_controller = None
         self.ica_decomposition_controller = None
+        self.ica_components_controller = None
         self.extract_epochs_controller = None
+        self.artifact_rejection_controller = None
         self.snr_controller = None
         self.source_estimation_controller = None
 
         # Plot
         self.power_spectral_density_controller = None
+        self.data_browser_view = None
         self.topographies_controller = None
         self.erp_image_controller = None
         self.erp_controller = None
@@ -139,6 +136,7 @@ class mainController(mainListener):
         # Utils
         self.waiting_while_processing_controller = None
         self.download_fsaverage_mne_data_controller = None
+        self.performance_view = None
 
         # Others
         self.study_currently_selected = False
@@ -249,6 +247,136 @@ class mainController(mainListener):
         """
         self.load_data_info()
 
+    # Open Directory
+    def open_directory_clicked(self, directory):
+        """
+        Check if the path to the directory is correct.
+        Read the headers of all the datasets of the directory, before opening them.
+        :param directory: Path to the directory.
+        :type directory: str
+        """
+        if directory != '':
+            if self.main_model.is_bulk_open_running():
+                error_message = "The files of a directory are already being opened, please wait until they are all " \
+                                "opened."
+                error_window = errorWindow(error_message)
+                error_window.show()
+                return
+            study = self.main_model.get_study()
+            if study is not None:
+                warning_message = "Loading supplementary datasets will clear the current study, are you sure you want " \
+                                  "to continue ?"
+                warning_window = warningWindow(warning_message, lambda: self.open_directory_confirmed(directory))
+                warning_window.set_listener(self)
+                warning_window.show()
+            else:
+                self.open_directory_confirmed(directory)
+
+    def open_directory_confirmed(self, directory):
+        """
+        The opening of the directory is confirmed, the current study is cleared.
+        :param directory: Path to the directory.
+        :type directory: str
+        """
+        self.main_model.clear_study()
+        self.menubar_controller.study_selection_deactivation(study_exist=False)
+        try:
+            self.main_model.open_directory(directory)
+        except Exception as error:
+            error_message = "An error has occurred during the opening of the directory."
+            error_window = errorWindow(error_message, detailed_message=str(error))
+            error_window.show()
+
+    def read_headers_computation_finished(self):
+        """
+        Create the controller displaying the headers of the files and the progress of their opening, then open the
+        files in parallel.
+        """
+        self.bulk_open_study_information = None
+        self.bulk_open_controller = bulkOpenController(self.main_model.get_bulk_open_headers())
+        self.bulk_open_controller.set_listener(self)
+        self.main_model.bulk_open_files()
+
+    def bulk_open_file_computation_finished(self, path_to_file):
+        """
+        A file of the directory is opened, its dataset is added to the menu. It is only displayed if it is the first
+        dataset opened, the current dataset is not changed while a computation may be running on it.
+        :param path_to_file: Path to the file.
+        :type path_to_file: str
+        """
+        dataset_index = self.main_model.get_bulk_open_dataset_index(path_to_file)
+        study_available = self.main_model.get_study() is not None
+        self.menubar_controller.add_dataset(dataset_index, self.main_model.get_dataset_name(dataset_index),
+                                            study_available)
+        if dataset_index == self.main_model.get_current_dataset_index():
+            self.display_all_info()
+        self.bulk_open_controller.file_opened(path_to_file)
+        self.bulk_open_create_pending_study()
+
+    def bulk_open_file_computation_error(self, path_to_file, error_message):
+        """
+        The opening of a file of the directory had an error.
+        :param path_to_file: Path to the file.
+        :type path_to_file: str
+        :param error_message: The error that occurred.
+        :type error_message: str
+        """
+        self.bulk_open_controller.file_error(path_to_file, error_message)
+        self.bulk_open_create_pending_study()
+
+    def bulk_open_create_study(self, study_name, task_name, dataset_names, paths_to_files, subjects, sessions, runs,
+                               conditions, groups):
+        """
+        Keep the information of the study created from the headers of the files of the directory, the study is created
+        once all the files are opened.
+        :param study_name: The name of the study
+        :type study_name: str
+        :param task_name: The name of the task linked to the study
+        :type task_name: str
+        :param dataset_names: The name of the datasets linked to the study
+        :type dataset_names: list of str
+        :param paths_to_files: The files of the datasets selected to be in the study
+        :type paths_to_files: list of str
+        :param subjects: The subjects assigned to each dataset in the study
+        :type subjects: list of str
+        :param sessions: The sessions assigned to each dataset in the study
+        :type sessions: list of str
+        :param runs: The runs assigned to each dataset in the study
+        :type runs: list of str
+        :param conditions: The conditions assigned to each dataset in the study
+        :type conditions: list of str
+        :param groups: The groups assigned to each dataset in the study
+        :type groups: list of str
+        """
+        self.bulk_open_study_information = (study_name, task_name, dataset_names, paths_to_files, subjects, sessions,
+                                            runs, conditions, groups)
+        if self.main_model.is_bulk_open_running():
+            self.bulk_open_controller.study_pending()
+        self.bulk_open_create_pending_study()
+
+    def bulk_open_create_pending_study(self):
+        """
+        Create the study kept from the headers of the files, if all the files are opened. The files that could not be
+        opened are not part of the study.
+        """
+        if self.bulk_open_study_information is None or self.main_model.is_bulk_open_running():
+            return
+        study_name, task_name, dataset_names, paths_to_files, *study_lists = self.bulk_open_study_information
+        self.bulk_open_study_information = None
+
+        dataset_indexes = [self.main_model.get_bulk_open_dataset_index(path) for path in paths_to_files]
+        opened = [i for i in range(len(dataset_indexes)) if dataset_indexes[i] is not None]
+        if not opened:
+            error_message = "None of the files selected for the study could be opened, the study has not been created."
+            error_window = errorWindow(error_message)
+            error_window.show()
+            return
+        dataset_names = [dataset_names[i] for i in opened]
+        dataset_indexes = [dataset_indexes[i] for i in opened]
+        subjects, sessions, runs, conditions, groups = [[values[i] for i in opened] for values in study_lists]
+        self.create_study_information(study_name, task_name, dataset_names, dataset_indexes, subjects, sessions, runs,
+                                      conditions, groups)
+
     # Load Data Info
     def load_data_info(self):
         """
@@ -468,6 +596,23 @@ class mainController(mainListener):
         processing_title_finished = "The exportation of the events into a TXT file had an error."
         self.waiting_while_processing_controller.stop_progress_bar(processing_title_finished, error=True)
 
+    # Export pipeline
+    def export_pipeline_clicked(self, path_to_file):
+        """
+        Check if the path to the file is correct.
+        Export the processing pipeline of the dataset to a JSON file, which can be replayed on other datasets by the
+        batch runner ("batch.py").
+        :param path_to_file: Path to the file.
+        :type path_to_file: str
+        """
+        if path_to_file != '':
+            try:
+                self.main_model.export_pipeline_clicked(path_to_file)
+            except Exception as error:
+                error_message = "An error has occurred during the exportation of the processing pipeline."
+                error_window = errorWindow(error_message, detailed_message=str(error))
+                error_window.show()
+
     # Save
     def save_file_clicked(self):
         """
@@ -682,7 +827,7 @@ class mainController(mainListener):
         self.filter_controller = filterController(all_channels_names)
         self.filter_controller.set_listener(self)
 
-    def filter_information(self, low_frequency, high_frequency, channels_selected, filter_method):
+    def filter_information(self, low_frequency, high_frequency, channels_selected, filter_method, n_jobs):
         """
         Create the waiting window while the filtering is done on the dataset.
         :param low_frequency: Lowest frequency from where the data will be filtered.
@@ -693,6 +838,8 @@ class mainController(mainListener):
         :type channels_selected: list of str
         :param filter_method: Method used for the filtering, either FIR or IIR.
         :type filter_method: str
+        :param n_jobs: Number of threads filtering the channels.
+        :type n_jobs: int
         """
         processing_title = "Filtering running, please wait."
         self.waiting_while_processing_controller = waitingWhileProcessingController(processing_title, self.filter_finished)
@@ -701,13 +848,13 @@ class mainController(mainListener):
         self.study_currently_selected = self.main_model.get_study_selected()
         if self.study_currently_selected:
             self.study_indexes_to_compute = copy(self.main_model.get_study().get_dataset_indexes())
-            self.filter_computation(low_frequency, high_frequency, channels_selected, filter_method,
+            self.filter_computation(low_frequency, high_frequency, channels_selected, filter_method, n_jobs,
                                     self.study_indexes_to_compute[0])
             del self.study_indexes_to_compute[0]
         else:
-            self.filter_computation(low_frequency, high_frequency, channels_selected, filter_method)
+            self.filter_computation(low_frequency, high_frequency, channels_selected, filter_method, n_jobs)
 
-    def filter_computation(self, low_frequency, high_frequency, channels_selected, filter_method, index=None):
+    def filter_computation(self, low_frequency, high_frequency, channels_selected, filter_method, n_jobs, index=None):
         """
         Call the model to perform the filtering on the chosen dataset.
         :param low_frequency: Lowest frequency from where the data will be filtered.
@@ -718,13 +865,15 @@ class mainController(mainListener):
         :type channels_selected: list of str
         :param filter_method: Method used for the filtering, either FIR or IIR.
         :type filter_method: str
+        :param n_jobs: Number of threads filtering the channels.
+        :type n_jobs: int
         :param index: The index of the dataset of the study.
         :type index: int
         """
-        self.main_model.filter(low_frequency, high_frequency, channels_selected, filter_method, index)
+        self.main_model.filter(low_frequency, high_frequency, channels_selected, filter_method, n_jobs, index)
 
     def filter_computation_finished(self, low_frequency=None, high_frequency=None, channels_selected=None,
-                                    filter_method=None):
+                                    filter_method=None, n_jobs=1):
         """
         Close the waiting window when the filtering is done on the dataset.
         :param low_frequency: Lowest frequency from where the data will be filtered.
@@ -735,13 +884,15 @@ class mainController(mainListener):
         :type channels_selected: list of str
         :param filter_method: Method used for the filtering, either FIR or IIR.
         :type filter_method: str
+        :param n_jobs: Number of threads filtering the channels.
+        :type n_jobs: int
         """
         if self.study_currently_selected:
             if len(self.study_indexes_to_compute) == 0:     # All study computation done
                 processing_title_finished = "Filtering finished."
                 self.waiting_while_processing_controller.stop_progress_bar(processing_title_finished)
             else:
-                self.filter_computation(low_frequency, high_frequency, channels_selected, filter_method,
+                self.filter_computation(low_frequency, high_frequency, channels_selected, filter_method, n_jobs,
                                         self.study_indexes_to_compute[0])
                 del self.study_indexes_to_compute[0]
         else:
@@ -775,11 +926,15 @@ class mainController(mainListener):
         self.resampling_controller = resamplingController(frequency)
         self.resampling_controller.set_listener(self)
 
-    def resampling_information(self, frequency):
+    def resampling_information(self, frequency, resampling_method, n_jobs):
         """
         Create the waiting window while the resampling is done on the dataset or the study.
         :param frequency: The new frequency at which the data will be resampled.
         :type frequency: int
+        :param resampling_method: Method used for the resampling, either FFT or polyphase.
+        :type resampling_method: str
+        :param n_jobs: Number of parallel jobs used for the resampling.
+        :type n_jobs: int
         """
         processing_title = "Resampling running, please wait."
         self.waiting_while_processing_controller = waitingWhileProcessingController(processing_title, self.resampling_finished)
@@ -788,33 +943,41 @@ class mainController(mainListener):
         self.study_currently_selected = self.main_model.get_study_selected()
         if self.study_currently_selected:
             self.study_indexes_to_compute = copy(self.main_model.get_study().get_dataset_indexes())
-            self.resampling_computation(frequency, self.study_indexes_to_compute[0])
+            self.resampling_computation(frequency, resampling_method, n_jobs, self.study_indexes_to_compute[0])
             del self.study_indexes_to_compute[0]
         else:
-            self.resampling_computation(frequency)
+            self.resampling_computation(frequency, resampling_method, n_jobs)
 
-    def resampling_computation(self, frequency, index=None):
+    def resampling_computation(self, frequency, resampling_method, n_jobs, index=None):
         """
         Call the model to do the resampling.
         :param frequency: The new frequency at which the data will be resampled.
         :type frequency: int
+        :param resampling_method: Method used for the resampling, either FFT or polyphase.
+        :type resampling_method: str
+        :param n_jobs: Number of parallel jobs used for the resampling.
+        :type n_jobs: int
         :param index: The index of the dataset of the study.
         :type index: int
         """
-        self.main_model.resampling(frequency, index)
+        self.main_model.resampling(frequency, resampling_method, n_jobs, index)
 
-    def resampling_computation_finished(self, frequency=None):
+    def resampling_computation_finished(self, frequency=None, resampling_method=None, n_jobs=1):
         """
         Close the waiting window when the resampling is done on the dataset.
         :param frequency: The new frequency at which the data will be resampled.
         :type frequency: int
+        :param resampling_method: Method used for the resampling, either FFT or polyphase.
+        :type resampling_method: str
+        :param n_jobs: Number of parallel jobs used for the resampling.
+        :type n_jobs: int
         """
         if self.study_currently_selected:
             if len(self.study_indexes_to_compute) == 0:     # All study computation done
                 processing_title_finished = "Resampling finished."
                 self.waiting_while_processing_controller.stop_progress_bar(processing_title_finished)
             else:
-                self.resampling_computation(frequency, self.study_indexes_to_compute[0])
+                self.resampling_computation(frequency, resampling_method, n_jobs, self.study_indexes_to_compute[0])
                 del self.study_indexes_to_compute[0]
         else:
             processing_title_finished = "Resampling finished."
@@ -943,7 +1106,73 @@ class mainController(mainListener):
 
     # Reject data
     def inspect_reject_data_clicked(self):
-        pass
+        """
+        Create the controller for rejecting the epochs of the dataset with artifacts.
+        """
+        if self.main_model.get_file_type() == "Epochs":
+            self.artifact_rejection_controller = artifactRejectionController()
+            self.artifact_rejection_controller.set_listener(self)
+        else:
+            error_message = "The artifact rejection is done on the epochs, please extract the epochs first."
+            error_window = errorWindow(error_message)
+            error_window.show()
+
+    def artifact_rejection_information(self, peak_to_peak_threshold, variance_threshold, flat_threshold, adaptive):
+        """
+        Create the waiting window while the artifact rejection is computed on the dataset.
+        :param peak_to_peak_threshold: Maximum peak-to-peak amplitude, in volts. If None, not used.
+        :type peak_to_peak_threshold: float
+        :param variance_threshold: Maximum variance, in volts squared. If None, not used.
+        :type variance_threshold: float
+        :param flat_threshold: Minimum peak-to-peak amplitude, in volts. If None, not used.
+        :type flat_threshold: float
+        :param adaptive: Compute the peak-to-peak threshold by cross-validation.
+        :type adaptive: bool
+        """
+        processing_title = "Artifact rejection running, please wait."
+        self.waiting_while_processing_controller = waitingWhileProcessingController(processing_title,
+                                                                                    self.artifact_rejection_finished)
+        self.waiting_while_processing_controller.set_listener(self)
+        self.main_model.artifact_rejection(peak_to_peak_threshold, variance_threshold, flat_threshold, adaptive)
+
+    def artifact_rejection_computation_finished(self, number_rejected, number_epochs, rejected_counts,
+                                                peak_to_peak_threshold):
+        """
+        Close the waiting window when the artifact rejection is computed, displaying the number of epochs rejected.
+        :param number_rejected: The number of epochs rejected.
+        :type number_rejected: int
+        :param number_epochs: The number of epochs of the dataset.
+        :type number_epochs: int
+        :param rejected_counts: The number of epochs rejected by each criterion.
+        :type rejected_counts: dict
+        :param peak_to_peak_threshold: The peak-to-peak threshold used, in volts.
+        :type peak_to_peak_threshold: float
+        """
+        processing_title_finished = "Artifact rejection finished, " + str(number_rejected) + " of " + \
+                                    str(number_epochs) + " epochs rejected (peak-to-peak: " + \
+                                    str(rejected_counts["peak_to_peak"]) + ", variance: " + \
+                                    str(rejected_counts["variance"]) + ", flat: " + str(rejected_counts["flat"]) + ")."
+        if peak_to_peak_threshold is not None:
+            processing_title_finished += "\nPeak-to-peak threshold: " + \
+                                         "{:.1f}".format(peak_to_peak_threshold * 1e6) + " µV."
+        self.waiting_while_processing_controller.stop_progress_bar(processing_title_finished)
+
+    def artifact_rejection_computation_error(self):
+        """
+        Close the waiting window because the artifact rejection had an error.
+        """
+        processing_title_finished = "The artifact rejection had an error."
+        self.waiting_while_processing_controller.stop_progress_bar(processing_title_finished, error=True)
+
+    def artifact_rejection_finished(self):
+        """
+        The artifact rejection is completely done, the epochs rejected are dropped. Update the information on the main
+        window.
+        """
+        number_events = self.main_model.get_number_of_events()
+        number_epochs = self.main_model.get_number_of_epochs()
+        self.main_view.update_number_of_events(number_events)
+        self.main_view.update_number_of_epochs(number_epochs)
 
     # ICA decomposition
     def ica_decomposition_clicked(self):
@@ -953,11 +1182,13 @@ class mainController(mainListener):
         self.ica_decomposition_controller = icaDecompositionController()
         self.ica_decomposition_controller.set_listener(self)
 
-    def ica_decomposition_information(self, ica_method):
+    def ica_decomposition_information(self, ica_method, ica_parameters):
         """
         Create the waiting window while the computation the ICA decomposition is done on the dataset.
         :param ica_method: Method used for performing the ICA decomposition
         :type ica_method: str
+        :param ica_parameters: The number of components and the parameters of the fast fit.
+        :type ica_parameters: dict
         """
         processing_title = "ICA decomposition running, please wait."
         self.waiting_while_processing_controller = waitingWhileProcessingController(processing_title, self.ica_decomposition_finished)
@@ -966,33 +1197,37 @@ class mainController(mainListener):
         self.study_currently_selected = self.main_model.get_study_selected()
         if self.study_currently_selected:
             self.study_indexes_to_compute = copy(self.main_model.get_study().get_dataset_indexes())
-            self.ica_decomposition_computation(ica_method, self.study_indexes_to_compute[0])
+            self.ica_decomposition_computation(ica_method, ica_parameters, self.study_indexes_to_compute[0])
             del self.study_indexes_to_compute[0]
         else:
-            self.ica_decomposition_computation(ica_method)
+            self.ica_decomposition_computation(ica_method, ica_parameters)
 
-    def ica_decomposition_computation(self, ica_method, index=None):
+    def ica_decomposition_computation(self, ica_method, ica_parameters, index=None):
         """
         Call the model for computing the ica decomposition on the chosen dataset.
         :param ica_method: Method used for performing the ICA decomposition
         :type ica_method: str
+        :param ica_parameters: The number of components and the parameters of the fast fit.
+        :type ica_parameters: dict
         :param index: The index of the dataset of the study.
         :type index: int
         """
-        self.main_model.ica_data_decomposition(ica_method, index)
+        self.main_model.ica_data_decomposition(ica_method, ica_parameters, index)
 
-    def ica_data_decomposition_computation_finished(self, ica_method=None):
+    def ica_data_decomposition_computation_finished(self, ica_method=None, ica_parameters=None):
         """
         Close the waiting window when the computation the ICA decomposition is done on the dataset.
         :param ica_method: Method used for performing the ICA decomposition
         :type ica_method: str
+        :param ica_parameters: The number of components and the parameters of the fast fit.
+        :type ica_parameters: dict
         """
         if self.study_currently_selected:
             if len(self.study_indexes_to_compute) == 0:     # All study computation done
                 processing_title_finished = "ICA decomposition finished."
                 self.waiting_while_processing_controller.stop_progress_bar(processing_title_finished)
             else:
-                self.ica_decomposition_computation(ica_method, self.study_indexes_to_compute[0])
+                self.ica_decomposition_computation(ica_method, ica_parameters, self.study_indexes_to_compute[0])
                 del self.study_indexes_to_compute[0]
         else:
             processing_title_finished = "ICA decomposition finished."
@@ -1007,14 +1242,32 @@ class mainController(mainListener):
 
     def ica_decomposition_finished(self):
         """
-        The computation the ICA decomposition is completely done, update the information on the main window.
+        The computation the ICA decomposition is completely done.
+        For a study, the decomposition has been applied, update the information on the main window. Otherwise, create
+        the controller for choosing the components removed from the dataset.
         """
         if self.study_currently_selected:
             all_info = self.main_model.get_all_study_displayed_info()
             self.main_view.display_study_info(all_info)
         else:
+            ica, file_data, exclude = self.main_model.get_ica_fit()
+            self.ica_components_controller = icaComponentsController(ica, file_data, exclude)
+            self.ica_components_controller.set_listener(self)
+
+    def ica_components_information(self, exclude):
+        """
+        Remove the components chosen from the dataset, then update the information on the main window.
+        :param exclude: The indexes of the components removed.
+        :type exclude: list of int
+        """
+        try:
+            self.main_model.apply_ica_decomposition(exclude)
             ica_status = self.main_model.get_ica()
             self.main_view.update_ica_decomposition(ica_status)
+        except Exception as error:
+            error_message = "An error has occurred during the removal of the ICA components."
+            error_window = errorWindow(error_message, detailed_message=str(error))
+            error_window.show()
 
     # Extract Epochs
     def extract_epochs_clicked(self):
@@ -1041,7 +1294,7 @@ class mainController(mainListener):
             error_window = errorWindow(error_message)
             error_window.show()
 
-    def extract_epochs_information(self, tmin, tmax, trials_selected):
+    def extract_epochs_information(self, tmin, tmax, trials_selected, events_selected):
         """
         Create the waiting window while the extraction of epochs is done on the dataset.
         :param tmin: Start time of the epoch to keep
@@ -1050,11 +1303,14 @@ class mainController(mainListener):
         :type tmax: float
         :param trials_selected: The indexes of the trials selected for the computation
         :type trials_selected: list of int
+        :param events_selected: The names of the events of the trials selected, "all" if all the trials are selected, or
+        None if the trials are selected by their indexes.
+        :type events_selected: list of str/str
         """
         processing_title = "Epochs extraction running, please wait."
         self.waiting_while_processing_controller = waitingWhileProcessingController(processing_title, self.extract_epochs_finished)
         self.waiting_while_processing_controller.set_listener(self)
-        self.main_model.extract_epochs(tmin, tmax, trials_selected)
+        self.main_model.extract_epochs(tmin, tmax, trials_selected, events_selected)
 
     def extract_epochs_computation_finished(self):
         """
@@ -1095,6 +1351,7 @@ class mainController(mainListener):
         all_channels_names = self.main_model.get_all_channels_names()
         event_values = self.main_model.get_event_values()
         event_ids = self.main_model.get_event_ids()
+        from tools.signal_to_noise_ratio.signal_to_noise_ratio_controller import signalToNoiseRatioController
         self.snr_controller = signalToNoiseRatioController(all_channels_names, event_values, event_ids)
         self.snr_controller.set_listener(self)
 
@@ -1159,6 +1416,7 @@ class mainController(mainListener):
                 event_ids = self.main_model.get_event_ids()
                 tmin = self.main_model.get_epochs_start()
                 tmax = self.main_model.get_epochs_end()
+                from tools.source_estimation.source_estimation_controller import sourceEstimationController
                 self.source_estimation_controller = sourceEstimationController(number_of_epochs, event_values, event_ids,
                                                                                tmin, tmax)
                 self.source_estimation_controller.set_listener(self)
@@ -1235,11 +1493,18 @@ class mainController(mainListener):
     def plot_data_clicked(self):
         """
         Plot the data of the dataset.
+        The raw datasets are displayed with the data browser once their decimation pyramid is built, otherwise with the
+        browser of MNE.
         """
         file_data = self.main_model.get_file_data()
         file_type = self.main_model.get_file_type()
         if file_type == "Raw":
-            self.main_view.plot_data(file_data, file_type)
+            decimation_pyramid = self.main_model.get_decimation_pyramid()
+            if decimation_pyramid is not None:
+                self.data_browser_view = dataBrowserView(file_data, decimation_pyramid)
+                self.data_browser_view.show()
+            else:
+                self.main_view.plot_data(file_data, file_type)
         else:
             event_values = self.main_model.get_event_values()
             event_ids = self.main_model.get_event_ids()
@@ -1323,9 +1588,9 @@ class mainController(mainListener):
         """
         The computation of the power spectral density is completely done, plot it.
         """
-        psd_fig = self.main_model.get_psd_fig()
-        topo_fig = self.main_model.get_psd_topo_fig()
-        self.power_spectral_density_controller.plot_psd(psd_fig, topo_fig)
+        psd = self.main_model.get_psd()
+        topo_time_points = self.main_model.get_psd_topo_time_points()
+        self.power_spectral_density_controller.plot_psd(psd, topo_time_points)
 
     # ERP Image
     def plot_ERP_image_clicked(self):
@@ -1442,6 +1707,7 @@ class mainController(mainListener):
         """
         number_of_channels = self.main_model.get_number_of_channels()
         file_data = self.main_model.get_file_data()
+        from connectivity.envelope_correlation.envelope_correlation_controller import envelopeCorrelationController
         self.envelope_correlation_controller = envelopeCorrelationController(number_of_channels, file_data)
         self.envelope_correlation_controller.set_listener(self)
 
@@ -1501,6 +1767,8 @@ class mainController(mainListener):
             self.download_fsaverage_mne_data_controller.set_listener(self)
         else:
             number_of_channels = self.main_model.get_number_of_channels()
+            from connectivity.source_space_connectivity.source_space_connectivity_controller import \
+                sourceSpaceConnectivityController
             self.source_space_connectivity_controller = sourceSpaceConnectivityController(number_of_channels)
             self.source_space_connectivity_controller.set_listener(self)
 
@@ -1566,6 +1834,8 @@ class mainController(mainListener):
         Create the controller for computing the sensor space connectivity on the dataset.
         """
         file_info = self.main_model.get_file_data().info
+        from connectivity.sensor_space_connectivity.sensor_space_connectivity_controller import \
+            sensorSpaceConnectivityController
         self.sensor_space_connectivity_controller = sensorSpaceConnectivityController(file_info)
         self.sensor_space_connectivity_controller.set_listener(self)
 
@@ -1603,6 +1873,8 @@ class mainController(mainListener):
 
     # Spectro temporal connectivity
     def spectro_temporal_connectivity_clicked(self):
+        from connectivity.spectro_temporal_connectivity.spectro_temporal_connectivity_controller import \
+            spectroTemporalConnectivityController
         self.spectro_temporal_connectivity_controller = spectroTemporalConnectivityController()
         self.spectro_temporal_connectivity_controller.set_listener(self)
 
@@ -1619,6 +1891,7 @@ class mainController(mainListener):
         number_of_channels = self.main_model.get_number_of_channels()
         event_values = self.main_model.get_event_values()
         event_ids = self.main_model.get_event_ids()
+        from classification.classify.classify_controller import classifyController
         self.classify_controller = classifyController(number_of_channels, event_values, event_ids)
         self.classify_controller.set_listener(self)
 
@@ -1668,6 +1941,99 @@ class mainController(mainListener):
         classifier = self.main_model.get_classifier()
         self.classify_controller.plot_results(classifier)
 
+    def classify_directory_clicked(self, directory):
+        """
+        Create the controller for classifying the subjects of a directory out of core. The events of the dataset are
+        proposed as the events to classify.
+        :param directory: Path to the directory of the epoched subjects.
+        :type directory: str
+        """
+        if directory != '':
+            number_of_channels = self.main_model.get_number_of_channels()
+            event_values = self.main_model.get_event_values()
+            event_ids = self.main_model.get_event_ids()
+            from classification.classify.classify_controller import classifyController
+            self.classify_controller = classifyController(number_of_channels, event_values, event_ids, directory)
+            self.classify_controller.set_listener(self)
+
+    def classify_directory_information(self, directory, pipeline_selected, cross_val_number, event_names):
+        """
+        Create the waiting window while the subjects of the directory are classified.
+        :param directory: Path to the directory of the epoched subjects.
+        :type directory: str
+        :param pipeline_selected: The pipeline(s) used for the classification.
+        :type pipeline_selected: list of str
+        :param cross_val_number: Number of cross-validation fold, the subjects are split between them.
+        :type cross_val_number: int
+        :param event_names: The events classified.
+        :type event_names: list of str
+        """
+        processing_title = "Classification of the subjects running, please wait."
+        self.waiting_while_processing_controller = waitingWhileProcessingController(processing_title, self.classify_finished)
+        self.waiting_while_processing_controller.set_listener(self)
+        self.main_model.classify_directory(directory, pipeline_selected, cross_val_number, event_names)
+
+    def batch_inference_clicked(self, path_to_file):
+        """
+        Check if the path to the file is correct.
+        Apply the pipelines fitted by the last classification next to the dataset on its epochs, and export the
+        probabilities of the classes to a CSV file.
+        :param path_to_file: Path to the CSV file.
+        :type path_to_file: str
+        """
+        if path_to_file != '':
+            if self.main_model.get_file_type() == "Epochs":
+                if not path_to_file.endswith(".csv"):
+                    path_to_file += ".csv"
+                self.batch_inference_information(export_path=path_to_file)
+            else:
+                error_message = "The batch inference is done on the epochs, please extract the epochs first."
+                error_window = errorWindow(error_message)
+                error_window.show()
+
+    def batch_inference_information(self, model_directory=None, pipeline_names=None, batch_size=64, export_path=None):
+        """
+        Create the waiting window while the pipelines fitted by a previous classification are applied on the dataset.
+        :param model_directory: Path to the directory of the model store. If None, the store next to the dataset is used.
+        :type model_directory: str
+        :param pipeline_names: The pipeline(s) used for the inference. If None, all the fitted pipelines are used.
+        :type pipeline_names: list of str
+        :param batch_size: Number of epochs given to the pipelines at once.
+        :type batch_size: int
+        :param export_path: Path of the CSV file where the probabilities are saved. If None, they are not saved.
+        :type export_path: str
+        """
+        processing_title = "Batch inference running, please wait."
+        self.waiting_while_processing_controller = waitingWhileProcessingController(processing_title, self.batch_inference_finished)
+        self.waiting_while_processing_controller.set_listener(self)
+        self.main_model.batch_inference(model_directory, pipeline_names, batch_size, export_path=export_path)
+
+    def batch_inference_computation_finished(self):
+        """
+        Close the waiting window when the batch inference is done on the dataset, displaying the pipelines used, their
+        throughput and the file where the probabilities are saved.
+        """
+        pipelines = self.main_model.get_batch_inference_pipelines()
+        throughput = self.main_model.get_batch_inference_throughput()
+        export_path = self.main_model.get_batch_inference_export_path()
+        processing_title_finished = "Batch inference finished with " + ", ".join(pipelines) + " (" + \
+                                    str(round(throughput, 2)) + " epochs/s)."
+        if export_path is not None:
+            processing_title_finished += "\nThe probabilities are saved in " + export_path + "."
+        self.waiting_while_processing_controller.stop_progress_bar(processing_title_finished)
+
+    def batch_inference_computation_error(self):
+        """
+        Close the waiting window and display an error message because an error occurred during the computation.
+        """
+        processing_title_finished = "An error as occurred during the computation of the batch inference, please try again."
+        self.waiting_while_processing_controller.stop_progress_bar(processing_title_finished, error=True)
+
+    def batch_inference_finished(self):
+        """
+        The batch inference is completely done, the main window does not change.
+        """
+
     """
     Statistics Menu
     """
@@ -1679,6 +2045,7 @@ class mainController(mainListener):
         all_channels_names = self.main_model.get_all_channels_names()
         event_values = self.main_model.get_event_values()
         event_ids = self.main_model.get_event_ids()
+        from statistics.statistics_snr.statistics_snr_controller import statisticsSnrController
         self.statistics_snr_controller = statisticsSnrController(all_channels_names, event_values, event_ids)
         self.statistics_snr_controller.set_listener(self)
 
@@ -1737,6 +2104,7 @@ class mainController(mainListener):
         """
         all_channels_names = self.main_model.get_all_channels_names()
         event_ids = self.main_model.get_event_ids()
+        from statistics.statistics_erp.statistics_erp_controller import statisticsErpController
         self.statistics_erp_controller = statisticsErpController(all_channels_names, event_ids)
         self.statistics_erp_controller.set_listener(self)
 
@@ -1762,6 +2130,7 @@ class mainController(mainListener):
         maximum_time = self.main_model.get_epochs_end()
         event_ids = self.main_model.get_event_ids()
         all_channels_names = self.main_model.get_all_channels_names()
+        from statistics.statistics_psd.statistics_psd_controller import statisticsPsdController
         self.statistics_psd_controller = statisticsPsdController(minimum_time, maximum_time, event_ids, all_channels_names)
         self.statistics_psd_controller.set_listener(self)
 
@@ -1811,11 +2180,11 @@ class mainController(mainListener):
         """
         The computation of the power spectral density is completely done, plot it.
         """
-        psd_fig_one = self.main_model.get_statistics_psd_fig_one()
-        topo_fig_one = self.main_model.get_statistics_psd_topo_fig_one()
-        psd_fig_two = self.main_model.get_statistics_psd_fig_two()
-        topo_fig_two = self.main_model.get_statistics_psd_topo_fig_two()
-        self.statistics_psd_controller.plot_psd(psd_fig_one, topo_fig_one, psd_fig_two, topo_fig_two)
+        psd_one = self.main_model.get_statistics_psd_one()
+        psd_two = self.main_model.get_statistics_psd_two()
+        topo_time_points = self.main_model.get_statistics_psd_topo_time_points()
+        channel_selected = self.main_model.get_statistics_psd_channel_selected()
+        self.statistics_psd_controller.plot_psd(psd_one, psd_two, topo_time_points, channel_selected)
 
     # ERSP ITC
     def statistics_ersp_itc_clicked(self):
@@ -1824,6 +2193,7 @@ class mainController(mainListener):
         """
         all_channels_names = self.main_model.get_all_channels_names()
         event_ids = self.main_model.get_event_ids()
+        from statistics.statistics_ersp_itc.statistics_ersp_itc_controller import statisticsErspItcController
         self.statistics_ersp_itc_controller = statisticsErspItcController(all_channels_names, event_ids)
         self.statistics_ersp_itc_controller.set_listener(self)
 
@@ -1886,6 +2256,8 @@ class mainController(mainListener):
         number_of_channels = self.main_model.get_number_of_channels()
         file_data = self.main_model.get_file_data()
         event_ids = self.main_model.get_event_ids()
+        from statistics.statistics_connectivity.statistics_connectivity_controller import \
+            statisticsConnectivityController
         self.statistics_connectivity_controller = statisticsConnectivityController(number_of_channels, file_data, event_ids)
         self.statistics_connectivity_controller.set_listener(self)
 
@@ -2022,6 +2394,16 @@ class mainController(mainListener):
         all_info = self.main_model.get_all_study_displayed_info()
         self.main_view.display_study_info(all_info)
 
+    """
+    Help Menu
+    """
+    def performance_clicked(self):
+        """
+        Display the time and memory used by the computations of the runnables and of their steps.
+        """
+        self.performance_view = performanceView()
+        self.performance_view.show()
+
     """
     Others
     """
@@ -78,6 +78,28 @@ class mainListener(ABC):
     def open_set_file_finished(self):
         pass
 
+    # Open Directory
+    @abstractmethod
+    def open_directory_clicked(self, directory):
+        pass
+
+    @abstractmethod
+    def read_headers_computation_finished(self):
+        pass
+
+    @abstractmethod
+    def bulk_open_file_computation_finished(self, path_to_file):
+        pass
+
+    @abstractmethod
+    def bulk_open_file_computation_error(self, path_to_file, error_message):
+        pass
+
+    @abstractmethod
+    def bulk_open_create_study(self, study_name, task_name, dataset_names, paths_to_files, subjects, sessions, runs,
+                               conditions, groups):
+        pass
+
     # Load Data Info
     @abstractmethod
     def load_data_info_information(self, montage, channels_selected, tmin, tmax, dataset_name):
@@ -147,6 +169,11 @@ class mainListener(ABC):
     def export_events_txt_computation_error(self):
         pass
 
+    # Export pipeline
+    @abstractmethod
+    def export_pipeline_clicked(self, path_to_file):
+        pass
+
     # Save
     @abstractmethod
     def save_file_clicked(self):
@@ -222,7 +249,7 @@ class mainListener(ABC):
         pass
 
     @abstractmethod
-    def filter_information(self, low_frequency, high_frequency, channels_selected, filter_method):
+    def filter_information(self, low_frequency, high_frequency, channels_selected, filter_method, n_jobs):
         pass
 
     @abstractmethod
@@ -243,7 +270,7 @@ class mainListener(ABC):
         pass
 
     @abstractmethod
-    def resampling_information(self, frequency):
+    def resampling_information(self, frequency, resampling_method, n_jobs):
         pass
 
     @abstractmethod
@@ -284,13 +311,30 @@ class mainListener(ABC):
     def inspect_reject_data_clicked(self):
         pass
 
+    @abstractmethod
+    def artifact_rejection_information(self, peak_to_peak_threshold, variance_threshold, flat_threshold, adaptive):
+        pass
+
+    @abstractmethod
+    def artifact_rejection_computation_finished(self, number_rejected, number_epochs, rejected_counts,
+                                                peak_to_peak_threshold):
+        pass
+
+    @abstractmethod
+    def artifact_rejection_computation_error(self):
+        pass
+
+    @abstractmethod
+    def artifact_rejection_finished(self):
+        pass
+
     # ICA decomposition
     @abstractmethod
     def ica_decomposition_clicked(self):
         pass
 
     @abstractmethod
-    def ica_decomposition_information(self, ica_method):
+    def ica_decomposition_information(self, ica_method, ica_parameters):
         pass
 
     @abstractmethod
@@ -305,13 +349,17 @@ class mainListener(ABC):
     def ica_decomposition_finished(self):
         pass
 
+    @abstractmethod
+    def ica_components_information(self, exclude):
+        pass
+
     # Extract epochs
     @abstractmethod
     def extract_epochs_clicked(self):
         pass
 
     @abstractmethod
-    def extract_epochs_information(self, tmin, tmax, trials_selected):
+    def extract_epochs_information(self, tmin, tmax, trials_selected, events_selected):
         pass
 
     @abstractmethod
@@ -542,6 +590,34 @@ class mainListener(ABC):
     def classify_finished(self):
         pass
 
+    @abstractmethod
+    def classify_directory_clicked(self, directory):
+        pass
+
+    @abstractmethod
+    def classify_directory_information(self, directory, pipeline_selected, cross_val_number, event_names):
+        pass
+
+    @abstractmethod
+    def batch_inference_clicked(self, path_to_file):
+        pass
+
+    @abstractmethod
+    def batch_inference_information(self, model_directory=None, pipeline_names=None, batch_size=64, export_path=None):
+        pass
+
+    @abstractmethod
+    def batch_inference_computation_finished(self):
+        pass
+
+    @abstractmethod
+    def batch_inference_computation_error(self):
+        pass
+
+    @abstractmethod
+    def batch_inference_finished(self):
+        pass
+
     """
     Statistics Menu
     """
@@ -615,6 +691,13 @@ class mainListener(ABC):
     def study_selected(self):
         pass
 
+    """
+    Help Menu
+    """
+    @abstractmethod
+    def performance_clicked(self):
+        pass
+
     """
     Others 
     """
@@ -7,30 +7,35 @@ Main model
 
 import numpy as np
 
-from os.path import getsize, splitext
-from copy import copy, deepcopy
+from os.path import splitext, join, dirname
+from copy import copy
+from functools import partial
 
 from mne import read_events, find_events, events_from_annotations
 
-from PyQt5.QtCore import QThreadPool
+from PyQt5.QtCore import QThreadPool, QThread
 
 from runnables.tools_runnable import filterRunnable, icaRunnable, sourceEstimationRunnable, resamplingRunnable, \
-    reReferencingRunnable, extractEpochsRunnable, signalToNoiseRatioRunnable
+    reReferencingRunnable, extractEpochsRunnable, signalToNoiseRatioRunnable, artifactRejectionRunnable
 from runnables.files_runnable import openCntFileRunnable, openSetFileRunnable, openFifFileRunnable, \
     findEventsFromChannelRunnable, loadDataInfoRunnable, exportDataCSVRunnable, exportDataSETRunnable, \
-    exportEventsTXTRunnable
-from runnables.plots_runnable import timeFrequencyRunnable
-from runnables.connectivity_runnable import envelopeCorrelationRunnable, sourceSpaceConnectivityRunnable, \
-    sensorSpaceConnectivityRunnable
-from runnables.classification_runnable import classifyRunnable
-from runnables.statistics_runnable import statisticsSnrRunnable, statisticsErspItcRunnable, \
-    statisticsConnectivityRunnable
+    exportEventsTXTRunnable, readHeadersRunnable, bulkOpenFileRunnable
+from runnables.plots_runnable import timeFrequencyRunnable, decimationPyramidRunnable
+# The connectivity, classification and statistics runnables load heavy libraries (mne_connectivity, TensorFlow,
+# pyriemann, ...), they are imported when they are first used so that the application starts quickly.
 
 from exceptions.exceptions import EventFileError
 
-from utils.file_path_search import get_directory_path_from_file_path
+from utils.file_path_search import get_directory_path_from_file_path, find_dataset_files
 from utils.view.error_window import errorWindow
 from utils.model.study_model import studyModel
+from utils.model.dataset_summary_cache import datasetSummaryCache
+from utils.model.dataset_history import datasetHistory
+from utils.model.event_table import eventTable
+from utils.model.file_header import get_file_size
+from utils.model.ica_operator import compute_ica_operator, apply_ica_operator
+from utils.model.pipeline import processingPipeline
+from utils.model.results_store import resultsStore, CONST_RESULTS_DIRECTORY
 
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
@@ -40,6 +45,12 @@ __maintainer__ = "Lemahieu Antoine"
 __email__ = "Antoine.Lemahieu@ulb.be"
 __status__ = "Dev"
 
+# Operations modifying the signals or the channels of a dataset, after which its decimation pyramid is built again
+CONST_SIGNAL_OPERATIONS = ("filter", "resampling", "re_referencing", "ica_decomposition", "extract_epochs",
+                           "artifact_rejection", "set_channel_names")
+# Files of a directory opened at the same time, each of them is in memory twice while it is read
+CONST_BULK_OPEN_MAXIMUM_THREADS = 4
+
 
 class mainModel:
     def __init__(self):
@@ -64,6 +75,26 @@ class mainModel:
         self.references = []            # "Unknown"
         self.read_events = []           # None     # Events info read from file or channel, used to transform raw to epochs
         self.read_event_ids = []        # None  # Event ids
+        self.dataset_histories = []     # datasetHistory    # Operations performed on the data, gives the version
+        self.pipelines = []             # processingPipeline    # Operations that can be replayed by the batch runner
+        self.pipeline_steps = {}        # Parameters of each running analysis, recorded in the pipeline when finished
+        self.ica_states = []            # None  # ICA applied last, with the data before it, until the next operation
+
+        # Summaries (evoked, PSD, TFR) and results of the datasets, computed again when the version of the dataset changes
+        self.dataset_summary_cache = datasetSummaryCache()
+        self.memoization_keys = {}      # Key of the result of each running runnable, stored when it is finished
+        self.results_stores = {}        # resultsStore of each directory containing datasets, kept across restarts
+
+        # Decimation pyramids of the raw datasets for the data browser, built in the background
+        self.decimation_pyramids = []               # None until built
+        self.decimation_pyramid_runnables = []      # Runnable building the pyramid, None once built
+
+        # Files of a directory opened at once, on a pool of their own so that the other computations are not delayed
+        self.bulk_open_pool = QThreadPool()
+        self.bulk_open_pool.setMaxThreadCount(max(min(CONST_BULK_OPEN_MAXIMUM_THREADS, QThread.idealThreadCount()), 1))
+        self.bulk_open_headers = []     # Header of each file, read before their data
+        self.bulk_open_runnables = {}   # Runnable of each file being opened
+        self.bulk_open_indexes = {}     # Index of the dataset of each file opened, None if the opening failed
 
         # Study
         self.study = None
@@ -81,6 +112,7 @@ class mainModel:
         self.open_fif_file_runnable = None
         self.open_cnt_file_runnable = None
         self.open_set_file_runnable = None
+        self.read_headers_runnable = None
         self.load_data_info_runnable = None
         self.find_events_from_channel_runnable = None
         self.export_data_csv_runnable = None
@@ -92,6 +124,7 @@ class mainModel:
         self.re_referencing_runnable = None
         self.ica_data_decomposition_runnable = None
         self.extract_epochs_runnable = None
+        self.artifact_rejection_runnable = None
         self.snr_runnable = None
         self.source_estimation_runnable = None
 
@@ -103,19 +136,21 @@ class mainModel:
         self.sensor_space_connectivity_runnable = None
 
         self.classify_runnable = None
+        self.batch_inference_runnable = None
 
         self.statistics_snr_runnable = None
         self.statistics_ersp_itc_runnable = None
         self.statistics_connectivity_runnable = None
 
         # Others
-        self.fig_psd = None     # PSD figure, to plot them in the main thread to avoid matplotlib errors.
-        self.fig_topo = None
+        self.ica_fit = None     # ICA decomposition computed, waiting for the components to remove to be chosen
+        self.psd = None     # PSD spectra, the figures are created when plotted in the main thread.
+        self.psd_topo_time_points = None
 
-        self.statistics_fig_psd_one = None
-        self.statistics_fig_topo_one = None
-        self.statistics_fig_psd_two = None
-        self.statistics_fig_topo_two = None
+        self.statistics_psd_one = None
+        self.statistics_psd_two = None
+        self.statistics_psd_topo_time_points = None
+        self.statistics_psd_channel_selected = None
 
     """
     File menu
@@ -207,6 +242,75 @@ class mainModel:
         """
         self.main_listener.open_set_file_computation_error()
 
+    # Open Directory
+    def open_directory(self, directory):
+        """
+        Creates the parallel runnable for reading the headers of all the datasets of a directory, before opening them.
+        :param directory: Path to the directory
+        :type directory: str
+        """
+        paths_to_files = find_dataset_files(directory)
+        if not paths_to_files:
+            raise FileNotFoundError("No dataset (.set, .fif, .cnt) has been found in the directory " + directory + ".")
+        self.bulk_open_headers = []
+        self.bulk_open_indexes = {}
+
+        pool = QThreadPool.globalInstance()
+        self.read_headers_runnable = readHeadersRunnable(paths_to_files)
+        pool.start(self.read_headers_runnable)
+        self.read_headers_runnable.signals.finished.connect(self.read_headers_computation_finished)
+
+    def read_headers_computation_finished(self):
+        """
+        Retrieves the headers from the runnable when they have been read.
+        Notifies the main controller that the reading is done.
+        """
+        self.bulk_open_headers = self.read_headers_runnable.get_headers()
+        self.main_listener.read_headers_computation_finished()
+
+    def bulk_open_files(self):
+        """
+        Creates a parallel runnable for opening each file whose header has been read. They are computed on the bounded
+        pool of the bulk opening, each dataset is added as soon as its file has been read.
+        """
+        for header in self.bulk_open_headers:
+            path_to_file = header["path"]
+            if header["file_type"] is None:     # The header could not be read
+                self.bulk_open_indexes[path_to_file] = None
+                continue
+            runnable = bulkOpenFileRunnable(path_to_file, header["file_type"])
+            self.bulk_open_runnables[path_to_file] = runnable
+            runnable.signals.finished.connect(lambda path=path_to_file: self.bulk_open_file_computation_finished(path))
+            runnable.signals.error.connect(lambda path=path_to_file: self.bulk_open_file_computation_error(path))
+            self.bulk_open_pool.start(runnable)
+
+    def bulk_open_file_computation_finished(self, path_to_file):
+        """
+        Adds the dataset read by the runnable, with all its channels and without cropping it. It is only selected if no
+        dataset was opened before, the current dataset stays the same otherwise.
+        Notifies the main controller that the file is opened.
+        :param path_to_file: Path to the file
+        :type path_to_file: str
+        """
+        runnable = self.bulk_open_runnables.pop(path_to_file)
+        file_data = runnable.get_file_data()
+        dataset_name = next(header["name"] for header in self.bulk_open_headers if header["path"] == path_to_file)
+        load_parameters = {"montage": "default", "channels_selected": file_data.ch_names, "tmin": None, "tmax": None}
+        self.add_dataset(file_data, runnable.get_file_type(), path_to_file, dataset_name, load_parameters,
+                         select=self.current_dataset_index == -1)
+        self.bulk_open_indexes[path_to_file] = len(self.file_data) - 1
+        self.main_listener.bulk_open_file_computation_finished(path_to_file)
+
+    def bulk_open_file_computation_error(self, path_to_file):
+        """
+        Notifies the main controller that the opening of a file had an error.
+        :param path_to_file: Path to the file
+        :type path_to_file: str
+        """
+        runnable = self.bulk_open_runnables.pop(path_to_file)
+        self.bulk_open_indexes[path_to_file] = None
+        self.main_listener.bulk_open_file_computation_error(path_to_file, runnable.get_error_message())
+
     # Data Info
     def load_data_info(self, montage, channels_selected, tmin, tmax, dataset_name):
         """
@@ -234,27 +338,83 @@ class mainModel:
         Retrieves the data from the runnable when the last information have been updated.
         Notifies the main controller that the reading is done.
         """
-        self.file_data.append(self.load_data_info_runnable.get_file_data())
-        self.file_type.append(self.file_type_tmp)
-        self.file_path_name.append(self.file_path_name_tmp)
-        self.dataset_name.append(self.dataset_name_tmp)
+        self.add_dataset(self.load_data_info_runnable.get_file_data(), self.file_type_tmp, self.file_path_name_tmp,
+                         self.dataset_name_tmp, self.load_data_info_runnable.get_parameters())
+        self.reset_tmp_attributes()
+        self.main_listener.load_data_info_computation_finished()
+
+    def add_dataset(self, file_data, file_type, file_path_name, dataset_name, load_parameters, select=True):
+        """
+        Adds a dataset whose information have been loaded, and selects it as the current dataset.
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Epochs/MNE.Raw
+        :param file_type: The type of the dataset.
+        :type file_type: str
+        :param file_path_name: The path to the file of the dataset.
+        :type file_path_name: str
+        :param dataset_name: The name of the dataset.
+        :type dataset_name: str
+        :param load_parameters: The montage, the channels selected and the start and end time kept.
+        :type load_parameters: dict
+        :param select: Select the dataset as the current dataset. The datasets of a directory are not selected, so that
+        the index of the current dataset does not change while a computation is performed on it.
+        :type select: bool
+        """
+        self.file_data.append(file_data)
+        self.file_type.append(file_type)
+        self.file_path_name.append(file_path_name)
+        self.dataset_name.append(dataset_name)
 
         self.channels_locations.append({})
         self.ica_decomposition.append("No")
         self.references.append("Unknown")
         self.read_events.append(None)     # Events info read from file or channel, used to transform raw to epochs
         self.read_event_ids.append(None)
-
-        self.current_dataset_index = len(self.file_data)-1
-
-        self.reset_tmp_attributes()
-
-        self.create_channels_locations()
-        file_type = self.file_type[self.current_dataset_index]
+        self.dataset_histories.append(datasetHistory(file_path_name))
+        self.dataset_histories[-1].record("load_data_info", load_parameters)
+        self.pipelines.append(processingPipeline())
+        self.pipelines[-1].record("load_data_info", load_parameters)
+        self.decimation_pyramids.append(None)
+        self.decimation_pyramid_runnables.append(None)
+        self.ica_states.append(None)
+
+        index = len(self.file_data) - 1
+        if select:
+            self.current_dataset_index = index
+
+        self.create_channels_locations(index)
         if file_type == "Raw":
-            self.try_finding_events()
+            self.try_finding_events(index)
+            file_path = self.get_file_path_name_without_extension(index) + "-pyramid.npz"
+            self.build_decimation_pyramid(index, file_path)
 
-        self.main_listener.load_data_info_computation_finished()
+    # Decimation pyramid
+    def build_decimation_pyramid(self, index, file_path=None):
+        """
+        Creates the parallel runnable for building the decimation pyramid of a raw dataset, used by the data browser.
+        :param index: The index of the dataset.
+        :type index: int
+        :param file_path: The path of the file in which the pyramid is stored alongside the dataset. If None, the
+        pyramid is only kept in memory.
+        :type file_path: str
+        """
+        self.decimation_pyramids[index] = None
+        pool = QThreadPool.globalInstance()
+        self.decimation_pyramid_runnables[index] = decimationPyramidRunnable(self.file_data[index],
+                                                                             self.dataset_histories[index].get_hash(),
+                                                                             file_path)
+        pool.start(self.decimation_pyramid_runnables[index])
+        self.decimation_pyramid_runnables[index].signals.finished.connect(self.decimation_pyramid_computation_finished)
+
+    def decimation_pyramid_computation_finished(self):
+        """
+        Retrieves the pyramids built. The runnables replaced by a newer one, because the data changed in the meantime,
+        are not in the list anymore and their pyramid is ignored.
+        """
+        for index, runnable in enumerate(self.decimation_pyramid_runnables):
+            if runnable is not None and runnable.get_decimation_pyramid() is not None:
+                self.decimation_pyramids[index] = runnable.get_decimation_pyramid()
+                self.decimation_pyramid_runnables[index] = None
 
     # Events
     def read_events_file(self, path_to_file):
@@ -271,6 +431,7 @@ class mainModel:
             if extension == "txt" or extension == "fif":
                 events = read_events(path_to_file)
                 self.read_events[self.current_dataset_index] = events
+                self.record_raw_events(self.current_dataset_index, "events")
             else:
                 raise EventFileError()
         except EventFileError:
@@ -307,6 +468,11 @@ class mainModel:
         """
         self.read_events[self.current_dataset_index] = self.find_events_from_channel_runnable.get_read_events()
         self.read_event_ids[self.current_dataset_index] = self.find_events_from_channel_runnable.get_read_event_ids()
+        if self.read_event_ids[self.current_dataset_index] is None:
+            self.record_raw_events(self.current_dataset_index, "stim_channel",
+                                   self.find_events_from_channel_runnable.get_stim_channel())
+        else:   # No events on the stim channel, they were found in the annotations
+            self.record_raw_events(self.current_dataset_index, "annotations")
         if self.read_events[self.current_dataset_index] is not None:
             if len(self.read_events[self.current_dataset_index]) == 0:
                 error_message = "It seems that the number of events found is 0, please check the channel used or use " \
@@ -409,6 +575,16 @@ class mainModel:
         self.main_listener.export_events_txt_computation_error()
 
     # Save
+    def export_pipeline_clicked(self, path_to_file):
+        """
+        Saves the pipeline of the current dataset in a JSON file, so that it can be replayed by the batch runner.
+        :param path_to_file: The path to the file.
+        :type path_to_file: str
+        """
+        if path_to_file[-5:] != ".json":
+            path_to_file += ".json"
+        self.pipelines[self.current_dataset_index].save(path_to_file)
+
     def save_file(self, path_to_file):
         """
         Saves the dataset into a FIF file, which is the extension of MNE.
@@ -453,6 +629,16 @@ class mainModel:
         del self.references[self.current_dataset_index]
         del self.read_events[self.current_dataset_index]
         del self.read_event_ids[self.current_dataset_index]
+        del self.dataset_histories[self.current_dataset_index]
+        del self.pipelines[self.current_dataset_index]
+        del self.decimation_pyramids[self.current_dataset_index]
+        del self.decimation_pyramid_runnables[self.current_dataset_index]
+        del self.ica_states[self.current_dataset_index]
+        self.ica_fit = None
+        self.dataset_summary_cache.clear()      # The indexes of the following datasets changed
+        for path_to_file, index in self.bulk_open_indexes.items():
+            if index is not None and index >= self.current_dataset_index:
+                self.bulk_open_indexes[path_to_file] = None if index == self.current_dataset_index else index - 1
 
         self.current_dataset_index = len(self.file_data) - 1
 
@@ -493,7 +679,7 @@ class mainModel:
     Tools menu
     """
     # Filtering
-    def filter(self, low_frequency, high_frequency, channels_selected, filter_method, index=None):
+    def filter(self, low_frequency, high_frequency, channels_selected, filter_method, n_jobs=1, index=None):
         """
         Creates the parallel runnable for filtering the dataset.
         :param low_frequency: Lowest frequency from where the data will be filtered.
@@ -504,6 +690,8 @@ class mainModel:
         :type channels_selected: list of str
         :param filter_method: Method used for the filtering, either FIR or IIR.
         :type filter_method: str
+        :param n_jobs: Number of threads filtering the channels.
+        :type n_jobs: int
         :param index: The index of the dataset of the study.
         :type index: int
         """
@@ -514,7 +702,8 @@ class mainModel:
             file_data = self.file_data[self.current_dataset_index]
 
         pool = QThreadPool.globalInstance()
-        self.filter_runnable = filterRunnable(low_frequency, high_frequency, channels_selected, file_data, filter_method)
+        self.filter_runnable = filterRunnable(low_frequency, high_frequency, channels_selected, file_data, filter_method,
+                                              n_jobs)
         pool.start(self.filter_runnable)
         self.filter_runnable.signals.finished.connect(self.filter_computation_finished)
         self.filter_runnable.signals.error.connect(self.filter_computation_error)
@@ -530,9 +719,18 @@ class mainModel:
             high_frequency = self.filter_runnable.get_high_frequency()
             channels_selected = self.filter_runnable.get_channels_selected()
             filter_method = self.filter_runnable.get_filter_method()
-            self.main_listener.filter_computation_finished(low_frequency, high_frequency, channels_selected, filter_method)
+            self.record_dataset_operation(self.study_index, "filter",
+                                          {"low_frequency": low_frequency, "high_frequency": high_frequency,
+                                           "channels_selected": channels_selected, "filter_method": filter_method})
+            self.main_listener.filter_computation_finished(low_frequency, high_frequency, channels_selected, filter_method,
+                                                           self.filter_runnable.get_n_jobs())
         else:
             self.file_data[self.current_dataset_index] = self.filter_runnable.get_file_data()
+            self.record_dataset_operation(self.current_dataset_index, "filter",
+                                          {"low_frequency": self.filter_runnable.get_low_frequency(),
+                                           "high_frequency": self.filter_runnable.get_high_frequency(),
+                                           "channels_selected": self.filter_runnable.get_channels_selected(),
+                                           "filter_method": self.filter_runnable.get_filter_method()})
             self.main_listener.filter_computation_finished()
 
     def filter_computation_error(self):
@@ -542,11 +740,15 @@ class mainModel:
         self.main_listener.filter_computation_error()
 
     # Resampling
-    def resampling(self, new_frequency, index=None):
+    def resampling(self, new_frequency, resampling_method="fft", n_jobs=1, index=None):
         """
         Creates the parallel runnable for performing a resampling.
         :param new_frequency: The new frequency at which the data will be resampled.
         :type new_frequency: int
+        :param resampling_method: Method used for the resampling, either FFT or polyphase.
+        :type resampling_method: str
+        :param n_jobs: Number of parallel jobs used for the resampling.
+        :type n_jobs: int
         :param index: The index of the dataset of the study.
         :type index: int
         """
@@ -559,7 +761,7 @@ class mainModel:
             events = self.get_event_values()
 
         pool = QThreadPool.globalInstance()
-        self.resampling_runnable = resamplingRunnable(new_frequency, file_data, events)
+        self.resampling_runnable = resamplingRunnable(new_frequency, file_data, events, resampling_method, n_jobs)
         pool.start(self.resampling_runnable)
         self.resampling_runnable.signals.finished.connect(self.resampling_computation_finished)
         self.resampling_runnable.signals.error.connect(self.resampling_computation_error)
@@ -571,12 +773,20 @@ class mainModel:
         """
         if self.study_selected:
             self.file_data[self.study_index] = self.resampling_runnable.get_file_data()
+            self.record_dataset_operation(self.study_index, "resampling",
+                                          {"frequency": self.resampling_runnable.get_frequency(),
+                                           "resampling_method": self.resampling_runnable.get_resampling_method()})
             self.set_event_values(self.resampling_runnable.get_events(), index=self.study_index)
 
             frequency = self.resampling_runnable.get_frequency()
-            self.main_listener.resampling_computation_finished(frequency)
+            resampling_method = self.resampling_runnable.get_resampling_method()
+            n_jobs = self.resampling_runnable.get_n_jobs()
+            self.main_listener.resampling_computation_finished(frequency, resampling_method, n_jobs)
         else:
             self.file_data[self.current_dataset_index] = self.resampling_runnable.get_file_data()
+            self.record_dataset_operation(self.current_dataset_index, "resampling",
+                                          {"frequency": self.resampling_runnable.get_frequency(),
+                                           "resampling_method": self.resampling_runnable.get_resampling_method()})
             self.set_event_values(self.resampling_runnable.get_events())
             self.main_listener.resampling_computation_finished()
 
@@ -624,6 +834,8 @@ class mainModel:
         """
         if self.study_selected:
             self.file_data[self.study_index] = self.re_referencing_runnable.get_file_data()
+            self.record_dataset_operation(self.study_index, "re_referencing",
+                                          {"references": self.re_referencing_runnable.get_references()})
             self.references[self.study_index] = self.re_referencing_runnable.get_references()
 
             save_data = self.re_referencing_runnable.get_save_data()
@@ -633,6 +845,8 @@ class mainModel:
                                                                    n_jobs)
         else:
             self.file_data[self.current_dataset_index] = self.re_referencing_runnable.get_file_data()
+            self.record_dataset_operation(self.current_dataset_index, "re_referencing",
+                                          {"references": self.re_referencing_runnable.get_references()})
             self.references[self.current_dataset_index] = self.re_referencing_runnable.get_references()
             self.main_listener.re_referencing_computation_finished()
 
@@ -643,50 +857,96 @@ class mainModel:
         self.main_listener.re_referencing_computation_error()
 
     # ICA decomposition
-    def ica_data_decomposition(self, ica_method, index=None):
+    def ica_data_decomposition(self, ica_method, ica_parameters, index=None):
         """
         Creates the parallel runnable for performing the ICA decomposition of the dataset.
+        If the last operation on the dataset is an ICA, the decomposition is computed on the data before it, so that
+        other components can be removed. The decomposition is cached with the version of the data, the method and the
+        parameters, it is not computed again if the ICA is opened again on the same data.
         :param ica_method: Method used for performing the ICA decomposition
         :type ica_method: str
+        :param ica_parameters: The number of components and the parameters of the fast fit, see "fit_ica".
+        :type ica_parameters: dict
         :param index: The index of the dataset of the study.
         :type index: int
         """
         if self.study_selected:
             self.study_index = index
-            file_data = self.file_data[index]
         else:
-            file_data = self.file_data[self.current_dataset_index]
+            index = self.current_dataset_index
+
+        ica_state = self.ica_states[index]
+        if ica_state is not None:   # The data before the last ICA is decomposed again
+            file_data, version, fingerprint = ica_state["file_data"], ica_state["version"], ica_state["fingerprint"]
+        else:
+            file_data = self.file_data[index]
+            version, fingerprint = self.get_dataset_version(index), self.dataset_histories[index].get_hash()
+        self.ica_fit = {"index": index, "file_data": file_data, "version": version, "fingerprint": fingerprint,
+                        "exclude": ica_state["exclude"] if ica_state is not None else []}
+
+        memoization_key = self.get_memoization_key("ica_decomposition", (ica_method, ica_parameters), index, version,
+                                                   fingerprint)
+        memoized_runnable = self.get_memoized_result(memoization_key)
+        if memoized_runnable is not None:     # Already decomposed with this method
+            self.ica_data_decomposition_runnable = memoized_runnable
+            self.ica_data_decomposition_computation_finished()
+            return
 
         pool = QThreadPool.globalInstance()
-        self.ica_data_decomposition_runnable = icaRunnable(ica_method, file_data)
+        self.ica_data_decomposition_runnable = icaRunnable(ica_method, file_data, ica_parameters)
+        self.remember_memoization_key(self.ica_data_decomposition_runnable, memoization_key)
         pool.start(self.ica_data_decomposition_runnable)
         self.ica_data_decomposition_runnable.signals.finished.connect(self.ica_data_decomposition_computation_finished)
         self.ica_data_decomposition_runnable.signals.error.connect(self.ica_data_decomposition_computation_error)
 
     def ica_data_decomposition_computation_finished(self):
         """
-        Retrieves the data from the runnable when the ICA decomposition is computed.
+        Retrieves the decomposition from the runnable when the ICA decomposition is computed.
+        For a study, the decomposition is applied directly. Otherwise, the components to remove are chosen first.
         Notifies the main controller that the computation is done.
         """
+        self.ica_fit["ica"] = self.ica_data_decomposition_runnable.get_ica()
+        self.ica_fit["ica_method"] = self.ica_data_decomposition_runnable.get_ica_method()
+        self.ica_fit["ica_parameters"] = self.ica_data_decomposition_runnable.get_ica_parameters()
         if self.study_selected:
-            self.file_data[self.study_index] = self.ica_data_decomposition_runnable.get_file_data()
-            self.ica_decomposition[self.study_index] = "Yes"
-
-            ica_method = self.ica_data_decomposition_runnable.get_ica_method()
-            self.main_listener.ica_data_decomposition_computation_finished(ica_method)
+            ica_method, ica_parameters = self.ica_fit["ica_method"], self.ica_fit["ica_parameters"]
+            self.apply_ica_decomposition(self.ica_fit["exclude"])
+            self.main_listener.ica_data_decomposition_computation_finished(ica_method, ica_parameters)
         else:
-            self.file_data[self.current_dataset_index] = self.ica_data_decomposition_runnable.get_file_data()
-            self.ica_decomposition[self.current_dataset_index] = "Yes"
             self.main_listener.ica_data_decomposition_computation_finished()
 
     def ica_data_decomposition_computation_error(self):
         """
         Notifies the main controller that the computation had an error.
         """
+        self.ica_fit = None
         self.main_listener.ica_data_decomposition_computation_error()
 
+    def apply_ica_decomposition(self, exclude):
+        """
+        Removes the components of the ICA decomposition computed from the data that was decomposed, with a single
+        matrix product. The data before the ICA is kept until the next operation on the dataset, so that other
+        components can be removed without computing the decomposition again.
+        :param exclude: The indexes of the components removed.
+        :type exclude: list of int
+        """
+        ica_fit = self.ica_fit
+        index = ica_fit["index"]
+        file_data = ica_fit["file_data"]
+        matrix, offset = compute_ica_operator(ica_fit["ica"], file_data.info, exclude)
+        self.file_data[index] = apply_ica_operator(file_data, matrix, offset)
+        parameters = {"ica_method": ica_fit["ica_method"], "exclude": list(exclude)}
+        parameters.update(ica_fit["ica_parameters"])
+        # Other components removed from the same data replace the ICA recorded, instead of a second ICA on top of it
+        self.record_dataset_operation(index, "ica_decomposition", parameters,
+                                      replace_last=self.ica_states[index] is not None)
+        self.ica_decomposition[index] = "Yes"
+        self.ica_states[index] = {"file_data": file_data, "version": ica_fit["version"],
+                                  "fingerprint": ica_fit["fingerprint"], "exclude": list(exclude)}
+        self.ica_fit = None
+
     # Extract Epochs
-    def extract_epochs(self, tmin, tmax, trials_selected):
+    def extract_epochs(self, tmin, tmax, trials_selected, events_selected):
         """
         Creates the parallel runnable for extracting the epochs of a dataset based on the events provided/or found beforehand.
         :param tmin: Start time of the epoch to keep
@@ -695,6 +955,9 @@ class mainModel:
         :type tmax: float
         :param trials_selected: The indexes of the trials selected for the computation
         :type trials_selected: list of int
+        :param events_selected: The names of the events of the trials selected, "all" if all the trials are selected, or
+        None if the trials are selected by their indexes.
+        :type events_selected: list of str/str
         """
         file_data = self.file_data[self.current_dataset_index]
         read_events = self.read_events[self.current_dataset_index]
@@ -702,7 +965,7 @@ class mainModel:
 
         pool = QThreadPool.globalInstance()
         self.extract_epochs_runnable = extractEpochsRunnable(file_data, read_events, read_event_ids, tmin, tmax,
-                                                             trials_selected)
+                                                             trials_selected, events_selected)
         pool.start(self.extract_epochs_runnable)
         self.extract_epochs_runnable.signals.finished.connect(self.extract_epochs_computation_finished)
         self.extract_epochs_runnable.signals.error.connect(self.extract_epochs_computation_error)
@@ -714,6 +977,8 @@ class mainModel:
         """
         self.file_type[self.current_dataset_index] = "Epochs"
         self.file_data[self.current_dataset_index] = self.extract_epochs_runnable.get_file_data()
+        self.record_dataset_operation(self.current_dataset_index, "extract_epochs",
+                                      self.extract_epochs_runnable.get_parameters())
         self.main_listener.extract_epochs_computation_finished()
 
     def extract_epochs_computation_error(self):
@@ -722,6 +987,50 @@ class mainModel:
         """
         self.main_listener.extract_epochs_computation_error()
 
+    # Artifact rejection
+    def artifact_rejection(self, peak_to_peak_threshold, variance_threshold, flat_threshold, adaptive):
+        """
+        Creates the parallel runnable for computing the epochs of the dataset rejected because of artifacts.
+        :param peak_to_peak_threshold: Maximum peak-to-peak amplitude, in volts. If None, not used.
+        :type peak_to_peak_threshold: float
+        :param variance_threshold: Maximum variance, in volts squared. If None, not used.
+        :type variance_threshold: float
+        :param flat_threshold: Minimum peak-to-peak amplitude, in volts. If None, not used.
+        :type flat_threshold: float
+        :param adaptive: Compute the peak-to-peak threshold by cross-validation.
+        :type adaptive: bool
+        """
+        file_data = self.file_data[self.current_dataset_index]
+
+        pool = QThreadPool.globalInstance()
+        self.artifact_rejection_runnable = artifactRejectionRunnable(file_data, peak_to_peak_threshold,
+                                                                     variance_threshold, flat_threshold, adaptive)
+        pool.start(self.artifact_rejection_runnable)
+        self.artifact_rejection_runnable.signals.finished.connect(self.artifact_rejection_computation_finished)
+        self.artifact_rejection_runnable.signals.error.connect(self.artifact_rejection_computation_error)
+
+    def artifact_rejection_computation_finished(self):
+        """
+        Retrieves the mask of the epochs kept from the runnable when the artifact rejection is computed, and drops the
+        epochs rejected from the dataset so that none of the tools uses them.
+        Notifies the main controller that the computation is done.
+        """
+        keep_mask = self.artifact_rejection_runnable.get_keep_mask()
+        if not keep_mask.all():
+            self.file_data[self.current_dataset_index] = self.file_data[self.current_dataset_index][keep_mask]
+        self.record_dataset_operation(self.current_dataset_index, "artifact_rejection",
+                                      self.artifact_rejection_runnable.get_parameters())
+        self.main_listener.artifact_rejection_computation_finished(
+            len(keep_mask) - int(keep_mask.sum()), len(keep_mask),
+            self.artifact_rejection_runnable.get_rejected_counts(),
+            self.artifact_rejection_runnable.get_peak_to_peak_threshold())
+
+    def artifact_rejection_computation_error(self):
+        """
+        Notifies the main controller that the computation had an error.
+        """
+        self.main_listener.artifact_rejection_computation_error()
+
     # SNR
     def signal_to_noise_ratio(self, snr_methods, source_method, read, write, picks, trials_selected):
         """
@@ -780,11 +1089,20 @@ class mainModel:
         file_data = self.file_data[self.current_dataset_index]
         file_path_name_without_extension = self.get_file_path_name_without_extension()
 
+        parameters = (source_estimation_method, epochs_method, trials_selected, tmin, tmax, export_path)
+        memoization_key = self.get_memoization_key("source_estimation", parameters)
+        memoized_runnable = self.get_memoized_result(memoization_key)
+        if memoized_runnable is not None:     # Already computed on this version of the dataset
+            self.source_estimation_runnable = memoized_runnable
+            self.source_estimation_computation_finished()
+            return
+
         pool = QThreadPool.globalInstance()
         self.source_estimation_runnable = sourceEstimationRunnable(source_estimation_method, file_data,
                                                                    file_path_name_without_extension,
                                                                    save_data, load_data, epochs_method, trials_selected,
                                                                    tmin, tmax, n_jobs, export_path)
+        self.remember_memoization_key(self.source_estimation_runnable, memoization_key)
         pool.start(self.source_estimation_runnable)
         self.source_estimation_runnable.signals.finished.connect(self.source_estimation_computation_finished)
         self.source_estimation_runnable.signals.error.connect(self.source_estimation_computation_error)
@@ -819,16 +1137,17 @@ class mainModel:
         :param topo_time_points: The time points for the topomaps.
         :type topo_time_points: list of float
         """
-        file_data = self.file_data[self.current_dataset_index]
+        index = self.current_dataset_index
+        file_data = self.file_data[index]
         try:
             bandwidth = 1.0/(maximum_time-minimum_time)     # To counter bandwidth normalization
-            self.fig_psd = file_data.plot_psd(fmin=minimum_frequency, fmax=maximum_frequency, tmin=minimum_time,
-                                              tmax=maximum_time, estimate="power", bandwidth=bandwidth,
-                                              average=False, show=False)
-            bands = []
-            for time in topo_time_points:
-                bands.append((time, str(time) + " Hz"))
-            self.fig_topo = file_data.plot_psd_topomap(bands=bands, tmin=minimum_time, tmax=maximum_time, show=False)
+            self.psd = self.dataset_summary_cache.get_psd(index, self.get_dataset_version(index), file_data,
+                                                          minimum_frequency, maximum_frequency, minimum_time,
+                                                          maximum_time, bandwidth)
+            self.psd_topo_time_points = topo_time_points
+            self.record_pipeline_step(index, "power_spectral_density",
+                                      {"minimum_frequency": minimum_frequency, "maximum_frequency": maximum_frequency,
+                                       "minimum_time": minimum_time, "maximum_time": maximum_time})
             self.power_spectral_density_computation_finished()
         except Exception as error:
             error_message = "An error has occurred during the computation of the PSD"
@@ -874,9 +1193,18 @@ class mainModel:
         """
         file_data = self.file_data[self.current_dataset_index]
 
+        parameters = (method_tfr, channel_selected, min_frequency, max_frequency, n_cycles)
+        memoization_key = self.get_memoization_key("time_frequency", parameters)
+        memoized_runnable = self.get_memoized_result(memoization_key)
+        if memoized_runnable is not None:     # Already computed on this version of the dataset
+            self.time_frequency_runnable = memoized_runnable
+            self.time_frequency_computation_finished()
+            return
+
         pool = QThreadPool.globalInstance()
         self.time_frequency_runnable = timeFrequencyRunnable(file_data, method_tfr, channel_selected,
                                                              min_frequency, max_frequency, n_cycles)
+        self.remember_memoization_key(self.time_frequency_runnable, memoization_key)
         pool.start(self.time_frequency_runnable)
         self.time_frequency_runnable.signals.finished.connect(self.time_frequency_computation_finished)
         self.time_frequency_runnable.signals.error.connect(self.time_frequency_computation_error)
@@ -916,9 +1244,21 @@ class mainModel:
         """
         file_data = self.file_data[self.current_dataset_index]
 
+        self.pipeline_steps["envelope_correlation"] = {"psi": psi, "fmin": fmin, "fmax": fmax,
+                                                       "connectivity_method": connectivity_method, "n_jobs": n_jobs}
+        parameters = (psi, fmin, fmax, connectivity_method, export_path)
+        memoization_key = self.get_memoization_key("envelope_correlation", parameters)
+        memoized_runnable = self.get_memoized_result(memoization_key)
+        if memoized_runnable is not None:     # Already computed on this version of the dataset
+            self.envelope_correlation_runnable = memoized_runnable
+            self.envelope_correlation_computation_finished()
+            return
+
         pool = QThreadPool.globalInstance()
+        from runnables.connectivity_runnable import envelopeCorrelationRunnable
         self.envelope_correlation_runnable = envelopeCorrelationRunnable(file_data, psi, fmin, fmax, connectivity_method,
                                                                          n_jobs, export_path)
+        self.remember_memoization_key(self.envelope_correlation_runnable, memoization_key)
         pool.start(self.envelope_correlation_runnable)
         self.envelope_correlation_runnable.signals.finished.connect(self.envelope_correlation_computation_finished)
         self.envelope_correlation_runnable.signals.error.connect(self.envelope_correlation_computation_error)
@@ -927,6 +1267,7 @@ class mainModel:
         """
         Notifies the main controller that the computation of the envelope correlation is done.
         """
+        self.record_pipeline_step(self.current_dataset_index, "envelope_correlation")
         self.main_listener.envelope_correlation_computation_finished()
 
     def envelope_correlation_computation_error(self):
@@ -967,11 +1308,22 @@ class mainModel:
         file_data = self.file_data[self.current_dataset_index]
         file_path_name_without_extension = self.get_file_path_name_without_extension()
 
+        parameters = (connectivity_method, spectrum_estimation_method, source_estimation_method, export_path, psi,
+                      fmin, fmax)
+        memoization_key = self.get_memoization_key("source_space_connectivity", parameters)
+        memoized_runnable = self.get_memoized_result(memoization_key)
+        if memoized_runnable is not None:     # Already computed on this version of the dataset
+            self.source_space_connectivity_runnable = memoized_runnable
+            self.source_space_connectivity_computation_finished()
+            return
+
         pool = QThreadPool.globalInstance()
+        from runnables.connectivity_runnable import sourceSpaceConnectivityRunnable
         self.source_space_connectivity_runnable = sourceSpaceConnectivityRunnable(file_data, file_path_name_without_extension,
                                                                                   connectivity_method, spectrum_estimation_method,
                                                                                   source_estimation_method, save_data, load_data,
                                                                                   n_jobs, export_path, psi, fmin, fmax)
+        self.remember_memoization_key(self.source_space_connectivity_runnable, memoization_key)
         pool.start(self.source_space_connectivity_runnable)
         self.source_space_connectivity_runnable.signals.finished.connect(self.source_space_connectivity_computation_finished)
         self.source_space_connectivity_runnable.signals.error.connect(self.source_space_connectivity_computation_error)
@@ -997,8 +1349,18 @@ class mainModel:
         """
         file_data = self.file_data[self.current_dataset_index]
 
+        parameters = (export_path,)
+        memoization_key = self.get_memoization_key("sensor_space_connectivity", parameters)
+        memoized_runnable = self.get_memoized_result(memoization_key)
+        if memoized_runnable is not None:     # Already computed on this version of the dataset
+            self.sensor_space_connectivity_runnable = memoized_runnable
+            self.sensor_space_connectivity_computation_finished()
+            return
+
         pool = QThreadPool.globalInstance()
+        from runnables.connectivity_runnable import sensorSpaceConnectivityRunnable
         self.sensor_space_connectivity_runnable = sensorSpaceConnectivityRunnable(file_data, export_path)
+        self.remember_memoization_key(self.sensor_space_connectivity_runnable, memoization_key)
         pool.start(self.sensor_space_connectivity_runnable)
         self.sensor_space_connectivity_runnable.signals.finished.connect(self.sensor_space_connectivity_computation_finished)
         self.sensor_space_connectivity_runnable.signals.error.connect(self.sensor_space_connectivity_computation_error)
@@ -1042,6 +1404,7 @@ class mainModel:
         directory_path = self.get_directory_path_from_file_path()
 
         pool = QThreadPool.globalInstance()
+        from runnables.classification_runnable import classifyRunnable
         self.classify_runnable = classifyRunnable(file_data, directory_path, pipeline_selected, feature_selection,
                                                   number_of_channels_to_select, hyper_tuning, cross_val_number, trials_selected)
         pool.start(self.classify_runnable)
@@ -1060,6 +1423,67 @@ class mainModel:
         """
         self.main_listener.classify_computation_error()
 
+    def classify_directory(self, directory, pipeline_selected, cross_val_number, event_names):
+        """
+        Creates the parallel runnable for classifying the epoched subjects of a directory out of core, one subject in
+        memory at a time.
+        :param directory: Path to the directory of the epoched subjects.
+        :type directory: str
+        :param pipeline_selected: The pipeline(s) used for the classification.
+        :type pipeline_selected: list of str
+        :param cross_val_number: Number of cross-validation fold, the subjects are split between them.
+        :type cross_val_number: int
+        :param event_names: The events classified.
+        :type event_names: list of str
+        """
+        pool = QThreadPool.globalInstance()
+        from runnables.classification_runnable import classifyDirectoryRunnable
+        self.classify_runnable = classifyDirectoryRunnable(directory, pipeline_selected, cross_val_number, event_names)
+        pool.start(self.classify_runnable)
+        self.classify_runnable.signals.finished.connect(self.classify_computation_finished)
+        self.classify_runnable.signals.error.connect(self.classify_computation_error)
+
+    def batch_inference(self, model_directory=None, pipeline_names=None, batch_size=64, index=None, export_path=None):
+        """
+        Creates the parallel runnable for computing the probabilities of the classes of the dataset with the pipelines
+        fitted by a previous classification.
+        :param model_directory: Path to the directory of the model store. If None, the store next to the dataset is used.
+        :type model_directory: str
+        :param pipeline_names: The pipeline(s) used for the inference. If None, all the fitted pipelines are used.
+        :type pipeline_names: list of str
+        :param batch_size: Number of epochs given to the pipelines at once.
+        :type batch_size: int
+        :param index: Index of the dataset on which the inference is performed. If None, the current dataset is used.
+        :type index: int
+        :param export_path: Path of the CSV file where the probabilities are saved. If None, they are not saved.
+        :type export_path: str
+        """
+        if index is None:
+            index = self.current_dataset_index
+        file_data = self.file_data[index]
+        if model_directory is None:
+            model_directory = join(get_directory_path_from_file_path(self.file_path_name[index]), "applepy_models")
+
+        pool = QThreadPool.globalInstance()
+        from runnables.classification_runnable import batchInferenceRunnable
+        self.batch_inference_runnable = batchInferenceRunnable(file_data, model_directory, pipeline_names, batch_size,
+                                                               export_path)
+        pool.start(self.batch_inference_runnable)
+        self.batch_inference_runnable.signals.finished.connect(self.batch_inference_computation_finished)
+        self.batch_inference_runnable.signals.error.connect(self.batch_inference_computation_error)
+
+    def batch_inference_computation_finished(self):
+        """
+        Notifies the main controller that the computation is done.
+        """
+        self.main_listener.batch_inference_computation_finished()
+
+    def batch_inference_computation_error(self):
+        """
+        Notifies the main controller that the computation had an error.
+        """
+        self.main_listener.batch_inference_computation_error()
+
     """
     Statistics Menu
     """
@@ -1086,6 +1510,7 @@ class mainModel:
         file_path_name_without_extension = self.get_file_path_name_without_extension()
 
         pool = QThreadPool.globalInstance()
+        from runnables.statistics_runnable import statisticsSnrRunnable
         self.statistics_snr_runnable = statisticsSnrRunnable(file_data, snr_methods, source_method, file_path_name_without_extension,
                                                              read, write, picks, stats_first_variable, stats_second_variable)
         pool.start(self.statistics_snr_runnable)
@@ -1127,31 +1552,21 @@ class mainModel:
         :param stats_second_variable: The second independent variable on which the statistics must be computed (an event id)
         :type stats_second_variable: str
         """
-        file_data = self.file_data[self.current_dataset_index]
+        index = self.current_dataset_index
+        file_data = self.file_data[index]
         try:
-            # Initialize variables
+            # The spectra of all the epochs are computed once, then split between the two variables.
             bandwidth = 1.0 / (maximum_time - minimum_time)  # To counter bandwidth normalization
-            bands = []
-            for time in topo_time_points:
-                bands.append((time, str(time) + " Hz"))
+            psd = self.dataset_summary_cache.get_psd(index, self.get_dataset_version(index), file_data,
+                                                     minimum_frequency, maximum_frequency, minimum_time, maximum_time,
+                                                     bandwidth)
+            event_table = eventTable.from_file_data(file_data)
             # First variable
-            file_data_one = deepcopy(file_data)
-            mask = self.create_mask_from_variable_to_keep(file_data_one, stats_first_variable)
-            file_data_one = file_data_one.drop(mask)
-            self.statistics_fig_psd_one = file_data_one.plot_psd(fmin=minimum_frequency, fmax=maximum_frequency, tmin=minimum_time,
-                                                                 tmax=maximum_time, estimate="power", bandwidth=bandwidth,
-                                                                 average=False, show=False, picks=channel_selected)
-            self.statistics_fig_topo_one = file_data_one.plot_psd_topomap(bands=bands, tmin=minimum_time, tmax=maximum_time,
-                                                                          show=False)
+            self.statistics_psd_one = psd.select_epochs(event_table.get_condition_mask(stats_first_variable))
             # Second variable
-            file_data_two = deepcopy(file_data)
-            mask = self.create_mask_from_variable_to_keep(file_data_two, stats_second_variable)
-            file_data_two = file_data_two.drop(mask)
-            self.statistics_fig_psd_two = file_data_two.plot_psd(fmin=minimum_frequency, fmax=maximum_frequency, tmin=minimum_time,
-                                                                 tmax=maximum_time, estimate="power", bandwidth=bandwidth,
-                                                                 average=False, show=False, picks=channel_selected)
-            self.statistics_fig_topo_two = file_data_two.plot_psd_topomap(bands=bands, tmin=minimum_time, tmax=maximum_time,
-                                                                          show=False)
+            self.statistics_psd_two = psd.select_epochs(event_table.get_condition_mask(stats_second_variable))
+            self.statistics_psd_topo_time_points = topo_time_points
+            self.statistics_psd_channel_selected = channel_selected
             self.statistics_psd_computation_finished()
         except Exception as error:
             error_message = "An error has occurred during the computation of the PSD"
@@ -1194,6 +1609,7 @@ class mainModel:
         file_data = self.file_data[self.current_dataset_index]
 
         pool = QThreadPool.globalInstance()
+        from runnables.statistics_runnable import statisticsErspItcRunnable
         self.statistics_ersp_itc_runnable = statisticsErspItcRunnable(file_data, method_tfr, channel_selected, min_frequency,
                                                                       max_frequency, n_cycles, stats_first_variable,
                                                                       stats_second_variable)
@@ -1239,6 +1655,7 @@ class mainModel:
         file_data = self.file_data[self.current_dataset_index]
 
         pool = QThreadPool.globalInstance()
+        from runnables.statistics_runnable import statisticsConnectivityRunnable
         self.statistics_connectivity_runnable = statisticsConnectivityRunnable(file_data, psi, fmin, fmax, connectivity_method,
                                                                                n_jobs, export_path, stats_first_variable,
                                                                                stats_second_variable)
@@ -1299,30 +1716,38 @@ class mainModel:
         file_path_name = self.file_path_name[self.current_dataset_index]
         return file_path_name[-3:] == "fif"
 
-    def create_channels_locations(self):
+    def create_channels_locations(self, index=None):
         """
         Retrieves the location of all channels from the MNE "Epochs" or "Raw" object for an easier use.
         Store the information inside the "self.channels_locations" attribute.
+        :param index: The index of the dataset. If None, the current dataset index will be taken.
+        :type index: int
         """
-        file_data = self.file_data[self.current_dataset_index]
-        channels_locations = self.channels_locations[self.current_dataset_index]
+        if index is None:
+            index = self.current_dataset_index
+        file_data = self.file_data[index]
+        channels_locations = self.channels_locations[index]
 
         channels_info = file_data.info.get("chs")
         for channel in channels_info:
             channels_locations[channel["ch_name"]] = channel["loc"][:3]
 
-        self.channels_locations[self.current_dataset_index] = channels_locations
+        self.channels_locations[index] = channels_locations
 
-    def try_finding_events(self):
+    def try_finding_events(self, index=None):
         """
         Try to find the events if a raw file as been loaded.
+        :param index: The index of the dataset. If None, the current dataset index will be taken.
+        :type index: int
         """
-        file_data = self.file_data[self.current_dataset_index]
+        if index is None:
+            index = self.current_dataset_index
+        file_data = self.file_data[index]
 
         read_ok = False
         try:
             read_events = find_events(file_data)
-            self.read_events[self.current_dataset_index] = read_events
+            self.read_events[index] = read_events
             read_ok = True
         except Exception as e:
             print(e)
@@ -1330,8 +1755,8 @@ class mainModel:
         if not read_ok:
             try:
                 read_events, read_event_ids = events_from_annotations(file_data)
-                self.read_events[self.current_dataset_index] = read_events
-                self.read_event_ids[self.current_dataset_index] = read_event_ids
+                self.read_events[index] = read_events
+                self.read_event_ids[index] = read_event_ids
             except Exception as e:
                 print(e)
                 print(type(e))
@@ -1341,15 +1766,9 @@ class mainModel:
         """
         Create a mask to know which trial to keep and which one to remove for the computation.
         :return mask: Mask of trials to remove. True means remove, and False means keep.
-        :rtype mask: list of boolean
+        :rtype mask: numpy.ndarray
         """
-        mask = [True for _ in range(len(file_data.events))]
-        event_ids = file_data.event_id
-        event_id_to_keep = event_ids[stats_variable]
-        for i, event in enumerate(file_data.events):
-            if event[2] == event_id_to_keep:        # 2 is the event id in the events
-                mask[i] = False
-        return mask
+        return eventTable.from_file_data(file_data).get_drop_mask(stats_variable)
 
     def reset_tmp_attributes(self):
         """
@@ -1360,6 +1779,139 @@ class mainModel:
         self.file_path_name_tmp = None
         self.dataset_name_tmp = None
 
+    def record_dataset_operation(self, index, operation, parameters=None, replace_last=False):
+        """
+        Records an operation that modified the data of a dataset in its history. This increments the version of the
+        dataset, so that the results computed on the older versions of the dataset are not used anymore.
+        :param index: The index of the dataset.
+        :type index: int
+        :param operation: The name of the operation.
+        :type operation: str
+        :param parameters: The parameters of the operation.
+        :type parameters: dict
+        :param replace_last: Replace the last operation recorded, when the operation is performed again on the data
+        before it.
+        :type replace_last: bool
+        """
+        self.dataset_histories[index].record(operation, parameters, replace_last)
+        self.pipelines[index].record(operation, parameters, replace_last)
+        if operation != "ica_decomposition":    # The data before the last ICA is not needed anymore
+            self.ica_states[index] = None
+        if operation in CONST_SIGNAL_OPERATIONS:
+            if self.file_type[index] == "Raw":
+                self.build_decimation_pyramid(index)
+            else:
+                self.decimation_pyramids[index] = None
+                self.decimation_pyramid_runnables[index] = None
+
+    def record_raw_events(self, index, source, stim_channel=None):
+        """
+        Records the events of a raw dataset in its history when they are read, found or modified. The events are not in
+        the data, but the epochs and the results are computed from them, so their version must change with the events.
+        The source of the events is recorded in the pipeline, so that the batch runner uses the same events: the stim
+        channel or the annotations they were found in, or the events themselves when they were read from a file or
+        modified.
+        :param index: The index of the dataset.
+        :type index: int
+        :param source: The source of the events: "stim_channel", "annotations" or "events".
+        :type source: str
+        :param stim_channel: The stimulation channel the events were found on. If None, MNE chose it.
+        :type stim_channel: str
+        """
+        events = self.read_events[index]
+        event_ids = self.read_event_ids[index]
+        parameters = {"source": source,
+                      "events_digest": None if events is None else eventTable(events, event_ids or {}).get_digest()}
+        if source == "stim_channel":
+            parameters["stim_channel"] = stim_channel
+        elif source == "events":
+            parameters["events"] = None if events is None else np.asarray(events).tolist()
+            parameters["event_ids"] = event_ids
+        self.record_dataset_operation(index, "set_events", parameters)
+
+    def record_pipeline_step(self, index, operation, parameters=None):
+        """
+        Records an analysis that does not modify the data of a dataset in its pipeline. If no parameters are given, the
+        parameters kept when the analysis was started are used.
+        :param index: The index of the dataset.
+        :type index: int
+        :param operation: The name of the operation.
+        :type operation: str
+        :param parameters: The parameters of the operation.
+        :type parameters: dict
+        """
+        if parameters is None:
+            parameters = self.pipeline_steps.pop(operation, None)
+        if parameters is not None:
+            self.pipelines[index].record(operation, parameters)
+
+    def get_memoization_key(self, kind, parameters, index=None, version=None, fingerprint=None):
+        """
+        Gets the key of the result of a computation: the dataset, its version and its hash, the kind of computation and
+        its parameters.
+        :param kind: The kind of computation.
+        :type kind: str
+        :param parameters: The parameters of the computation.
+        :type parameters: tuple
+        :param index: The index of the dataset. If None, the current dataset index will be taken.
+        :type index: int
+        :param version: The version of the dataset the computation is performed on, if it is not the current version.
+        :type version: int
+        :param fingerprint: The hash of the dataset at this version.
+        :type fingerprint: str
+        :return: The key of the result.
+        :rtype: tuple
+        """
+        if index is None:
+            index = self.current_dataset_index
+        if version is None:
+            version = self.get_dataset_version(index)
+            fingerprint = self.dataset_histories[index].get_hash()
+        return index, version, fingerprint, kind, parameters
+
+    def get_memoized_result(self, memoization_key):
+        """
+        Gets the result of a computation already performed with the same parameters on the same version of the
+        dataset, from the memory or from the results store next to the dataset.
+        :param memoization_key: The key of the result, see "get_memoization_key".
+        :type memoization_key: tuple
+        :return: The result of the computation, None if it has not been computed yet.
+        :rtype: object
+        """
+        index, version, fingerprint, kind, parameters = memoization_key
+        result = self.dataset_summary_cache.get_result(index, version, kind, parameters)
+        if result is None:
+            result = self.get_results_store(index).get_result(fingerprint, kind, parameters)
+            if result is not None:
+                self.dataset_summary_cache.set_result(index, version, kind, parameters, result)
+        return result
+
+    def remember_memoization_key(self, runnable, memoization_key):
+        """
+        Remembers the key of the result of a runnable, so that its result is stored by "memoize_result" when it is
+        finished. The key is kept per runnable, so that several computations of the same kind can run at the same time.
+        Must be called before the runnable is started, so that the result is stored before the model is notified.
+        :param runnable: The runnable performing the computation.
+        :type runnable: QRunnable
+        :param memoization_key: The key of the result, see "get_memoization_key".
+        :type memoization_key: tuple
+        """
+        self.memoization_keys[runnable] = memoization_key
+        runnable.signals.finished.connect(partial(self.memoize_result, runnable))
+
+    def memoize_result(self, runnable):
+        """
+        Stores the result of a finished runnable, with the key remembered by "remember_memoization_key", in the memory
+        and in the results store next to the dataset.
+        :param runnable: The runnable that performed the computation.
+        :type runnable: QRunnable
+        """
+        memoization_key = self.memoization_keys.pop(runnable, None)
+        if memoization_key is not None:
+            index, version, fingerprint, kind, parameters = memoization_key
+            self.dataset_summary_cache.set_result(index, version, kind, parameters, runnable)
+            self.get_results_store(index).store_result(fingerprint, kind, parameters, runnable.get_results())
+
     """
     Getters
     """
@@ -1375,13 +1927,17 @@ class mainModel:
                     self.get_reference(), self.get_channels_locations_status(), self.get_ica(), self.get_dataset_size()]
         return all_info
 
-    def get_dataset_name(self):
+    def get_dataset_name(self, index=None):
         """
         Gets the dataset name of the dataset.
+        :param index: The index of the dataset. If None, the current dataset index will be taken.
+        :type index: int
         :return: The dataset name
         :rtype: str
         """
-        dataset_name = self.dataset_name[self.current_dataset_index]
+        if index is None:
+            index = self.current_dataset_index
+        dataset_name = self.dataset_name[index]
         return dataset_name
 
     def get_all_dataset_names(self):
@@ -1392,6 +1948,32 @@ class mainModel:
         """
         return self.dataset_name
 
+    def get_bulk_open_headers(self):
+        """
+        Gets the headers of the files of the directory opened at once.
+        :return: The header of each file.
+        :rtype: list of dict
+        """
+        return self.bulk_open_headers
+
+    def get_bulk_open_dataset_index(self, path_to_file):
+        """
+        Gets the index of the dataset of a file of the directory opened at once.
+        :param path_to_file: Path to the file
+        :type path_to_file: str
+        :return: The index of the dataset. None if the file could not be opened or if the dataset has been removed.
+        :rtype: int
+        """
+        return self.bulk_open_indexes.get(path_to_file)
+
+    def is_bulk_open_running(self):
+        """
+        Checks if files of the directory opened at once are still being read.
+        :return: True if the reading of some files is not finished.
+        :rtype: bool
+        """
+        return len(self.bulk_open_runnables) > 0
+
     def get_file_path_name(self):
         """
         Gets the file path of the dataset.
@@ -1600,6 +2182,15 @@ class mainModel:
         ica_decomposition = self.ica_decomposition[self.current_dataset_index]
         return ica_decomposition
 
+    def get_ica_fit(self):
+        """
+        Gets the ICA decomposition computed, waiting for the components to remove to be chosen.
+        :return: The fitted ICA, the data that was decomposed and the components removed the last time the ICA was
+        applied on this data.
+        :rtype: (MNE.preprocessing.ICA, MNE.Epochs/MNE.Raw, list of int)
+        """
+        return self.ica_fit["ica"], self.ica_fit["file_data"], self.ica_fit["exclude"]
+
     def get_all_ica(self):
         """
         Gets the status of the ICA decomposition of all the datasets.
@@ -1614,11 +2205,7 @@ class mainModel:
         :return: The size of the dataset.
         :rtype: float
         """
-        file_path_name = self.file_path_name[self.current_dataset_index]
-        try:
-            return round(getsize(file_path_name[:-3] + "fdt") / (1024 ** 2), 3)
-        except:
-            return round(getsize(file_path_name) / (1024 ** 2), 3)
+        return round(get_file_size(self.file_path_name[self.current_dataset_index]) / (1024 ** 2), 3)
 
     def get_all_channels_names(self):
         """
@@ -1646,6 +2233,65 @@ class mainModel:
         """
         return self.file_data
 
+    def get_dataset_version(self, index=None):
+        """
+        Gets the version of the dataset, incremented each time its data is modified.
+        :param index: The index of the dataset. If None, the current dataset index will be taken.
+        :type index: int
+        :return: The version of the dataset.
+        :rtype: int
+        """
+        if index is None:
+            index = self.current_dataset_index
+        return self.dataset_histories[index].get_version()
+
+    def get_results_store(self, index=None):
+        """
+        Gets the results store of the directory containing the dataset.
+        :param index: The index of the dataset. If None, the current dataset index will be taken.
+        :type index: int
+        :return: The results store.
+        :rtype: resultsStore
+        """
+        if index is None:
+            index = self.current_dataset_index
+        directory = join(dirname(self.file_path_name[index]), CONST_RESULTS_DIRECTORY)
+        if directory not in self.results_stores:
+            self.results_stores[directory] = resultsStore(directory)
+        return self.results_stores[directory]
+
+    def get_decimation_pyramid(self, index=None):
+        """
+        Gets the decimation pyramid of the raw dataset, used by the data browser.
+        :param index: The index of the dataset. If None, the current dataset index will be taken.
+        :type index: int
+        :return: The decimation pyramid. None if it is not built yet or if the dataset is not raw.
+        :rtype: decimationPyramid
+        """
+        if index is None:
+            index = self.current_dataset_index
+        return self.decimation_pyramids[index]
+
+    def get_dataset_history(self, index=None):
+        """
+        Gets the processing history of the dataset.
+        :param index: The index of the dataset. If None, the current dataset index will be taken.
+        :type index: int
+        :return: The history of the dataset.
+        :rtype: datasetHistory
+        """
+        if index is None:
+            index = self.current_dataset_index
+        return self.dataset_histories[index]
+
+    def get_dataset_summary_cache(self):
+        """
+        Gets the cache of the summaries (evoked, PSD, TFR) computed on the datasets.
+        :return: The cache of the summaries.
+        :rtype: datasetSummaryCache
+        """
+        return self.dataset_summary_cache
+
     def get_read_events(self):
         """
         Gets the read events obtained after the epochs' importation.
@@ -1741,23 +2387,21 @@ class mainModel:
         """
         return self.source_estimation_runnable.get_source_estimation_data()
 
-    def get_psd_fig(self):
+    def get_psd(self):
         """
-        Get the power spectral density's figure
-        :return: The figure of the actual power spectral density's data computed
-        :rtype: matplotlib.Figure
+        Get the power spectral density computed.
+        :return: The power spectral density of each epoch and each channel.
+        :rtype: powerSpectralDensity
         """
-        return self.fig_topo
-        # return self.power_spectral_density_runnable.get_psd_fig()
+        return self.psd
 
-    def get_psd_topo_fig(self):
+    def get_psd_topo_time_points(self):
         """
-        Get the power spectral density's figure fo the topographies
-        :return: The figure of the topographies of the actual power spectral density's data computed
-        :rtype: matplotlib.Figure
+        Get the time points for the topomaps of the power spectral density.
+        :return: The time points for the topomaps.
+        :rtype: list of float
         """
-        return self.fig_psd
-        # return self.power_spectral_density_runnable.get_topo_fig()
+        return self.psd_topo_time_points
 
     def get_tfr_channel_selected(self):
         """
@@ -1831,6 +2475,38 @@ class mainModel:
         """
         return self.classify_runnable.get_classifier()
 
+    def get_batch_inference_probabilities(self):
+        """
+        Gets the probabilities of the classes obtained by the batch inference performed on the dataset.
+        :return: The probabilities, of shape (pipelines, epochs, classes).
+        :rtype: numpy.ndarray
+        """
+        return self.batch_inference_runnable.get_probabilities()
+
+    def get_batch_inference_pipelines(self):
+        """
+        Gets the names of the pipelines used by the batch inference, in the order of the probabilities.
+        :return: The names of the pipelines.
+        :rtype: list of str
+        """
+        return self.batch_inference_runnable.get_pipelines_used()
+
+    def get_batch_inference_throughput(self):
+        """
+        Gets the number of epochs per second predicted by the batch inference.
+        :return: The throughput.
+        :rtype: float
+        """
+        return self.batch_inference_runnable.get_throughput()
+
+    def get_batch_inference_export_path(self):
+        """
+        Gets the path of the CSV file where the probabilities of the last batch inference are saved.
+        :return: The path of the file. None if the probabilities are not saved.
+        :rtype: str
+        """
+        return self.batch_inference_runnable.get_export_path()
+
     # Statistics SNR
     def get_statistics_first_SNRs(self):
         """
@@ -1865,37 +2541,37 @@ class mainModel:
         return self.statistics_snr_runnable.get_SNR_methods()
 
     # Statistics PSD
-    def get_statistics_psd_fig_one(self):
+    def get_statistics_psd_one(self):
         """
-        Get the power spectral density's figure of the first independent variable
-        :return: The figure of the actual power spectral density's data computed
-        :rtype: matplotlib.Figure
+        Get the power spectral density of the first independent variable
+        :return: The power spectral density of each epoch of the first independent variable
+        :rtype: powerSpectralDensity
         """
-        return self.statistics_fig_psd_one
+        return self.statistics_psd_one
 
-    def get_statistics_psd_topo_fig_one(self):
+    def get_statistics_psd_two(self):
         """
-        Get the power spectral density's figure of the topographies of the first independent variable
-        :return: The figure of the topographies of the actual power spectral density's data computed
-        :rtype: matplotlib.Figure
+        Get the power spectral density of the second independent variable
+        :return: The power spectral density of each epoch of the second independent variable
+        :rtype: powerSpectralDensity
         """
-        return self.statistics_fig_topo_one
+        return self.statistics_psd_two
 
-    def get_statistics_psd_fig_two(self):
+    def get_statistics_psd_topo_time_points(self):
         """
-        Get the power spectral density's figure of the second independent variable
-        :return: The figure of the actual power spectral density's data computed
-        :rtype: matplotlib.Figure
+        Get the time points for the topomaps of the power spectral density statistics.
+        :return: The time points for the topomaps.
+        :rtype: list of float
         """
-        return self.statistics_fig_psd_two
+        return self.statistics_psd_topo_time_points
 
-    def get_statistics_psd_topo_fig_two(self):
+    def get_statistics_psd_channel_selected(self):
         """
-        Get the power spectral density's figure of the topographies of the second independent variable
-        :return: The figure of the topographies of the actual power spectral density's data computed
-        :rtype: matplotlib.Figure
+        Get the channel selected for the power spectral density statistics.
+        :return: The channel selected.
+        :rtype: str
         """
-        return self.statistics_fig_topo_two
+        return self.statistics_psd_channel_selected
 
     # Statistics ERSP ITC
     def get_statistics_ersp_itc_channel_selected(self):
@@ -1995,8 +2671,11 @@ class mainModel:
         file_type = self.file_type[index]
         if file_type == "Raw":
             self.read_events[index] = np.copy(event_values)
+            self.record_raw_events(index, "events")
         elif file_type == "Epochs":
             self.file_data[index].events = np.copy(event_values)
+            events_digest = eventTable(event_values, self.file_data[index].event_id).get_digest()
+            self.record_dataset_operation(index, "set_event_values", {"events_digest": events_digest})
 
     def set_event_ids(self, event_ids):
         """
@@ -2007,8 +2686,10 @@ class mainModel:
         file_type = self.file_type[self.current_dataset_index]
         if file_type == "Raw":
             self.read_event_ids[self.current_dataset_index] = copy(event_ids)
+            self.record_raw_events(self.current_dataset_index, "events")
         elif file_type == "Epochs":
             self.file_data[self.current_dataset_index].event_id = copy(event_ids)
+            self.record_dataset_operation(self.current_dataset_index, "set_event_ids", {"event_ids": event_ids})
 
     def set_channel_locations(self, channel_locations, channel_names):
         """
@@ -2027,6 +2708,8 @@ class mainModel:
             channel["loc"] = np.array([channel_location[0], channel_location[1], channel_location[2], 0.0, 0.0, 0.0,
                                        np.NAN, np.NAN, np.NAN, np.NAN, np.NAN, np.NAN])     # MNE Format
         self.channels_locations[self.current_dataset_index] = copy(new_channels_locations)
+        self.record_dataset_operation(self.current_dataset_index, "set_channel_locations",
+                                      {"channel_locations": channel_locations})
 
     def set_channel_names(self, channel_names):
         """
@@ -2036,6 +2719,7 @@ class mainModel:
         """
         file_data = self.file_data[self.current_dataset_index]
         self.file_data[self.current_dataset_index] = file_data.pick_channels(channel_names)
+        self.record_dataset_operation(self.current_dataset_index, "set_channel_names", {"channel_names": channel_names})
 
     def set_reference(self, channels_selected):
         """
@@ -9,8 +9,11 @@ from PyQt5.QtWidgets import QMainWindow, QWidget, QGridLayout, QLabel, QFileDial
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
+from mne import pick_info, pick_types
 from mne.viz import plot_sensors, set_3d_backend, set_browser_backend
 
+from utils.view.topomap_engine import topomapEngine
+
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
 __credits__ = ["Lemahieu Antoine"]
@@ -194,10 +197,14 @@ class mainView(QMainWindow):
         :type mode: str
         """
         evoked = file_data.average()
+        picks = pick_types(evoked.info, eeg=True, exclude="bads")     # The good EEG channels, as for the PSD
+        data = evoked.data[picks][:, evoked.time_as_index(time_points)] * 1e6      # V to µV
+        titles = [str(time_point) + " s" for time_point in time_points]
+        topomap_engine = topomapEngine(pick_info(evoked.info, picks))
         if mode == "separated":
-            evoked.plot_topomap(times=time_points)
+            topomap_engine.plot_topomaps(data, titles).show()
         elif mode == "animated":
-            evoked.animate_topomap(times=time_points, frame_rate=2)
+            topomap_engine.animate_topomaps(data, titles, frame_rate=2).show()
 
     @staticmethod
     def plot_erp_image(file_data, channel_selected):
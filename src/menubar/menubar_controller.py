@@ -90,6 +90,9 @@ class menubarController(menubarListener):
     def open_set_file_clicked(self, path_to_file):
         self.main_listener.open_set_file_clicked(path_to_file)
 
+    def open_directory_clicked(self, directory):
+        self.main_listener.open_directory_clicked(directory)
+
     def read_events_file_clicked(self, path_to_file):
         self.main_listener.read_events_file_clicked(path_to_file)
 
@@ -105,6 +108,9 @@ class menubarController(menubarListener):
     def export_events_to_file_clicked(self):
         self.main_listener.export_events_to_file_clicked()
 
+    def export_pipeline_clicked(self, path_to_file):
+        self.main_listener.export_pipeline_clicked(path_to_file)
+
     def save_file_clicked(self):
         self.main_listener.save_file_clicked()
 
@@ -203,6 +209,12 @@ class menubarController(menubarListener):
     def classify_clicked(self):
         self.main_listener.classify_clicked()
 
+    def classify_directory_clicked(self, directory):
+        self.main_listener.classify_directory_clicked(directory)
+
+    def batch_inference_clicked(self, path_to_file):
+        self.main_listener.batch_inference_clicked(path_to_file)
+
     # Statistics menu
     def statistics_snr_clicked(self):
         self.main_listener.statistics_snr_clicked()
@@ -240,6 +252,9 @@ class menubarController(menubarListener):
     def about_clicked(self):
         print("About")
 
+    def performance_clicked(self):
+        self.main_listener.performance_clicked()
+
     """
     Setters
     """
@@ -37,6 +37,10 @@ class menubarListener(ABC):
     def open_set_file_clicked(self, path_to_file):
         pass
 
+    @abstractmethod
+    def open_directory_clicked(self, directory):
+        pass
+
     # Events
     @abstractmethod
     def read_events_file_clicked(self, path_to_file):
@@ -59,6 +63,10 @@ class menubarListener(ABC):
     def export_events_to_file_clicked(self):
         pass
 
+    @abstractmethod
+    def export_pipeline_clicked(self, path_to_file):
+        pass
+
     # Save
     @abstractmethod
     def save_file_clicked(self):
@@ -201,6 +209,14 @@ class menubarListener(ABC):
     def classify_clicked(self):
         pass
 
+    @abstractmethod
+    def classify_directory_clicked(self, directory):
+        pass
+
+    @abstractmethod
+    def batch_inference_clicked(self, path_to_file):
+        pass
+
     """
     Statistics menu
     """
@@ -256,3 +272,7 @@ class menubarListener(ABC):
     @abstractmethod
     def about_clicked(self):
         pass
+
+    @abstractmethod
+    def performance_clicked(self):
+        pass
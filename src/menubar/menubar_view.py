@@ -7,6 +7,8 @@ Main controller
 
 from PyQt5.QtWidgets import QMenuBar, QMenu, QFileDialog, QAction
 
+from utils.view.dataset_file_dialog import datasetFileDialog
+
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
 __credits__ = ["Lemahieu Antoine"]
@@ -120,6 +122,10 @@ class menubarView(QMenuBar):
         open_set_file_action = QAction("SET File", self)
         open_set_file_action.triggered.connect(self.open_set_file_trigger)
         self.open_menu.addAction(open_set_file_action)
+        self.open_menu.addSeparator()
+        open_directory_action = QAction("Directory of datasets (BIDS)", self)
+        open_directory_action.triggered.connect(self.open_directory_trigger)
+        self.open_menu.addAction(open_directory_action)
 
     def create_events_menu(self):
         read_events_file_action = QAction("Read events from file (.fif/.txt)", self)
@@ -140,6 +146,10 @@ class menubarView(QMenuBar):
         export_events_to_file_action = QAction("Export events to TXT file", self)
         export_events_to_file_action.triggered.connect(self.export_events_to_file_trigger)
         self.export_menu.addAction(export_events_to_file_action)
+        self.export_menu.addSeparator()
+        export_pipeline_action = QAction("Export processing pipeline to JSON file", self)
+        export_pipeline_action.triggered.connect(self.export_pipeline_trigger)
+        self.export_menu.addAction(export_pipeline_action)
 
     def create_file_menu(self):
         # Save
@@ -204,11 +214,10 @@ class menubarView(QMenuBar):
         re_referencing_action.triggered.connect(self.re_referencing_trigger)
         self.tools_menu.addAction(re_referencing_action)
         self.tools_menu.addSeparator()
-        # inspect_reject_data_action = QAction("Inspect/Reject data by eyes", self)
-        # inspect_reject_data_action.triggered.connect(self.inspect_reject_data_trigger)
-        # inspect_reject_data_action.setEnabled(False)
-        # self.tools_menu.addAction(inspect_reject_data_action)
-        # self.tools_menu.addSeparator()
+        inspect_reject_data_action = QAction("Reject epochs with artifacts", self)
+        inspect_reject_data_action.triggered.connect(self.inspect_reject_data_trigger)
+        self.tools_menu.addAction(inspect_reject_data_action)
+        self.tools_menu.addSeparator()
         decompose_ICA_action = QAction("Decompose data with ICA", self)
         decompose_ICA_action.triggered.connect(self.ica_decomposition_trigger)
         self.tools_menu.addAction(decompose_ICA_action)
@@ -268,6 +277,12 @@ class menubarView(QMenuBar):
         classify_action = QAction("Classify", self)
         classify_action.triggered.connect(self.classify_trigger)
         self.classification_menu.addAction(classify_action)
+        classify_directory_action = QAction("Classify a directory of subjects (out-of-core)", self)
+        classify_directory_action.triggered.connect(self.classify_directory_trigger)
+        self.classification_menu.addAction(classify_directory_action)
+        batch_inference_action = QAction("Apply the fitted pipelines (batch inference)", self)
+        batch_inference_action.triggered.connect(self.batch_inference_trigger)
+        self.classification_menu.addAction(batch_inference_action)
 
     def create_statistics_menu(self):
         statistics_snr_action = QAction("Signal-to-Noise Ratio", self)
@@ -308,6 +323,10 @@ class menubarView(QMenuBar):
         about_action.triggered.connect(self.about_trigger)
         about_action.setEnabled(False)
         self.help_menu.addAction(about_action)
+        self.help_menu.addSeparator()
+        performance_action = QAction("Performance", self)
+        performance_action.triggered.connect(self.performance_trigger)
+        self.help_menu.addAction(performance_action)
 
     """
     Menu Manipulation
@@ -513,16 +532,20 @@ class menubarView(QMenuBar):
     File menu triggers
     """
     def open_fif_file_trigger(self):
-        path_to_file = QFileDialog().getOpenFileName(self, "Open file", "*.fif")
-        self.menubar_listener.open_fif_file_clicked(path_to_file[0])
+        path_to_file = datasetFileDialog.get_open_file_name(self, "Open file", "FIF files (*.fif *.fif.gz)")
+        self.menubar_listener.open_fif_file_clicked(path_to_file)
 
     def open_cnt_file_trigger(self):
-        path_to_file = QFileDialog().getOpenFileName(self, "Open file", "*.cnt")
-        self.menubar_listener.open_cnt_file_clicked(path_to_file[0])
+        path_to_file = datasetFileDialog.get_open_file_name(self, "Open file", "CNT files (*.cnt)")
+        self.menubar_listener.open_cnt_file_clicked(path_to_file)
 
     def open_set_file_trigger(self):
-        path_to_file = QFileDialog().getOpenFileName(self, "Open file", "*.set")
-        self.menubar_listener.open_set_file_clicked(path_to_file[0])
+        path_to_file = datasetFileDialog.get_open_file_name(self, "Open file", "SET files (*.set)")
+        self.menubar_listener.open_set_file_clicked(path_to_file)
+
+    def open_directory_trigger(self):
+        directory = QFileDialog().getExistingDirectory(self, "Open directory")
+        self.menubar_listener.open_directory_clicked(directory)
 
     def read_events_file_trigger(self):
         path_to_file = QFileDialog().getOpenFileName(self, "Open file")
@@ -542,6 +565,10 @@ class menubarView(QMenuBar):
     def export_events_to_file_trigger(self):
         self.menubar_listener.export_events_to_file_clicked()
 
+    def export_pipeline_trigger(self):
+        path_to_file = QFileDialog().getSaveFileName(self, "Export processing pipeline to JSON file")
+        self.menubar_listener.export_pipeline_clicked(path_to_file[0])
+
     def save_file_trigger(self):
         self.menubar_listener.save_file_clicked()
 
@@ -674,6 +701,14 @@ class menubarView(QMenuBar):
     def classify_trigger(self):
         self.menubar_listener.classify_clicked()
 
+    def classify_directory_trigger(self):
+        directory = QFileDialog().getExistingDirectory(self, "Open directory of epoched subjects")
+        self.menubar_listener.classify_directory_clicked(directory)
+
+    def batch_inference_trigger(self):
+        path_to_file = QFileDialog().getSaveFileName(self, "Export the probabilities of the classes to a CSV file")
+        self.menubar_listener.batch_inference_clicked(path_to_file[0])
+
     """
     Study menu trigger
     """
@@ -710,6 +745,9 @@ class menubarView(QMenuBar):
     def about_trigger(self):
         self.menubar_listener.about_clicked()
 
+    def performance_trigger(self):
+        self.menubar_listener.performance_clicked()
+
     """
     Setters
     """
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Data browser view
+"""
+
+import numpy as np
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QGridLayout, QPushButton, QScrollBar, QLabel
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_DEFAULT_DURATION = 10.0       # Seconds displayed when the browser is opened
+
+
+class dataBrowserView(QWidget):
+    def __init__(self, file_data, decimation_pyramid, n_channels=10):
+        """
+        Window browsing the channels of a long raw recording.
+        Each redraw only uses about one point per pixel and per channel: the minimum and maximum of the blocks of the
+        decimation pyramid when the window is wide, and the samples themselves when the window is narrow.
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Raw
+        :param decimation_pyramid: The decimation pyramid of the recording.
+        :type decimation_pyramid: decimationPyramid
+        :param n_channels: The number of channels displayed at once.
+        :type n_channels: int
+        """
+        super().__init__()
+        self.file_data = file_data
+        self.decimation_pyramid = decimation_pyramid
+        self.channels_names = file_data.ch_names
+        self.n_channels = min(n_channels, len(self.channels_names))
+        self.sampling_frequency = decimation_pyramid.get_sampling_frequency()
+        self.number_of_samples = decimation_pyramid.get_number_of_samples()
+        self.window_samples = min(int(CONST_DEFAULT_DURATION * self.sampling_frequency), self.number_of_samples)
+
+        self.setWindowTitle("Channel data")
+
+        self.grid_layout = QGridLayout()
+        self.setLayout(self.grid_layout)
+
+        self.figure = Figure()
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.axes = self.figure.add_subplot(111)
+        self.lines = [self.axes.plot([], [], color="black", linewidth=0.5)[0] for _ in range(self.n_channels)]
+        self.axes.set_xlabel("Time (s)")
+        self.axes.set_ylim(-1, self.n_channels)
+        self.axes.invert_yaxis()
+
+        self.time_scroll_bar = QScrollBar(Qt.Orientation.Horizontal, self)
+        self.time_scroll_bar.valueChanged.connect(self.update_plot)
+        self.channels_scroll_bar = QScrollBar(Qt.Orientation.Vertical, self)
+        self.channels_scroll_bar.setMaximum(len(self.channels_names) - self.n_channels)
+        self.channels_scroll_bar.setPageStep(self.n_channels)
+        self.channels_scroll_bar.valueChanged.connect(self.update_plot)
+        self.zoom_in_button = QPushButton("&Zoom in", self)
+        self.zoom_in_button.clicked.connect(self.zoom_in_trigger)
+        self.zoom_out_button = QPushButton("Zoom &out", self)
+        self.zoom_out_button.clicked.connect(self.zoom_out_trigger)
+        self.level_label = QLabel(self)
+
+        self.grid_layout.addWidget(self.canvas, 0, 0, 1, 3)
+        self.grid_layout.addWidget(self.channels_scroll_bar, 0, 3)
+        self.grid_layout.addWidget(self.time_scroll_bar, 1, 0, 1, 3)
+        self.grid_layout.addWidget(self.zoom_out_button, 2, 0)
+        self.grid_layout.addWidget(self.level_label, 2, 1)
+        self.grid_layout.addWidget(self.zoom_in_button, 2, 2)
+
+        self.update_time_scroll_bar()
+
+    """
+    Plots
+    """
+    def update_plot(self):
+        """
+        Redraw the channels displayed on the window of the recording displayed.
+        """
+        first_sample = self.time_scroll_bar.value()
+        last_sample = min(first_sample + self.window_samples, self.number_of_samples)
+        first_channel = self.channels_scroll_bar.value()
+        picks = list(range(first_channel, first_channel + self.n_channels))
+        scalings = self.decimation_pyramid.get_scalings()[picks]
+
+        level = self.decimation_pyramid.choose_level(first_sample, last_sample, self.canvas.width())
+        if level is None:
+            data, times = self.file_data.get_data(picks=picks, start=first_sample, stop=last_sample, return_times=True)
+            self.level_label.setText("Samples")
+        else:
+            block_times, minimums, maximums = self.decimation_pyramid.get_envelope(level, first_sample, last_sample,
+                                                                                  picks)
+            # Vertical segment from the minimum to the maximum of each block, drawn as a single line.
+            times = np.repeat(block_times, 2)
+            data = np.stack((minimums, maximums), axis=2).reshape(len(picks), -1)
+            self.level_label.setText("Level " + str(level + 1))
+
+        data = data / (2 * scalings[:, np.newaxis])
+        for i, line in enumerate(self.lines):
+            line.set_data(times, i - data[i])
+        self.axes.set_xlim(first_sample / self.sampling_frequency, last_sample / self.sampling_frequency)
+        self.axes.set_yticks(range(self.n_channels))
+        self.axes.set_yticklabels([self.channels_names[pick] for pick in picks])
+        self.canvas.draw_idle()
+
+    def update_time_scroll_bar(self):
+        """
+        Update the range of the time scroll bar after a zoom, then redraw the channels.
+        """
+        self.time_scroll_bar.setMaximum(max(self.number_of_samples - self.window_samples, 0))
+        self.time_scroll_bar.setPageStep(self.window_samples)
+        self.time_scroll_bar.setSingleStep(max(self.window_samples // 10, 1))
+        self.update_plot()
+
+    def resizeEvent(self, event):
+        """
+        Redraw the channels with the level corresponding to the new width of the window.
+        :param event: The resize event.
+        :type event: QResizeEvent
+        """
+        super().resizeEvent(event)
+        self.update_plot()
+
+    """
+    Triggers
+    """
+    def zoom_in_trigger(self):
+        """
+        Display a window of the recording twice shorter.
+        """
+        self.window_samples = max(self.window_samples // 2, 2)
+        self.update_time_scroll_bar()
+
+    def zoom_out_trigger(self):
+        """
+        Display a window of the recording twice longer.
+        """
+        self.window_samples = min(self.window_samples * 2, self.number_of_samples)
+        self.update_time_scroll_bar()
@@ -57,15 +57,17 @@ class powerSpectralDensityController(powerSpectralDensityListener):
                                                          topo_time_points)
         self.power_spectral_density_view.close()
 
-    def plot_psd(self, psd_fig, topo_fig):
+    def plot_psd(self, psd, topo_time_points, channels_selected=None):
         """
         Send the information to the view for plotting the power spectral density computed.
-        :param psd_fig: The figure of the actual power spectral density's data computed
-        :type psd_fig: matplotlib.Figure
-        :param topo_fig: The figure of the topographies of the actual power spectral density's data computed
-        :type topo_fig: matplotlib.Figure
+        :param psd: The power spectral density computed.
+        :type psd: powerSpectralDensity
+        :param topo_time_points: The time points for the topomaps.
+        :type topo_time_points: list of float
+        :param channels_selected: Channels plotted. If None, all the channels are plotted.
+        :type channels_selected: str/list of str
         """
-        self.power_spectral_density_view.plot_psd(psd_fig, topo_fig)
+        self.power_spectral_density_view.plot_psd(psd, topo_time_points, channels_selected)
 
     """
     Setters
@@ -9,6 +9,7 @@ from PyQt5.QtGui import QDoubleValidator
 from PyQt5.QtWidgets import QWidget, QGridLayout, QLineEdit, QPushButton, QLabel
 
 from utils.view.error_window import errorWindow
+from utils.view.psd_figures import create_psd_figure, create_topographies_figure
 
 
 __author__ = "Lemahieu Antoine"
@@ -71,16 +72,20 @@ class powerSpectralDensityView(QWidget):
         self.grid_layout.addWidget(self.confirm, 6, 1)
 
     @staticmethod
-    def plot_psd(psd_fig, topo_fig):
+    def plot_psd(psd, topo_time_points, channels_selected=None):
         """
-        Plot the power spectral density.
-        :param psd_fig: The figure of the actual power spectral density's data computed
-        :type psd_fig: matplotlib.Figure
-        :param topo_fig: The figure of the topographies of the actual power spectral density's data computed
-        :type topo_fig: matplotlib.Figure
+        Plot the power spectral density. The figures are only created here, from the spectra already computed.
+        :param psd: The power spectral density computed.
+        :type psd: powerSpectralDensity
+        :param topo_time_points: The time points for the topomaps.
+        :type topo_time_points: list of float
+        :param channels_selected: Channels plotted. If None, all the channels are plotted.
+        :type channels_selected: str/list of str
         """
         try:
+            topo_fig = create_topographies_figure(psd, topo_time_points)
             topo_fig.show()
+            psd_fig = create_psd_figure(psd, channels_selected)
             psd_fig.show()
         except Exception as error:
             error_message = "An error has occurred during the computation of the PSD"
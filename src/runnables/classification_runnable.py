@@ -5,13 +5,16 @@
 Classification runnable
 """
 
-from copy import deepcopy
+from os.path import join
 
 from PyQt5.QtCore import QRunnable, pyqtSignal, QObject
 
 from classification.applePy.classifier import ApplePyClassifier
+from classification.applePy.model_store import ModelStore
 
 from utils.view.error_window import errorWindow
+from utils.model.performance_profiler import profiled, record_step_error
+from utils.model.epochs_extraction import select_epochs
 
 
 __author__ = "Lemahieu Antoine"
@@ -61,7 +64,7 @@ class classifyRunnable(QRunnable):
         self.signals = classifyWorkerSignals()
 
         self.classifier = None
-        self.file_data = deepcopy(file_data)
+        self.file_data = file_data
         self.directory_path = directory_path
         self.pipeline_selected = pipeline_selected
         self.feature_selection = feature_selection
@@ -70,14 +73,18 @@ class classifyRunnable(QRunnable):
         self.cross_val_number = cross_val_number
         self.trials_selected = trials_selected
 
+    @profiled
     def run(self):
         """
         Create the classifier and launch the computation of the classification.
+        The fitted pipelines are kept in a model store next to the dataset, so a pipeline already fitted on the same data
+        with the same hyperparameters is reloaded instead of being fitted again.
         Notifies the main model that the computation is finished.
         """
         try:
-            self.transform_file_data_with_trials_selected()
-            self.classifier = ApplePyClassifier(used_pipelines=self.pipeline_selected)
+            self.file_data = select_epochs(self.file_data, self.trials_selected)
+            model_store = ModelStore(join(self.directory_path, "applepy_models"))
+            self.classifier = ApplePyClassifier(used_pipelines=self.pipeline_selected, model_store=model_store)
             self.classifier.classify(self.file_data, dataset_path=self.directory_path, classify_test=False, test_dataset_size=5,
                                      independent_features_selection=self.feature_selection, channels_to_select=self.number_of_channels_to_select,
                                      tune_hypers=self.hyper_tuning, use_groups=False, cv_value=self.cross_val_number)
@@ -86,17 +93,60 @@ class classifyRunnable(QRunnable):
             error_message = "An error as occurred during the computation of the classification."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
-    def transform_file_data_with_trials_selected(self):
+    def get_classifier(self):
+        """
+        Get the classifier/pipelines on which the classification is performed.
+        :return: The classifiers
+        :rtype: ApplePyClassifier
+        """
+        return self.classifier
+
+
+class classifyDirectoryRunnable(QRunnable):
+    def __init__(self, directory, pipeline_selected, cross_val_number, event_names):
         """
-        Create a mask to know which trial to keep and which one to remove for the computation.
-        Apply this mask on the data to keep only the trials/epochs selected by the user.
+        Runnable for the classification of the epoched subjects of a directory, kept on disk.
+        Each subject is read and saved in memory-mapped files, then the pipelines are cross-validated between the
+        subjects, with only one subject in memory at a time.
+        :param directory: Path to the directory of the epoched subjects.
+        :type directory: str
+        :param pipeline_selected: The pipeline(s) used for the classification.
+        :type pipeline_selected: list of str
+        :param cross_val_number: Number of cross-validation fold, the subjects are split between them.
+        :type cross_val_number: int
+        :param event_names: The events classified.
+        :type event_names: list of str
         """
-        mask = [True for _ in range(len(self.file_data.events))]
-        for i in self.trials_selected:
-            mask[i] = False
-        self.file_data.drop(mask)
+        super().__init__()
+        self.signals = classifyWorkerSignals()
+
+        self.classifier = None
+        self.directory = directory
+        self.pipeline_selected = pipeline_selected
+        self.cross_val_number = cross_val_number
+        self.event_names = event_names
+
+    @profiled
+    def run(self):
+        """
+        Create the classifier, save the subjects on disk and launch the out-of-core classification.
+        Notifies the main model that the computation is finished.
+        """
+        try:
+            self.classifier = ApplePyClassifier(used_pipelines=self.pipeline_selected)
+            dataset = self.classifier.prepare_memmap_dataset(self.directory, join(self.directory, "applepy_subjects"),
+                                                             tmin=None, tmax=None, event_ids=self.event_names)
+            self.classifier.classify_out_of_core(dataset, dataset_path=self.directory, cv_value=self.cross_val_number)
+            self.signals.finished.emit()
+        except Exception as error:
+            error_message = "An error as occurred during the computation of the classification of the subjects."
+            error_window = errorWindow(error_message, detailed_message=str(error))
+            error_window.show()
+            record_step_error()
+            self.signals.error.emit()
 
     def get_classifier(self):
         """
@@ -105,3 +155,114 @@ class classifyRunnable(QRunnable):
         :rtype: ApplePyClassifier
         """
         return self.classifier
+
+
+class batchInferenceWorkerSignals(QObject):
+    """
+    Contain the signals used by the batch inference runnable.
+    """
+    finished = pyqtSignal()
+    error = pyqtSignal()
+
+
+class batchInferenceRunnable(QRunnable):
+    def __init__(self, file_data, model_directory, pipeline_names=None, batch_size=64, export_path=None):
+        """
+        Runnable for the computation of the probabilities of the classes of a dataset with pipelines already fitted by a
+        previous classification.
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Epochs
+        :param model_directory: Path to the directory of the model store containing the fitted pipelines.
+        :type model_directory: str
+        :param pipeline_names: The pipeline(s) used for the inference. If None, all the fitted pipelines are used.
+        :type pipeline_names: list of str
+        :param batch_size: Number of epochs given to the pipelines at once.
+        :type batch_size: int
+        :param export_path: Path of the CSV file where the probabilities are saved. If None, they are not saved.
+        :type export_path: str
+        """
+        super().__init__()
+        self.signals = batchInferenceWorkerSignals()
+
+        self.file_data = file_data
+        self.model_directory = model_directory
+        self.pipeline_names = pipeline_names
+        self.batch_size = batch_size
+        self.export_path = export_path
+
+        self.probabilities = None
+        self.pipelines_used = None
+        self.throughput = None
+
+    @profiled
+    def run(self):
+        """
+        Reload the fitted pipelines and stream the epochs through them in batches, then save the probabilities.
+        Notifies the main model that the computation is finished.
+        """
+        try:
+            classifier = ApplePyClassifier()
+            classifier.load_fitted_pipelines(self.model_directory)
+            self.probabilities, self.pipelines_used, self.throughput = classifier.predict_proba_batches(
+                self.file_data, batch_size=self.batch_size, pipeline_names=self.pipeline_names)
+            if self.export_path is not None:
+                self.export_probabilities(classifier.event_names)
+            self.signals.finished.emit()
+        except Exception as error:
+            error_message = "An error as occurred during the computation of the batch inference."
+            error_window = errorWindow(error_message, detailed_message=str(error))
+            error_window.show()
+            record_step_error()
+            self.signals.error.emit()
+
+    def export_probabilities(self, class_names):
+        """
+        Save the probabilities in a CSV file, with one line per epoch and its event, and one column per pipeline and
+        class.
+        :param class_names: The names of the classes, in the order of the probabilities. If None, their indexes are used.
+        :type class_names: list of str
+        """
+        number_of_pipelines, number_of_epochs, number_of_classes = self.probabilities.shape
+        if class_names is None or len(class_names) != number_of_classes:
+            class_names = [str(i) for i in range(number_of_classes)]
+        event_names = {event_id: event_name for event_name, event_id in self.file_data.event_id.items()}
+        columns = [pipeline + " " + str(class_name) for pipeline in self.pipelines_used for class_name in class_names]
+        rows = self.probabilities.transpose(1, 0, 2).reshape(number_of_epochs, number_of_pipelines * number_of_classes)
+        with open(self.export_path, "w") as file:
+            file.write(", ".join(["Epoch", "Event"] + columns) + "\n")
+            for i in range(number_of_epochs):
+                event_id = self.file_data.events[i, 2]
+                file.write(", ".join([str(i + 1), event_names.get(event_id, str(event_id))] +
+                                     ["{:.6f}".format(probability) for probability in rows[i]]) + "\n")
+
+    def get_probabilities(self):
+        """
+        Get the probabilities of the classes for each pipeline and each epoch.
+        :return: The probabilities, of shape (pipelines, epochs, classes).
+        :rtype: numpy.ndarray
+        """
+        return self.probabilities
+
+    def get_pipelines_used(self):
+        """
+        Get the names of the pipelines, in the order of the first axis of the probabilities.
+        :return: The names of the pipelines.
+        :rtype: list of str
+        """
+        return self.pipelines_used
+
+    def get_throughput(self):
+        """
+        Get the number of epochs predicted per second.
+        :return: The throughput.
+        :rtype: float
+        """
+        return self.throughput
+
+    def get_export_path(self):
+        """
+        Get the path of the CSV file where the probabilities are saved.
+        :return: The path of the file. None if the probabilities are not saved.
+        :rtype: str
+        """
+        return self.export_path
@@ -16,6 +16,7 @@ from mne_connectivity import envelope_correlation, spectral_connectivity_epochs,
 
 from utils.view.error_window import errorWindow
 from utils.file_path_search import get_project_freesurfer_path, get_labels_from_subject
+from utils.model.performance_profiler import profiled, record_step_error
 
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
@@ -70,6 +71,7 @@ class envelopeCorrelationRunnable(QRunnable):
         self.envelope_correlation_data = None
         self.psi_data = None
 
+    @profiled
     def run(self):
         """
         Launch the computation of the envelope correlation on the given data.
@@ -86,8 +88,10 @@ class envelopeCorrelationRunnable(QRunnable):
             error_message = "An error as occurred during the computation of the envelope correlation."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
+    @profiled
     def compute_correlation_data(self):
         """
         Compute the correct correlation data depending on the method chosen by the user.
@@ -163,6 +167,14 @@ class envelopeCorrelationRunnable(QRunnable):
         """
         return self.psi_data
 
+    def get_results(self):
+        """
+        Get the results of the envelope correlation computation, to store them in the results store.
+        :return: The results, by name of their getter.
+        :rtype: dict
+        """
+        return {"envelope_correlation_data": self.envelope_correlation_data, "psi_data": self.psi_data}
+
 
 # Source Space Connectivity
 class sourceSpaceConnectivityWorkerSignals(QObject):
@@ -228,6 +240,7 @@ class sourceSpaceConnectivityRunnable(QRunnable):
         self.source_space_connectivity_data = None
         self.psi_data = None
 
+    @profiled
     def run(self):
         """
         Launch the computation of the source space connectivity on the given data.
@@ -247,12 +260,14 @@ class sourceSpaceConnectivityRunnable(QRunnable):
             detailed_message = str(error)
             error_window = errorWindow(error_message, detailed_message)
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
         except Exception as error:
             error_message = "An error as occurred during the computation of the source space."
             detailed_message = str(error)
             error_window = errorWindow(error_message, detailed_message)
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     """
@@ -286,6 +301,7 @@ class sourceSpaceConnectivityRunnable(QRunnable):
                 file.write("\n")
             file.close()
 
+    @profiled
     def compute_envelope_correlation_with_source_space(self):
         """
         Launch the computation of the source space if it is not provided.
@@ -316,6 +332,7 @@ class sourceSpaceConnectivityRunnable(QRunnable):
     """
     Source Space
     """
+    @profiled
     def compute_inverse(self, inv):
         """
         Apply the inverse operator on the given data.
@@ -345,6 +362,7 @@ class sourceSpaceConnectivityRunnable(QRunnable):
         inv = self.compute_inverse_operator(fwd, noise_cov)
         return inv
 
+    @profiled
     def compute_noise_covariance(self):
         """
         Compute the noise covariance of the given data.
@@ -357,6 +375,7 @@ class sourceSpaceConnectivityRunnable(QRunnable):
             noise_cov.save(self.file_path + "-cov.fif")
         return noise_cov
 
+    @profiled
     def compute_source_space(self):
         """
         Compute the source space of the "fsaverage" model.
@@ -370,6 +389,7 @@ class sourceSpaceConnectivityRunnable(QRunnable):
             write_source_spaces(self.file_path + "-src.fif", src, overwrite=True, verbose=False)
         return src
 
+    @profiled
     def compute_bem_solution(self):
         """
         Compute the BEM solution of the "fsaverage" model.
@@ -385,6 +405,7 @@ class sourceSpaceConnectivityRunnable(QRunnable):
             write_bem_solution(self.file_path + "-bem-sol.fif", bem, overwrite=True, verbose=False)
         return bem
 
+    @profiled
     def compute_forward_solution(self, src, bem):
         """
         Compute the forward solution of the given data, based on the source space model of the "fsaverage" model.
@@ -402,6 +423,7 @@ class sourceSpaceConnectivityRunnable(QRunnable):
             write_forward_solution(self.file_path + "-fwd.fif", fwd, overwrite=True, verbose=False)
         return fwd
 
+    @profiled
     def compute_inverse_operator(self, fwd, noise_cov):
         """
         Compute the inverse operator of the given data, based on the forward solution and the noise covariance previously
@@ -439,6 +461,14 @@ class sourceSpaceConnectivityRunnable(QRunnable):
         """
         return self.psi_data
 
+    def get_results(self):
+        """
+        Get the results of the source space connectivity computation, to store them in the results store.
+        :return: The results, by name of their getter.
+        :rtype: dict
+        """
+        return {"source_space_connectivity_data": self.source_space_connectivity_data, "psi_data": self.psi_data}
+
 
 # Sensor Space Connectivity
 class sensorSpaceConnectivityWorkerSignals(QObject):
@@ -466,6 +496,7 @@ class sensorSpaceConnectivityRunnable(QRunnable):
         self.export_path = export_path
         self.sensor_space_connectivity_data = None
 
+    @profiled
     def run(self):
         """
         Launch the computation of the sensor space connectivity on the given data.
@@ -482,6 +513,7 @@ class sensorSpaceConnectivityRunnable(QRunnable):
             error_message = "An error as occurred during the computation of the sensor space connectivity."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     def check_data_export(self):
@@ -521,3 +553,11 @@ class sensorSpaceConnectivityRunnable(QRunnable):
         :rtype: list of, list of float
         """
         return self.sensor_space_connectivity_data
+
+    def get_results(self):
+        """
+        Get the results of the sensor space connectivity computation, to store them in the results store.
+        :return: The results, by name of their getter.
+        :rtype: dict
+        """
+        return {"sensor_space_connectivity_data": self.sensor_space_connectivity_data}
@@ -5,6 +5,8 @@
 Files runnable
 """
 
+from os.path import basename, splitext
+
 from PyQt5.QtCore import QRunnable, pyqtSignal, QObject
 
 from mne import read_epochs, find_events, events_from_annotations
@@ -12,7 +14,11 @@ from mne.channels import make_standard_montage
 from mne.io import read_raw_fif, read_raw_eeglab, read_epochs_eeglab
 
 from utils.cnt_reader.cnt_file_reader import get_raw_from_cnt
+from utils.file_path_search import get_bids_entities
+from utils.model.file_header import read_file_header
+from utils.model.event_table import eventTable
 from utils.view.error_window import errorWindow
+from utils.model.performance_profiler import profiled, record_step_error
 
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
@@ -46,23 +52,24 @@ class openFifFileRunnable(QRunnable):
         self.file_data = None
         self.file_type = None
 
+    @profiled
     def run(self):
         """
-        Launch the reading of the FIF file.
+        Launch the reading of the FIF file, with the reader of the type given by its header.
         Notifies the main model that the computation is finished.
         """
         try:
-            if self.path_to_file[-7:-4] == "raw":
-                self.file_type = "Raw"
+            self.file_type = read_file_header(self.path_to_file)["file_type"]
+            if self.file_type == "Raw":
                 self.file_data = read_raw_fif(self.path_to_file, preload=True)
             else:
-                self.file_type = "Epochs"
                 self.file_data = read_epochs(self.path_to_file, preload=True)
             self.signals.finished.emit()
-        except TypeError as error:
+        except (TypeError, ValueError, OSError) as error:
             error_message = "An error has occurred"
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     def get_file_data(self):
@@ -113,6 +120,7 @@ class openCntFileRunnable(QRunnable):
         self.file_data = None
         self.file_type = None
 
+    @profiled
     def run(self):
         """
         Launch the reading of the ANT eego CNT file.
@@ -126,6 +134,7 @@ class openCntFileRunnable(QRunnable):
             error_message = "An error has occurred during the reading of the ANT eego CNT file."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     def get_file_data(self):
@@ -178,40 +187,164 @@ class openSetFileRunnable(QRunnable):
         self.read_events = None
         self.read_event_ids = None
 
+    @profiled
     def run(self):
         """
-        Launch the reading of the SET file.
+        Launch the reading of the SET file, with the reader of the type given by its header.
         Notifies the main model that the computation is finished.
         """
-        raw_read, epochs_read = False, False
-        detailed_error = None
         try:
-            self.file_data = read_raw_eeglab(self.path_to_file, preload=True)
-            self.file_type = "Raw"
-            raw_read = True
+            self.file_type = read_file_header(self.path_to_file)["file_type"]
+            if self.file_type == "Raw":
+                self.file_data = read_raw_eeglab(self.path_to_file, preload=True)
+            else:
+                self.file_data = read_epochs_eeglab(self.path_to_file)
+            self.signals.finished.emit()
         except Exception as error:
-            raw_read = False
             print(error)
             print(type(error))
-            detailed_error = error
+            error_message = "An error has occurred during the reading of the SET file."
+            error_window = errorWindow(error_message, detailed_message=str(error))
+            error_window.show()
+            record_step_error()
+            self.signals.error.emit()
 
-        if not raw_read:    # Raw reading failed, try epochs
-            try:
-                self.file_data = read_epochs_eeglab(self.path_to_file)
-                self.file_type = "Epochs"
-                epochs_read = True
-            except Exception as error:
-                epochs_read = False
-                detailed_error = error
-                print(error)
-                print(type(error))
+    def get_file_data(self):
+        """
+        Get the file data.
+        :return: MNE data of the dataset.
+        :rtype: MNE.Epochs/MNE.Raw
+        """
+        return self.file_data
 
-        if raw_read or epochs_read:
+    def get_file_type(self):
+        """
+        Get the file type.
+        :return: The file type.
+        :rtype: str
+        """
+        return self.file_type
+
+    def get_path_to_file(self):
+        """
+        Get the path to the file.
+        :return: The path to the file.
+        :rtype: str
+        """
+        return self.path_to_file
+
+
+# Read Headers
+class readHeadersWorkerSignals(QObject):
+    """
+    Contain the signals used by the read headers runnable.
+    """
+    finished = pyqtSignal()
+
+
+class readHeadersRunnable(QRunnable):
+    def __init__(self, paths_to_files):
+        """
+        Runnable for the reading of the headers of several files, without their data, before the files are opened.
+        :param paths_to_files: The paths to the files.
+        :type paths_to_files: list of str
+        """
+        super().__init__()
+        self.signals = readHeadersWorkerSignals()
+
+        self.paths_to_files = paths_to_files
+        self.headers = []
+
+    @profiled
+    def run(self):
+        """
+        Launch the reading of the headers of the files.
+        Notifies the main model that the computation is finished.
+        """
+        self.headers = [self.read_header(path_to_file) for path_to_file in self.paths_to_files]
+        self.signals.finished.emit()
+
+    @staticmethod
+    def read_header(path_to_file):
+        """
+        Read the header of a file, without its samples, and the study information given by its BIDS entities.
+        :param path_to_file: The path to the file.
+        :type path_to_file: str
+        :return: The information of the header (see "read_file_header"), the study information, and the error if the
+        header can not be read, in which case the type of the file is None.
+        :rtype: dict
+        """
+        try:
+            header = read_file_header(path_to_file)
+            header["error"] = None
+        except Exception as error:
+            header = {"path": path_to_file, "name": splitext(basename(path_to_file))[0], "file_type": None,
+                      "channels": None, "sfreq": None, "duration": None, "epochs": None, "events": None, "size": None,
+                      "error": str(error)}
+        header.update(get_bids_entities(path_to_file))
+        return header
+
+    def get_headers(self):
+        """
+        Get the headers of the files.
+        :return: The header of each file, in the same order as the paths.
+        :rtype: list of dict
+        """
+        return self.headers
+
+
+# Bulk Open File
+class bulkOpenFileWorkerSignals(QObject):
+    """
+    Contain the signals used by the bulk open file runnable.
+    """
+    finished = pyqtSignal()
+    error = pyqtSignal()
+
+
+class bulkOpenFileRunnable(QRunnable):
+    def __init__(self, path_to_file, file_type):
+        """
+        Runnable for the opening of one of the files of a directory opened at once, getting the dataset's data.
+        Several of these runnables are computed at the same time, the errors are thus not displayed in a window but
+        kept for the progress window.
+        :param path_to_file: The path to the file.
+        :type path_to_file: str
+        :param file_type: The type of the file, read from its header.
+        :type file_type: str
+        """
+        super().__init__()
+        self.signals = bulkOpenFileWorkerSignals()
+
+        self.path_to_file = path_to_file
+        self.file_type = file_type
+        self.file_data = None
+        self.error_message = None
+
+    @profiled
+    def run(self):
+        """
+        Launch the reading of the file, with the reader of its extension and type.
+        Notifies the main model that the computation is finished.
+        """
+        extension = splitext(self.path_to_file)[1].lower()
+        try:
+            if extension == ".cnt":
+                self.file_data = get_raw_from_cnt(self.path_to_file)
+            elif extension == ".fif":
+                if self.file_type == "Raw":
+                    self.file_data = read_raw_fif(self.path_to_file, preload=True)
+                else:
+                    self.file_data = read_epochs(self.path_to_file, preload=True)
+            else:
+                if self.file_type == "Raw":
+                    self.file_data = read_raw_eeglab(self.path_to_file, preload=True)
+                else:
+                    self.file_data = read_epochs_eeglab(self.path_to_file)
             self.signals.finished.emit()
-        else:
-            error_message = "An error has occurred during the reading of the SET file."
-            error_window = errorWindow(error_message, detailed_message=str(detailed_error))
-            error_window.show()
+        except Exception as error:
+            self.error_message = str(error)
+            record_step_error()
             self.signals.error.emit()
 
     def get_file_data(self):
@@ -238,6 +371,14 @@ class openSetFileRunnable(QRunnable):
         """
         return self.path_to_file
 
+    def get_error_message(self):
+        """
+        Get the error that occurred during the reading of the file.
+        :return: The error message. None if the file has been read.
+        :rtype: str
+        """
+        return self.error_message
+
 
 # Load Data Info
 class loadDataInfoWorkerSignals(QObject):
@@ -271,6 +412,7 @@ class loadDataInfoRunnable(QRunnable):
         self.tmin = tmin
         self.tmax = tmax
 
+    @profiled
     def run(self):
         """
         Launch the loading of the additional information of the dataset.
@@ -297,6 +439,15 @@ class loadDataInfoRunnable(QRunnable):
     def get_file_data(self):
         return self.file_data
 
+    def get_parameters(self):
+        """
+        Get the parameters used for loading the information of the dataset.
+        :return: The montage, the channels selected and the start and end time kept.
+        :rtype: dict
+        """
+        return {"montage": self.montage, "channels_selected": self.channels_selected, "tmin": self.tmin,
+                "tmax": self.tmax}
+
 
 # Find Events From Channel
 class findEventsFromChannelWorkerSignals(QObject):
@@ -324,6 +475,7 @@ class findEventsFromChannelRunnable(QRunnable):
         self.read_events = None
         self.read_event_ids = None
 
+    @profiled
     def run(self):
         """
         Launch the reading of the events based on the stimulation channel of the given data.
@@ -341,6 +493,7 @@ class findEventsFromChannelRunnable(QRunnable):
                                 "channel used for the computation."
                 error_window = errorWindow(error_message, detailed_message=str(error))
                 error_window.show()
+                record_step_error()
                 self.signals.error.emit()
             else:   # No stim channel was precised and computation failed, so try another method.
                 try:
@@ -352,6 +505,7 @@ class findEventsFromChannelRunnable(QRunnable):
                     error_message = "An error has occurred when trying to find the events."
                     error_window = errorWindow(error_message, detailed_message=str(error))
                     error_window.show()
+                    record_step_error()
                     self.signals.error.emit()
 
     def get_read_events(self):
@@ -370,6 +524,14 @@ class findEventsFromChannelRunnable(QRunnable):
         """
         return self.read_event_ids
 
+    def get_stim_channel(self):
+        """
+        Get the stimulation channel the events are found on.
+        :return: The stimulation channel. None if MNE chose it, or if the events were found in the annotations.
+        :rtype: str
+        """
+        return self.stim_channel
+
 
 # Export Data to CSV file
 class exportDataCSVWorkerSignals(QObject):
@@ -395,6 +557,7 @@ class exportDataCSVRunnable(QRunnable):
         self.file_data = file_data
         self.path_to_file = path_to_file
 
+    @profiled
     def run(self):
         """
         Launch the exportation of the data of the dataset into a CSV file.
@@ -423,6 +586,7 @@ class exportDataCSVRunnable(QRunnable):
             error_message = "An error has occurred when exporting the data into a CSV file."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
 
@@ -450,6 +614,7 @@ class exportDataSETRunnable(QRunnable):
         self.file_data = file_data
         self.path_to_file = path_to_file
 
+    @profiled
     def run(self):
         """
         Launch the exportation of the data of the dataset into a SET file.
@@ -462,6 +627,7 @@ class exportDataSETRunnable(QRunnable):
             error_message = "An error has occurred when exporting the data into a SET file."
             error_window = errorWindow(error_message=error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
 
@@ -489,29 +655,19 @@ class exportEventsTXTRunnable(QRunnable):
         self.file_data = file_data
         self.path_to_file = path_to_file
 
+    @profiled
     def run(self):
         """
         Launch the exportation of the events of the dataset into a TXT file.
         Notifies the main model that the computation is finished.
         """
         try:
-            event_values = self.file_data.events
-            event_ids = self.file_data.event_id
-            file = open(self.path_to_file + ".txt", "x")
-            file.write("Number, Type, Latency \n")
-            for i in range(len(event_values)):
-                latency = event_values[i][0]
-                event_id = event_values[i][2]
-                file.write(str(i) + ", ")   # Event number
-                for key in event_ids.keys():
-                    if event_ids[key] == event_id:  # Find correct key / event name
-                        file.write(key + ", ")
-                        break
-                file.write(str(latency) + "\n")
-            file.close()
+            with open(self.path_to_file + ".txt", "x") as file:
+                eventTable.from_file_data(self.file_data).export_txt(file)
             self.signals.finished.emit()
         except Exception as error:
             error_message = "An error has occurred during the exportation of the events into a TXT file."
             error_window = errorWindow(error_message=error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
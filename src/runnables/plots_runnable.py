@@ -6,11 +6,17 @@ Plots runnable
 """
 
 import numpy as np
+
+from os.path import isfile
+
 from PyQt5.QtCore import QRunnable, pyqtSignal, QObject
 
 from mne.time_frequency import tfr_morlet, tfr_multitaper, tfr_stockwell
 
+from utils.model.decimation_pyramid import decimationPyramid
+from utils.model.power_spectral_density import powerSpectralDensity
 from utils.view.error_window import errorWindow
+from utils.model.performance_profiler import profiled, record_step_error
 
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
@@ -56,43 +62,41 @@ class powerSpectralDensityRunnable(QRunnable):
         self.tmin = minimum_time
         self.tmax = maximum_time
         self.topo_time_points = topo_time_points
-        self.fig_psd = None
-        self.fig_topo = None
+        self.psd = None
 
+    @profiled
     def run(self):
         """
         Launch the computation of the power spectral density on the given data.
         Notifies the main model that the computation is finished.
         """
         try:
-            self.fig_psd = self.file_data.plot_psd(fmin=self.fmin, fmax=self.fmax, tmin=self.tmin, tmax=self.tmax,
-                                                   average=False, show=False)
-            bands = []
-            for time in self.topo_time_points:
-                bands.append((time, str(time) + " Hz"))
-            self.fig_topo = self.file_data.plot_psd_topomap(bands=bands, tmin=self.tmin, tmax=self.tmax, show=False)
+            bandwidth = 1.0 / (self.tmax - self.tmin)     # To counter bandwidth normalization
+            self.psd = powerSpectralDensity.compute(self.file_data, self.fmin, self.fmax, self.tmin, self.tmax,
+                                                    bandwidth=bandwidth)
             self.signals.finished.emit()
         except Exception as error:
             error_message = "An error has occurred during the computation of the PSD"
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
-    def get_psd_fig(self):
+    def get_psd(self):
         """
-        Get the power spectral density's figure
-        :return: The figure of the actual power spectral density's data computed
-        :rtype: matplotlib.Figure
+        Get the power spectral density computed.
+        :return: The power spectral density of each epoch and each channel.
+        :rtype: powerSpectralDensity
         """
-        return self.fig_psd
+        return self.psd
 
-    def get_topo_fig(self):
+    def get_topo_time_points(self):
         """
-        Get the power spectral density's figure fo the topographies
-        :return: The figure of the topographies of the actual power spectral density's data computed
-        :rtype: matplotlib.Figure
+        Get the time points for the topomaps.
+        :return: The time points for the topomaps.
+        :rtype: list of float
         """
-        return self.fig_topo
+        return self.topo_time_points
 
 
 # Time Frequency
@@ -133,6 +137,7 @@ class timeFrequencyRunnable(QRunnable):
         self.power = None
         self.itc = None
 
+    @profiled
     def run(self):
         """
         Launch the computation of the time-frequency analysis on the given data.
@@ -157,6 +162,7 @@ class timeFrequencyRunnable(QRunnable):
             detailed_message = str(error)
             error_window = errorWindow(error_message, detailed_message)
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     def get_channel_selected(self):
@@ -182,3 +188,76 @@ class timeFrequencyRunnable(QRunnable):
         :rtype: MNE.AverageTFR
         """
         return self.itc
+
+    def get_results(self):
+        """
+        Get the results of the time-frequency analysis computation, to store them in the results store.
+        :return: The results, by name of their getter.
+        :rtype: dict
+        """
+        return {"channel_selected": self.channel_selected, "power": self.power, "itc": self.itc}
+
+
+# Decimation pyramid
+class decimationPyramidWorkerSignals(QObject):
+    """
+    Contain the signals used by the decimation pyramid runnable.
+    """
+    finished = pyqtSignal()
+    error = pyqtSignal()
+
+
+class decimationPyramidRunnable(QRunnable):
+    def __init__(self, file_data, fingerprint, file_path=None):
+        """
+        Runnable for building the decimation pyramid of a raw recording, used by the data browser.
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Raw
+        :param fingerprint: The fingerprint of the dataset.
+        :type fingerprint: str
+        :param file_path: The path of the file in which the pyramid is stored alongside the dataset. If the file
+        contains the pyramid of the same dataset, it is read instead of being built. If None, the pyramid is not stored.
+        :type file_path: str
+        """
+        super().__init__()
+        self.signals = decimationPyramidWorkerSignals()
+
+        self.file_data = file_data
+        self.fingerprint = fingerprint
+        self.file_path = file_path
+        self.decimation_pyramid = None
+
+    @profiled
+    def run(self):
+        """
+        Launch the building of the decimation pyramid, or read it from its file.
+        Notifies the main model that the computation is finished.
+        No error message is displayed if the building fails, the data browser of MNE is then used.
+        """
+        try:
+            if self.file_path is not None and isfile(self.file_path):
+                decimation_pyramid = decimationPyramid.load(self.file_path)
+                if decimation_pyramid.get_fingerprint() == self.fingerprint:
+                    self.decimation_pyramid = decimation_pyramid
+            if self.decimation_pyramid is None:
+                self.decimation_pyramid = decimationPyramid.build(self.file_data, self.fingerprint)
+                if self.file_path is not None:
+                    try:
+                        self.decimation_pyramid.save(self.file_path)
+                    except OSError:     # The directory of the dataset may be read-only, the pyramid is kept in memory.
+                        pass
+            self.signals.finished.emit()
+        except Exception:
+            record_step_error()
+            self.signals.error.emit()
+
+    """
+    Getters
+    """
+    def get_decimation_pyramid(self):
+        """
+        Get the decimation pyramid built.
+        :return: The decimation pyramid.
+        :rtype: decimationPyramid
+        """
+        return self.decimation_pyramid
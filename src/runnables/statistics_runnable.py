@@ -23,8 +23,10 @@ from mne.viz import plot_snr_estimate
 from mne_connectivity import envelope_correlation, spectral_connectivity_epochs, phase_slope_index
 from scipy.stats import ttest_ind
 
+from utils.model.event_table import eventTable
 from utils.view.error_window import errorWindow
 from utils.file_path_search import get_project_freesurfer_path
+from utils.model.performance_profiler import profiled, record_step_error
 
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
@@ -88,6 +90,7 @@ class statisticsSnrRunnable(QRunnable):
         self.second_SNRs = None
         self.t_values = []
 
+    @profiled
     def run(self):
         """
         Launch the computation of the SNR
@@ -118,8 +121,10 @@ class statisticsSnrRunnable(QRunnable):
             error_message = "An error as occurred during the computation of the SNR."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
+    @profiled
     def compute_all_SNRs(self):
         """
         Launch all the SNR methods selected by the user.
@@ -513,6 +518,7 @@ class statisticsSnrRunnable(QRunnable):
         else:
             return self.compute_estimate_SNR(evoked, inv)
 
+    @profiled
     def compute_estimate_SNR(self, evoked, inv):
         print("Compute estimate SNR")
 
@@ -533,6 +539,7 @@ class statisticsSnrRunnable(QRunnable):
         inv = self.compute_inverse_operator(fwd, noise_cov)
         return inv
 
+    @profiled
     def compute_noise_covariance(self):
         print("Compute noise covariance")
         noise_cov = compute_covariance(self.file_data, tmax=0., method=['shrunk', 'empirical'], verbose=False)
@@ -540,6 +547,7 @@ class statisticsSnrRunnable(QRunnable):
             noise_cov.save(self.file_path + "-cov.fif")
         return noise_cov
 
+    @profiled
     def compute_source_space(self):
         print("Compute source space")
         src = setup_source_space(self.subject, spacing='oct6', add_dist='patch', subjects_dir=self.subjects_dir, verbose=False)
@@ -547,6 +555,7 @@ class statisticsSnrRunnable(QRunnable):
             write_source_spaces(self.file_path + "-src.fif", src, overwrite=True, verbose=False)
         return src
 
+    @profiled
     def compute_bem_solution(self):
         print("Compute bem solution")
         conductivity = (0.3, 0.006, 0.3)  # for three layers
@@ -556,6 +565,7 @@ class statisticsSnrRunnable(QRunnable):
             write_bem_solution(self.file_path + "-bem-sol.fif", bem, overwrite=True, verbose=False)
         return bem
 
+    @profiled
     def compute_forward_solution(self, src, bem):
         print("Compute forward solution")
         fwd = make_forward_solution(self.file_data.info, trans='fsaverage', src=src, bem=bem, meg=False, eeg=True, mindist=5.0, n_jobs=1,
@@ -564,6 +574,7 @@ class statisticsSnrRunnable(QRunnable):
             write_forward_solution(self.file_path + "-fwd.fif", fwd, overwrite=True, verbose=False)
         return fwd
 
+    @profiled
     def compute_inverse_operator(self, fwd, noise_cov):
         print("Compute inverse operator")
         inverse_operator = make_inverse_operator(self.file_data.info, fwd, noise_cov, loose=0.2, depth=0.8, verbose=False)
@@ -585,15 +596,9 @@ class statisticsSnrRunnable(QRunnable):
         """
         Create a mask to know which trial to keep and which one to remove for the computation.
         :return mask: Mask of trials to remove. True means remove, and False means keep.
-        :rtype mask: list of boolean
+        :rtype mask: numpy.ndarray
         """
-        mask = [True for _ in range(len(self.file_data.events))]
-        event_ids = self.file_data.event_id
-        event_id_to_keep = event_ids[stats_variable]
-        for i, event in enumerate(self.file_data.events):
-            if event[2] == event_id_to_keep:        # 2 is the event id in the events
-                mask[i] = False
-        return mask
+        return eventTable.from_file_data(self.file_data).get_drop_mask(stats_variable)
 
     def pretty_print_SNRs(self, SNRs, all_methods=False, means=True):
         if all_methods:
@@ -687,6 +692,7 @@ class statisticsErspItcRunnable(QRunnable):
         self.itc_one = None
         self.itc_two = None
 
+    @profiled
     def run(self):
         """
         Launch the computation of the time-frequency analysis on the given data.
@@ -725,6 +731,7 @@ class statisticsErspItcRunnable(QRunnable):
             detailed_message = str(error)
             error_window = errorWindow(error_message, detailed_message)
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     """
@@ -735,15 +742,9 @@ class statisticsErspItcRunnable(QRunnable):
         """
         Create a mask to know which trial to keep and which one to remove for the computation.
         :return mask: Mask of trials to remove. True means remove, and False means keep.
-        :rtype mask: list of boolean
+        :rtype mask: numpy.ndarray
         """
-        mask = [True for _ in range(len(file_data.events))]
-        event_ids = file_data.event_id
-        event_id_to_keep = event_ids[stats_variable]
-        for i, event in enumerate(file_data.events):
-            if event[2] == event_id_to_keep:        # 2 is the event id in the events
-                mask[i] = False
-        return mask
+        return eventTable.from_file_data(file_data).get_drop_mask(stats_variable)
 
     """
     Getters
@@ -842,6 +843,7 @@ class statisticsConnectivityRunnable(QRunnable):
         self.psi_data_one = None
         self.psi_data_two = None
 
+    @profiled
     def run(self):
         """
         Launch the computation of the envelope correlation on the given data.
@@ -869,8 +871,10 @@ class statisticsConnectivityRunnable(QRunnable):
             error_message = "An error as occurred during the computation of the envelope correlation."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
+    @profiled
     def compute_correlation_data(self, file_data_one, file_data_two):
         """
         Compute the correct correlation data depending on the method chosen by the user.
@@ -937,15 +941,9 @@ class statisticsConnectivityRunnable(QRunnable):
         """
         Create a mask to know which trial to keep and which one to remove for the computation.
         :return mask: Mask of trials to remove. True means remove, and False means keep.
-        :rtype mask: list of boolean
-        """
-        mask = [True for _ in range(len(file_data.events))]
-        event_ids = file_data.event_id
-        event_id_to_keep = event_ids[stats_variable]
-        for i, event in enumerate(file_data.events):
-            if event[2] == event_id_to_keep:        # 2 is the event id in the events
-                mask[i] = False
-        return mask
+        :rtype mask: numpy.ndarray
+        """
+        return eventTable.from_file_data(file_data).get_drop_mask(stats_variable)
 
     """
     Getters
@@ -5,12 +5,11 @@
 Study runnable
 """
 
-import numpy as np
 from PyQt5.QtCore import QRunnable, pyqtSignal, QObject
 
-from mne.time_frequency import tfr_morlet, tfr_multitaper, tfr_stockwell
-
+from utils.model.dataset_summary_cache import datasetSummaryCache
 from utils.view.error_window import errorWindow
+from utils.model.performance_profiler import profiled, record_step_error
 
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
@@ -31,11 +30,15 @@ class studyTimeFrequencyWorkerSignals(QObject):
 
 
 class studyTimeFrequencyRunnable(QRunnable):
-    def __init__(self, file_data, method_tfr, channel_selected, min_frequency, max_frequency, n_cycles):
+    def __init__(self, all_datasets, method_tfr, channel_selected, min_frequency, max_frequency, n_cycles):
         """
-        Runnable for the computation of the time-frequency analysis of the given data.
-        :param file_data: MNE data of the dataset.
-        :type file_data: MNE.Epochs/MNE.Raw
+        Runnable for the computation of the time-frequency analysis of the datasets of the study.
+        The analysis of each dataset is given when it is already in the summary cache, and is computed otherwise. The
+        cache is not used by the runnable, it is read and updated by the study on the main thread, see
+        "get_computed_tfr". The analyses of the datasets are combined weighted by their number of epochs.
+        :param all_datasets: The index, the version, the MNE data and the cached analysis (None if it must be
+        computed) of each dataset.
+        :type all_datasets: list of (int, int, MNE.Epochs, (MNE.AverageTFR, MNE.AverageTFR))
         :param method_tfr: Method used for computing the time-frequency analysis.
         :type method_tfr: str
         :param channel_selected: Channel on which the time-frequency analysis will be computed.
@@ -50,7 +53,7 @@ class studyTimeFrequencyRunnable(QRunnable):
         super().__init__()
         self.signals = studyTimeFrequencyWorkerSignals()
 
-        self.file_data = file_data
+        self.all_datasets = all_datasets
         self.method_tfr = method_tfr
         self.channel_selected = channel_selected
         self.min_frequency = min_frequency
@@ -58,7 +61,9 @@ class studyTimeFrequencyRunnable(QRunnable):
         self.n_cycles = n_cycles
         self.power = None
         self.itc = None
+        self.computed_tfr = []
 
+    @profiled
     def run(self):
         """
         Launch the computation of the time-frequency analysis on the given data.
@@ -67,22 +72,21 @@ class studyTimeFrequencyRunnable(QRunnable):
         Notifies the main model when an error occurs.
         """
         try:
-            freqs = np.arange(self.min_frequency, self.max_frequency)
-            if self.method_tfr == "Morlet":
-                self.power, self.itc = tfr_morlet(self.file_data, freqs=freqs, n_cycles=self.n_cycles,
-                                                  picks=self.channel_selected)
-            elif self.method_tfr == "Multitaper":
-                self.power, self.itc = tfr_multitaper(self.file_data, freqs=freqs, n_cycles=self.n_cycles,
-                                                      picks=self.channel_selected)
-            elif self.method_tfr == "Stockwell":
-                self.power, self.itc = tfr_stockwell(self.file_data, freqs=freqs, n_cycles=self.n_cycles,
-                                                     picks=self.channel_selected)
+            all_tfr = []
+            for index, version, file_data, tfr in self.all_datasets:
+                if tfr is None:
+                    tfr = datasetSummaryCache.compute_tfr(file_data, self.method_tfr, self.channel_selected,
+                                                          self.min_frequency, self.max_frequency, self.n_cycles)
+                    self.computed_tfr.append((index, version, tfr))
+                all_tfr.append(tfr)
+            self.power, self.itc = datasetSummaryCache.combine_tfr_summaries(all_tfr)
             self.signals.finished.emit()
         except ValueError as error:
             error_message = "An error as occurred during the computation of the time frequency analysis."
             detailed_message = str(error)
             error_window = errorWindow(error_message, detailed_message)
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     def get_channel_selected(self):
@@ -93,6 +97,14 @@ class studyTimeFrequencyRunnable(QRunnable):
         """
         return self.channel_selected
 
+    def get_computed_tfr(self):
+        """
+        Get the time-frequency analyses computed by the runnable, that were not in the summary cache.
+        :return: The index and the version of each dataset, with the power and the inter-trial coherence computed.
+        :rtype: list of (int, int, (MNE.AverageTFR, MNE.AverageTFR))
+        """
+        return self.computed_tfr
+
     def get_power(self):
         """
         Get the "power" data of the time-frequency analysis computation.
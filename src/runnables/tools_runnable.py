@@ -13,17 +13,24 @@ from PyQt5.QtCore import QRunnable, pyqtSignal, QObject
 from matplotlib import pyplot as plt
 
 from mne import make_forward_solution, write_forward_solution, compute_covariance, setup_source_space, \
-    write_source_spaces, make_bem_model, make_bem_solution, write_bem_solution, Epochs, read_source_spaces, \
+    write_source_spaces, make_bem_model, make_bem_solution, write_bem_solution, read_source_spaces, \
     read_bem_solution, read_forward_solution, read_cov
 from mne.minimum_norm import read_inverse_operator, make_inverse_operator, apply_inverse, \
     write_inverse_operator, apply_inverse_epochs
-from mne.preprocessing import ICA
 from mne.time_frequency import psd_welch
 from mne.viz import plot_snr_estimate
 from scipy.signal import welch
 
+from utils.model.event_table import eventTable
 from utils.view.error_window import errorWindow
 from utils.file_path_search import get_project_freesurfer_path
+from utils.model.performance_profiler import profiled, record_step_error
+from utils.model.ica_operator import fit_ica
+from utils.model.filter_engine import filter_data
+from utils.model.resampling_engine import resample_data
+from utils.model.rest_operator import get_rest_operator, apply_rest_operator
+from utils.model.artifact_rejection import compute_epochs_statistics, compute_adaptive_threshold, compute_keep_mask
+from utils.model.epochs_extraction import extract_epochs, select_epochs
 
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
@@ -44,7 +51,7 @@ class filterWorkerSignals(QObject):
 
 
 class filterRunnable(QRunnable):
-    def __init__(self, low_frequency, high_frequency, channels_selected, file_data, filter_method):
+    def __init__(self, low_frequency, high_frequency, channels_selected, file_data, filter_method, n_jobs=1):
         """
         Runnable for the computation of the filtering of the given data.
         :param low_frequency: Lowest frequency from where the data will be filtered.
@@ -57,6 +64,8 @@ class filterRunnable(QRunnable):
         :type file_data: MNE.Epochs/MNE.Raw
         :param filter_method: Method used for the filtering, either FIR or IIR.
         :type filter_method: str
+        :param n_jobs: Number of threads filtering the channels.
+        :type n_jobs: int
         """
         super().__init__()
         self.signals = filterWorkerSignals()
@@ -66,20 +75,23 @@ class filterRunnable(QRunnable):
         self.channels_selected = channels_selected
         self.file_data = file_data
         self.filter_method = filter_method
+        self.n_jobs = n_jobs
 
+    @profiled
     def run(self):
         """
         Launch the computation of the filtering on the given data.
         Notifies the main model that the computation is finished.
         """
         try:
-            self.file_data.filter(l_freq=self.low_frequency, h_freq=self.high_frequency, picks=self.channels_selected,
-                                  method=self.filter_method)
+            filter_data(self.file_data, self.low_frequency, self.high_frequency, self.channels_selected,
+                        self.filter_method, self.n_jobs)
             self.signals.finished.emit()
         except Exception as error:
             error_message = "An error has occurred during the filtering."
             error_window = errorWindow(error_message=error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     def get_file_data(self):
@@ -122,6 +134,14 @@ class filterRunnable(QRunnable):
         """
         return self.filter_method
 
+    def get_n_jobs(self):
+        """
+        Gets the number of threads used for the filtering.
+        :return: The number of threads.
+        :rtype: int
+        """
+        return self.n_jobs
+
 
 # Resampling
 class resamplingWorkerSignals(QObject):
@@ -133,7 +153,7 @@ class resamplingWorkerSignals(QObject):
 
 
 class resamplingRunnable(QRunnable):
-    def __init__(self, frequency, file_data, events):
+    def __init__(self, frequency, file_data, events, resampling_method="fft", n_jobs=1):
         """
         Runnable for the computation of the resampling of the given data.
         :param frequency: The new frequency at which the data will be resampled.
@@ -142,13 +162,20 @@ class resamplingRunnable(QRunnable):
         :type file_data: MNE.Epochs/MNE.Raw
         :param events: The events.
         :type events: list of, list of int
+        :param resampling_method: Method used for the resampling, either FFT or polyphase.
+        :type resampling_method: str
+        :param n_jobs: Number of parallel jobs (processes for the FFT, threads for the polyphase) used for the resampling.
+        :type n_jobs: int
         """
         super().__init__()
         self.signals = resamplingWorkerSignals()
         self.frequency = frequency
         self.file_data = file_data
         self.events = events
+        self.resampling_method = resampling_method
+        self.n_jobs = n_jobs
 
+    @profiled
     def run(self):
         """
         Launch the computation of the resampling on the given data.
@@ -157,16 +184,19 @@ class resamplingRunnable(QRunnable):
         try:
             old_frequency = self.file_data.info.get("sfreq")
             new_frequency = self.frequency
-            self.file_data.resample(new_frequency)
+            if self.resampling_method == "polyphase":
+                self.file_data = resample_data(self.file_data, new_frequency, self.n_jobs)
+            else:
+                self.file_data.resample(new_frequency, n_jobs=self.n_jobs)
 
-            for i in range(0, len(self.events)):
-                self.events[i][0] = self.events[i][0] * (new_frequency / old_frequency)
+            self.events = eventTable(self.events, {}).rescale_latencies(new_frequency / old_frequency).to_array()
 
             self.signals.finished.emit()
         except Exception as error:
             error_message = "An error has occurred during the resampling."
             error_window = errorWindow(error_message=error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     """
@@ -196,6 +226,22 @@ class resamplingRunnable(QRunnable):
         """
         return self.frequency
 
+    def get_resampling_method(self):
+        """
+        Get the method used for the resampling.
+        :return: The method used for the resampling, either FFT or polyphase.
+        :rtype: str
+        """
+        return self.resampling_method
+
+    def get_n_jobs(self):
+        """
+        Get the number of parallel jobs used for the resampling.
+        :return: The number of jobs.
+        :rtype: int
+        """
+        return self.n_jobs
+
 
 # Re-referencing
 class reReferencingWorkerSignals(QObject):
@@ -237,19 +283,21 @@ class reReferencingRunnable(QRunnable):
         self.subject = "fsaverage"
         self.subjects_dir = get_project_freesurfer_path()
 
+    @profiled
     def run(self):
         """
         Launch the computation of the re-referencing on the given data.
         Compute the forward solution and the necessary information for the computation of the re-referencing to the point
-        in infinity, which requires some information of the source space to be done.
+        in infinity, which requires some information of the source space to be done. The re-referencing matrix obtained
+        is kept for the montage, the forward solution is only computed again for another montage or if it must be saved.
         Notifies the main model that the computation is finished.
         """
         try:
             if self.references == "infinity":
-                src = self.compute_source_space()
-                bem = self.compute_bem_solution()
-                fwd = self.compute_forward_solution(src, bem)
-                self.file_data.set_eeg_reference('REST', forward=fwd)
+                forward_origin = self.file_path if self.read_files else self.subject
+                rest_matrix = get_rest_operator(self.file_data.info, self.compute_forward_solution_from_scratch,
+                                                forward_origin, recompute=self.write_files)
+                apply_rest_operator(self.file_data, rest_matrix)
             else:
                 self.file_data.set_eeg_reference(ref_channels=self.references)
             self.signals.finished.emit()
@@ -257,8 +305,20 @@ class reReferencingRunnable(QRunnable):
             error_message = "An error has occurred during the computation of the re-referencing."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
+    def compute_forward_solution_from_scratch(self):
+        """
+        Compute the source space, the BEM solution and then the forward solution of the given data.
+        :return: The forward solution.
+        :rtype: MNE.Forward
+        """
+        src = self.compute_source_space()
+        bem = self.compute_bem_solution()
+        return self.compute_forward_solution(src, bem)
+
+    @profiled
     def compute_source_space(self):
         """
         Compute the source space of the "fsaverage" model.
@@ -275,6 +335,7 @@ class reReferencingRunnable(QRunnable):
             write_source_spaces(self.file_path + "-src.fif", src, overwrite=True, verbose=False)
         return src
 
+    @profiled
     def compute_bem_solution(self):
         """
         Compute the BEM solution of the "fsaverage" model.
@@ -293,6 +354,7 @@ class reReferencingRunnable(QRunnable):
             write_bem_solution(self.file_path + "-bem-sol.fif", bem, overwrite=True, verbose=False)
         return bem
 
+    @profiled
     def compute_forward_solution(self, src, bem):
         """
         Compute the forward solution of the given data, based on the source space model of the "fsaverage" model.
@@ -367,45 +429,54 @@ class icaWorkerSignals(QObject):
 
 
 class icaRunnable(QRunnable):
-    def __init__(self, ica_method, file_data):
+    def __init__(self, ica_method, file_data, ica_parameters=None):
         """
         Runnable for the computation of the ICA decomposition of the given data.
+        Only the decomposition is computed, the data is not modified. The components are removed afterwards, with the
+        operator of the decomposition, so that the decomposition can be kept and another set of components removed.
         :param ica_method: Method used for performing the ICA decomposition
         :type ica_method: str
         :param file_data: MNE data of the dataset.
         :type file_data: MNE.Epochs/MNE.Raw
+        :param ica_parameters: The number of components and the parameters of the fast fit (decim, high_pass,
+        epochs_fraction, reject_by_annotation), see "fit_ica". If None, the decomposition is fitted on all the data.
+        :type ica_parameters: dict
         """
         super().__init__()
         self.signals = icaWorkerSignals()
         self.ica_method = ica_method
-        self.file_data = deepcopy(file_data)
+        self.file_data = file_data
+        if ica_parameters is None:
+            ica_parameters = {}
+        self.ica_parameters = ica_parameters
+        self.ica = None
 
+    @profiled
     def run(self):
         """
         Launch the computation of the ICA decomposition on the given data.
         Notifies the main model that the computation is finished.
         """
         try:
-            ica = ICA(method=self.ica_method)
-            ica.fit(self.file_data)
-            ica.apply(self.file_data)
+            self.ica = fit_ica(self.file_data, self.ica_method, **self.ica_parameters)
             self.signals.finished.emit()
         except Exception as error:
             error_message = "An error as occurred during the computation of the ICA."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     """
     Getters
     """
-    def get_file_data(self):
+    def get_ica(self):
         """
-        Get the file data.
-        :return: MNE data of the dataset.
-        :rtype: MNE.Epochs/MNE.Raw
+        Get the ICA decomposition, with its unmixing matrix, its PCA and the variance of its components.
+        :return: The fitted ICA.
+        :rtype: MNE.preprocessing.ICA
         """
-        return self.file_data
+        return self.ica
 
     def get_ica_method(self):
         """
@@ -415,6 +486,22 @@ class icaRunnable(QRunnable):
         """
         return self.ica_method
 
+    def get_ica_parameters(self):
+        """
+        Gets the number of components and the parameters of the fast fit of the ICA decomposition.
+        :return: The parameters.
+        :rtype: dict
+        """
+        return self.ica_parameters
+
+    def get_results(self):
+        """
+        Get the results of the ICA decomposition, to store them in the results store.
+        :return: The results, by name of their getter.
+        :rtype: dict
+        """
+        return {"ica": self.ica, "ica_method": self.ica_method, "ica_parameters": self.ica_parameters}
+
 
 # Extract Epochs
 class extractEpochsWorkerSignals(QObject):
@@ -426,7 +513,7 @@ class extractEpochsWorkerSignals(QObject):
 
 
 class extractEpochsRunnable(QRunnable):
-    def __init__(self, file_data, events, event_ids, tmin, tmax, trials_selected):
+    def __init__(self, file_data, events, event_ids, tmin, tmax, trials_selected, events_selected):
         """
         Runnable for the computation of the extraction of the epochs of the given data.
         :param file_data: MNE data of the dataset.
@@ -441,6 +528,9 @@ class extractEpochsRunnable(QRunnable):
         :type tmax: float
         :param trials_selected: The indexes of the trials selected for the computation
         :type trials_selected: list of int
+        :param events_selected: The names of the events of the trials selected, "all" if all the trials are selected, or
+        None if the trials are selected by their indexes.
+        :type events_selected: list of str/str
         """
         super().__init__()
         self.signals = extractEpochsWorkerSignals()
@@ -451,33 +541,25 @@ class extractEpochsRunnable(QRunnable):
         self.tmin = tmin
         self.tmax = tmax
         self.trials_selected = trials_selected
+        self.events_selected = events_selected
 
+    @profiled
     def run(self):
         """
         Launch the computation of the extraction of the epochs on the given data.
         Notifies the main model that the computation is finished.
         """
         try:
-            self.file_data = Epochs(self.file_data, events=self.events, event_id=self.event_ids, tmin=self.tmin,
-                                    tmax=self.tmax, preload=True)
-            self.transform_file_data_with_trials_selected()
+            self.file_data = extract_epochs(self.file_data, self.events, self.event_ids, self.tmin, self.tmax,
+                                            self.trials_selected)
             self.signals.finished.emit()
         except Exception as error:
             error_message = "An error has occurred during the epoch extraction"
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
-    def transform_file_data_with_trials_selected(self):
-        """
-        Create a mask to know which trial to keep and which one to remove for the computation.
-        Apply this mask on the data to keep only the trials/epochs selected by the user.
-        """
-        mask = [True for _ in range(len(self.file_data.events))]
-        for i in self.trials_selected:
-            mask[i] = False
-        self.file_data.drop(mask)
-
     """
     Getters
     """
@@ -489,6 +571,120 @@ class extractEpochsRunnable(QRunnable):
         """
         return self.file_data
 
+    def get_parameters(self):
+        """
+        Get the parameters used for the extraction of the epochs. The trials are recorded by the names of their events,
+        so that the indexes are found again in each dataset, unless they were selected by their indexes. The digest of
+        the events and the event ids identify the events the epochs are extracted from.
+        :return: The start and end time of the epochs, the events or the trials selected, the digest of the events and
+        the event ids.
+        :rtype: dict
+        """
+        parameters = {"tmin": self.tmin, "tmax": self.tmax,
+                      "events_digest": eventTable(self.events, self.event_ids or {}).get_digest(),
+                      "event_ids": self.event_ids}
+        if self.events_selected is not None:
+            parameters["events_selected"] = self.events_selected
+        else:
+            parameters["trials_selected"] = self.trials_selected
+        return parameters
+
+
+# Artifact rejection
+class artifactRejectionWorkerSignals(QObject):
+    """
+    Contain the signals used by the artifact rejection runnable.
+    """
+    finished = pyqtSignal()
+    error = pyqtSignal()
+
+
+class artifactRejectionRunnable(QRunnable):
+    def __init__(self, file_data, peak_to_peak_threshold, variance_threshold, flat_threshold, adaptive):
+        """
+        Runnable for the computation of the epochs rejected because of artifacts. The data itself is not modified.
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Epochs
+        :param peak_to_peak_threshold: Maximum peak-to-peak amplitude, in volts. If None, not used.
+        :type peak_to_peak_threshold: float
+        :param variance_threshold: Maximum variance, in volts squared. If None, not used.
+        :type variance_threshold: float
+        :param flat_threshold: Minimum peak-to-peak amplitude, in volts. If None, not used.
+        :type flat_threshold: float
+        :param adaptive: Compute the peak-to-peak threshold by cross-validation instead of using the one given.
+        :type adaptive: bool
+        """
+        super().__init__()
+        self.signals = artifactRejectionWorkerSignals()
+
+        self.file_data = file_data
+        self.peak_to_peak_threshold = peak_to_peak_threshold
+        self.variance_threshold = variance_threshold
+        self.flat_threshold = flat_threshold
+        self.adaptive = adaptive
+
+        self.keep_mask = None
+        self.rejected_counts = None
+
+    @profiled
+    def run(self):
+        """
+        Launch the computation of the statistics of the epochs and of the mask of the epochs kept.
+        Notifies the main model that the computation is finished.
+        """
+        try:
+            data, peak_to_peak, variance = compute_epochs_statistics(self.file_data)
+            if self.adaptive:
+                self.peak_to_peak_threshold = compute_adaptive_threshold(data, peak_to_peak)
+            self.keep_mask, self.rejected_counts = compute_keep_mask(peak_to_peak, variance,
+                                                                     self.peak_to_peak_threshold,
+                                                                     self.variance_threshold, self.flat_threshold)
+            self.signals.finished.emit()
+        except Exception as error:
+            error_message = "An error has occurred during the artifact rejection."
+            error_window = errorWindow(error_message, detailed_message=str(error))
+            error_window.show()
+            record_step_error()
+            self.signals.error.emit()
+
+    """
+    Getters
+    """
+    def get_keep_mask(self):
+        """
+        Get the mask of the epochs kept.
+        :return: True for the epochs kept, False for the epochs rejected.
+        :rtype: numpy.ndarray
+        """
+        return self.keep_mask
+
+    def get_rejected_counts(self):
+        """
+        Get the number of epochs rejected by each criterion.
+        :return: The number of epochs rejected for the peak-to-peak amplitude, the variance and the flatness.
+        :rtype: dict
+        """
+        return self.rejected_counts
+
+    def get_peak_to_peak_threshold(self):
+        """
+        Get the peak-to-peak threshold used, computed by cross-validation in the adaptive mode.
+        :return: The peak-to-peak threshold, in volts.
+        :rtype: float
+        """
+        return self.peak_to_peak_threshold
+
+    def get_parameters(self):
+        """
+        Get the parameters used for the artifact rejection. In the adaptive mode, the peak-to-peak threshold is not
+        recorded, it is computed again on each dataset.
+        :return: The thresholds and the adaptive mode.
+        :rtype: dict
+        """
+        return {"peak_to_peak_threshold": None if self.adaptive else self.peak_to_peak_threshold,
+                "variance_threshold": self.variance_threshold, "flat_threshold": self.flat_threshold,
+                "adaptive": self.adaptive}
+
 
 # SNR
 class signalToNoiseRatioWorkerSignals(QObject):
@@ -536,6 +732,7 @@ class signalToNoiseRatioRunnable(QRunnable):
 
         self.SNRs = []
 
+    @profiled
     def run(self):
         """
         Launch the computation of the SNR
@@ -543,16 +740,17 @@ class signalToNoiseRatioRunnable(QRunnable):
         Notifies the main model when an error occurs.
         """
         try:
-            mask = self.create_mask_from_indexes_to_keep()
-            self.file_data = self.file_data.drop(mask)
+            self.file_data = select_epochs(self.file_data, self.trials_selected)
             self.compute_all_SNRs()
             self.signals.finished.emit()
         except Exception as error:
             error_message = "An error as occurred during the computation of the SNR."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
+    @profiled
     def compute_all_SNRs(self):
         """
         Launch all the SNR methods selected by the user.
@@ -948,6 +1146,7 @@ class signalToNoiseRatioRunnable(QRunnable):
         else:
             return self.compute_estimate_SNR(evoked, inv)
 
+    @profiled
     def compute_estimate_SNR(self, evoked, inv):
         print("Compute estimate SNR")
 
@@ -968,6 +1167,7 @@ class signalToNoiseRatioRunnable(QRunnable):
         inv = self.compute_inverse_operator(fwd, noise_cov)
         return inv
 
+    @profiled
     def compute_noise_covariance(self):
         print("Compute noise covariance")
         noise_cov = compute_covariance(self.file_data, tmax=0., method=['shrunk', 'empirical'], verbose=False)
@@ -975,6 +1175,7 @@ class signalToNoiseRatioRunnable(QRunnable):
             noise_cov.save(self.file_path + "-cov.fif")
         return noise_cov
 
+    @profiled
     def compute_source_space(self):
         print("Compute source space")
         src = setup_source_space(self.subject, spacing='oct6', add_dist='patch', subjects_dir=self.subjects_dir, verbose=False)
@@ -982,6 +1183,7 @@ class signalToNoiseRatioRunnable(QRunnable):
             write_source_spaces(self.file_path + "-src.fif", src, overwrite=True, verbose=False)
         return src
 
+    @profiled
     def compute_bem_solution(self):
         print("Compute bem solution")
         conductivity = (0.3, 0.006, 0.3)  # for three layers
@@ -991,6 +1193,7 @@ class signalToNoiseRatioRunnable(QRunnable):
             write_bem_solution(self.file_path + "-bem-sol.fif", bem, overwrite=True, verbose=False)
         return bem
 
+    @profiled
     def compute_forward_solution(self, src, bem):
         print("Compute forward solution")
         fwd = make_forward_solution(self.file_data.info, trans='fsaverage', src=src, bem=bem, meg=False, eeg=True, mindist=5.0, n_jobs=1,
@@ -999,6 +1202,7 @@ class signalToNoiseRatioRunnable(QRunnable):
             write_forward_solution(self.file_path + "-fwd.fif", fwd, overwrite=True, verbose=False)
         return fwd
 
+    @profiled
     def compute_inverse_operator(self, fwd, noise_cov):
         print("Compute inverse operator")
         inverse_operator = make_inverse_operator(self.file_data.info, fwd, noise_cov, loose=0.2, depth=0.8, verbose=False)
@@ -1016,17 +1220,6 @@ class signalToNoiseRatioRunnable(QRunnable):
     def root_mean_squared(self, data, axis=0):
         return np.sqrt(self.mean_squared(data, axis=axis))
 
-    def create_mask_from_indexes_to_keep(self):
-        """
-        Create a mask to know which trial to keep and which one to remove for the computation.
-        :return mask: Mask of trials to remove. True means remove, and False means keep.
-        :rtype mask: list of boolean
-        """
-        mask = [True for _ in range(len(self.file_data.events))]
-        for i in self.trials_selected:
-            mask[i] = False
-        return mask
-
     def pretty_print_SNRs(self, SNRs, all_methods=False, means=True):
         if all_methods:
             print("=====\nAll methods complete SNRs :\n")
@@ -1113,6 +1306,7 @@ class sourceEstimationRunnable(QRunnable):
 
         self.source_estimation_data = None
 
+    @profiled
     def run(self):
         """
         Launch the computation of the source estimation.
@@ -1132,11 +1326,13 @@ class sourceEstimationRunnable(QRunnable):
             detailed_message = str(error)
             error_window = errorWindow(error_message, detailed_message)
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
         except Exception as error:
             error_message = "An error as occurred during the computation of the source estimation."
             error_window = errorWindow(error_message, detailed_message=str(error))
             error_window.show()
+            record_step_error()
             self.signals.error.emit()
 
     """
@@ -1182,6 +1378,7 @@ class sourceEstimationRunnable(QRunnable):
             stc = self.compute_inverse_averaged(inv)
         return stc
 
+    @profiled
     def compute_inverse_single_trial(self, inv):
         """
         Apply the inverse operator on a single signal of the given data.
@@ -1199,6 +1396,7 @@ class sourceEstimationRunnable(QRunnable):
                                    nave=evoked.nave, verbose=False)[0]
         return stc
 
+    @profiled
     def compute_inverse_evoked(self, inv):
         """
         Apply the inverse operator on the evoked signal of the given data.
@@ -1208,14 +1406,14 @@ class sourceEstimationRunnable(QRunnable):
         :rtype: MNE.SourceEstimate
         """
         print("Apply inverse on evoked data")
-        mask = self.create_mask_from_indexes_to_keep()
-        data = self.file_data.drop(mask)
+        data = select_epochs(self.file_data, self.trials_selected)
         evoked = data.average()
         snr = 3.0
         lambda2 = 1.0 / snr ** 2
         stc = apply_inverse(evoked, inv, lambda2, method=self.source_estimation_method, pick_ori="normal", verbose=False)
         return stc
 
+    @profiled
     def compute_inverse_averaged(self, inv):
         """
         Apply the inverse operator on all the signals of the given data and then average to give the final result.
@@ -1225,8 +1423,7 @@ class sourceEstimationRunnable(QRunnable):
         :rtype: MNE.SourceEstimate
         """
         print("Apply inverse on all data averaged")
-        mask = self.create_mask_from_indexes_to_keep()
-        data = self.file_data.drop(mask)
+        data = select_epochs(self.file_data, self.trials_selected)
         evoked = data.average()
         snr = 3.0
         lambda2 = 1.0 / snr ** 2
@@ -1249,6 +1446,7 @@ class sourceEstimationRunnable(QRunnable):
         inv = self.compute_inverse_operator(fwd, noise_cov)
         return inv
 
+    @profiled
     def compute_noise_covariance(self):
         """
         Compute the noise covariance of the given data.
@@ -1261,6 +1459,7 @@ class sourceEstimationRunnable(QRunnable):
             noise_cov.save(self.file_path + "-cov.fif")
         return noise_cov
 
+    @profiled
     def compute_source_space(self):
         """
         Compute the source space of the "fsaverage" model.
@@ -1274,6 +1473,7 @@ class sourceEstimationRunnable(QRunnable):
             write_source_spaces(self.file_path + "-src.fif", src, overwrite=True, verbose=False)
         return src
 
+    @profiled
     def compute_bem_solution(self):
         """
         Compute the BEM solution of the "fsaverage" model.
@@ -1289,6 +1489,7 @@ class sourceEstimationRunnable(QRunnable):
             write_bem_solution(self.file_path + "-bem-sol.fif", bem, overwrite=True, verbose=False)
         return bem
 
+    @profiled
     def compute_forward_solution(self, src, bem):
         """
         Compute the forward solution of the given data, based on the source space model of the "fsaverage" model.
@@ -1306,6 +1507,7 @@ class sourceEstimationRunnable(QRunnable):
             write_forward_solution(self.file_path + "-fwd.fif", fwd, overwrite=True, verbose=False)
         return fwd
 
+    @profiled
     def compute_inverse_operator(self, fwd, noise_cov):
         """
         Compute the inverse operator of the given data, based on the forward solution and the noise covariance previously
@@ -1327,17 +1529,6 @@ class sourceEstimationRunnable(QRunnable):
     """
     Others
     """
-    def create_mask_from_indexes_to_keep(self):
-        """
-        Create a mask to know which trial to keep and which one to remove for the computation.
-        :return mask: Mask of trials to remove. True means remove, and False means keep.
-        :rtype mask: list of boolean
-        """
-        mask = [True for _ in range(len(self.file_data.events))]
-        for i in self.trials_selected:
-            mask[i] = False
-        return mask
-
     def check_data_export(self):
         """
         Check if the source estimation data must be exported.
@@ -1371,3 +1562,11 @@ class sourceEstimationRunnable(QRunnable):
         :rtype: MNE.SourceEstimate
         """
         return self.source_estimation_data
+
+    def get_results(self):
+        """
+        Get the results of the source estimation computation, to store them in the results store.
+        :return: The results, by name of their getter.
+        :rtype: dict
+        """
+        return {"source_estimation_data": self.source_estimation_data}
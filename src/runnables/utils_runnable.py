@@ -12,6 +12,8 @@ from PyQt5.QtCore import QRunnable, pyqtSignal, QObject
 from mne.datasets import fetch_fsaverage
 from mne.datasets.sample import data_path
 
+from utils.model.performance_profiler import profiled
+
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
 __credits__ = ["Lemahieu Antoine"]
@@ -37,6 +39,7 @@ class downloadFsaverageMneDataRunnable(QRunnable):
         super().__init__()
         self.signals = downloadFsaverageMneDataWorkerSignals()
 
+    @profiled
     def run(self):
         """
         Launch the computation of the filtering on the given data.
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the startup of the application: time until the main window is displayed, and the import time of each
+package, in the same way as "python -X importtime".
+Usage: python startup_benchmark.py [--repeat N] [--top N] [--offscreen]
+"""
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from time import perf_counter
+
+from utils.model.performance_profiler import get_median
+
+CONST_PHASES = ["qt", "import_main_controller", "create_main_controller", "show", "total"]
+
+
+def measure_time_to_window():
+    """
+    Starts the application, in this process, and measures each phase until the main window is displayed.
+    Prints the durations of the phases, in seconds, as JSON.
+    """
+    start = perf_counter()
+    durations = {}
+
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+    durations["qt"] = perf_counter() - start
+
+    phase_start = perf_counter()
+    from main_controller import mainController
+    durations["import_main_controller"] = perf_counter() - phase_start
+
+    phase_start = perf_counter()
+    main_controller = mainController(app.primaryScreen().size())
+    durations["create_main_controller"] = perf_counter() - phase_start
+
+    phase_start = perf_counter()
+    main_controller.show()
+
+    def window_displayed():
+        durations["show"] = perf_counter() - phase_start
+        durations["total"] = perf_counter() - start
+        print(json.dumps(durations))
+        app.quit()
+
+    QTimer.singleShot(0, window_displayed)      # Called once the event loop has displayed the window
+    app.exec()
+
+
+def measure_import_times(module):
+    """
+    Imports a module in a new interpreter with "-X importtime" and sums the import time of each top-level package.
+    :param module: The name of the module imported.
+    :type module: str
+    :return: The import time of each top-level package, in seconds, and the total import time.
+    :rtype: (dict, float)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module], capture_output=True,
+                            text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    packages = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(self_time) / 1e6
+        total += int(self_time) / 1e6
+    return packages, total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the startup time of MNE Vision.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of startups measured.")
+    parser.add_argument("--top", type=int, default=15, help="Number of packages displayed.")
+    parser.add_argument("--offscreen", action="store_true", help="Use the offscreen Qt platform (no display needed).")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.child:
+        measure_time_to_window()
+        sys.exit(0)
+
+    environment = dict(os.environ)
+    if arguments.offscreen:
+        environment["QT_QPA_PLATFORM"] = "offscreen"
+
+    runs = []
+    for _ in range(arguments.repeat):
+        start = perf_counter()
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"], capture_output=True, text=True,
+                               env=environment, cwd=os.path.dirname(os.path.abspath(__file__)))
+        process_time = perf_counter() - start
+        if child.returncode != 0:
+            sys.exit("The application could not be started:\n" + child.stderr)
+        durations = json.loads(child.stdout.strip().splitlines()[-1])
+        durations["process"] = process_time    # Including the start of the interpreter and its exit
+        runs.append(durations)
+
+    print("Time to window (median of " + str(arguments.repeat) + " startups):")
+    for phase in CONST_PHASES + ["process"]:
+        print("    " + phase.ljust(26) + "{:.3f}".format(get_median([run[phase] for run in runs])) + " s")
+
+    packages, total = measure_import_times("main_controller")
+    print("Import time of \"main_controller\": " + "{:.3f}".format(total) + " s, slowest packages:")
+    for package, duration in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:arguments.top]:
+        print("    " + package.ljust(26) + "{:.3f}".format(duration) + " s")
@@ -18,6 +18,7 @@ from scipy.stats import ttest_ind
 
 from utils.view.separator import create_layout_separator
 from utils.elements_selector.elements_selector_controller import multipleSelectorController
+from utils.model.event_table import eventTable
 from utils.view.error_window import errorWindow
 
 __author__ = "Lemahieu Antoine"
@@ -242,15 +243,9 @@ class statisticsErpView(QWidget):
         """
         Create a mask to know which trial to keep and which one to remove for the computation.
         :return mask: Mask of trials to remove. True means remove, and False means keep.
-        :rtype mask: list of boolean
+        :rtype mask: numpy.ndarray
         """
-        mask = [True for _ in range(len(file_data.events))]
-        event_ids = file_data.event_id
-        event_id_to_keep = event_ids[stats_variable]
-        for i, event in enumerate(file_data.events):
-            if event[2] == event_id_to_keep:        # 2 is the event id in the events
-                mask[i] = False
-        return mask
+        return eventTable.from_file_data(file_data).get_drop_mask(stats_variable)
 
     """
     Setters
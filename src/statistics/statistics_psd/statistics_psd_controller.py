@@ -68,19 +68,19 @@ class statisticsPsdController(statisticsPsdListener):
                                                       topo_time_points, channel_selected, stats_first_variable, stats_second_variable)
         self.statistics_psd_view.close()
 
-    def plot_psd(self, psd_fig_one, topo_fig_one, psd_fig_two, topo_fig_two):
+    def plot_psd(self, psd_one, psd_two, topo_time_points, channel_selected):
         """
         Send the information to the view for plotting the power spectral density computed.
-        :param psd_fig_one: The figure of the actual power spectral density's data computed on the first independent variable
-        :type psd_fig_one: matplotlib.Figure
-        :param topo_fig_one: The figure of the topographies of the actual power spectral density's data computed on the first independent variable
-        :type topo_fig_one: matplotlib.Figure
-        :param psd_fig_two: The figure of the actual power spectral density's data computed on the second independent variable
-        :type psd_fig_two: matplotlib.Figure
-        :param topo_fig_two: The figure of the topographies of the actual power spectral density's data computed on the second independent variable
-        :type topo_fig_two: matplotlib.Figure
+        :param psd_one: The power spectral density computed on the first independent variable
+        :type psd_one: powerSpectralDensity
+        :param psd_two: The power spectral density computed on the second independent variable
+        :type psd_two: powerSpectralDensity
+        :param topo_time_points: The time points for the topomaps.
+        :type topo_time_points: list of float
+        :param channel_selected: Channel selected for the PSD.
+        :type channel_selected: str
         """
-        self.statistics_psd_view.plot_psd(psd_fig_one, topo_fig_one, psd_fig_two, topo_fig_two)
+        self.statistics_psd_view.plot_psd(psd_one, psd_two, topo_time_points, channel_selected)
 
     """
     Getters
@@ -14,6 +14,7 @@ from scipy.stats import ttest_ind, ttest_1samp
 
 from utils.elements_selector.elements_selector_controller import multipleSelectorController
 from utils.view.error_window import errorWindow
+from utils.view.psd_figures import create_psd_figure, create_topographies_figure
 from utils.view.separator import create_layout_separator
 
 __author__ = "Lemahieu Antoine"
@@ -227,46 +228,33 @@ class statisticsPsdView(QWidget):
     Plots
     """
     @staticmethod
-    def plot_psd(psd_fig_one, topo_fig_one, psd_fig_two, topo_fig_two):
+    def plot_psd(psd_one, psd_two, topo_time_points, channel_selected):
         """
         Plot the power spectral density.
-        :param psd_fig_one: The figure of the actual power spectral density's data computed on the first independent variable
-        :type psd_fig_one: matplotlib.Figure
-        :param topo_fig_one: The figure of the topographies of the actual power spectral density's data computed on the first independent variable
-        :type topo_fig_one: matplotlib.Figure
-        :param psd_fig_two: The figure of the actual power spectral density's data computed on the second independent variable
-        :type psd_fig_two: matplotlib.Figure
-        :param topo_fig_two: The figure of the topographies of the actual power spectral density's data computed on the second independent variable
-        :type topo_fig_two: matplotlib.Figure
+        The figures are created from the spectra already computed, and the statistics use the spectrum of every epoch.
+        :param psd_one: The power spectral density computed on the first independent variable
+        :type psd_one: powerSpectralDensity
+        :param psd_two: The power spectral density computed on the second independent variable
+        :type psd_two: powerSpectralDensity
+        :param topo_time_points: The time points for the topomaps.
+        :type topo_time_points: list of float
+        :param channel_selected: Channel selected for the PSD.
+        :type channel_selected: str
         """
         try:
             # First Variable
-            psd_fig_one.axes[0].set_title("Power spectral density - First independent variable")
-            psd_fig_one.show()
-            topo_fig_one.suptitle("PSD Topographies - First independent variable")
-            topo_fig_one.show()
+            create_psd_figure(psd_one, channel_selected, "Power spectral density - First independent variable").show()
+            create_topographies_figure(psd_one, topo_time_points, "PSD Topographies - First independent variable").show()
             # Second variable
-            psd_fig_two.axes[0].set_title("Power spectral density - Second independent variable")
-            psd_fig_two.show()
-            topo_fig_two.suptitle("PSD Topographies - Second independent variable")
-            topo_fig_two.show()
+            create_psd_figure(psd_two, channel_selected, "Power spectral density - Second independent variable").show()
+            create_topographies_figure(psd_two, topo_time_points, "PSD Topographies - Second independent variable").show()
 
             # Stats
-            psd_one_data = psd_fig_one.axes[0].lines[2].get_ydata()
-            psd_two_data = psd_fig_two.axes[0].lines[2].get_ydata()
-            # Get the first axis corresponding to the main plot, then the line 2 is the plotted psd data (0 and 1 are the axis).
+            psd_one_data = psd_one.get_epochs_db(channel_selected)     # Shape (epochs, frequencies)
+            psd_two_data = psd_two.get_epochs_db(channel_selected)
+            t_values, p_values = ttest_ind(psd_one_data, psd_two_data, axis=0, nan_policy="omit")
 
-            # t_values = ttest_ind_no_p(psd_one_data, psd_two_data)
-            # t_values = ttest_1samp_no_p(np.array([psd_one_data, psd_two_data]))
-
-            p_values = []
-            for i in range(len(psd_one_data)):
-                new_t_values, new_p_values = ttest_1samp(np.array([psd_one_data[i], psd_two_data[i]]), popmean=0.0, nan_policy="omit")
-                p_values.append(new_p_values)
-
-            print(p_values)
-
-            x = psd_fig_one.axes[0].lines[2].get_xdata()
+            x = psd_one.get_frequencies()
             # Plot
             fig, ax = plt.subplots()
             ax.plot(x, p_values)
@@ -7,7 +7,7 @@ Study Plots Controller
 
 from copy import copy
 
-from mne import combine_evoked, concatenate_epochs
+from mne import concatenate_epochs
 
 from plots.power_spectral_density.power_spectral_density_controller import powerSpectralDensityController
 from plots.time_frequency_ersp_itc.time_frequency_ersp_itc_controller import timeFrequencyErspItcController
@@ -75,11 +75,12 @@ class studyPlotsController(studyPlotsListener):
         :type subjects_selected: str/list of str
         """
         try:
-            all_file_data = self.study.get_selected_file_data_with_subjects(subjects_selected)
+            all_datasets = self.study.get_selected_datasets_with_subjects(subjects_selected)
+            summary_cache = self.study.get_dataset_summary_cache()
             all_evoked = []
-            for file_data in all_file_data:
-                all_evoked.append(file_data.average(picks=channels_selected))
-            evoked = combine_evoked(all_evoked, weights="nave")
+            for index, version, file_data in all_datasets:
+                all_evoked.append(summary_cache.get_evoked(index, version, file_data))
+            evoked = summary_cache.combine_evoked_summaries(all_evoked, channels_selected)
             self.study_plots_view.plot_erps(evoked)
         except Exception as error:
             error_message = "An error occurred during the computation of the ERPs, please try again."
@@ -146,9 +147,9 @@ class studyPlotsController(studyPlotsListener):
         """
         The computation of the power spectral density is completely done, plot it.
         """
-        psd_fig = self.study.get_psd_fig()
-        topo_fig = self.study.get_psd_topo_fig()
-        self.power_spectral_density_controller.plot_psd(psd_fig, topo_fig)
+        psd = self.study.get_psd()
+        topo_time_points = self.study.get_psd_topo_time_points()
+        self.power_spectral_density_controller.plot_psd(psd, topo_time_points, self.channels_selected)
 
     # ERP image
     def plot_erp_image_clicked(self, channels_selected, subjects_selected):
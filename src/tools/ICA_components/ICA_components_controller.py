@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ICA components controller
+"""
+
+from tools.ICA_components.ICA_components_view import icaComponentsView
+from tools.ICA_components.ICA_components_listener import icaComponentsListener
+
+from utils.view.error_window import errorWindow
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class icaComponentsController(icaComponentsListener):
+    def __init__(self, ica, file_data, exclude):
+        """
+        Controller for choosing the components of the ICA decomposition removed from the dataset.
+        Create a new window displaying the components.
+        :param ica: The fitted ICA.
+        :type ica: MNE.preprocessing.ICA
+        :param file_data: MNE data of the dataset that was decomposed.
+        :type file_data: MNE.Epochs/MNE.Raw
+        :param exclude: The components removed the last time the ICA was applied on this data.
+        :type exclude: list of int
+        """
+        self.main_listener = None
+
+        self.ica = ica
+        self.file_data = file_data
+
+        component_names = ["ICA" + str(i).zfill(3) for i in range(ica.n_components_)]
+        self.ica_components_view = icaComponentsView(component_names, exclude)
+        self.ica_components_view.set_listener(self)
+
+        self.ica_components_view.show()
+
+    def cancel_button_clicked(self):
+        """
+        Close the window. The decomposition is kept, it is not computed again if the ICA is opened again.
+        """
+        self.ica_components_view.close()
+
+    def confirm_button_clicked(self, exclude):
+        """
+        Close the window and send the information to the main controller.
+        :param exclude: The indexes of the components removed.
+        :type exclude: list of int
+        """
+        self.ica_components_view.close()
+        self.main_listener.ica_components_information(exclude)
+
+    def plot_sources_clicked(self):
+        """
+        Plot the time course of the components.
+        """
+        try:
+            self.ica.plot_sources(self.file_data, show=True)
+        except Exception as error:
+            error_message = "An error has occurred during the plotting of the sources of the components."
+            error_window = errorWindow(error_message, detailed_message=str(error))
+            error_window.show()
+
+    def plot_components_clicked(self):
+        """
+        Plot the topographies of the components. The channels locations of the dataset are needed.
+        """
+        try:
+            self.ica.plot_components(inst=self.file_data, show=True)
+        except Exception as error:
+            error_message = "An error has occurred during the plotting of the components, please check that the " \
+                            "channels locations are known."
+            error_window = errorWindow(error_message, detailed_message=str(error))
+            error_window.show()
+
+    """
+    Setters
+    """
+    def set_listener(self, listener):
+        """
+        Set the main listener so that the controller is able to communicate with the main controller.
+        :param listener: main listener
+        :type listener: mainController
+        """
+        self.main_listener = listener
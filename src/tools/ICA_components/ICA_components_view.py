@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ICA components view
+"""
+
+from PyQt5.QtWidgets import QWidget, QGridLayout, QVBoxLayout, QPushButton, QLabel, QCheckBox, QScrollArea
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class icaComponentsView(QWidget):
+    def __init__(self, component_names, exclude):
+        """
+        Window displaying the components of the ICA decomposition, to choose the ones removed from the data.
+        :param component_names: The names of the components.
+        :type component_names: list of str
+        :param exclude: The indexes of the components checked when the window is opened.
+        :type exclude: list of int
+        """
+        super().__init__()
+        self.ica_components_listener = None
+
+        self.setWindowTitle("ICA Components")
+
+        self.vertical_layout = QVBoxLayout()
+        self.setLayout(self.vertical_layout)
+
+        self.components_widget = QWidget()
+        self.components_layout = QVBoxLayout()
+        self.components_widget.setLayout(self.components_layout)
+        self.components_check_boxes = []
+        for i, component_name in enumerate(component_names):
+            check_box = QCheckBox(component_name)
+            check_box.setChecked(i in exclude)
+            self.components_layout.addWidget(check_box)
+            self.components_check_boxes.append(check_box)
+        self.components_scroll_area = QScrollArea()
+        self.components_scroll_area.setWidget(self.components_widget)
+        self.components_scroll_area.setWidgetResizable(True)
+
+        self.buttons_widget = QWidget()
+        self.buttons_layout = QGridLayout()
+        self.buttons_widget.setLayout(self.buttons_layout)
+        self.plot_sources = QPushButton("Plot &sources", self)
+        self.plot_sources.clicked.connect(self.plot_sources_trigger)
+        self.plot_components = QPushButton("Plot c&omponents", self)
+        self.plot_components.clicked.connect(self.plot_components_trigger)
+        self.cancel = QPushButton("&Cancel", self)
+        self.cancel.clicked.connect(self.cancel_ica_components_trigger)
+        self.confirm = QPushButton("&Confirm", self)
+        self.confirm.clicked.connect(self.confirm_ica_components_trigger)
+        self.buttons_layout.addWidget(self.plot_sources, 0, 0)
+        self.buttons_layout.addWidget(self.plot_components, 0, 1)
+        self.buttons_layout.addWidget(self.cancel, 1, 0)
+        self.buttons_layout.addWidget(self.confirm, 1, 1)
+
+        self.vertical_layout.addWidget(QLabel("Components removed from the data : "))
+        self.vertical_layout.addWidget(self.components_scroll_area)
+        self.vertical_layout.addWidget(self.buttons_widget)
+
+    """
+    Triggers
+    """
+    def plot_sources_trigger(self):
+        """
+        Send the information to the controller that the sources of the components must be plotted.
+        """
+        self.ica_components_listener.plot_sources_clicked()
+
+    def plot_components_trigger(self):
+        """
+        Send the information to the controller that the topographies of the components must be plotted.
+        """
+        self.ica_components_listener.plot_components_clicked()
+
+    def cancel_ica_components_trigger(self):
+        """
+        Send the information to the controller that the ICA is not applied.
+        """
+        self.ica_components_listener.cancel_button_clicked()
+
+    def confirm_ica_components_trigger(self):
+        """
+        Retrieve the components checked and send the information to the controller.
+        """
+        exclude = [i for i, check_box in enumerate(self.components_check_boxes) if check_box.isChecked()]
+        self.ica_components_listener.confirm_button_clicked(exclude)
+
+    """
+    Setters
+    """
+    def set_listener(self, listener):
+        """
+        Set the listener to the controller.
+        :param listener: Listener to the controller.
+        :type listener: icaComponentsController
+        """
+        self.ica_components_listener = listener
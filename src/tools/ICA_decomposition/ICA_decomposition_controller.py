@@ -35,14 +35,16 @@ class icaDecompositionController(icaDecompositionListener):
         """
         self.ica_decomposition_view.close()
 
-    def confirm_button_clicked(self, ica_method):
+    def confirm_button_clicked(self, ica_method, ica_parameters):
         """
         Close the window and send the information to the main controller.
         :param ica_method: Method used for performing the ICA decomposition
         :type ica_method: str
+        :param ica_parameters: The number of components and the parameters of the fast fit.
+        :type ica_parameters: dict
         """
         self.ica_decomposition_view.close()
-        self.main_listener.ica_decomposition_information(ica_method)
+        self.main_listener.ica_decomposition_information(ica_method, ica_parameters)
 
     """
     Setters
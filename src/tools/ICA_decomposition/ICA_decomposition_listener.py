@@ -27,5 +27,5 @@ class icaDecompositionListener(ABC):
         pass
 
     @abstractmethod
-    def confirm_button_clicked(self, ica_method):
+    def confirm_button_clicked(self, ica_method, ica_parameters):
         pass
@@ -5,7 +5,7 @@
 ICA decomposition view
 """
 
-from PyQt5.QtWidgets import QWidget, QGridLayout, QComboBox, QPushButton, QLabel
+from PyQt5.QtWidgets import QWidget, QGridLayout, QComboBox, QPushButton, QLabel, QSpinBox, QCheckBox
 
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
@@ -15,6 +15,9 @@ __maintainer__ = "Lemahieu Antoine"
 __email__ = "Antoine.Lemahieu@ulb.be"
 __status__ = "Dev"
 
+CONST_FAST_FIT_DECIMATION = 3
+CONST_FAST_FIT_HIGH_PASS = 1.0
+
 
 class icaDecompositionView(QWidget):
     def __init__(self):
@@ -32,6 +35,27 @@ class icaDecompositionView(QWidget):
         self.method_selection = QComboBox()
         self.method_selection.addItems(["fastica", "infomax", "picard"])
 
+        self.n_components_spinbox = QSpinBox()
+        self.n_components_spinbox.setRange(0, 1024)
+        self.n_components_spinbox.setSpecialValueText("All")     # 0 keeps all the PCA components
+
+        # The fast fit is done on a reduced copy of the data, the decomposition obtained is applied to the whole data.
+        self.fast_fit_check_box = QCheckBox("Fast fit")
+        self.fast_fit_check_box.stateChanged.connect(self.fast_fit_trigger)
+        self.decimation_spinbox = QSpinBox()
+        self.decimation_spinbox.setRange(1, 100)
+        self.decimation_spinbox.setValue(CONST_FAST_FIT_DECIMATION)
+        self.high_pass_check_box = QCheckBox("High-pass at " + "{:g}".format(CONST_FAST_FIT_HIGH_PASS) + " Hz")
+        self.high_pass_check_box.setChecked(True)
+        self.epochs_percentage_spinbox = QSpinBox()
+        self.epochs_percentage_spinbox.setRange(1, 100)
+        self.epochs_percentage_spinbox.setValue(100)
+        self.epochs_percentage_spinbox.setSuffix(" %")
+        self.fast_fit_trigger()
+
+        self.reject_by_annotation_check_box = QCheckBox("Ignore the segments annotated as bad")
+        self.reject_by_annotation_check_box.setChecked(True)
+
         self.cancel = QPushButton("&Cancel", self)
         self.cancel.clicked.connect(self.cancel_ica_decomposition_trigger)
         self.confirm = QPushButton("&Confirm", self)
@@ -39,12 +63,30 @@ class icaDecompositionView(QWidget):
 
         self.grid_layout.addWidget(QLabel("ICA decomposition method : "), 0, 0)
         self.grid_layout.addWidget(self.method_selection, 0, 1)
-        self.grid_layout.addWidget(self.cancel, 1, 0)
-        self.grid_layout.addWidget(self.confirm, 1, 1)
+        self.grid_layout.addWidget(QLabel("Number of components : "), 1, 0)
+        self.grid_layout.addWidget(self.n_components_spinbox, 1, 1)
+        self.grid_layout.addWidget(self.reject_by_annotation_check_box, 2, 0, 1, 2)
+        self.grid_layout.addWidget(self.fast_fit_check_box, 3, 0, 1, 2)
+        self.grid_layout.addWidget(QLabel("Decimation : "), 4, 0)
+        self.grid_layout.addWidget(self.decimation_spinbox, 4, 1)
+        self.grid_layout.addWidget(self.high_pass_check_box, 5, 0, 1, 2)
+        self.grid_layout.addWidget(QLabel("Epochs used (epoched data) : "), 6, 0)
+        self.grid_layout.addWidget(self.epochs_percentage_spinbox, 6, 1)
+        self.grid_layout.addWidget(self.cancel, 7, 0)
+        self.grid_layout.addWidget(self.confirm, 7, 1)
 
     """
     Triggers
     """
+    def fast_fit_trigger(self):
+        """
+        Enable the parameters of the fast fit only when it is selected.
+        """
+        enabled = self.fast_fit_check_box.isChecked()
+        self.decimation_spinbox.setEnabled(enabled)
+        self.high_pass_check_box.setEnabled(enabled)
+        self.epochs_percentage_spinbox.setEnabled(enabled)
+
     def cancel_ica_decomposition_trigger(self):
         """
         Send the information to the controller that the computation is cancelled.
@@ -56,7 +98,16 @@ class icaDecompositionView(QWidget):
         Retrieve the parameters and send the information to the controller.
         """
         ica_method = self.method_selection.currentText()
-        self.ica_decomposition_listener.confirm_button_clicked(ica_method)
+        n_components = self.n_components_spinbox.value()
+        ica_parameters = {"n_components": n_components if n_components > 0 else None,
+                          "reject_by_annotation": self.reject_by_annotation_check_box.isChecked()}
+        if self.fast_fit_check_box.isChecked():
+            ica_parameters["decim"] = self.decimation_spinbox.value()
+            if self.high_pass_check_box.isChecked():
+                ica_parameters["high_pass"] = CONST_FAST_FIT_HIGH_PASS
+            if self.epochs_percentage_spinbox.value() < 100:
+                ica_parameters["epochs_fraction"] = self.epochs_percentage_spinbox.value() / 100
+        self.ica_decomposition_listener.confirm_button_clicked(ica_method, ica_parameters)
 
     """
     Setters
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Artifact rejection controller
+"""
+
+from tools.artifact_rejection.artifact_rejection_listener import artifactRejectionListener
+from tools.artifact_rejection.artifact_rejection_view import artifactRejectionView
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class artifactRejectionController(artifactRejectionListener):
+    def __init__(self):
+        """
+        Controller for rejecting the epochs with artifacts.
+        Create a new window for specifying the thresholds.
+        """
+        self.main_listener = None
+        self.artifact_rejection_view = artifactRejectionView()
+        self.artifact_rejection_view.set_listener(self)
+
+        self.artifact_rejection_view.show()
+
+    def cancel_button_clicked(self):
+        """
+        Close the window.
+        """
+        self.artifact_rejection_view.close()
+
+    def confirm_button_clicked(self, peak_to_peak_threshold, variance_threshold, flat_threshold, adaptive):
+        """
+        Close the window and send the information to the main controller.
+        :param peak_to_peak_threshold: Maximum peak-to-peak amplitude, in volts. If None, not used.
+        :type peak_to_peak_threshold: float
+        :param variance_threshold: Maximum variance, in volts squared. If None, not used.
+        :type variance_threshold: float
+        :param flat_threshold: Minimum peak-to-peak amplitude, in volts. If None, not used.
+        :type flat_threshold: float
+        :param adaptive: Compute the peak-to-peak threshold by cross-validation.
+        :type adaptive: bool
+        """
+        self.artifact_rejection_view.close()
+        self.main_listener.artifact_rejection_information(peak_to_peak_threshold, variance_threshold, flat_threshold,
+                                                          adaptive)
+
+    """
+    Setters
+    """
+    def set_listener(self, listener):
+        """
+        Set the main listener so that the controller is able to communicate with the main controller.
+        :param listener: main listener
+        :type listener: mainController
+        """
+        self.main_listener = listener
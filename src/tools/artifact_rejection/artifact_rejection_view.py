@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Artifact rejection view
+"""
+
+from PyQt5.QtGui import QDoubleValidator
+from PyQt5.QtWidgets import QWidget, QGridLayout, QLineEdit, QPushButton, QLabel, QCheckBox, QHBoxLayout, QVBoxLayout
+
+from utils.view.separator import create_layout_separator
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class artifactRejectionView(QWidget):
+    def __init__(self):
+        """
+        Window displaying the thresholds for rejecting the epochs with artifacts.
+        """
+        super().__init__()
+        self.artifact_rejection_listener = None
+
+        self.setWindowTitle("Artifact Rejection")
+
+        self.vertical_layout = QVBoxLayout()
+        self.setLayout(self.vertical_layout)
+
+        # Thresholds, an unchecked threshold is not used
+        self.thresholds_widget = QWidget()
+        self.thresholds_layout = QGridLayout()
+        self.peak_to_peak_check_box = QCheckBox("Maximum peak-to-peak (µV) : ")
+        self.peak_to_peak_check_box.setChecked(True)
+        self.peak_to_peak_line = QLineEdit("150,0")
+        self.peak_to_peak_line.setValidator(QDoubleValidator())
+        self.adaptive_check_box = QCheckBox("Adaptive peak-to-peak threshold (cross-validated)")
+        self.adaptive_check_box.stateChanged.connect(self.adaptive_trigger)
+        self.variance_check_box = QCheckBox("Maximum variance (µV²) : ")
+        self.variance_line = QLineEdit("1000,0")
+        self.variance_line.setValidator(QDoubleValidator())
+        self.flat_check_box = QCheckBox("Minimum peak-to-peak, flat channel (µV) : ")
+        self.flat_check_box.setChecked(True)
+        self.flat_line = QLineEdit("1,0")
+        self.flat_line.setValidator(QDoubleValidator())
+        self.thresholds_layout.addWidget(self.peak_to_peak_check_box, 0, 0)
+        self.thresholds_layout.addWidget(self.peak_to_peak_line, 0, 1)
+        self.thresholds_layout.addWidget(self.adaptive_check_box, 1, 0, 1, 2)
+        self.thresholds_layout.addWidget(self.variance_check_box, 2, 0)
+        self.thresholds_layout.addWidget(self.variance_line, 2, 1)
+        self.thresholds_layout.addWidget(self.flat_check_box, 3, 0)
+        self.thresholds_layout.addWidget(self.flat_line, 3, 1)
+        self.thresholds_widget.setLayout(self.thresholds_layout)
+
+        self.cancel_confirm_widget = QWidget()
+        self.cancel_confirm_layout = QHBoxLayout()
+        self.cancel = QPushButton("&Cancel", self)
+        self.cancel.clicked.connect(self.cancel_artifact_rejection_trigger)
+        self.confirm = QPushButton("&Confirm", self)
+        self.confirm.clicked.connect(self.confirm_artifact_rejection_trigger)
+        self.cancel_confirm_layout.addWidget(self.cancel)
+        self.cancel_confirm_layout.addWidget(self.confirm)
+        self.cancel_confirm_widget.setLayout(self.cancel_confirm_layout)
+
+        self.vertical_layout.addWidget(QLabel("The epochs rejected are ignored by the tools computed on the trials."))
+        self.vertical_layout.addWidget(self.thresholds_widget)
+        self.vertical_layout.addWidget(create_layout_separator())
+        self.vertical_layout.addWidget(self.cancel_confirm_widget)
+
+    """
+    Triggers
+    """
+    def adaptive_trigger(self):
+        """
+        The peak-to-peak threshold is not given when it is computed by cross-validation.
+        """
+        adaptive = self.adaptive_check_box.isChecked()
+        self.peak_to_peak_line.setEnabled(not adaptive)
+        if adaptive:
+            self.peak_to_peak_check_box.setChecked(True)
+
+    def cancel_artifact_rejection_trigger(self):
+        """
+        Send the information to the controller that the computation is cancelled.
+        """
+        self.artifact_rejection_listener.cancel_button_clicked()
+
+    def confirm_artifact_rejection_trigger(self):
+        """
+        Retrieve the thresholds, converted to volts, and send the information to the controller.
+        """
+        adaptive = self.adaptive_check_box.isChecked()
+        peak_to_peak_threshold = self.get_threshold(self.peak_to_peak_check_box, self.peak_to_peak_line, 1e-6)
+        variance_threshold = self.get_threshold(self.variance_check_box, self.variance_line, 1e-12)
+        flat_threshold = self.get_threshold(self.flat_check_box, self.flat_line, 1e-6)
+        self.artifact_rejection_listener.confirm_button_clicked(peak_to_peak_threshold, variance_threshold,
+                                                                flat_threshold, adaptive)
+
+    """
+    Getters
+    """
+    @staticmethod
+    def get_threshold(check_box, line, scale):
+        """
+        Get the value of a threshold.
+        :param check_box: The check box telling if the threshold is used.
+        :type check_box: QCheckBox
+        :param line: The line containing the value of the threshold.
+        :type line: QLineEdit
+        :param scale: The factor converting the value to volts.
+        :type scale: float
+        :return: The threshold. None if it is not used.
+        :rtype: float
+        """
+        if not check_box.isChecked() or not line.hasAcceptableInput():
+            return None
+        return float(line.text().replace(',', '.')) * scale
+
+    """
+    Setters
+    """
+    def set_listener(self, listener):
+        """
+        Set the listener to the controller.
+        :param listener: Listener to the controller.
+        :type listener: artifactRejectionController
+        """
+        self.artifact_rejection_listener = listener
@@ -41,16 +41,21 @@ class extractEpochsController(extractEpochsListener):
         """
         self.extract_epochs_view.close()
 
-    def confirm_button_clicked(self, tmin, tmax, trials_selected):
+    def confirm_button_clicked(self, tmin, tmax, trials_selected, events_selected):
         """
         Close the window and send the information to the main controller.
         :param tmin: Start time of the epoch to keep
         :type tmin: float
         :param tmax: End time of the epoch to keep
         :type tmax: float
+        :param trials_selected: The indexes of the trials selected for the computation
+        :type trials_selected: list of int
+        :param events_selected: The names of the events of the trials selected, "all" if all the trials are selected, or
+        None if the trials are selected by their indexes.
+        :type events_selected: list of str/str
         """
         self.extract_epochs_view.close()
-        self.main_listener.extract_epochs_information(tmin, tmax, trials_selected)
+        self.main_listener.extract_epochs_information(tmin, tmax, trials_selected, events_selected)
 
     """
     Getters
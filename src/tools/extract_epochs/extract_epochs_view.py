@@ -36,6 +36,7 @@ class extractEpochsView(QWidget):
         self.event_values = event_values
         self.event_ids = event_ids
         self.trials_selected = None
+        self.events_selected = "all"
 
         self.setWindowTitle("Extract Epochs")
 
@@ -110,7 +111,7 @@ class extractEpochsView(QWidget):
         else:
             trials_selected = self.trials_selected
 
-        self.extract_epochs_listener.confirm_button_clicked(tmin, tmax, trials_selected)
+        self.extract_epochs_listener.confirm_button_clicked(tmin, tmax, trials_selected, self.events_selected)
 
     def event_selection_indexes_trigger(self):
         """
@@ -156,9 +157,11 @@ class extractEpochsView(QWidget):
         """
         trials_to_use = []
         if element_type == "indexes":
+            self.events_selected = None     # Only valid for this dataset
             for trial in elements_selected:
                 trials_to_use.append(int(trial)-1)  # -1 To get index in the list, not "position"
         elif element_type == "events":
+            self.events_selected = elements_selected
             # Get ids of the events selected
             event_ids_selected = []
             for event in elements_selected:
@@ -37,7 +37,7 @@ class filterController(filterListener):
         """
         self.filter_view.close()
 
-    def confirm_button_clicked(self, low_frequency, high_frequency, channels_selected, filter_method):
+    def confirm_button_clicked(self, low_frequency, high_frequency, channels_selected, filter_method, n_jobs):
         """
         Close the window and send the information to the main controller.
         :param low_frequency: Lowest frequency from where the data will be filtered.
@@ -48,9 +48,11 @@ class filterController(filterListener):
         :type channels_selected: list of str
         :param filter_method: Method used for the filtering, either FIR or IIR.
         :type filter_method: str
+        :param n_jobs: Number of threads filtering the channels.
+        :type n_jobs: int
         """
         self.filter_view.close()
-        self.main_listener.filter_information(low_frequency, high_frequency, channels_selected, filter_method)
+        self.main_listener.filter_information(low_frequency, high_frequency, channels_selected, filter_method, n_jobs)
 
     """
     Getters
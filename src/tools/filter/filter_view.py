@@ -5,8 +5,12 @@
 Filter view
 """
 
+from multiprocessing import cpu_count
+
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QDoubleValidator
-from PyQt5.QtWidgets import QWidget, QLineEdit, QPushButton, QGridLayout, QLabel, QHBoxLayout, QVBoxLayout, QComboBox
+from PyQt5.QtWidgets import QWidget, QLineEdit, QPushButton, QGridLayout, QLabel, QHBoxLayout, QVBoxLayout, QComboBox, \
+    QSlider
 
 from utils.elements_selector.elements_selector_controller import multipleSelectorController
 from utils.view.separator import create_layout_separator
@@ -63,6 +67,21 @@ class filterView(QWidget):
         self.lines_layout.addWidget(self.high_frequency_line, 1, 1)
         self.lines_widget.setLayout(self.lines_layout)
 
+        # Number of jobs
+        self.n_jobs_widget = QWidget()
+        self.n_jobs_layout = QHBoxLayout()
+        self.n_jobs_slider = QSlider(Qt.Orientation.Horizontal, self)
+        self.n_jobs_slider.setMinimum(1)
+        self.n_jobs_slider.setMaximum(cpu_count())
+        self.n_jobs_slider.setValue(cpu_count())
+        self.n_jobs_slider.setSingleStep(1)
+        self.n_jobs_slider.valueChanged.connect(self.slider_value_changed_trigger)
+        self.n_jobs_label = QLabel(str(cpu_count()))
+        self.n_jobs_layout.addWidget(QLabel("Number of parallel jobs : "))
+        self.n_jobs_layout.addWidget(self.n_jobs_slider)
+        self.n_jobs_layout.addWidget(self.n_jobs_label)
+        self.n_jobs_widget.setLayout(self.n_jobs_layout)
+
         # Cancel Confirm
         self.cancel_confirm_widget = QWidget()
         self.cancel_confirm_layout = QHBoxLayout()
@@ -79,6 +98,8 @@ class filterView(QWidget):
         self.global_layout.addWidget(create_layout_separator())
         self.global_layout.addWidget(self.lines_widget)
         self.global_layout.addWidget(create_layout_separator())
+        self.global_layout.addWidget(self.n_jobs_widget)
+        self.global_layout.addWidget(create_layout_separator())
         self.global_layout.addWidget(self.cancel_confirm_widget)
         self.setLayout(self.global_layout)
 
@@ -104,7 +125,9 @@ class filterView(QWidget):
         if self.high_frequency_line.hasAcceptableInput():
             high_frequency = self.high_frequency_line.text()
             high_frequency = float(high_frequency.replace(',', '.'))
-        self.filter_listener.confirm_button_clicked(low_frequency, high_frequency, self.channels_selected, filter_method)
+        n_jobs = self.n_jobs_slider.value()
+        self.filter_listener.confirm_button_clicked(low_frequency, high_frequency, self.channels_selected, filter_method,
+                                                    n_jobs)
 
     def channels_selection_trigger(self):
         """
@@ -115,6 +138,13 @@ class filterView(QWidget):
         self.channels_selector_controller = multipleSelectorController(self.all_channels_names, title, box_checked=True)
         self.channels_selector_controller.set_listener(self.filter_listener)
 
+    def slider_value_changed_trigger(self):
+        """
+        Change the value of the slider displayed on the window when the actual slider is moved.
+        """
+        slider_value = self.n_jobs_slider.value()
+        self.n_jobs_label.setText(str(slider_value))
+
     """
     Setters
     """
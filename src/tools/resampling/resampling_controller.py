@@ -37,13 +37,17 @@ class resamplingController(resamplingListener):
         """
         self.resampling_view.close()
 
-    def confirm_button_clicked(self, frequency):
+    def confirm_button_clicked(self, frequency, resampling_method, n_jobs):
         """
         Close the window and send the information to the main controller.
         :param frequency: The frequency rate
         :type frequency: float
+        :param resampling_method: Method used for the resampling, either FFT or polyphase.
+        :type resampling_method: str
+        :param n_jobs: Number of parallel jobs used for the resampling.
+        :type n_jobs: int
         """
-        self.main_listener.resampling_information(frequency)
+        self.main_listener.resampling_information(frequency, resampling_method, n_jobs)
         self.resampling_view.close()
 
     """
@@ -27,5 +27,5 @@ class resamplingListener(ABC):
         pass
 
     @abstractmethod
-    def confirm_button_clicked(self, frequency):
+    def confirm_button_clicked(self, frequency, resampling_method, n_jobs):
         pass
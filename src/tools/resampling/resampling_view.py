@@ -5,7 +5,10 @@
 Resampling view
 """
 
-from PyQt5.QtWidgets import QWidget, QGridLayout, QSpinBox, QPushButton, QLabel
+from multiprocessing import cpu_count
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QGridLayout, QSpinBox, QPushButton, QLabel, QComboBox, QSlider, QHBoxLayout
 
 __author__ = "Lemahieu Antoine"
 __copyright__ = "Copyright 2022"
@@ -35,6 +38,22 @@ class resamplingView(QWidget):
         self.spinbox_value.setMinimum(1)
         self.spinbox_value.setMaximum(16384)
         self.spinbox_value.setValue(frequency)
+        self.method_box = QComboBox()
+        self.method_box.addItems(["fft", "polyphase"])
+
+        self.n_jobs_widget = QWidget()
+        self.n_jobs_layout = QHBoxLayout()
+        self.n_jobs_slider = QSlider(Qt.Orientation.Horizontal, self)
+        self.n_jobs_slider.setMinimum(1)
+        self.n_jobs_slider.setMaximum(cpu_count())
+        self.n_jobs_slider.setValue(1)
+        self.n_jobs_slider.setSingleStep(1)
+        self.n_jobs_slider.valueChanged.connect(self.slider_value_changed_trigger)
+        self.n_jobs_label = QLabel("1")
+        self.n_jobs_layout.addWidget(self.n_jobs_slider)
+        self.n_jobs_layout.addWidget(self.n_jobs_label)
+        self.n_jobs_widget.setLayout(self.n_jobs_layout)
+
         self.cancel = QPushButton("&Cancel", self)
         self.cancel.clicked.connect(self.cancel_resampling_trigger)
         self.confirm = QPushButton("&Confirm", self)
@@ -42,8 +61,12 @@ class resamplingView(QWidget):
 
         self.grid_layout.addWidget(QLabel("Frequency (Hz) : "), 0, 0)
         self.grid_layout.addWidget(self.spinbox_value, 0, 1)
-        self.grid_layout.addWidget(self.cancel, 1, 0)
-        self.grid_layout.addWidget(self.confirm, 1, 1)
+        self.grid_layout.addWidget(QLabel("Resampling method : "), 1, 0)
+        self.grid_layout.addWidget(self.method_box, 1, 1)
+        self.grid_layout.addWidget(QLabel("Number of parallel jobs : "), 2, 0)
+        self.grid_layout.addWidget(self.n_jobs_widget, 2, 1)
+        self.grid_layout.addWidget(self.cancel, 3, 0)
+        self.grid_layout.addWidget(self.confirm, 3, 1)
 
     """
     Triggers
@@ -59,7 +82,16 @@ class resamplingView(QWidget):
         Retrieve the parameters and send the information to the controller.
         """
         frequency = self.spinbox_value.value()
-        self.resampling_listener.confirm_button_clicked(frequency)
+        resampling_method = self.method_box.currentText()
+        n_jobs = self.n_jobs_slider.value()
+        self.resampling_listener.confirm_button_clicked(frequency, resampling_method, n_jobs)
+
+    def slider_value_changed_trigger(self):
+        """
+        Change the value of the slider displayed on the window when the actual slider is moved.
+        """
+        slider_value = self.n_jobs_slider.value()
+        self.n_jobs_label.setText(str(slider_value))
 
     """
     Setters
@@ -5,6 +5,9 @@
 File path search
 """
 
+import os
+import re
+
 from pathlib import Path
 
 from mne import read_labels_from_annot
@@ -18,6 +21,14 @@ __maintainer__ = "Lemahieu Antoine"
 __email__ = "Antoine.Lemahieu@ulb.be"
 __status__ = "Dev"
 
+CONST_DATASET_EXTENSIONS = (".set", ".fif", ".cnt")
+# FIF files that are not datasets, written next to the datasets (source estimation, ICA, ...), "-" or "_" separated
+CONST_DERIVATIVE_SUFFIXES = tuple(separator + suffix + ".fif" for separator in ("-", "_")
+                                  for suffix in ("fwd", "src", "cov", "inv", "bem", "bem-sol", "sol", "trans", "ave",
+                                                 "ica", "proj"))
+# Entities of the BIDS file names ("sub-01_ses-02_task-rest_run-1_eeg.set") and the study information they give
+CONST_BIDS_ENTITIES = {"sub": "subject", "ses": "session", "task": "task", "run": "run", "acq": "condition"}
+
 
 def get_project_root_path():
     """
@@ -59,6 +70,43 @@ def get_directory_path_from_file_path(file_path):
     return str(path)
 
 
+def find_dataset_files(directory):
+    """
+    Find the datasets that can be opened by the application in a directory and its subdirectories, so that a BIDS-like
+    dataset (sub-XX/ses-YY/eeg/...) is found as well. The hidden directories, the "derivatives" directories, the
+    datasets written by the batch runner and the files of MNE that are not datasets (forward solution, inverse
+    operator, ...) are ignored.
+    :param directory: The directory.
+    :type directory: str
+    :return: The paths of the datasets, sorted.
+    :rtype: list of str
+    """
+    file_paths = []
+    for root, directories, file_names in os.walk(directory):
+        directories[:] = [name for name in directories if not name.startswith(".") and name != "derivatives"]
+        for file_name in file_names:
+            if file_name.lower().endswith(CONST_DATASET_EXTENSIONS) and "-processed-" not in file_name \
+                    and not file_name.lower().endswith(CONST_DERIVATIVE_SUFFIXES):
+                file_paths.append(os.path.join(root, file_name))
+    return sorted(file_paths)
+
+
+def get_bids_entities(file_path):
+    """
+    Get the study information given by the BIDS entities of the name of a file, or of its directories.
+    :param file_path: The path to the file.
+    :type file_path: str
+    :return: The subject, session, task, run and condition of the file, empty when they are not given.
+    :rtype: dict
+    """
+    entities = {information: "" for information in CONST_BIDS_ENTITIES.values()}
+    for part in Path(file_path).parts:      # The file name is the last part, it overrides the directories
+        for key, value in re.findall(r"(?:^|_)([a-z]+)-([a-zA-Z0-9]+)", part):
+            if key in CONST_BIDS_ENTITIES:
+                entities[CONST_BIDS_ENTITIES[key]] = value
+    return entities
+
+
 def get_labels_from_subject(subject, subjects_dir):
     """
     Get the labels names from a specific subject.
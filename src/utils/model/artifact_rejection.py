@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Artifact rejection
+"""
+
+import numpy as np
+
+from mne import pick_types
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_ADAPTIVE_FOLDS = 10
+CONST_ADAPTIVE_CANDIDATES = 40      # Thresholds tried, between the quantiles below of the peak-to-peak of the epochs
+CONST_ADAPTIVE_QUANTILES = (0.1, 1.0)
+
+
+def compute_epochs_statistics(file_data):
+    """
+    Computes the peak-to-peak amplitude and the variance of each channel of each epoch, on the whole data at once. The
+    bad channels and the channels that are not data channels (EOG, stimulation, ...) are not used.
+    :param file_data: MNE data of the dataset.
+    :type file_data: MNE.Epochs
+    :return: The data of the channels used, of shape (epochs, channels, times), their peak-to-peak amplitude and their
+    variance, of shape (epochs, channels).
+    :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+    """
+    picks = pick_types(file_data.info, meg=True, eeg=True, seeg=True, ecog=True, exclude="bads")
+    data = file_data.get_data(picks=picks)
+    peak_to_peak = np.ptp(data, axis=-1)
+    variance = np.var(data, axis=-1)
+    return data, peak_to_peak, variance
+
+
+def compute_adaptive_threshold(data, peak_to_peak, n_folds=CONST_ADAPTIVE_FOLDS):
+    """
+    Computes a global peak-to-peak threshold by cross-validation, as done by "autoreject": for each fold, the epochs
+    under the threshold of the training epochs are averaged, and the threshold kept is the one whose average is the
+    closest to the median of the validation epochs, which is not affected by the artifacts.
+    The training epochs are sorted by their peak-to-peak amplitude, the averages of all the thresholds are thus obtained
+    at once with a cumulative sum.
+    :param data: The data of the channels used, of shape (epochs, channels, times).
+    :type data: numpy.ndarray
+    :param peak_to_peak: The peak-to-peak amplitude of each channel of each epoch.
+    :type peak_to_peak: numpy.ndarray
+    :param n_folds: Number of folds of the cross-validation.
+    :type n_folds: int
+    :return: The peak-to-peak threshold.
+    :rtype: float
+    """
+    epochs_peak_to_peak = np.max(peak_to_peak, axis=1)
+    candidates = np.unique(np.quantile(epochs_peak_to_peak, np.linspace(*CONST_ADAPTIVE_QUANTILES,
+                                                                         CONST_ADAPTIVE_CANDIDATES)))
+    n_folds = min(n_folds, len(data))
+    folds = np.arange(len(data)) % n_folds
+    errors = np.zeros(len(candidates))
+    for fold in range(n_folds):
+        train = np.flatnonzero(folds != fold)
+        order = train[np.argsort(epochs_peak_to_peak[train])]
+        cumulative_sums = np.cumsum(data[order], axis=0)
+        # Number of training epochs under each threshold, and the average of these epochs
+        kept = np.searchsorted(epochs_peak_to_peak[order], candidates, side="right")
+        averages = cumulative_sums[np.maximum(kept - 1, 0)] / np.maximum(kept, 1)[:, np.newaxis, np.newaxis]
+        validation_median = np.median(data[folds == fold], axis=0)
+        fold_errors = np.sqrt(np.mean((averages - validation_median) ** 2, axis=(1, 2)))
+        errors += np.where(kept > 0, fold_errors, np.inf)
+    return float(candidates[np.argmin(errors)])
+
+
+def compute_keep_mask(peak_to_peak, variance, peak_to_peak_threshold=None, variance_threshold=None,
+                      flat_threshold=None):
+    """
+    Computes the epochs kept: an epoch is rejected if the peak-to-peak amplitude or the variance of one of its channels
+    is above its threshold, or if one of its channels is flat.
+    :param peak_to_peak: The peak-to-peak amplitude of each channel of each epoch.
+    :type peak_to_peak: numpy.ndarray
+    :param variance: The variance of each channel of each epoch.
+    :type variance: numpy.ndarray
+    :param peak_to_peak_threshold: Maximum peak-to-peak amplitude, in volts. If None, not used.
+    :type peak_to_peak_threshold: float
+    :param variance_threshold: Maximum variance, in volts squared. If None, not used.
+    :type variance_threshold: float
+    :param flat_threshold: Minimum peak-to-peak amplitude, in volts. If None, not used.
+    :type flat_threshold: float
+    :return: The mask of the epochs kept, and the number of epochs rejected by each criterion.
+    :rtype: (numpy.ndarray, dict)
+    """
+    rejected = {"peak_to_peak": np.zeros(len(peak_to_peak), dtype=bool),
+                "variance": np.zeros(len(peak_to_peak), dtype=bool), "flat": np.zeros(len(peak_to_peak), dtype=bool)}
+    if peak_to_peak_threshold is not None:
+        rejected["peak_to_peak"] = np.any(peak_to_peak > peak_to_peak_threshold, axis=1)
+    if variance_threshold is not None:
+        rejected["variance"] = np.any(variance > variance_threshold, axis=1)
+    if flat_threshold is not None:
+        rejected["flat"] = np.any(peak_to_peak < flat_threshold, axis=1)
+    keep_mask = ~(rejected["peak_to_peak"] | rejected["variance"] | rejected["flat"])
+    return keep_mask, {criterion: int(np.sum(mask)) for criterion, mask in rejected.items()}
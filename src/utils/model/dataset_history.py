@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dataset history
+"""
+
+import hashlib
+import os
+
+from copy import deepcopy
+from time import time
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class datasetHistory:
+    def __init__(self, origin):
+        """
+        Processing history of a dataset.
+        Each operation modifying the data of the dataset is recorded with its parameters, and increments the version of
+        the dataset. The hash of the dataset is chained from the origin of the dataset and every operation recorded, so
+        two datasets read from the same file and processed the same way have the same hash.
+        If the origin is a file, its size and modification time are part of the hash, so that the results computed on
+        a file are not used anymore once the file is replaced.
+        :param origin: The origin of the dataset, usually the path to its file.
+        :type origin: str
+        """
+        self.origin = origin
+        self.entries = []
+        self.version = 0
+        sha = hashlib.sha1(str(origin).encode())
+        sha.update(repr(get_file_signature(origin)).encode())
+        self.origin_hash = sha.hexdigest()
+        self.hash = self.origin_hash
+
+    def record(self, operation, parameters=None, replace_last=False):
+        """
+        Records an operation performed on the data of the dataset.
+        :param operation: The name of the operation.
+        :type operation: str
+        :param parameters: The parameters of the operation.
+        :type parameters: dict
+        :param replace_last: Replace the last operation recorded, when the operation is performed again on the data
+        before it. The version is still incremented.
+        :type replace_last: bool
+        :return: The new hash of the dataset.
+        :rtype: str
+        """
+        if parameters is None:
+            parameters = {}
+        if replace_last and self.entries:
+            self.entries.pop()
+            self.hash = self.entries[-1]["hash"] if self.entries else self.origin_hash
+        self.version += 1
+        sha = hashlib.sha1(self.hash.encode())
+        sha.update(operation.encode())
+        sha.update(repr(sorted(parameters.items())).encode())
+        self.hash = sha.hexdigest()
+        self.entries.append({"operation": operation, "parameters": deepcopy(parameters), "hash": self.hash,
+                             "time": time()})
+        return self.hash
+
+    """
+    Getters
+    """
+    def get_version(self):
+        """
+        Gets the version of the dataset, which is the number of operations performed.
+        :return: The version of the dataset.
+        :rtype: int
+        """
+        return self.version
+
+    def get_hash(self):
+        """
+        Gets the hash of the dataset, chained from its origin and all the operations recorded.
+        :return: The hash of the dataset.
+        :rtype: str
+        """
+        return self.hash
+
+    def get_entries(self):
+        """
+        Gets the operations recorded, with their parameters and the hash of the dataset after each of them.
+        :return: The operations recorded.
+        :rtype: list of dict
+        """
+        return self.entries
+
+    def get_origin(self):
+        """
+        Gets the origin of the dataset.
+        :return: The origin of the dataset.
+        :rtype: str
+        """
+        return self.origin
+
+
+def get_file_signature(file_path):
+    """
+    Gets the size and the modification time of a file, and of the file containing its data for the EEGLAB files.
+    :param file_path: The path to the file.
+    :type file_path: str
+    :return: The size and the modification time of each file, None if the path is not a file.
+    :rtype: tuple
+    """
+    if not isinstance(file_path, str) or not os.path.isfile(file_path):
+        return None
+    file_paths = [file_path, os.path.splitext(file_path)[0] + ".fdt"]
+    return tuple((os.path.getsize(path), os.stat(path).st_mtime_ns) for path in file_paths if os.path.isfile(path))
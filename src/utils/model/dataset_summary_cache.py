@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dataset summary cache
+"""
+
+import numpy as np
+
+from copy import deepcopy
+
+from mne import combine_evoked
+from mne.time_frequency import tfr_morlet, tfr_multitaper, tfr_stockwell
+
+from utils.model.power_spectral_density import powerSpectralDensity
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class datasetSummaryCache:
+    def __init__(self):
+        """
+        Cache of the summaries computed on each dataset (evoked per condition, PSD per epoch, time-frequency power), and
+        of the results of the computations performed on them.
+        A summary is stored with the version of the dataset it was computed on, and is computed again as soon as the
+        dataset has a new version.
+        The summaries of the datasets of a study can then be combined, weighted by their number of epochs, without
+        concatenating the epochs of all the datasets.
+        """
+        self.summaries = {}
+
+    """
+    Summaries
+    """
+    def get_summary(self, index, version, kind, parameters, compute_summary):
+        """
+        Gets a summary of a dataset, computing it if it is not in the cache or if it was computed on an older version
+        of the dataset.
+        :param index: The index of the dataset.
+        :type index: int
+        :param version: The current version of the dataset.
+        :type version: int
+        :param kind: The kind of summary.
+        :type kind: str
+        :param parameters: The parameters of the computation of the summary.
+        :type parameters: tuple
+        :param compute_summary: Function computing the summary.
+        :type compute_summary: function
+        :return: The summary.
+        :rtype: object
+        """
+        summary = self.get_result(index, version, kind, parameters)
+        if summary is None:
+            summary = compute_summary()
+            self.set_result(index, version, kind, parameters, summary)
+        return summary
+
+    def get_result(self, index, version, kind, parameters):
+        """
+        Gets a result computed on a dataset, if it is in the cache and was computed on the given version of the dataset.
+        :param index: The index of the dataset.
+        :type index: int
+        :param version: The current version of the dataset.
+        :type version: int
+        :param kind: The kind of result.
+        :type kind: str
+        :param parameters: The parameters of the computation of the result.
+        :type parameters: tuple
+        :return: The result, None if it is not in the cache.
+        :rtype: object
+        """
+        key = (index, kind, self.make_hashable(parameters))
+        if key in self.summaries and self.summaries[key][0] == version:
+            return self.summaries[key][1]
+        return None
+
+    def set_result(self, index, version, kind, parameters, result):
+        """
+        Stores a result computed on a dataset. The results computed on the older versions of the dataset are removed,
+        but not the results of the newer versions when the result is computed on an older version (the data before the
+        last ICA).
+        :param index: The index of the dataset.
+        :type index: int
+        :param version: The current version of the dataset.
+        :type version: int
+        :param kind: The kind of result.
+        :type kind: str
+        :param parameters: The parameters of the computation of the result.
+        :type parameters: tuple
+        :param result: The result.
+        :type result: object
+        """
+        for other_key in list(self.summaries.keys()):
+            if other_key[0] == index and self.summaries[other_key][0] < version:
+                del self.summaries[other_key]
+        self.summaries[(index, kind, self.make_hashable(parameters))] = (version, result)
+
+    def get_evoked(self, index, version, file_data):
+        """
+        Gets the evoked response of each condition of the dataset.
+        :param index: The index of the dataset.
+        :type index: int
+        :param version: The current version of the dataset.
+        :type version: int
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Epochs
+        :return: The evoked response of each condition.
+        :rtype: list of MNE.Evoked
+        """
+        def compute_evoked():
+            all_evoked = []
+            for condition in file_data.event_id.keys():
+                condition_data = file_data[condition]
+                if len(condition_data) > 0:
+                    all_evoked.append(condition_data.average())
+            return all_evoked
+
+        return self.get_summary(index, version, "evoked", (), compute_evoked)
+
+    def get_psd(self, index, version, file_data, minimum_frequency, maximum_frequency, minimum_time, maximum_time,
+                bandwidth):
+        """
+        Gets the power spectral density of each epoch and each channel of the dataset.
+        :param index: The index of the dataset.
+        :type index: int
+        :param version: The current version of the dataset.
+        :type version: int
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Epochs
+        :param minimum_frequency: Minimum frequency from which the power spectral density will be computed.
+        :type minimum_frequency: float
+        :param maximum_frequency: Maximum frequency from which the power spectral density will be computed.
+        :type maximum_frequency: float
+        :param minimum_time: Minimum time of the epochs from which the power spectral density will be computed.
+        :type minimum_time: float
+        :param maximum_time: Maximum time of the epochs from which the power spectral density will be computed.
+        :type maximum_time: float
+        :param bandwidth: Bandwidth of the multi-taper windowing function.
+        :type bandwidth: float
+        :return: The power spectral density of each epoch and each channel.
+        :rtype: powerSpectralDensity
+        """
+        def compute_psd():
+            return powerSpectralDensity.compute(file_data, minimum_frequency, maximum_frequency, minimum_time,
+                                                maximum_time, bandwidth=bandwidth)
+
+        parameters = (minimum_frequency, maximum_frequency, minimum_time, maximum_time, bandwidth)
+        return self.get_summary(index, version, "psd", parameters, compute_psd)
+
+    def get_tfr(self, index, version, file_data, method_tfr, channel_selected, min_frequency, max_frequency, n_cycles):
+        """
+        Gets the time-frequency power and inter-trial coherence of the dataset.
+        :param index: The index of the dataset.
+        :type index: int
+        :param version: The current version of the dataset.
+        :type version: int
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Epochs
+        :param method_tfr: Method used for computing the time-frequency analysis.
+        :type method_tfr: str
+        :param channel_selected: Channel on which the time-frequency analysis will be computed.
+        :type channel_selected: str
+        :param min_frequency: Minimum frequency from which the time-frequency analysis will be computed.
+        :type min_frequency: float
+        :param max_frequency: Maximum frequency from which the time-frequency analysis will be computed.
+        :type max_frequency: float
+        :param n_cycles: Number of cycles used by the time-frequency analysis for his computation.
+        :type n_cycles: int
+        :return: The power and the inter-trial coherence.
+        :rtype: (MNE.AverageTFR, MNE.AverageTFR)
+        """
+        def compute_tfr():
+            return self.compute_tfr(file_data, method_tfr, channel_selected, min_frequency, max_frequency, n_cycles)
+
+        parameters = (method_tfr, channel_selected, min_frequency, max_frequency, n_cycles)
+        return self.get_summary(index, version, "tfr", parameters, compute_tfr)
+
+    def get_cached_tfr(self, index, version, method_tfr, channel_selected, min_frequency, max_frequency, n_cycles):
+        """
+        Gets the time-frequency power and inter-trial coherence of the dataset if they are in the cache, without
+        computing them.
+        :param index: The index of the dataset.
+        :type index: int
+        :param version: The current version of the dataset.
+        :type version: int
+        :param method_tfr: Method used for computing the time-frequency analysis.
+        :type method_tfr: str
+        :param channel_selected: Channel on which the time-frequency analysis will be computed.
+        :type channel_selected: str
+        :param min_frequency: Minimum frequency from which the time-frequency analysis will be computed.
+        :type min_frequency: float
+        :param max_frequency: Maximum frequency from which the time-frequency analysis will be computed.
+        :type max_frequency: float
+        :param n_cycles: Number of cycles used by the time-frequency analysis for his computation.
+        :type n_cycles: int
+        :return: The power and the inter-trial coherence, None if they are not in the cache.
+        :rtype: (MNE.AverageTFR, MNE.AverageTFR)
+        """
+        parameters = (method_tfr, channel_selected, min_frequency, max_frequency, n_cycles)
+        return self.get_result(index, version, "tfr", parameters)
+
+    def set_tfr(self, index, version, method_tfr, channel_selected, min_frequency, max_frequency, n_cycles, tfr):
+        """
+        Stores the time-frequency power and inter-trial coherence computed on the dataset.
+        :param index: The index of the dataset.
+        :type index: int
+        :param version: The version of the dataset the analysis was computed on.
+        :type version: int
+        :param method_tfr: Method used for computing the time-frequency analysis.
+        :type method_tfr: str
+        :param channel_selected: Channel on which the time-frequency analysis was computed.
+        :type channel_selected: str
+        :param min_frequency: Minimum frequency from which the time-frequency analysis was computed.
+        :type min_frequency: float
+        :param max_frequency: Maximum frequency from which the time-frequency analysis was computed.
+        :type max_frequency: float
+        :param n_cycles: Number of cycles used by the time-frequency analysis for his computation.
+        :type n_cycles: int
+        :param tfr: The power and the inter-trial coherence.
+        :type tfr: (MNE.AverageTFR, MNE.AverageTFR)
+        """
+        parameters = (method_tfr, channel_selected, min_frequency, max_frequency, n_cycles)
+        self.set_result(index, version, "tfr", parameters, tfr)
+
+    @staticmethod
+    def compute_tfr(file_data, method_tfr, channel_selected, min_frequency, max_frequency, n_cycles):
+        """
+        Computes the time-frequency power and inter-trial coherence of the dataset. Does not use the cache, so that it
+        can be called from a runnable.
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Epochs
+        :param method_tfr: Method used for computing the time-frequency analysis.
+        :type method_tfr: str
+        :param channel_selected: Channel on which the time-frequency analysis will be computed.
+        :type channel_selected: str
+        :param min_frequency: Minimum frequency from which the time-frequency analysis will be computed.
+        :type min_frequency: float
+        :param max_frequency: Maximum frequency from which the time-frequency analysis will be computed.
+        :type max_frequency: float
+        :param n_cycles: Number of cycles used by the time-frequency analysis for his computation.
+        :type n_cycles: int
+        :return: The power and the inter-trial coherence.
+        :rtype: (MNE.AverageTFR, MNE.AverageTFR)
+        """
+        freqs = np.arange(min_frequency, max_frequency)
+        if method_tfr == "Morlet":
+            return tfr_morlet(file_data, freqs=freqs, n_cycles=n_cycles, picks=channel_selected)
+        elif method_tfr == "Multitaper":
+            return tfr_multitaper(file_data, freqs=freqs, n_cycles=n_cycles, picks=channel_selected)
+        elif method_tfr == "Stockwell":
+            return tfr_stockwell(file_data, freqs=freqs, n_cycles=n_cycles, picks=channel_selected)
+
+    def clear(self, index=None):
+        """
+        Removes the summaries of a dataset, or all the summaries.
+        :param index: The index of the dataset. If None, all the summaries are removed.
+        :type index: int
+        """
+        if index is None:
+            self.summaries = {}
+        else:
+            for key in list(self.summaries.keys()):
+                if key[0] == index:
+                    del self.summaries[key]
+
+    @staticmethod
+    def make_hashable(parameters):
+        """
+        Transforms the parameters of a computation so that they can be used in a key of the cache.
+        :param parameters: The parameters.
+        :type parameters: object
+        :return: The hashable parameters.
+        :rtype: object
+        """
+        if isinstance(parameters, dict):
+            return tuple((key, datasetSummaryCache.make_hashable(parameters[key])) for key in sorted(parameters.keys()))
+        if isinstance(parameters, (list, tuple)):
+            return tuple(datasetSummaryCache.make_hashable(parameter) for parameter in parameters)
+        if isinstance(parameters, np.ndarray):
+            return tuple(parameters.ravel().tolist())
+        return parameters
+
+    """
+    Combinations
+    """
+    @staticmethod
+    def combine_evoked_summaries(all_evoked, channels_selected):
+        """
+        Combines the evoked responses of several datasets, weighted by their number of epochs.
+        :param all_evoked: The evoked responses of each condition of each dataset.
+        :type all_evoked: list of, list of MNE.Evoked
+        :param channels_selected: Channels selected
+        :type channels_selected: str/list of str
+        :return: The combined evoked response.
+        :rtype: MNE.Evoked
+        """
+        all_evoked = [evoked for dataset_evoked in all_evoked for evoked in dataset_evoked]
+        evoked = combine_evoked(all_evoked, weights="nave")
+        return evoked.pick(channels_selected)
+
+    @staticmethod
+    def combine_psd_summaries(all_psds):
+        """
+        Combines the power spectral densities of several datasets into their mean over all the epochs.
+        :param all_psds: The power spectral density of each epoch of each dataset, of shape (epochs, channels,
+        frequencies).
+        :type all_psds: list of numpy.ndarray
+        :return: The mean power spectral density, of shape (channels, frequencies).
+        :rtype: numpy.ndarray
+        """
+        total = np.sum([psds.sum(axis=0) for psds in all_psds], axis=0)
+        number_of_epochs = np.sum([psds.shape[0] for psds in all_psds])
+        return total / number_of_epochs
+
+    @staticmethod
+    def combine_tfr_summaries(all_tfr):
+        """
+        Combines the time-frequency analyses of several datasets, weighted by their number of epochs.
+        The combined inter-trial coherence is the weighted mean of the coherence of each dataset.
+        :param all_tfr: The power and inter-trial coherence of each dataset.
+        :type all_tfr: list of (MNE.AverageTFR, MNE.AverageTFR)
+        :return: The combined power and inter-trial coherence.
+        :rtype: (MNE.AverageTFR, MNE.AverageTFR)
+        """
+        weights = np.array([power.nave for power, _ in all_tfr], dtype=float)
+        weights = weights / weights.sum()
+        power = deepcopy(all_tfr[0][0])
+        itc = deepcopy(all_tfr[0][1])
+        power.data = np.tensordot(weights, np.array([tfr[0].data for tfr in all_tfr]), axes=1)
+        itc.data = np.tensordot(weights, np.array([tfr[1].data for tfr in all_tfr]), axes=1)
+        power.nave = int(np.sum([tfr[0].nave for tfr in all_tfr]))
+        itc.nave = power.nave
+        return power, itc
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Decimation pyramid
+"""
+
+import numpy as np
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_BASE_BLOCK_SIZE = 16      # Samples summarized by each point of the first level
+CONST_LEVEL_FACTOR = 4          # Each level summarizes this number of points of the previous level
+CONST_MINIMUM_BLOCKS = 512      # No level is built with less points than this
+CONST_CHANNELS_PER_BLOCK = 16   # Channels read at once from the data when building the pyramid
+
+
+class decimationPyramid:
+    def __init__(self, minimums, maximums, block_sizes, sampling_frequency, number_of_samples, scalings,
+                 fingerprint=None):
+        """
+        Min/max decimation pyramid of a raw recording, used by the data browser.
+        Each level keeps, for blocks of samples of increasing size, the minimum and maximum of each channel. Drawing a
+        window of the recording then only needs about one block per pixel, whatever the length of the window.
+        :param minimums: The minimums of each level, of shape (channels, blocks).
+        :type minimums: list of numpy.ndarray
+        :param maximums: The maximums of each level, of shape (channels, blocks).
+        :type maximums: list of numpy.ndarray
+        :param block_sizes: The number of samples summarized by a block of each level.
+        :type block_sizes: list of int
+        :param sampling_frequency: The sampling frequency of the recording.
+        :type sampling_frequency: float
+        :param number_of_samples: The number of samples of the recording.
+        :type number_of_samples: int
+        :param scalings: The scaling of each channel, half of its robust peak-to-peak amplitude.
+        :type scalings: numpy.ndarray
+        :param fingerprint: The fingerprint of the dataset the pyramid was built on.
+        :type fingerprint: str
+        """
+        self.minimums = minimums
+        self.maximums = maximums
+        self.block_sizes = block_sizes
+        self.sampling_frequency = sampling_frequency
+        self.number_of_samples = number_of_samples
+        self.scalings = scalings
+        self.fingerprint = fingerprint
+
+    @staticmethod
+    def build(file_data, fingerprint=None):
+        """
+        Builds the pyramid of a raw recording. The channels are read by blocks, so that the whole recording is never
+        copied at once.
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Raw
+        :param fingerprint: The fingerprint of the dataset.
+        :type fingerprint: str
+        :return: The pyramid.
+        :rtype: decimationPyramid
+        """
+        number_of_channels = len(file_data.ch_names)
+        number_of_samples = file_data.n_times
+        block_sizes = [CONST_BASE_BLOCK_SIZE]
+        while number_of_samples // (block_sizes[-1] * CONST_LEVEL_FACTOR) >= CONST_MINIMUM_BLOCKS:
+            block_sizes.append(block_sizes[-1] * CONST_LEVEL_FACTOR)
+
+        minimums = []
+        maximums = []
+        for block_size in block_sizes:
+            number_of_blocks = -(-number_of_samples // block_size)
+            minimums.append(np.empty((number_of_channels, number_of_blocks), dtype=np.float32))
+            maximums.append(np.empty((number_of_channels, number_of_blocks), dtype=np.float32))
+
+        for first_channel in range(0, number_of_channels, CONST_CHANNELS_PER_BLOCK):
+            channels = slice(first_channel, min(first_channel + CONST_CHANNELS_PER_BLOCK, number_of_channels))
+            data = file_data.get_data(picks=list(range(channels.start, channels.stop)))
+            minimums[0][channels] = decimationPyramid.reduce(data, CONST_BASE_BLOCK_SIZE, np.min)
+            maximums[0][channels] = decimationPyramid.reduce(data, CONST_BASE_BLOCK_SIZE, np.max)
+            for level in range(1, len(block_sizes)):
+                minimums[level][channels] = decimationPyramid.reduce(minimums[level - 1][channels], CONST_LEVEL_FACTOR,
+                                                                     np.min)
+                maximums[level][channels] = decimationPyramid.reduce(maximums[level - 1][channels], CONST_LEVEL_FACTOR,
+                                                                     np.max)
+
+        # Same idea as the "auto" scalings of MNE, computed on the first level instead of the whole recording.
+        scalings = (np.percentile(maximums[0], 99.5, axis=1) - np.percentile(minimums[0], 0.5, axis=1)) / 2
+        scalings[scalings == 0] = 1.0
+        return decimationPyramid(minimums, maximums, block_sizes, file_data.info["sfreq"], number_of_samples,
+                                 scalings, fingerprint)
+
+    @staticmethod
+    def reduce(data, block_size, function):
+        """
+        Reduces each block of consecutive values of the data. The last block is completed with its last value.
+        :param data: The data, of shape (channels, values).
+        :type data: numpy.ndarray
+        :param block_size: The number of values of each block.
+        :type block_size: int
+        :param function: The reduction, numpy.min or numpy.max.
+        :type function: function
+        :return: The reduced data, of shape (channels, blocks).
+        :rtype: numpy.ndarray
+        """
+        padding = -data.shape[1] % block_size
+        if padding > 0:
+            data = np.pad(data, ((0, 0), (0, padding)), mode="edge")
+        return function(data.reshape(data.shape[0], -1, block_size), axis=2)
+
+    """
+    Levels
+    """
+    def choose_level(self, first_sample, last_sample, width):
+        """
+        Chooses the coarsest level having at least one block per pixel for the window of the recording displayed.
+        :param first_sample: The first sample of the window.
+        :type first_sample: int
+        :param last_sample: The last sample of the window.
+        :type last_sample: int
+        :param width: The width of the window, in pixels.
+        :type width: int
+        :return: The level, or None if the samples themselves must be displayed.
+        :rtype: int
+        """
+        samples_per_pixel = (last_sample - first_sample) / max(width, 1)
+        level = None
+        for i, block_size in enumerate(self.block_sizes):
+            if block_size <= samples_per_pixel:
+                level = i
+        return level
+
+    def get_envelope(self, level, first_sample, last_sample, picks):
+        """
+        Gets the minimums and maximums of the channels selected on a window of the recording, with the level given.
+        :param level: The level.
+        :type level: int
+        :param first_sample: The first sample of the window.
+        :type first_sample: int
+        :param last_sample: The last sample of the window.
+        :type last_sample: int
+        :param picks: The indexes of the channels.
+        :type picks: list of int
+        :return: The times of the blocks, and the minimums and maximums, of shape (channels, blocks).
+        :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        """
+        block_size = self.block_sizes[level]
+        first_block = first_sample // block_size
+        last_block = min(-(-last_sample // block_size), self.minimums[level].shape[1])
+        times = (np.arange(first_block, last_block) * block_size + block_size / 2) / self.sampling_frequency
+        return times, self.minimums[level][picks, first_block:last_block], \
+            self.maximums[level][picks, first_block:last_block]
+
+    """
+    Files
+    """
+    def save(self, file_path):
+        """
+        Saves the pyramid in a NPZ file.
+        :param file_path: The path of the file.
+        :type file_path: str
+        """
+        levels = {}
+        for level in range(len(self.block_sizes)):
+            levels["minimums_" + str(level)] = self.minimums[level]
+            levels["maximums_" + str(level)] = self.maximums[level]
+        np.savez(file_path, block_sizes=np.array(self.block_sizes), sampling_frequency=self.sampling_frequency,
+                 number_of_samples=self.number_of_samples, scalings=self.scalings, fingerprint=str(self.fingerprint),
+                 **levels)
+
+    @staticmethod
+    def load(file_path):
+        """
+        Loads a pyramid saved in a NPZ file.
+        :param file_path: The path of the file.
+        :type file_path: str
+        :return: The pyramid.
+        :rtype: decimationPyramid
+        """
+        with np.load(file_path) as npz_file:
+            block_sizes = npz_file["block_sizes"].tolist()
+            minimums = [npz_file["minimums_" + str(level)] for level in range(len(block_sizes))]
+            maximums = [npz_file["maximums_" + str(level)] for level in range(len(block_sizes))]
+            return decimationPyramid(minimums, maximums, block_sizes, float(npz_file["sampling_frequency"]),
+                                     int(npz_file["number_of_samples"]), npz_file["scalings"],
+                                     str(npz_file["fingerprint"]))
+
+    """
+    Getters
+    """
+    def get_sampling_frequency(self):
+        """
+        Gets the sampling frequency of the recording.
+        :return: The sampling frequency.
+        :rtype: float
+        """
+        return self.sampling_frequency
+
+    def get_number_of_samples(self):
+        """
+        Gets the number of samples of the recording.
+        :return: The number of samples.
+        :rtype: int
+        """
+        return self.number_of_samples
+
+    def get_scalings(self):
+        """
+        Gets the scaling of each channel.
+        :return: The scalings.
+        :rtype: numpy.ndarray
+        """
+        return self.scalings
+
+    def get_fingerprint(self):
+        """
+        Gets the fingerprint of the dataset the pyramid was built on.
+        :return: The fingerprint.
+        :rtype: str
+        """
+        return self.fingerprint
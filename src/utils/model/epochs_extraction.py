@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Epochs extraction
+"""
+
+import numpy as np
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+from mne import Epochs, EpochsArray
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+# Annotations of the segments that MNE does not use for the epochs
+CONST_REJECTED_ANNOTATIONS = ("bad", "edge")
+
+
+def extract_epochs(file_data, events, event_ids, tmin, tmax, trials_selected=None):
+    """
+    Extracts the epochs around the events selected only, instead of extracting the epochs of all the events and dropping
+    the ones that are not selected.
+    If the raw data is in memory and has no segment annotated as bad, the windows are taken from a strided view of its
+    data and copied directly into the array of the epochs. Otherwise, MNE reads the epochs of the events selected.
+    The baseline correction is the same as the one of MNE in both cases.
+    :param file_data: MNE data of the dataset.
+    :type file_data: MNE.Raw
+    :param events: The events from which the epochs will be extracted.
+    :type events: list of, list of int
+    :param event_ids: The event ids
+    :type event_ids: dict
+    :param tmin: Start time of the epoch to keep
+    :type tmin: float
+    :param tmax: End time of the epoch to keep
+    :type tmax: float
+    :param trials_selected: The indexes of the events selected. If None, all the events are used.
+    :type trials_selected: list of int
+    :return: The epochs.
+    :rtype: MNE.Epochs
+    """
+    events = np.asarray(events, dtype=np.int64).reshape(-1, 3)
+    if trials_selected is not None:
+        trials_selected = np.asarray(trials_selected, dtype=int)
+        events = events[trials_selected[(trials_selected >= 0) & (trials_selected < len(events))]]
+    if event_ids:
+        events = events[np.isin(events[:, 2], list(event_ids.values()))]
+
+    descriptions = [description.lower() for description in file_data.annotations.description]
+    if not file_data.preload or any(description.startswith(CONST_REJECTED_ANNOTATIONS)
+                                    for description in descriptions):
+        return Epochs(file_data, events=events, event_id=event_ids, tmin=tmin, tmax=tmax, preload=True,
+                      on_missing="ignore")
+
+    sfreq = file_data.info["sfreq"]
+    start_index = int(round(tmin * sfreq))
+    number_of_times = int(round(tmax * sfreq)) + 1 - start_index
+    data = file_data.get_data()     # (channels, times)
+    starts = events[:, 0] - file_data.first_samp + start_index
+    inside = (starts >= 0) & (starts + number_of_times <= data.shape[1])     # Epochs outside the data are not kept
+    events, starts = events[inside], starts[inside]
+
+    # View of every window of the data, without copy, of shape (channels, windows, times)
+    windows = sliding_window_view(data, number_of_times, axis=1)
+    epochs_data = np.empty((len(starts), data.shape[0], number_of_times), dtype=data.dtype)
+    np.take(windows, starts, axis=1, out=epochs_data.transpose(1, 0, 2), mode="clip")
+    return EpochsArray(epochs_data, file_data.info, events=events, tmin=start_index / sfreq, event_id=event_ids,
+                       baseline=(None, 0), on_missing="ignore", verbose=False)
+
+
+def select_epochs(file_data, trials_selected):
+    """
+    Selects the epochs of the trials selected, copying only their data. The dataset itself is not modified.
+    :param file_data: MNE data of the dataset.
+    :type file_data: MNE.Epochs
+    :param trials_selected: The indexes of the trials selected for the computation
+    :type trials_selected: list of int
+    :return: The epochs selected.
+    :rtype: MNE.Epochs
+    """
+    trials_selected = np.asarray(trials_selected, dtype=int)
+    metadata = None if file_data.metadata is None else file_data.metadata.iloc[trials_selected]
+    # The data is already baseline corrected, the correction is not applied again
+    return EpochsArray(file_data._data[trials_selected], file_data.info, events=file_data.events[trials_selected],
+                       tmin=file_data.tmin, event_id=file_data.event_id, metadata=metadata, on_missing="ignore",
+                       verbose=False)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Event table
+"""
+
+import hashlib
+
+import numpy as np
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_EVENT_DTYPE = np.dtype([("latency", np.int64), ("previous", np.int64), ("id", np.int64)])
+
+
+class eventTable:
+    def __init__(self, events, event_ids):
+        """
+        Columnar table of the events of a dataset.
+        The events are kept in a structured array with one column per field, and the event ids are inverted into an
+        id to name map, so that the lookups, the masks and the exportation are vectorized over all the events.
+        :param events: The events, one row per event: latency, previous value, id.
+        :type events: list of, list of int
+        :param event_ids: The event ids, name to id.
+        :type event_ids: dict
+        """
+        events = np.asarray(events, dtype=np.int64).reshape(-1, 3)
+        self.events = np.empty(events.shape[0], dtype=CONST_EVENT_DTYPE)
+        self.events["latency"] = events[:, 0]
+        self.events["previous"] = events[:, 1]
+        self.events["id"] = events[:, 2]
+        self.event_ids = dict(event_ids)
+        self.id_to_name = {event_id: name for name, event_id in self.event_ids.items()}
+
+    @staticmethod
+    def from_file_data(file_data):
+        """
+        Creates the table of the events of an MNE dataset.
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Epochs/MNE.Raw
+        :return: The table of the events.
+        :rtype: eventTable
+        """
+        return eventTable(file_data.events, file_data.event_id)
+
+    """
+    Lookups
+    """
+    def get_names(self):
+        """
+        Gets the name of every event. The names are only looked up once per distinct id. An event whose id has no
+        name is named after its id.
+        :return: The names of the events.
+        :rtype: numpy.ndarray
+        """
+        unique_ids, inverse = np.unique(self.events["id"], return_inverse=True)
+        unique_names = np.array([self.id_to_name.get(event_id, str(event_id)) for event_id in unique_ids.tolist()],
+                                dtype=object)
+        return unique_names[inverse]
+
+    def get_condition_mask(self, event_name):
+        """
+        Gets the mask of the events of a condition.
+        :param event_name: The name of the condition.
+        :type event_name: str
+        :return: True for the events of the condition.
+        :rtype: numpy.ndarray
+        """
+        return self.events["id"] == self.event_ids[event_name]
+
+    def get_drop_mask(self, event_name):
+        """
+        Gets the mask of the events to remove to keep only a condition.
+        :param event_name: The name of the condition kept.
+        :type event_name: str
+        :return: True for the events to remove, False for the events of the condition.
+        :rtype: numpy.ndarray
+        """
+        return np.logical_not(self.get_condition_mask(event_name))
+
+    """
+    Modifications
+    """
+    def rescale_latencies(self, ratio):
+        """
+        Rescales the latencies of all the events, after a resampling of the data. The latencies are rounded to the
+        nearest sample, like the events of the epochs resampled by "resample_data".
+        :param ratio: The new sampling frequency divided by the old one.
+        :type ratio: float
+        :return: The table of the events.
+        :rtype: eventTable
+        """
+        self.events["latency"] = np.round(self.events["latency"] * ratio).astype(np.int64)
+        return self
+
+    """
+    Exportation
+    """
+    def export_txt(self, file):
+        """
+        Exports the events in a TXT file, one line per event with its number, name and latency.
+        :param file: The file, opened for writing.
+        :type file: file object
+        """
+        numbers = np.arange(self.events.shape[0])
+        rows = np.column_stack((numbers.astype(str), self.get_names().astype(str),
+                                self.events["latency"].astype(str)))
+        np.savetxt(file, rows, fmt="%s", delimiter=", ", header="Number, Type, Latency ", comments="")
+
+    """
+    Getters
+    """
+    def to_array(self):
+        """
+        Gets the events in the format of MNE.
+        :return: The events, of shape (events, 3).
+        :rtype: numpy.ndarray
+        """
+        return np.column_stack((self.events["latency"], self.events["previous"], self.events["id"]))
+
+    def get_digest(self):
+        """
+        Gets the digest of the events and of the event ids. It identifies them in the history of the dataset and in the
+        parameters of the computations made from them.
+        :return: The SHA-1 digest.
+        :rtype: str
+        """
+        sha = hashlib.sha1(np.ascontiguousarray(self.to_array(), dtype=np.int64).tobytes())
+        sha.update(repr(sorted(self.event_ids.items())).encode())
+        return sha.hexdigest()
+
+    def get_latencies(self):
+        """
+        Gets the latency of every event.
+        :return: The latencies.
+        :rtype: numpy.ndarray
+        """
+        return self.events["latency"]
+
+    def get_ids(self):
+        """
+        Gets the id of every event.
+        :return: The ids.
+        :rtype: numpy.ndarray
+        """
+        return self.events["id"]
+
+    def get_id_to_name(self):
+        """
+        Gets the map from the event ids to their names.
+        :return: The names of the event ids.
+        :rtype: dict
+        """
+        return self.id_to_name
+
+    def __len__(self):
+        return self.events.shape[0]
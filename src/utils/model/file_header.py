@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+File header
+"""
+
+import struct
+import zlib
+
+from os.path import basename, splitext, getsize, isfile
+
+import numpy as np
+
+from scipy.io import loadmat
+
+from mne import read_epochs
+from mne.io import read_raw_fif
+
+from utils.cnt_reader.libeep import cnt_file
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+# Fields of the EEGLAB structure describing the dataset, the samples are stored in other fields or in the FDT file
+CONST_SET_HEADER_FIELDS = ("nbchan", "trials", "pnts", "srate", "event")
+CONST_FIF_EPOCHS_SUFFIXES = ("epo.fif", "epo.fif.gz")
+
+# Data elements of the MATLAB 5 files, read to get the fields of the "EEG" structure without its samples
+CONST_MAT_MATRIX = 14
+CONST_MAT_COMPRESSED = 15
+CONST_MAT_STRUCT_CLASS = 2
+CONST_MAT_TYPES = {1: "i1", 2: "u1", 3: "i2", 4: "u2", 5: "i4", 6: "u4", 7: "f4", 9: "f8", 12: "i8", 13: "u8"}
+CONST_MAT_CHUNK_SIZE = 1024 ** 2
+
+
+def read_file_header(path_to_file):
+    """
+    Reads the header of a SET, FIF or CNT file, without reading its samples.
+    :param path_to_file: The path to the file.
+    :type path_to_file: str
+    :return: The path, name, type ("Raw"/"Epochs"), number of channels, sampling frequency, duration of a raw file,
+    number of epochs of an epochs file, number of events and size in bytes of the file. The information that the header
+    does not contain is None.
+    :rtype: dict
+    """
+    extension = splitext(path_to_file)[1].lower()
+    if extension == ".set":
+        header = read_set_header(path_to_file)
+    elif extension == ".cnt":
+        header = read_cnt_header(path_to_file)
+    elif path_to_file.lower().endswith((".fif", ".fif.gz")):
+        header = read_fif_header(path_to_file)
+    else:
+        raise ValueError("The file " + path_to_file + " is not a SET, FIF or CNT file.")
+    header["path"] = path_to_file
+    header["name"] = splitext(basename(path_to_file))[0]
+    header["size"] = get_file_size(path_to_file)
+    return header
+
+
+def read_set_header(path_to_file):
+    """
+    Reads the header of an EEGLAB SET file from the fields of its MATLAB structure. An epoched dataset has more than
+    one trial.
+    :param path_to_file: The path to the file.
+    :type path_to_file: str
+    :return: The information of the header.
+    :rtype: dict
+    """
+    try:
+        content = loadmat(path_to_file, squeeze_me=True, struct_as_record=False, variable_names=CONST_SET_HEADER_FIELDS)
+        if "nbchan" in content:
+            fields = {field: content.get(field) for field in CONST_SET_HEADER_FIELDS}
+        else:   # Older files store the fields in an "EEG" structure, with the samples if there is no FDT file
+            fields = read_set_header_structure(path_to_file)
+    except NotImplementedError:     # MATLAB 7.3 file, stored in HDF5
+        fields = read_set_header_hdf5(path_to_file)
+
+    trials = int(fields["trials"]) if fields["trials"] is not None else 1
+    sfreq = float(fields["srate"])
+    events = fields["event"]
+    if events is None:
+        event_count = 0
+    elif isinstance(events, np.ndarray):
+        event_count = events.size
+    else:   # A single event is squeezed into a structure
+        event_count = 1
+
+    file_type = "Epochs" if trials > 1 else "Raw"
+    return {"file_type": file_type, "channels": int(fields["nbchan"]), "sfreq": sfreq,
+            "duration": int(fields["pnts"]) / sfreq if file_type == "Raw" else None,
+            "epochs": trials if file_type == "Epochs" else None, "events": event_count}
+
+
+def read_set_header_hdf5(path_to_file):
+    """
+    Reads the fields of the header of a SET file saved in the MATLAB 7.3 format, stored in HDF5.
+    :param path_to_file: The path to the file.
+    :type path_to_file: str
+    :return: The value of each field of the header.
+    :rtype: dict
+    """
+    import h5py     # Only needed by these files, installed with the reader of MNE
+    with h5py.File(path_to_file, "r") as file:
+        group = file["EEG"] if "EEG" in file else file
+        fields = {}
+        for field in CONST_SET_HEADER_FIELDS[:-1]:
+            fields[field] = np.asarray(group[field]).item() if field in group else None
+        event = group.get("event")
+        if event is None or not hasattr(event, "keys") or "latency" not in event:
+            fields["event"] = None
+        else:
+            fields["event"] = np.empty(event["latency"].size)
+    return fields
+
+
+def read_set_header_structure(path_to_file):
+    """
+    Reads the fields of the header in the "EEG" structure of a SET file saved in the MATLAB 5 format. The file is read
+    sequentially and the other fields of the structure, such as the samples, are skipped without being loaded.
+    :param path_to_file: The path to the file.
+    :type path_to_file: str
+    :return: The value of each field of the header. The events are an empty array with one element per event.
+    :rtype: dict
+    """
+    with open(path_to_file, "rb") as file:
+        byte_order = "<" if file.read(128)[126:128] == b"IM" else ">"
+        while True:
+            data_type, size, _ = matElementReader(file, byte_order).read_tag()
+            if data_type is None:
+                break
+            start = file.tell()
+            reader = matElementReader(file, byte_order)
+            if data_type == CONST_MAT_COMPRESSED:
+                reader = matElementReader(file, byte_order, zlib.decompressobj())
+                data_type, _, _ = reader.read_tag()
+            if data_type == CONST_MAT_MATRIX:
+                mat_class, _, name = reader.read_matrix_header()
+                if name == "EEG" and mat_class == CONST_MAT_STRUCT_CLASS:
+                    return reader.read_structure_fields(CONST_SET_HEADER_FIELDS)
+            file.seek(start + size + (-size % 8 if data_type != CONST_MAT_COMPRESSED else 0))
+    raise ValueError("The file " + path_to_file + " does not contain an EEGLAB dataset.")
+
+
+class matElementReader:
+    def __init__(self, file, byte_order, decompressor=None):
+        """
+        Reads the data elements of a MATLAB 5 file sequentially, from the file or from a compressed variable. The
+        compressed variables are decompressed by chunks, so that skipping an element never loads it.
+        :param file: The file, opened in binary mode.
+        :type file: io.BufferedReader
+        :param byte_order: The byte order of the file, "<" or ">".
+        :type byte_order: str
+        :param decompressor: The decompressor of the compressed variable read. If None, the file is read directly.
+        :type decompressor: zlib.Decompress
+        """
+        self.file = file
+        self.byte_order = byte_order
+        self.decompressor = decompressor
+        self.buffer = b""
+        self.position = 0
+
+    def read(self, size):
+        """
+        Reads bytes of the file or of the compressed variable.
+        :param size: The number of bytes read.
+        :type size: int
+        :return: The bytes read, fewer if the end is reached.
+        :rtype: bytes
+        """
+        if self.decompressor is None:
+            data = self.file.read(size)
+        else:
+            while len(self.buffer) < size and not self.decompressor.eof:
+                compressed = self.decompressor.unconsumed_tail or self.file.read(CONST_MAT_CHUNK_SIZE)
+                if not compressed:
+                    break
+                self.buffer += self.decompressor.decompress(compressed, CONST_MAT_CHUNK_SIZE)
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        self.position += len(data)
+        return data
+
+    def skip(self, size):
+        """
+        Skips bytes of the file or of the compressed variable, by chunks.
+        :param size: The number of bytes skipped.
+        :type size: int
+        """
+        while size > 0:
+            skipped = len(self.read(min(size, CONST_MAT_CHUNK_SIZE)))
+            if skipped == 0:
+                break
+            size -= skipped
+
+    def read_tag(self):
+        """
+        Reads the tag of a data element. The data of the small elements is stored in their tag.
+        :return: The type, the size and the data of a small element. The type is None at the end.
+        :rtype: (int, int, bytes)
+        """
+        tag = self.read(8)
+        if len(tag) < 8:
+            return None, 0, None
+        data_type, size = struct.unpack(self.byte_order + "II", tag)
+        if data_type >> 16:
+            return data_type & 0xFFFF, data_type >> 16, tag[4:4 + (data_type >> 16)]
+        return data_type, size, None
+
+    def read_element(self):
+        """
+        Reads a data element that is not a matrix.
+        :return: The type and the data of the element.
+        :rtype: (int, bytes)
+        """
+        data_type, size, data = self.read_tag()
+        if data is None:
+            data = self.read(size)
+            self.skip(-size % 8)
+        return data_type, data
+
+    def read_matrix_header(self):
+        """
+        Reads the flags, the dimensions and the name of a matrix.
+        :return: The class, the dimensions and the name of the matrix.
+        :rtype: (int, tuple of int, str)
+        """
+        _, flags = self.read_element()
+        _, dimensions = self.read_element()
+        _, name = self.read_element()
+        return (struct.unpack(self.byte_order + "I", flags[:4])[0] & 0xFF,
+                tuple(np.frombuffer(dimensions, self.byte_order + "i4")), name.decode("latin-1"))
+
+    def read_structure_fields(self, field_names):
+        """
+        Reads some fields of a structure of one element, the other fields are skipped.
+        :param field_names: The names of the fields read.
+        :type field_names: tuple of str
+        :return: The value of each field read, None if the field is not in the structure or is empty.
+        :rtype: dict
+        """
+        _, name_length = self.read_element()
+        name_length = struct.unpack(self.byte_order + "i", name_length[:4])[0]
+        _, names = self.read_element()
+        fields = dict.fromkeys(field_names)
+        for i in range(0, len(names), name_length):
+            name = names[i:i + name_length].split(b"\0")[0].decode("latin-1")
+            _, size, _ = self.read_tag()
+            end = self.position + size
+            if name in field_names and size > 0:
+                fields[name] = self.read_field_value()
+            self.skip(end - self.position)
+        return fields
+
+    def read_field_value(self):
+        """
+        Reads the first value of a numerical field. A structure array field is given as an empty array of the same
+        dimensions.
+        :return: The value of the field, None if it is empty.
+        :rtype: float/numpy.ndarray
+        """
+        mat_class, dimensions, _ = self.read_matrix_header()
+        if mat_class == CONST_MAT_STRUCT_CLASS:
+            return np.empty(dimensions)
+        data_type, data = self.read_element()
+        if len(data) == 0 or data_type not in CONST_MAT_TYPES:
+            return None
+        return np.frombuffer(data, self.byte_order + CONST_MAT_TYPES[data_type])[0]
+
+
+def read_fif_header(path_to_file):
+    """
+    Reads the header of a FIF file. The measurement information, the events and the directory of the data buffers are
+    read, but not the samples. The type is given by the name of the file ("-epo.fif" for epochs), the other reader is
+    only tried if the name is not correct.
+    :param path_to_file: The path to the file.
+    :type path_to_file: str
+    :return: The information of the header.
+    :rtype: dict
+    """
+    epochs_name = path_to_file.lower().endswith(CONST_FIF_EPOCHS_SUFFIXES)
+    readers = [read_fif_epochs_header, read_fif_raw_header]
+    if not epochs_name:
+        readers.reverse()
+    try:
+        return readers[0](path_to_file)
+    except ValueError:      # Named as the other type
+        return readers[1](path_to_file)
+
+
+def read_fif_raw_header(path_to_file):
+    """
+    Reads the header of a raw FIF file.
+    :param path_to_file: The path to the file.
+    :type path_to_file: str
+    :return: The information of the header.
+    :rtype: dict
+    """
+    raw = read_raw_fif(path_to_file, preload=False, verbose=False)
+    return {"file_type": "Raw", "channels": len(raw.ch_names), "sfreq": raw.info["sfreq"],
+            "duration": raw.n_times / raw.info["sfreq"], "epochs": None, "events": len(raw.annotations)}
+
+
+def read_fif_epochs_header(path_to_file):
+    """
+    Reads the header of an epochs FIF file.
+    :param path_to_file: The path to the file.
+    :type path_to_file: str
+    :return: The information of the header.
+    :rtype: dict
+    """
+    epochs = read_epochs(path_to_file, preload=False, verbose=False)
+    return {"file_type": "Epochs", "channels": len(epochs.ch_names), "sfreq": epochs.info["sfreq"],
+            "duration": None, "epochs": len(epochs.events), "events": len(epochs.events)}
+
+
+def read_cnt_header(path_to_file):
+    """
+    Reads the header of an ANT eego CNT file. These files are always continuous.
+    :param path_to_file: The path to the file.
+    :type path_to_file: str
+    :return: The information of the header.
+    :rtype: dict
+    """
+    cnt = cnt_file(path_to_file)
+    sfreq = cnt.get_sample_frequency()
+    return {"file_type": "Raw", "channels": cnt.get_channel_count(), "sfreq": sfreq,
+            "duration": cnt.get_sample_count() / sfreq, "epochs": None, "events": cnt.get_trigger_count()}
+
+
+def get_file_size(path_to_file):
+    """
+    Gets the size of a dataset, with the FDT file containing the samples of a SET file if there is one.
+    :param path_to_file: The path to the file.
+    :type path_to_file: str
+    :return: The size in bytes.
+    :rtype: int
+    """
+    size = getsize(path_to_file)
+    data_file = splitext(path_to_file)[0] + ".fdt"
+    if path_to_file.lower().endswith(".set") and isfile(data_file):
+        size += getsize(data_file)
+    return size
+
+
+def format_file_header(header):
+    """
+    Describes the header of a file in a few lines, for the previews of the dialogs.
+    :param header: The header of the file.
+    :type header: dict
+    :return: The description of the header.
+    :rtype: str
+    """
+    if header["file_type"] == "Raw":
+        length = "{:.1f}".format(header["duration"]) + " s"
+    else:
+        length = str(header["epochs"]) + " epochs"
+    return (header["file_type"] + ", " + str(header["channels"]) + " channels, " + "{:g}".format(header["sfreq"]) +
+            " Hz\n" + length + ", " + str(header["events"]) + " events, " +
+            "{:.1f}".format(header["size"] / 1024 ** 2) + " MB")
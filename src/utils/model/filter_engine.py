@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Filter engine
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import numpy as np
+
+from scipy.signal import oaconvolve, sosfiltfilt
+
+from mne import BaseEpochs, pick_channels, pick_types
+from mne.filter import create_filter
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+# Channels filtered together, the temporary arrays are only the size of a block and not of the whole data
+CONST_FILTER_CHANNELS_PER_BLOCK = 8
+# Annotations of the discontinuities of a raw recording, over which MNE does not filter
+CONST_SKIP_BY_ANNOTATION = ("edge", "bad_acq_skip")
+
+filter_designs = {}
+filter_designs_lock = Lock()
+
+
+def get_filter_design(sfreq, low_frequency, high_frequency, filter_method):
+    """
+    Gets the design of a filter, computed only once for each sampling frequency, band and method, so that the datasets
+    of a study filtered with the same band share it.
+    The design is the same as the one of MNE: a zero-phase FIR filter designed with "firwin" and a Hamming window, or a
+    4th order Butterworth IIR filter applied forward and backward.
+    :param sfreq: The sampling frequency of the data.
+    :type sfreq: float
+    :param low_frequency: Lowest frequency from where the data will be filtered.
+    :type low_frequency: float
+    :param high_frequency: Highest frequency from where the data will be filtered.
+    :type high_frequency: float
+    :param filter_method: Method used for the filtering, either FIR or IIR.
+    :type filter_method: str
+    :return: The coefficients of the FIR filter, or the parameters of the IIR filter with its second-order sections.
+    :rtype: numpy.ndarray/dict
+    """
+    key = (float(sfreq), low_frequency, high_frequency, filter_method)
+    with filter_designs_lock:
+        design = filter_designs.get(key)
+    if design is None:
+        design = create_filter(None, sfreq, low_frequency, high_frequency, method=filter_method,
+                               iir_params=get_iir_params(filter_method), verbose=False)
+        with filter_designs_lock:
+            filter_designs[key] = design
+    return design
+
+
+def filter_data(file_data, low_frequency, high_frequency, channels_selected=None, filter_method="fir", n_jobs=1):
+    """
+    Filters the data in place, by blocks of channels filtered in parallel by a pool of threads. The FFT convolution and
+    the IIR filtering of numpy and scipy release the GIL, the blocks are thus filtered at the same time.
+    Each block is read from and written back to the array of the data in memory. "apply_function" is not used, it gives
+    all the channels of epochs to the function whatever the picks with MNE before 1.7, so each block would filter all the
+    channels again. The blocks are disjoint, the threads never write the same part of the array.
+    A raw recording made of several segments (the boundaries of the EEGLAB files) is filtered by MNE, which filters
+    each segment on its own so that the filter does not ring over the discontinuities.
+    :param file_data: MNE data of the dataset. It must be loaded in memory.
+    :type file_data: MNE.Epochs/MNE.Raw
+    :param low_frequency: Lowest frequency from where the data will be filtered. If None, no high-pass.
+    :type low_frequency: float
+    :param high_frequency: Highest frequency from where the data will be filtered. If None, no low-pass.
+    :type high_frequency: float
+    :param channels_selected: Channels on which the filtering will be performed. If None, all the data channels.
+    :type channels_selected: list of str
+    :param filter_method: Method used for the filtering, either FIR or IIR.
+    :type filter_method: str
+    :param n_jobs: Number of threads filtering the blocks of channels.
+    :type n_jobs: int
+    """
+    if low_frequency is None and high_frequency is None:
+        return
+    if has_discontinuities(file_data):
+        file_data.filter(l_freq=low_frequency, h_freq=high_frequency, picks=channels_selected, method=filter_method,
+                         iir_params=get_iir_params(filter_method), skip_by_annotation=CONST_SKIP_BY_ANNOTATION,
+                         n_jobs=n_jobs, verbose=False)
+        return
+    design = get_filter_design(file_data.info["sfreq"], low_frequency, high_frequency, filter_method)
+
+    data_picks = pick_types(file_data.info, meg=True, eeg=True, seeg=True, ecog=True, fnirs=True, exclude=[])
+    if channels_selected is None:
+        picks = data_picks
+    else:
+        picks = pick_channels(file_data.ch_names, include=channels_selected, ordered=False)
+
+    data = file_data._data     # Raw: (channels, times), Epochs: (epochs, channels, times), not copied
+
+    def filter_block(block):
+        if filter_method == "iir":
+            data[..., block, :] = apply_iir_filter(data[..., block, :], design)
+        else:
+            data[..., block, :] = apply_fir_filter(data[..., block, :], design)
+
+    process_channel_blocks(filter_block, picks, n_jobs)
+
+    if set(data_picks).issubset(picks):
+        update_filter_information(file_data.info, low_frequency, high_frequency)
+
+
+def get_iir_params(filter_method):
+    """
+    Gets the parameters of the IIR filter, the same as the default ones of MNE: a 4th order Butterworth filter.
+    :param filter_method: Method used for the filtering, either FIR or IIR.
+    :type filter_method: str
+    :return: The parameters of the IIR filter, None for a FIR filter.
+    :rtype: dict
+    """
+    return dict(order=4, ftype="butter", output="sos") if filter_method == "iir" else None
+
+
+def has_discontinuities(file_data):
+    """
+    Checks if a raw recording has annotations marking discontinuities, over which it must not be filtered.
+    :param file_data: MNE data of the dataset.
+    :type file_data: MNE.Epochs/MNE.Raw
+    :return: True if the data is a raw recording with discontinuities.
+    :rtype: bool
+    """
+    if isinstance(file_data, BaseEpochs):
+        return False
+    return any(description.lower().startswith(CONST_SKIP_BY_ANNOTATION)
+               for description in file_data.annotations.description)
+
+
+def process_channel_blocks(function, picks, n_jobs=1):
+    """
+    Calls a function on each block of channels, in a pool of threads if more than one job is used. The blocks are
+    disjoint, the function can thus write its result in a shared array.
+    :param function: The function processing a block, called with the indexes of the channels of the block.
+    :type function: function
+    :param picks: The indexes of the channels processed.
+    :type picks: numpy.ndarray
+    :param n_jobs: Number of threads processing the blocks.
+    :type n_jobs: int
+    """
+    blocks = [picks[i:i + CONST_FILTER_CHANNELS_PER_BLOCK] for i in range(0, len(picks),
+                                                                           CONST_FILTER_CHANNELS_PER_BLOCK)]
+    if n_jobs > 1 and len(blocks) > 1:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(function, blocks))     # Raises the error of a block if there is one
+    else:
+        for block in blocks:
+            function(block)
+
+
+def apply_fir_filter(block, coefficients):
+    """
+    Applies a zero-phase FIR filter on a block of data, with an overlap-add FFT convolution. The edges are padded with
+    the reflection of the signal, as done by MNE.
+    :param block: The data of the block of channels, the last axis is the time.
+    :type block: numpy.ndarray
+    :param coefficients: The coefficients of the filter, of odd length.
+    :type coefficients: numpy.ndarray
+    :return: The filtered data.
+    :rtype: numpy.ndarray
+    """
+    n_times = block.shape[-1]
+    n_edge = max(min(len(coefficients), n_times) - 1, 0)
+    padded = pad_reflect_limited(block, n_edge)
+    kernel = coefficients.reshape((1,) * (block.ndim - 1) + (-1,))
+    # The "same" mode centers the convolution on the middle of the symmetric kernel, which gives a zero-phase filter
+    filtered = oaconvolve(padded, kernel, mode="same", axes=-1)
+    return filtered[..., n_edge:n_edge + n_times]
+
+
+def apply_iir_filter(block, iir_params):
+    """
+    Applies an IIR filter forward and backward on a block of data, so that its phase is zero.
+    :param block: The data of the block of channels, the last axis is the time.
+    :type block: numpy.ndarray
+    :param iir_params: The parameters of the filter, with its second-order sections and the length of the padding.
+    :type iir_params: dict
+    :return: The filtered data.
+    :rtype: numpy.ndarray
+    """
+    padlen = min(iir_params.get("padlen", 3 * (2 * len(iir_params["sos"]) + 1)), block.shape[-1] - 1)
+    return sosfiltfilt(iir_params["sos"], block, axis=-1, padlen=padlen)
+
+
+def pad_reflect_limited(block, n_edge):
+    """
+    Pads the edges of the data with the odd reflection of the signal, and with zeros if the padding is longer than the
+    signal.
+    :param block: The data of the block of channels, the last axis is the time.
+    :type block: numpy.ndarray
+    :param n_edge: The number of samples added on each edge.
+    :type n_edge: int
+    :return: The padded data.
+    :rtype: numpy.ndarray
+    """
+    n_reflect = min(n_edge, block.shape[-1] - 1)
+    widths = [(0, 0)] * (block.ndim - 1)
+    padded = np.pad(block, widths + [(n_reflect, n_reflect)], mode="reflect", reflect_type="odd")
+    if n_edge > n_reflect:
+        padded = np.pad(padded, widths + [(n_edge - n_reflect, n_edge - n_reflect)], mode="constant")
+    return padded
+
+
+def update_filter_information(info, low_frequency, high_frequency):
+    """
+    Updates the high-pass and low-pass frequencies of the information of the dataset, as done by MNE when all the data
+    channels are filtered.
+    :param info: The information of the dataset.
+    :type info: MNE.Info
+    :param low_frequency: Lowest frequency from where the data has been filtered.
+    :type low_frequency: float
+    :param high_frequency: Highest frequency from where the data has been filtered.
+    :type high_frequency: float
+    """
+    band_pass = low_frequency is None or high_frequency is None or low_frequency < high_frequency
+    with info._unlock():
+        if high_frequency is not None and band_pass and (info["lowpass"] is None or high_frequency < info["lowpass"]):
+            info["lowpass"] = float(high_frequency)
+        if low_frequency is not None and band_pass and (info["highpass"] is None or low_frequency > info["highpass"]):
+            info["highpass"] = float(low_frequency)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ICA operator
+"""
+
+import numpy as np
+
+from mne import BaseEpochs
+from mne.io import RawArray
+from mne.preprocessing import ICA
+
+from utils.model.filter_engine import filter_data
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_ICA_RANDOM_STATE = 97     # The decompositions cached and the benchmark are reproducible
+
+
+def fit_ica(file_data, ica_method, n_components=None, decim=None, high_pass=None, epochs_fraction=None,
+            reject_by_annotation=True):
+    """
+    Fits an ICA decomposition on the data. The data itself is never modified.
+    In the fast mode, the decomposition is fitted on a high-passed copy of the data, which removes the slow drifts that
+    slow down the convergence, keeping only one sample out of "decim" and, for epochs, a random part of the epochs.
+    The unmixing obtained is then applied to the original data.
+    :param file_data: MNE data of the dataset.
+    :type file_data: MNE.Epochs/MNE.Raw
+    :param ica_method: Method used for performing the ICA decomposition
+    :type ica_method: str
+    :param n_components: Number of PCA components kept for the decomposition. If None, all the components are kept.
+    :type n_components: int
+    :param decim: One sample out of "decim" is used for the fit. If None, all the samples are used.
+    :type decim: int
+    :param high_pass: Cut-off frequency of the high-pass filter applied on the copy fitted. If None, no filter.
+    :type high_pass: float
+    :param epochs_fraction: Fraction of the epochs, drawn randomly, used for the fit. If None, all the epochs are used.
+    :type epochs_fraction: float
+    :param reject_by_annotation: Ignore the segments of a raw dataset annotated as bad.
+    :type reject_by_annotation: bool
+    :return: The fitted ICA.
+    :rtype: MNE.preprocessing.ICA
+    """
+    fit_data = file_data
+    if epochs_fraction is not None and epochs_fraction < 1 and isinstance(file_data, BaseEpochs):
+        random_generator = np.random.default_rng(CONST_ICA_RANDOM_STATE)
+        number_of_epochs = max(int(round(len(file_data) * epochs_fraction)), 1)
+        fit_data = file_data[np.sort(random_generator.choice(len(file_data), number_of_epochs, replace=False))]
+    if high_pass is not None:
+        if fit_data is file_data:
+            fit_data = fit_data.copy()
+        filter_data(fit_data, high_pass, None)
+
+    ica = ICA(n_components=n_components, method=ica_method, random_state=CONST_ICA_RANDOM_STATE)
+    ica.fit(fit_data, decim=decim, reject_by_annotation=reject_by_annotation)
+    return ica
+
+
+def compute_ica_operator(ica, info, exclude):
+    """
+    Computes the linear operator removing the excluded components of a fitted ICA from the data, so that a new set of
+    excluded components is applied with a single matrix product instead of fitting the ICA again.
+    The removal of the components is affine (whitening, unmixing, mixing of the kept components, then adding the mean
+    back), the operator is thus obtained by applying the ICA on a zero sample and on one sample per channel.
+    :param ica: The fitted ICA.
+    :type ica: MNE.preprocessing.ICA
+    :param info: The information of the dataset the ICA is applied to.
+    :type info: MNE.Info
+    :param exclude: The indexes of the components removed.
+    :type exclude: list of int
+    :return: The matrix, of shape (channels, channels), and the offset added to each channel.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    number_of_channels = len(info["ch_names"])
+    probe_data = np.hstack([np.zeros((number_of_channels, 1)), np.eye(number_of_channels)])
+    probe = RawArray(probe_data, info.copy(), verbose=False)
+    applied_data = ica.apply(probe, exclude=list(exclude), verbose=False).get_data()
+    offset = applied_data[:, 0]
+    matrix = applied_data[:, 1:] - offset[:, np.newaxis]
+    return matrix, offset
+
+
+def apply_ica_operator(file_data, matrix, offset):
+    """
+    Applies the operator of an ICA on a copy of the data of a dataset.
+    :param file_data: MNE data of the dataset.
+    :type file_data: MNE.Epochs/MNE.Raw
+    :param matrix: The matrix of the operator.
+    :type matrix: numpy.ndarray
+    :param offset: The offset added to each channel.
+    :type offset: numpy.ndarray
+    :return: The data without the excluded components.
+    :rtype: MNE.Epochs/MNE.Raw
+    """
+    offset = offset[:, np.newaxis]
+    file_data = file_data.copy()
+    # The function receives all the channels of the raw data, or all the epochs, and the matrix product is broadcast
+    file_data.apply_function(lambda data: np.matmul(matrix, data) + offset, picks="all", channel_wise=False)
+    return file_data
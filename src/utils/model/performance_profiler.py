@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Performance profiler
+"""
+
+import json
+import logging
+import os
+import threading
+
+import psutil
+
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from time import perf_counter, thread_time, time
+
+from utils.file_path_search import get_project_root_path
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_LOG_DIRECTORY = "logs"
+CONST_LOG_FILE = "performance.log"
+CONST_LOG_MAXIMUM_SIZE = 5 * 1024 ** 2      # 5 MB per file
+CONST_LOG_BACKUPS = 3
+CONST_MAXIMUM_RECORDS = 1000                # Records kept in memory for the performance panel
+
+records = deque(maxlen=CONST_MAXIMUM_RECORDS)
+records_lock = threading.Lock()
+steps_stack = threading.local()     # Steps currently running in each thread, to know the parent of a step
+logger = None
+
+
+def profiled(function):
+    """
+    Decorator measuring the wall-clock time, the CPU time and the memory of a method of a runnable.
+    "run" is recorded as the whole computation of the runnable, the other methods as its steps.
+    :param function: The method.
+    :type function: function
+    :return: The method measured.
+    :rtype: function
+    """
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        with profile_step(type(self).__name__, function.__name__):
+            return function(self, *args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def profile_step(runnable, step):
+    """
+    Measures a step of a computation, then records it in the rotating log and in the records shown by the performance
+    panel.
+    The CPU time is the time of the thread running the step, so that the runnables computed at the same time are not
+    counted. The memory is the resident set size of the whole application when the step starts and when it finishes.
+    The status is "error" if the step raised an exception or if the runnable caught it and called "record_step_error".
+    :param runnable: The name of the runnable.
+    :type runnable: str
+    :param step: The name of the step.
+    :type step: str
+    """
+    if not hasattr(steps_stack, "steps"):
+        steps_stack.steps = []
+    parent = steps_stack.steps[-1]["step"] if steps_stack.steps else None
+    current_step = {"step": step, "failed": False}
+    steps_stack.steps.append(current_step)
+    status = "error"
+    start_rss = get_rss()
+    start_wall_time = perf_counter()
+    start_cpu_time = thread_time()
+    try:
+        yield
+        if not current_step["failed"]:
+            status = "ok"
+    finally:
+        steps_stack.steps.pop()
+        record = {"time": time(), "runnable": runnable, "step": step, "parent": parent,
+                  "wall_time": perf_counter() - start_wall_time, "cpu_time": thread_time() - start_cpu_time,
+                  "start_rss": start_rss, "end_rss": get_rss(), "status": status}
+        with records_lock:
+            records.append(record)
+        get_logger().info(json.dumps(record))
+
+
+def record_step_error():
+    """
+    Records that the step running in this thread failed. The runnables catch their exceptions to display them, so they
+    call it before emitting their error signal.
+    """
+    if getattr(steps_stack, "steps", None):
+        steps_stack.steps[-1]["failed"] = True
+
+
+def get_rss():
+    """
+    Gets the current resident set size of the application.
+    :return: The resident set size, in bytes.
+    :rtype: int
+    """
+    return psutil.Process().memory_info().rss
+
+
+def get_median(values):
+    """
+    Gets the median of measures, the upper one for an even number of measures.
+    The "statistics" module of the standard library can not be used, it is shadowed by the statistics package of the
+    project.
+    :param values: The measures.
+    :type values: list of float
+    :return: The median.
+    :rtype: float
+    """
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def get_logger():
+    """
+    Gets the logger writing the records in the rotating log of the project, created the first time it is used.
+    :return: The logger.
+    :rtype: logging.Logger
+    """
+    global logger
+    if logger is None:
+        logger = logging.getLogger("mne_vision.performance")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        try:
+            log_directory = os.path.join(get_project_root_path(), CONST_LOG_DIRECTORY)
+            os.makedirs(log_directory, exist_ok=True)
+            handler = RotatingFileHandler(os.path.join(log_directory, CONST_LOG_FILE), maxBytes=CONST_LOG_MAXIMUM_SIZE,
+                                          backupCount=CONST_LOG_BACKUPS)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+        except OSError:     # Read-only installation, the records are only kept in memory
+            logger.addHandler(logging.NullHandler())
+    return logger
+
+
+def get_records():
+    """
+    Gets the last records, oldest first.
+    :return: The records.
+    :rtype: list of dict
+    """
+    with records_lock:
+        return list(records)
+
+
+def clear_records():
+    """
+    Removes the records kept in memory. The rotating log is not modified.
+    """
+    with records_lock:
+        records.clear()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pipeline
+"""
+
+import json
+
+import numpy as np
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_PIPELINE_VERSION = 1
+# Operations that can be replayed on other datasets, in the order they can appear in a pipeline
+CONST_PIPELINE_OPERATIONS = ("load_data_info", "set_events", "filter", "resampling", "re_referencing", "ica_decomposition",
+                             "extract_epochs", "artifact_rejection", "power_spectral_density", "envelope_correlation")
+
+
+class processingPipeline:
+    def __init__(self, steps=None):
+        """
+        Sequence of the operations performed on a dataset, with their parameters.
+        The pipeline is recorded while the user processes a dataset in the application, saved in a JSON file, then
+        replayed by the batch runner on other datasets without the graphical interface.
+        :param steps: The steps already recorded.
+        :type steps: list of dict
+        """
+        if steps is None:
+            steps = []
+        self.steps = steps
+
+    def record(self, operation, parameters=None, replace_last=False):
+        """
+        Records an operation performed on the dataset. The operations that can not be replayed on another dataset (the
+        modification of the events or of the channels names for example) are ignored.
+        :param operation: The name of the operation.
+        :type operation: str
+        :param parameters: The parameters of the operation.
+        :type parameters: dict
+        :param replace_last: Replace the last step of the same operation, when the operation is performed again on the
+        data before it.
+        :type replace_last: bool
+        """
+        if operation in CONST_PIPELINE_OPERATIONS:
+            if parameters is None:
+                parameters = {}
+            if replace_last and operation in self.get_operations():
+                last_index = len(self.steps) - 1 - self.get_operations()[::-1].index(operation)
+                del self.steps[last_index]
+            self.steps.append({"operation": operation, "parameters": self.make_serializable(parameters)})
+
+    """
+    Files
+    """
+    def save(self, file_path):
+        """
+        Saves the pipeline in a JSON file.
+        :param file_path: The path of the file.
+        :type file_path: str
+        """
+        with open(file_path, "w") as file:
+            json.dump({"version": CONST_PIPELINE_VERSION, "steps": self.steps}, file, indent=4)
+
+    @staticmethod
+    def load(file_path):
+        """
+        Loads a pipeline saved in a JSON file.
+        :param file_path: The path of the file.
+        :type file_path: str
+        :return: The pipeline.
+        :rtype: processingPipeline
+        """
+        with open(file_path, "r") as file:
+            content = json.load(file)
+        if content.get("version") != CONST_PIPELINE_VERSION:
+            raise ValueError("The version of the pipeline file is not supported.")
+        for step in content["steps"]:
+            if step["operation"] not in CONST_PIPELINE_OPERATIONS:
+                raise ValueError("The operation \"" + str(step["operation"]) + "\" can not be replayed.")
+        return processingPipeline(content["steps"])
+
+    """
+    Utils
+    """
+    @staticmethod
+    def make_serializable(value):
+        """
+        Transforms the parameters of an operation so that they can be written in a JSON file.
+        :param value: The parameters.
+        :type value: object
+        :return: The parameters, with lists instead of tuples and arrays, and Python numbers instead of numpy numbers.
+        :rtype: object
+        """
+        if isinstance(value, dict):
+            return {str(key): processingPipeline.make_serializable(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return [processingPipeline.make_serializable(item) for item in value]
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    """
+    Getters
+    """
+    def get_steps(self):
+        """
+        Gets the steps of the pipeline.
+        :return: The steps, each with the name of the operation and its parameters.
+        :rtype: list of dict
+        """
+        return self.steps
+
+    def get_operations(self):
+        """
+        Gets the names of the operations of the pipeline.
+        :return: The names of the operations.
+        :rtype: list of str
+        """
+        return [step["operation"] for step in self.steps]
@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pipeline runner
+"""
+
+import os
+
+import numpy as np
+
+from time import perf_counter
+
+from mne import read_epochs, find_events, events_from_annotations, setup_source_space, make_bem_model, \
+    make_bem_solution, make_forward_solution
+from mne.channels import make_standard_montage
+from mne.io import read_raw_fif, read_raw_eeglab, read_epochs_eeglab
+from mne_connectivity import envelope_correlation, phase_slope_index, spectral_connectivity_epochs
+
+from utils.cnt_reader.cnt_file_reader import get_raw_from_cnt
+from utils.file_path_search import get_project_freesurfer_path
+from utils.model.file_header import read_file_header
+from utils.model.artifact_rejection import compute_epochs_statistics, compute_adaptive_threshold, compute_keep_mask
+from utils.model.epochs_extraction import extract_epochs
+from utils.model.filter_engine import filter_data
+from utils.model.resampling_engine import resample_data
+from utils.model.rest_operator import get_rest_operator, apply_rest_operator
+from utils.model.event_table import eventTable
+from utils.model.power_spectral_density import powerSpectralDensity
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class pipelineRunner:
+    def __init__(self, pipeline, file_path, output_directory):
+        """
+        Replays a pipeline on a single dataset, without the graphical interface.
+        Each step does the same computation as the runnable used by the application for the operation, and its duration
+        is measured.
+        :param pipeline: The pipeline to replay.
+        :type pipeline: processingPipeline
+        :param file_path: The path of the dataset.
+        :type file_path: str
+        :param output_directory: The directory in which the processed dataset and the results are written.
+        :type output_directory: str
+        """
+        self.pipeline = pipeline
+        self.file_path = file_path
+        self.output_directory = output_directory
+        self.dataset_name = os.path.splitext(os.path.basename(file_path))[0]
+
+        self.file_data = None
+        self.file_type = None
+        self.read_events = None
+        self.read_event_ids = None
+
+        self.timings = []
+
+    def run(self):
+        """
+        Opens the dataset, replays every step of the pipeline, then saves the processed dataset.
+        :return: The duration of each step, in seconds.
+        :rtype: list of (str, float)
+        """
+        self.timed_step("open_file", self.open_file, {})
+        for step in self.pipeline.get_steps():
+            self.timed_step(step["operation"], getattr(self, step["operation"]), step["parameters"])
+        self.timed_step("save_file", self.save_file, {})
+        return self.timings
+
+    def timed_step(self, operation, function, parameters):
+        """
+        Runs a step and records its duration.
+        :param operation: The name of the operation.
+        :type operation: str
+        :param function: The function performing the operation.
+        :type function: function
+        :param parameters: The parameters of the operation.
+        :type parameters: dict
+        """
+        start = perf_counter()
+        function(**parameters)
+        self.timings.append((operation, perf_counter() - start))
+
+    """
+    Files
+    """
+    def open_file(self):
+        """
+        Reads the dataset, in the same way as the application, then looks for the events of a raw dataset.
+        """
+        extension = os.path.splitext(self.file_path)[1].lower()
+        self.file_type = read_file_header(self.file_path)["file_type"]
+        if extension == ".fif":
+            if self.file_type == "Raw":
+                self.file_data = read_raw_fif(self.file_path, preload=True)
+            else:
+                self.file_data = read_epochs(self.file_path, preload=True)
+        elif extension == ".cnt":
+            self.file_data = get_raw_from_cnt(self.file_path)
+        else:
+            if self.file_type == "Raw":
+                self.file_data = read_raw_eeglab(self.file_path, preload=True)
+            else:
+                self.file_data = read_epochs_eeglab(self.file_path)
+
+        if self.file_type == "Raw":
+            try:
+                self.read_events = find_events(self.file_data)
+            except Exception:
+                try:
+                    self.read_events, self.read_event_ids = events_from_annotations(self.file_data)
+                except Exception:
+                    pass
+
+    def save_file(self):
+        """
+        Saves the processed dataset in a FIF file of the output directory.
+        """
+        if self.file_type == "Raw":
+            file_name = self.dataset_name + "-processed-raw.fif"
+        else:
+            file_name = self.dataset_name + "-processed-epo.fif"
+        self.file_data.save(os.path.join(self.output_directory, file_name), overwrite=True)
+
+    """
+    Steps
+    """
+    def set_events(self, source, events_digest=None, stim_channel=None, events=None, event_ids=None):
+        """
+        Sets the events of the raw dataset in the same way as they were set in the application, instead of the events
+        found when the dataset was opened.
+        :param source: The source of the events: "stim_channel", "annotations" or "events".
+        :type source: str
+        :param events_digest: The digest of the events of the dataset the pipeline was recorded on. Not used.
+        :type events_digest: str
+        :param stim_channel: The stimulation channel the events are found on. If None, MNE chooses it.
+        :type stim_channel: str
+        :param events: The events read from a file or modified in the application, used as they are.
+        :type events: list of, list of int
+        :param event_ids: The event ids of the events used as they are.
+        :type event_ids: dict
+        """
+        if source == "stim_channel":
+            self.read_events = find_events(self.file_data, stim_channel=stim_channel)
+            self.read_event_ids = None
+        elif source == "annotations":
+            self.read_events, self.read_event_ids = events_from_annotations(self.file_data)
+        else:
+            self.read_events = None if events is None else np.asarray(events, dtype=np.int64).reshape(-1, 3)
+            self.read_event_ids = event_ids
+
+    def load_data_info(self, montage, channels_selected, tmin, tmax):
+        """
+        Sets the montage, keeps the channels selected that exist in the dataset and crops the dataset.
+        :param montage: Montage of the headset
+        :type montage: str
+        :param channels_selected: Channels selected
+        :type channels_selected: list of str
+        :param tmin: Start time of the epoch or raw file to keep
+        :type tmin: float
+        :param tmax: End time of the epoch or raw file to keep
+        :type tmax: float
+        """
+        if montage != "default":
+            self.file_data.set_montage(make_standard_montage(montage))
+        channels_selected = [channel for channel in channels_selected if channel in self.file_data.ch_names]
+        self.file_data = self.file_data.pick_channels(channels_selected)
+        if tmin is not None and tmax is not None:
+            self.file_data = self.file_data.crop(tmin=tmin, tmax=min(tmax, self.file_data.times[-1]))
+
+    def filter(self, low_frequency, high_frequency, channels_selected, filter_method):
+        """
+        Filters the dataset.
+        :param low_frequency: Lowest frequency from where the data will be filtered.
+        :type low_frequency: float
+        :param high_frequency: Highest frequency from where the data will be filtered.
+        :type high_frequency: float
+        :param channels_selected: Channels on which the filtering will be performed.
+        :type channels_selected: list of str
+        :param filter_method: Method used for the filtering, either FIR or IIR.
+        :type filter_method: str
+        """
+        if channels_selected is not None:
+            channels_selected = [channel for channel in channels_selected if channel in self.file_data.ch_names]
+        # The datasets are already replayed in parallel processes, the channels are thus filtered by a single thread
+        filter_data(self.file_data, low_frequency, high_frequency, channels_selected, filter_method)
+
+    def resampling(self, frequency, resampling_method="fft"):
+        """
+        Resamples the dataset and the latencies of its events.
+        :param frequency: The new frequency at which the data will be resampled.
+        :type frequency: int
+        :param resampling_method: Method used for the resampling, either FFT or polyphase.
+        :type resampling_method: str
+        """
+        old_frequency = self.file_data.info["sfreq"]
+        if resampling_method == "polyphase":
+            self.file_data = resample_data(self.file_data, frequency)
+        else:
+            self.file_data.resample(frequency)
+        if self.read_events is not None:
+            self.read_events = eventTable(self.read_events, {}).rescale_latencies(frequency / old_frequency).to_array()
+
+    def re_referencing(self, references):
+        """
+        Re-references the dataset. The reference to the point at infinity uses the forward solution of the "fsaverage"
+        model.
+        :param references: References from which the data will be re-referenced.
+        :type references: list of str; str
+        """
+        if references == "infinity":
+            def compute_forward_solution():
+                subjects_dir = get_project_freesurfer_path()
+                src = setup_source_space(subject="fsaverage", spacing="oct6", add_dist="patch",
+                                         subjects_dir=subjects_dir, verbose=False)
+                model = make_bem_model(subject="fsaverage", ico=4, conductivity=(0.3, 0.006, 0.3),
+                                       subjects_dir=subjects_dir, verbose=False)
+                bem = make_bem_solution(model, verbose=False)
+                return make_forward_solution(self.file_data.info, trans="fsaverage", src=src, bem=bem, meg=False,
+                                             eeg=True, mindist=5.0, verbose=False)
+
+            # The matrix is kept by the worker process for the next datasets with the same montage
+            apply_rest_operator(self.file_data, get_rest_operator(self.file_data.info, compute_forward_solution))
+        else:
+            self.file_data.set_eeg_reference(ref_channels=references)
+
+    def ica_decomposition(self, ica_method, exclude=None, **ica_parameters):
+        """
+        Skips the ICA decomposition of the dataset, with a warning.
+        The components removed from the recorded dataset do not correspond to the components of this dataset, and an
+        ICA applied without removing any component gives back the same data. The decomposition would thus take minutes
+        without changing the dataset.
+        :param ica_method: Method used for performing the ICA decomposition
+        :type ica_method: str
+        :param exclude: The indexes of the components removed from the recorded dataset.
+        :type exclude: list of int
+        :param ica_parameters: The number of components and the parameters of the fast fit, see "fit_ica".
+        :type ica_parameters: dict
+        """
+        print("Warning: " + self.dataset_name + ": the ICA decomposition (" + ica_method + ") is skipped, the "
+              "components to remove must be chosen for each dataset in the application.")
+
+    def extract_epochs(self, tmin, tmax, events_selected=None, trials_selected=None, event_ids=None, events_digest=None):
+        """
+        Extracts the epochs around the events of the trials selected only. The trials selected by the names of their
+        events are found in the events of this dataset.
+        :param tmin: Start time of the epoch to keep
+        :type tmin: float
+        :param tmax: End time of the epoch to keep
+        :type tmax: float
+        :param events_selected: The names of the events of the trials selected, or "all". If None, the trials are given by
+        their indexes.
+        :type events_selected: list of str/str
+        :param trials_selected: The indexes of the trials selected, when they were selected by their indexes.
+        :type trials_selected: list of int
+        :param event_ids: The event ids of the dataset the pipeline was recorded on. Not used, the events selected are
+        found with the event ids of this dataset, or named by their value if it has none.
+        :type event_ids: dict
+        :param events_digest: The digest of the events of the dataset the pipeline was recorded on. Not used, the events
+        of this dataset are different.
+        :type events_digest: str
+        """
+        if self.read_events is None:
+            raise ValueError("No events were found in the dataset, the epochs can not be extracted.")
+        event_values = np.asarray(self.read_events).reshape(-1, 3)[:, 2]
+        read_event_ids = self.read_event_ids
+        if read_event_ids is None:      # Events of a stim channel, named by their value as MNE does
+            read_event_ids = {str(event_value): int(event_value) for event_value in np.unique(event_values)}
+        if events_selected == "all":
+            trials_selected = None
+        elif events_selected is not None:
+            event_ids_selected = [read_event_ids[event] for event in events_selected if event in read_event_ids]
+            trials_selected = np.flatnonzero(np.isin(event_values, event_ids_selected))
+        self.file_data = extract_epochs(self.file_data, self.read_events, self.read_event_ids, tmin, tmax,
+                                        trials_selected)
+        self.file_type = "Epochs"
+
+    def artifact_rejection(self, peak_to_peak_threshold, variance_threshold, flat_threshold, adaptive):
+        """
+        Drops the epochs with artifacts.
+        :param peak_to_peak_threshold: Maximum peak-to-peak amplitude, in volts. If None, not used.
+        :type peak_to_peak_threshold: float
+        :param variance_threshold: Maximum variance, in volts squared. If None, not used.
+        :type variance_threshold: float
+        :param flat_threshold: Minimum peak-to-peak amplitude, in volts. If None, not used.
+        :type flat_threshold: float
+        :param adaptive: Compute the peak-to-peak threshold of this dataset by cross-validation.
+        :type adaptive: bool
+        """
+        if self.file_type != "Epochs":
+            raise ValueError("The artifact rejection is done on the epochs, the epochs must be extracted first.")
+        data, peak_to_peak, variance = compute_epochs_statistics(self.file_data)
+        if adaptive:
+            peak_to_peak_threshold = compute_adaptive_threshold(data, peak_to_peak)
+        keep_mask, _ = compute_keep_mask(peak_to_peak, variance, peak_to_peak_threshold, variance_threshold,
+                                         flat_threshold)
+        self.file_data = self.file_data[keep_mask]
+
+    def power_spectral_density(self, minimum_frequency, maximum_frequency, minimum_time, maximum_time):
+        """
+        Computes the power spectral density of the dataset and exports its mean in a CSV file.
+        :param minimum_frequency: Minimum frequency from which the power spectral density will be computed.
+        :type minimum_frequency: float
+        :param maximum_frequency: Maximum frequency from which the power spectral density will be computed.
+        :type maximum_frequency: float
+        :param minimum_time: Minimum time of the epochs from which the power spectral density will be computed.
+        :type minimum_time: float
+        :param maximum_time: Maximum time of the epochs from which the power spectral density will be computed.
+        :type maximum_time: float
+        """
+        bandwidth = 1.0 / (maximum_time - minimum_time)     # To counter bandwidth normalization
+        psd = powerSpectralDensity.compute(self.file_data, minimum_frequency, maximum_frequency, minimum_time,
+                                           maximum_time, bandwidth=bandwidth)
+        psd.export_csv(os.path.join(self.output_directory, self.dataset_name + "-psd.csv"))
+
+    def envelope_correlation(self, psi, fmin, fmax, connectivity_method, n_jobs):
+        """
+        Computes the connectivity between the channels of the dataset and exports it in a TXT file.
+        :param psi: Check if the computation of the Phase Slope Index must be done.
+        :type psi: bool
+        :param fmin: Minimum frequency from which the envelope correlation will be computed.
+        :type fmin: float
+        :param fmax: Maximum frequency from which the envelope correlation will be computed.
+        :type fmax: float
+        :param connectivity_method: Method used for computing the connectivity.
+        :type connectivity_method: str
+        :param n_jobs: Number of processes used to compute the connectivity
+        :type n_jobs: int
+        """
+        if connectivity_method == "envelope_correlation":
+            correlation_data = envelope_correlation(self.file_data).combine()
+        else:
+            correlation_data = spectral_connectivity_epochs(self.file_data, method=connectivity_method,
+                                                            mode="multitaper", sfreq=self.file_data.info["sfreq"],
+                                                            fmin=fmin, fmax=fmax, faverage=True, mt_adaptive=True,
+                                                            n_jobs=n_jobs)
+        self.save_connectivity(correlation_data.get_data(output="dense")[:, :, 0], "-connectivity")
+        if psi:
+            psi_data = phase_slope_index(self.file_data, fmin=fmin, fmax=fmax)
+            self.save_connectivity(psi_data.get_data(output="dense")[:, :, 0], "-PSI")
+
+    def save_connectivity(self, data, file_name):
+        """
+        Writes a connectivity matrix in a TXT file of the output directory, with the same format as the application.
+        :param data: The connectivity matrix.
+        :type data: numpy.ndarray
+        :param file_name: The suffix of the name of the file.
+        :type file_name: str
+        """
+        file_path = os.path.join(self.output_directory, self.dataset_name + file_name + ".txt")
+        np.savetxt(file_path, data, delimiter=", ", header=", ".join(self.file_data.ch_names), comments="")
+
+    """
+    Getters
+    """
+    def get_timings(self):
+        """
+        Gets the duration of each step already performed.
+        :return: The name of the operation and its duration in seconds, for each step.
+        :rtype: list of (str, float)
+        """
+        return self.timings
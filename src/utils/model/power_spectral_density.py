@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Power spectral density
+"""
+
+import numpy as np
+
+from mne import pick_info, pick_types
+from mne.time_frequency import psd_multitaper, psd_welch
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class powerSpectralDensity:
+    def __init__(self, psds, frequencies, info):
+        """
+        Power spectral density of each epoch and each channel of a dataset.
+        The spectra are computed once, then the plots, the topographies, the statistics and the exportation all use
+        these arrays, so that no figure has to be drawn before it is shown.
+        :param psds: The power spectral density, of shape (epochs, channels, frequencies).
+        :type psds: numpy.ndarray
+        :param frequencies: The frequencies of the power spectral density.
+        :type frequencies: numpy.ndarray
+        :param info: MNE information of the channels of the power spectral density.
+        :type info: MNE.Info
+        """
+        self.psds = psds
+        self.frequencies = frequencies
+        self.info = info
+
+    @staticmethod
+    def compute(file_data, minimum_frequency, maximum_frequency, minimum_time, maximum_time, method="multitaper",
+                bandwidth=None):
+        """
+        Computes the power spectral density of every epoch and every channel of the dataset.
+        :param file_data: MNE data of the dataset.
+        :type file_data: MNE.Epochs/MNE.Raw
+        :param minimum_frequency: Minimum frequency from which the power spectral density will be computed.
+        :type minimum_frequency: float
+        :param maximum_frequency: Maximum frequency from which the power spectral density will be computed.
+        :type maximum_frequency: float
+        :param minimum_time: Minimum time of the epochs from which the power spectral density will be computed.
+        :type minimum_time: float
+        :param maximum_time: Maximum time of the epochs from which the power spectral density will be computed.
+        :type maximum_time: float
+        :param method: Method used to compute the power spectral density, "multitaper" or "welch".
+        :type method: str
+        :param bandwidth: Bandwidth of the multi-taper windowing function. If None, the default bandwidth of MNE is used.
+        :type bandwidth: float
+        :return: The power spectral density.
+        :rtype: powerSpectralDensity
+        """
+        if method == "welch":
+            number_of_samples = int(round((maximum_time - minimum_time) * file_data.info["sfreq"])) + 1
+            psds, frequencies = psd_welch(file_data, fmin=minimum_frequency, fmax=maximum_frequency, tmin=minimum_time,
+                                          tmax=maximum_time, n_fft=min(256, number_of_samples), picks="all")
+        else:
+            psds, frequencies = psd_multitaper(file_data, fmin=minimum_frequency, fmax=maximum_frequency,
+                                               tmin=minimum_time, tmax=maximum_time, bandwidth=bandwidth, picks="all")
+        if psds.ndim == 2:      # Raw data, a single "epoch"
+            psds = psds[np.newaxis]
+        return powerSpectralDensity(psds, frequencies, file_data.info)
+
+    """
+    Selections
+    """
+    def select_epochs(self, epochs_kept):
+        """
+        Gets the power spectral density of some of the epochs only, without computing it again.
+        :param epochs_kept: Mask or indexes of the epochs to keep.
+        :type epochs_kept: numpy.ndarray
+        :return: The power spectral density of the epochs kept.
+        :rtype: powerSpectralDensity
+        """
+        return powerSpectralDensity(self.psds[epochs_kept], self.frequencies, self.info)
+
+    def get_picks(self, channels_selected=None):
+        """
+        Gets the indexes of the channels selected.
+        :param channels_selected: Channels selected. If None, all the channels are selected.
+        :type channels_selected: str/list of str
+        :return: The indexes of the channels.
+        :rtype: list of int
+        """
+        if channels_selected is None:
+            return list(range(len(self.info.ch_names)))
+        if isinstance(channels_selected, str):
+            channels_selected = [channels_selected]
+        return [self.info.ch_names.index(channel) for channel in channels_selected]
+
+    def get_data_picks(self):
+        """
+        Gets the indexes of the good EEG channels, which can be plotted on the topographies.
+        :return: The indexes of the channels.
+        :rtype: numpy.ndarray
+        """
+        return pick_types(self.info, eeg=True, exclude="bads")
+
+    """
+    Computations
+    """
+    def get_mean(self, channels_selected=None):
+        """
+        Gets the power spectral density averaged over the epochs.
+        :param channels_selected: Channels selected. If None, all the channels are selected.
+        :type channels_selected: str/list of str
+        :return: The mean power spectral density, of shape (channels, frequencies).
+        :rtype: numpy.ndarray
+        """
+        return self.psds[:, self.get_picks(channels_selected)].mean(axis=0)
+
+    def get_mean_db(self, channels_selected=None):
+        """
+        Gets the power spectral density averaged over the epochs, in µV²/Hz (dB).
+        :param channels_selected: Channels selected. If None, all the channels are selected.
+        :type channels_selected: str/list of str
+        :return: The mean power spectral density in dB, of shape (channels, frequencies).
+        :rtype: numpy.ndarray
+        """
+        return self.to_db(self.get_mean(channels_selected))
+
+    def get_epochs_db(self, channels_selected=None):
+        """
+        Gets the power spectral density of each epoch averaged over the channels selected, in µV²/Hz (dB).
+        :param channels_selected: Channels selected. If None, all the channels are selected.
+        :type channels_selected: str/list of str
+        :return: The power spectral density in dB, of shape (epochs, frequencies).
+        :rtype: numpy.ndarray
+        """
+        return self.to_db(self.psds[:, self.get_picks(channels_selected)].mean(axis=1))
+
+    def get_topographies(self, frequencies):
+        """
+        Gets the mean power spectral density of each EEG channel at the frequencies given, for the topographies.
+        :param frequencies: The frequencies of the topographies.
+        :type frequencies: list of float
+        :return: The power spectral density in dB, of shape (frequencies, channels), and the information of the
+        channels.
+        :rtype: (numpy.ndarray, MNE.Info)
+        """
+        data_picks = self.get_data_picks()
+        frequency_indexes = np.abs(self.frequencies[np.newaxis, :] - np.asarray(frequencies)[:, np.newaxis]).argmin(axis=1)
+        topographies = self.to_db(self.psds[:, data_picks][:, :, frequency_indexes].mean(axis=0)).T
+        return topographies, pick_info(self.info, data_picks)
+
+    @staticmethod
+    def to_db(psds):
+        """
+        Converts power spectral densities from V²/Hz to µV²/Hz (dB).
+        :param psds: The power spectral densities.
+        :type psds: numpy.ndarray
+        :return: The power spectral densities in dB.
+        :rtype: numpy.ndarray
+        """
+        return 10 * np.log10(psds * 1e12)
+
+    """
+    Exportation
+    """
+    def export_csv(self, file_path, channels_selected=None):
+        """
+        Exports the mean power spectral density of the channels in a CSV file, one line per frequency.
+        :param file_path: The path of the file.
+        :type file_path: str
+        :param channels_selected: Channels selected. If None, all the channels are exported.
+        :type channels_selected: str/list of str
+        """
+        picks = self.get_picks(channels_selected)
+        header = "Frequency, " + ", ".join(self.info.ch_names[pick] for pick in picks)
+        data = np.column_stack((self.frequencies, self.get_mean(channels_selected).T))
+        np.savetxt(file_path, data, delimiter=", ", header=header, comments="")
+
+    """
+    Getters
+    """
+    def get_psds(self):
+        """
+        Gets the power spectral density of each epoch and each channel.
+        :return: The power spectral density, of shape (epochs, channels, frequencies).
+        :rtype: numpy.ndarray
+        """
+        return self.psds
+
+    def get_frequencies(self):
+        """
+        Gets the frequencies of the power spectral density.
+        :return: The frequencies.
+        :rtype: numpy.ndarray
+        """
+        return self.frequencies
+
+    def get_info(self):
+        """
+        Gets the MNE information of the channels.
+        :return: The information of the channels.
+        :rtype: MNE.Info
+        """
+        return self.info
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Resampling engine
+"""
+
+from fractions import Fraction
+from threading import Lock
+
+import numpy as np
+
+from scipy.signal import firwin, resample_poly
+
+from mne import BaseEpochs, EpochsArray, pick_types
+from mne.io import RawArray
+
+from utils.model.filter_engine import process_channel_blocks
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+# Sampling frequencies are rounded to a fraction of this denominator, so that the up and down factors stay small
+CONST_FREQUENCY_MAXIMUM_DENOMINATOR = 1000
+# Above this factor, the polyphase kernel (20 times the largest factor) is larger than the FFT of most recordings
+CONST_MAXIMUM_RESAMPLING_FACTOR = 320
+
+resampling_plans = {}
+resampling_plans_lock = Lock()
+
+
+def get_resampling_plan(old_frequency, new_frequency):
+    """
+    Gets the plan of a polyphase resampling: the up and down factors of the rational ratio between the frequencies, and
+    the anti-aliasing low-pass kernel. It is computed only once for each ratio, so that the datasets of a study
+    resampled at the same frequency share it.
+    The kernel is the same as the one of "scipy.signal.resample_poly": a Kaiser window of 20 times the largest factor.
+    There is no plan when the largest factor is above "CONST_MAXIMUM_RESAMPLING_FACTOR", for example from 500.123Hz to
+    250Hz (250000/500123).
+    :param old_frequency: The sampling frequency of the data.
+    :type old_frequency: float
+    :param new_frequency: The new frequency at which the data will be resampled.
+    :type new_frequency: float
+    :return: The up factor, the down factor and the kernel. None if the factors are too large.
+    :rtype: (int, int, numpy.ndarray)
+    """
+    ratio = (Fraction(new_frequency).limit_denominator(CONST_FREQUENCY_MAXIMUM_DENOMINATOR) /
+             Fraction(old_frequency).limit_denominator(CONST_FREQUENCY_MAXIMUM_DENOMINATOR))
+    up, down = ratio.numerator, ratio.denominator
+    if max(up, down) > CONST_MAXIMUM_RESAMPLING_FACTOR:
+        return None
+    with resampling_plans_lock:
+        kernel = resampling_plans.get((up, down))
+    if kernel is None:
+        max_rate = max(up, down)
+        kernel = firwin(2 * 10 * max_rate + 1, 1 / max_rate, window=("kaiser", 5.0))
+        with resampling_plans_lock:
+            resampling_plans[(up, down)] = kernel
+    return up, down, kernel
+
+
+def resample_data(file_data, new_frequency, n_jobs=1):
+    """
+    Resamples the data with a polyphase filter, by blocks of channels resampled in parallel by a pool of threads. Only
+    the resampled data and the temporary arrays of the blocks are allocated, instead of the padded FFT of the whole
+    recording.
+    When the ratio between the frequencies has no plan, the data is resampled by MNE with the FFT instead.
+    The stimulation channels are not filtered, each new sample keeps the largest value of the samples it replaces so
+    that the triggers are not lost.
+    :param file_data: MNE data of the dataset. It must be loaded in memory.
+    :type file_data: MNE.Epochs/MNE.Raw
+    :param new_frequency: The new frequency at which the data will be resampled.
+    :type new_frequency: float
+    :param n_jobs: Number of threads resampling the blocks of channels.
+    :type n_jobs: int
+    :return: The resampled data, in a new MNE object with the same annotations or epochs.
+    :rtype: MNE.Epochs/MNE.Raw
+    """
+    resampling_plan = get_resampling_plan(file_data.info["sfreq"], new_frequency)
+    if resampling_plan is None:
+        return file_data.copy().resample(new_frequency, n_jobs=n_jobs, verbose=False)
+    up, down, kernel = resampling_plan
+    # Raw: (channels, times), Epochs: (epochs, channels, times). The data of the dataset is only read, the resampled
+    # data is written in a new array given to a new MNE object, so the array of MNE is used without the copy of
+    # "get_data". It is only read with "get_data" when the data is not loaded in memory.
+    data = file_data._data if file_data.preload else file_data.get_data()
+    n_times = data.shape[-1]
+    n_new_times = -(-n_times * up // down)
+    resampled_data = np.empty(data.shape[:-1] + (n_new_times,), dtype=data.dtype)
+
+    stim_picks = pick_types(file_data.info, meg=False, stim=True, exclude=[])
+    picks = np.setdiff1d(np.arange(len(file_data.ch_names)), stim_picks)
+
+    def resample_block(block):
+        # "resample_poly" multiplies the kernel by the up factor in place with some versions of scipy
+        resampled_data[..., block, :] = resample_poly(data[..., block, :], up, down, axis=-1, window=kernel.copy(),
+                                                      padtype="line")
+
+    process_channel_blocks(resample_block, picks, n_jobs)
+    if len(stim_picks) > 0:
+        starts = np.arange(n_new_times) * down // up
+        resampled_data[..., stim_picks, :] = np.maximum.reduceat(data[..., stim_picks, :], starts, axis=-1)
+
+    info = file_data.info.copy()
+    with info._unlock():
+        info["sfreq"] = float(new_frequency)
+        if info["lowpass"] is None or info["lowpass"] > new_frequency / 2:
+            info["lowpass"] = float(new_frequency) / 2
+
+    if isinstance(file_data, BaseEpochs):
+        # Rounded like "eventTable.rescale_latencies", so that the events of the epochs and of the table stay equal
+        events = file_data.events.copy()
+        events[:, 0] = np.round(events[:, 0] * up / down).astype(events.dtype)
+        return EpochsArray(resampled_data, info, events=events, tmin=file_data.tmin, event_id=file_data.event_id,
+                           metadata=file_data.metadata, baseline=None, verbose=False)
+    resampled_raw = RawArray(resampled_data, info, first_samp=int(round(file_data.first_samp * up / down)),
+                             verbose=False)
+    resampled_raw.set_annotations(file_data.annotations)
+    return resampled_raw
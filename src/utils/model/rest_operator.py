@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+REST operator
+"""
+
+import hashlib
+
+from threading import Lock
+
+import numpy as np
+
+from mne import pick_info, pick_types
+from mne.io import RawArray
+from mne.io.constants import FIFF
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+rest_operators = {}
+rest_operators_lock = Lock()
+
+
+def get_rest_operator(info, compute_forward, forward_origin="fsaverage", recompute=False):
+    """
+    Gets the matrix re-referencing the EEG channels to the point at infinity (REST). It only depends on the montage and
+    on the forward model, it is thus computed once per montage, and the datasets sharing the montage are re-referenced
+    with a single matrix product without computing the source space, the BEM and the forward solution again.
+    :param info: The information of the dataset.
+    :type info: MNE.Info
+    :param compute_forward: The function computing the forward solution of the montage, only called if the matrix has
+    not been computed yet.
+    :type compute_forward: function
+    :param forward_origin: The model or the file from which the forward solution is computed.
+    :type forward_origin: str
+    :param recompute: Compute the matrix even if it is already known, when the forward solution must be written.
+    :type recompute: bool
+    :return: The matrix, of shape (EEG channels, EEG channels).
+    :rtype: numpy.ndarray
+    """
+    key = (get_montage_fingerprint(info), forward_origin)
+    with rest_operators_lock:
+        matrix = rest_operators.get(key)
+    if matrix is None or recompute:
+        matrix = compute_rest_operator(info, compute_forward())
+        with rest_operators_lock:
+            rest_operators[key] = matrix
+    return matrix
+
+
+def get_montage_fingerprint(info):
+    """
+    Computes the fingerprint of the montage of the EEG channels: their names, their locations and the bad channels,
+    which are not re-referenced.
+    :param info: The information of the dataset.
+    :type info: MNE.Info
+    :return: The fingerprint.
+    :rtype: str
+    """
+    picks = pick_types(info, meg=False, eeg=True, exclude=[])
+    sha = hashlib.sha1(",".join(info["ch_names"][pick] for pick in picks).encode())
+    sha.update(np.round(np.array([info["chs"][pick]["loc"][:3] for pick in picks]), 6).tobytes())
+    sha.update(",".join(sorted(info["bads"])).encode())
+    return sha.hexdigest()
+
+
+def compute_rest_operator(info, forward):
+    """
+    Computes the matrix of the REST re-referencing. The re-referencing is linear, the matrix is thus obtained by
+    re-referencing one sample per EEG channel with MNE.
+    :param info: The information of the dataset.
+    :type info: MNE.Info
+    :param forward: The forward solution of the montage.
+    :type forward: MNE.Forward
+    :return: The matrix, of shape (EEG channels, EEG channels).
+    :rtype: numpy.ndarray
+    """
+    picks = pick_types(info, meg=False, eeg=True, exclude=[])
+    probe = RawArray(np.eye(len(picks)), pick_info(info, picks), verbose=False)
+    probe.set_eeg_reference("REST", forward=forward, verbose=False)
+    return probe.get_data()
+
+
+def apply_rest_operator(file_data, matrix):
+    """
+    Re-references the EEG channels of the data to the point at infinity, in place, with the matrix of the montage.
+    :param file_data: MNE data of the dataset.
+    :type file_data: MNE.Epochs/MNE.Raw
+    :param matrix: The matrix of the REST re-referencing.
+    :type matrix: numpy.ndarray
+    """
+    picks = pick_types(file_data.info, meg=False, eeg=True, exclude=[])
+    # The function receives the EEG channels of the raw data, or of all the epochs, and the matrix product is broadcast
+    file_data.apply_function(lambda data: np.matmul(matrix, data), picks=picks, channel_wise=False)
+    with file_data.info._unlock():
+        file_data.info["custom_ref_applied"] = FIFF.FIFFV_MNE_CUSTOM_REF_ON
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Results store
+"""
+
+import hashlib
+import os
+import sqlite3
+
+import numpy as np
+
+from time import time
+
+from utils.model.dataset_summary_cache import datasetSummaryCache
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_RESULTS_DIRECTORY = "mne_vision_results"
+CONST_INDEX_FILE = "results.sqlite"
+CONST_MAXIMUM_SIZE = 2 * 1024 ** 3     # 2 GB
+
+
+class resultsStore:
+    def __init__(self, directory, maximum_size=CONST_MAXIMUM_SIZE):
+        """
+        Store of the results of the expensive analyses, kept on disk across restarts of the application.
+        The results are saved in NPZ files, indexed in an SQLite database by the fingerprint of the dataset they were
+        computed on, the kind of analysis and its parameters.
+        When the files exceed the maximum size, the least recently used results are removed.
+        :param directory: The directory in which the results are stored.
+        :type directory: str
+        :param maximum_size: The maximum size of the stored results, in bytes.
+        :type maximum_size: int
+        """
+        self.directory = directory
+        self.maximum_size = maximum_size
+        os.makedirs(self.directory, exist_ok=True)
+
+        with self.connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, fingerprint TEXT, kind TEXT, "
+                               "parameters TEXT, file_name TEXT, size INTEGER, created REAL, last_access REAL)")
+
+    def connect(self):
+        """
+        Opens a connection to the index of the store. A new connection is opened each time, so that the store can be
+        used by the runnables' threads.
+        :return: The connection.
+        :rtype: sqlite3.Connection
+        """
+        return sqlite3.connect(os.path.join(self.directory, CONST_INDEX_FILE))
+
+    """
+    Results
+    """
+    def get_result(self, fingerprint, kind, parameters):
+        """
+        Gets a result stored for the given dataset, kind of analysis and parameters.
+        :param fingerprint: The fingerprint of the dataset.
+        :type fingerprint: str
+        :param kind: The kind of analysis.
+        :type kind: str
+        :param parameters: The parameters of the analysis.
+        :type parameters: tuple
+        :return: The stored result, None if it is not in the store.
+        :rtype: storedResult
+        """
+        key = self.make_key(fingerprint, kind, parameters)
+        try:
+            with self.connect() as connection:
+                row = connection.execute("SELECT file_name FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                with np.load(os.path.join(self.directory, row[0]), allow_pickle=True) as npz_file:
+                    values = {name: self.unpack_value(npz_file[name]) for name in npz_file.files}
+                connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time(), key))
+            return storedResult(values)
+        except (OSError, ValueError, sqlite3.Error):
+            return None
+
+    def store_result(self, fingerprint, kind, parameters, values):
+        """
+        Stores the result of an analysis, then removes the least recently used results if the store is too big.
+        :param fingerprint: The fingerprint of the dataset.
+        :type fingerprint: str
+        :param kind: The kind of analysis.
+        :type kind: str
+        :param parameters: The parameters of the analysis.
+        :type parameters: tuple
+        :param values: The values of the result, by name.
+        :type values: dict
+        :return: True if the result has been stored.
+        :rtype: bool
+        """
+        key = self.make_key(fingerprint, kind, parameters)
+        file_name = key + ".npz"
+        file_path = os.path.join(self.directory, file_name)
+        try:
+            np.savez(file_path, **{name: self.pack_value(value) for name, value in values.items()})
+            with self.connect() as connection:
+                connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                   (key, fingerprint, kind, repr(datasetSummaryCache.make_hashable(parameters)),
+                                    file_name, os.path.getsize(file_path), time(), time()))
+            self.evict()
+            return True
+        except (OSError, ValueError, sqlite3.Error):
+            return False
+
+    def evict(self):
+        """
+        Removes the least recently used results until the size of the store is below its maximum size.
+        """
+        with self.connect() as connection:
+            rows = connection.execute("SELECT key, file_name, size FROM results ORDER BY last_access DESC").fetchall()
+            total_size = 0
+            for key, file_name, size in rows:
+                total_size += size
+                if total_size > self.maximum_size:
+                    self.remove_file(file_name)
+                    connection.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def clear(self):
+        """
+        Removes all the results of the store.
+        """
+        with self.connect() as connection:
+            for (file_name,) in connection.execute("SELECT file_name FROM results").fetchall():
+                self.remove_file(file_name)
+            connection.execute("DELETE FROM results")
+
+    def remove_file(self, file_name):
+        """
+        Removes the file of a result, if it still exists.
+        :param file_name: The name of the file.
+        :type file_name: str
+        """
+        file_path = os.path.join(self.directory, file_name)
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+    """
+    Utils
+    """
+    @staticmethod
+    def make_key(fingerprint, kind, parameters):
+        """
+        Creates the key of a result from the fingerprint of the dataset, the kind of analysis and its parameters.
+        :param fingerprint: The fingerprint of the dataset.
+        :type fingerprint: str
+        :param kind: The kind of analysis.
+        :type kind: str
+        :param parameters: The parameters of the analysis.
+        :type parameters: tuple
+        :return: The key.
+        :rtype: str
+        """
+        sha = hashlib.sha1(fingerprint.encode())
+        sha.update(kind.encode())
+        sha.update(repr(datasetSummaryCache.make_hashable(parameters)).encode())
+        return sha.hexdigest()
+
+    @staticmethod
+    def pack_value(value):
+        """
+        Transforms a value so that it can be saved in a NPZ file. Numerical arrays are saved as they are, the other
+        values (MNE objects, lists, ...) are pickled.
+        :param value: The value.
+        :type value: object
+        :return: The array saved in the file.
+        :rtype: numpy.ndarray
+        """
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            return value
+        packed_value = np.empty((), dtype=object)
+        packed_value[()] = value
+        return packed_value
+
+    @staticmethod
+    def unpack_value(array):
+        """
+        Transforms back an array read from a NPZ file into the value that was saved.
+        :param array: The array read.
+        :type array: numpy.ndarray
+        :return: The value.
+        :rtype: object
+        """
+        if array.dtype == object and array.ndim == 0:
+            return array.item()
+        return array
+
+    """
+    Getters
+    """
+    def get_total_size(self):
+        """
+        Gets the size of all the results stored.
+        :return: The size, in bytes.
+        :rtype: int
+        """
+        with self.connect() as connection:
+            total_size = connection.execute("SELECT SUM(size) FROM results").fetchone()[0]
+        return 0 if total_size is None else total_size
+
+    def get_directory(self):
+        """
+        Gets the directory in which the results are stored.
+        :return: The directory.
+        :rtype: str
+        """
+        return self.directory
+
+
+class storedResult:
+    def __init__(self, values):
+        """
+        Result read from the results store. It gives access to its values with the same getters as the runnable that
+        computed it, so that it can replace the runnable once the computation is finished.
+        :param values: The values of the result, by name.
+        :type values: dict
+        """
+        self.values = values
+
+    def __getattr__(self, name):
+        """
+        Gives the getter "get_<value name>" of each value of the result.
+        :param name: The name of the attribute.
+        :type name: str
+        :return: The getter.
+        :rtype: function
+        """
+        if name.startswith("get_") and name[4:] in self.__dict__.get("values", {}):
+            return lambda: self.values[name[4:]]
+        raise AttributeError(name)
+
+    def get_results(self):
+        """
+        Gets the values of the result.
+        :return: The values of the result, by name.
+        :rtype: dict
+        """
+        return self.values
@@ -5,13 +5,15 @@
 Study Model
 """
 
+import numpy as np
+
 from copy import copy
 from os.path import getsize
 
 from PyQt5.QtCore import QThreadPool
-from mne import concatenate_epochs
 
 from runnables.study_runnable import studyTimeFrequencyRunnable
+from utils.model.power_spectral_density import powerSpectralDensity
 from utils.view.error_window import errorWindow
 
 __author__ = "Lemahieu Antoine"
@@ -61,8 +63,8 @@ class studyModel:
 
         self.time_frequency_runnable = None
 
-        self.fig_psd = None
-        self.fig_topo = None
+        self.psd = None
+        self.psd_topo_time_points = None
 
     """
     Plots
@@ -88,19 +90,19 @@ class studyModel:
         :type topo_time_points: list of float
         """
         try:
-            all_file_data = self.get_selected_file_data_with_subjects(subjects_selected)
-            all_file_data = self.adapt_events(all_file_data)
-            file_data = concatenate_epochs(all_file_data)
-            file_data = file_data.pick(channels_selected)
+            all_datasets = self.get_selected_datasets_with_subjects(subjects_selected)
+            summary_cache = self.get_dataset_summary_cache()
 
             bandwidth = 1.0 / (maximum_time - minimum_time)  # To counter bandwidth normalization
-            self.fig_psd = file_data.plot_psd(fmin=minimum_frequency, fmax=maximum_frequency, tmin=minimum_time,
-                                              tmax=maximum_time, estimate="power", bandwidth=bandwidth,
-                                              average=False, show=False)
-            bands = []
-            for time in topo_time_points:
-                bands.append((time, str(time) + " Hz"))
-            self.fig_topo = file_data.plot_psd_topomap(bands=bands, tmin=minimum_time, tmax=maximum_time, show=False)
+            all_psds = []
+            for index, version, file_data in all_datasets:
+                all_psds.append(summary_cache.get_psd(index, version, file_data, minimum_frequency, maximum_frequency,
+                                                      minimum_time, maximum_time, bandwidth))
+            mean_psd = summary_cache.combine_psd_summaries([psd.get_psds() for psd in all_psds])
+
+            # The mean over all the epochs of the study, as a single "epoch".
+            self.psd = powerSpectralDensity(mean_psd[np.newaxis], all_psds[0].get_frequencies(), all_psds[0].get_info())
+            self.psd_topo_time_points = topo_time_points
             self.power_spectral_density_computation_finished()
         except Exception as error:
             error_message = "An error has occurred during the computation of the PSD"
@@ -138,12 +140,15 @@ class studyModel:
         :type n_cycles: int
         """
         try:
-            all_file_data = self.get_selected_file_data_with_subjects(subjects_selected)
-            all_file_data = self.adapt_events(all_file_data)
-            file_data = concatenate_epochs(all_file_data)
+            summary_cache = self.get_dataset_summary_cache()
+            all_datasets = []
+            for index, version, file_data in self.get_selected_datasets_with_subjects(subjects_selected):
+                tfr = summary_cache.get_cached_tfr(index, version, method_tfr, channels_selected, min_frequency,
+                                                   max_frequency, n_cycles)
+                all_datasets.append((index, version, file_data, tfr))
 
             pool = QThreadPool.globalInstance()
-            self.time_frequency_runnable = studyTimeFrequencyRunnable(file_data, method_tfr, channels_selected,
+            self.time_frequency_runnable = studyTimeFrequencyRunnable(all_datasets, method_tfr, channels_selected,
                                                                       min_frequency, max_frequency, n_cycles)
             pool.start(self.time_frequency_runnable)
             self.time_frequency_runnable.signals.finished.connect(self.time_frequency_computation_finished)
@@ -156,8 +161,15 @@ class studyModel:
 
     def time_frequency_computation_finished(self):
         """
+        Stores the time-frequency analyses computed by the runnable in the summary cache, on the main thread so that
+        the cache is never modified by two threads at the same time.
         Notifies the main controller that the computation is done.
         """
+        runnable = self.time_frequency_runnable
+        summary_cache = self.get_dataset_summary_cache()
+        for index, version, tfr in runnable.get_computed_tfr():
+            summary_cache.set_tfr(index, version, runnable.method_tfr, runnable.get_channel_selected(),
+                                  runnable.min_frequency, runnable.max_frequency, runnable.n_cycles, tfr)
         self.study_listener.plot_time_frequency_computation_finished()
 
     def time_frequency_computation_error(self):
@@ -372,6 +384,31 @@ class studyModel:
                 selected_file_data.append(all_file_data[index])
         return selected_file_data
 
+    def get_selected_datasets_with_subjects(self, subjects_selected):
+        """
+        Gets the index, the version and the data of the selected datasets in the study in function of the subjects
+        selected.
+        :param subjects_selected: Subjects selected
+        :type subjects_selected: str/list of str
+        :return: The index, the version and the MNE data of each selected dataset.
+        :rtype: list of (int, int, MNE Epochs/Raw)
+        """
+        all_file_data = self.main_listener.get_all_file_data()
+        selected_datasets = []
+        for index in self.dataset_indexes:
+            if self.subjects[index] in subjects_selected:       # If the dataset subject is in the subject selected, ok.
+                version = self.main_listener.get_dataset_version(index)
+                selected_datasets.append((index, version, all_file_data[index]))
+        return selected_datasets
+
+    def get_dataset_summary_cache(self):
+        """
+        Gets the cache of the summaries (evoked, PSD, TFR) computed on the datasets.
+        :return: The cache of the summaries.
+        :rtype: datasetSummaryCache
+        """
+        return self.main_listener.get_dataset_summary_cache()
+
     def get_unique_subjects(self):
         """
         Gets only one copy of each subject.
@@ -466,21 +503,21 @@ class studyModel:
         return file_data[0].ch_names
 
     # Runnables
-    def get_psd_fig(self):
+    def get_psd(self):
         """
-        Get the power spectral density's figure
-        :return: The figure of the actual power spectral density's data computed
-        :rtype: matplotlib.Figure
+        Get the power spectral density computed on the datasets of the study.
+        :return: The mean power spectral density of the study.
+        :rtype: powerSpectralDensity
         """
-        return self.fig_topo
+        return self.psd
 
-    def get_psd_topo_fig(self):
+    def get_psd_topo_time_points(self):
         """
-        Get the power spectral density's figure fo the topographies
-        :return: The figure of the topographies of the actual power spectral density's data computed
-        :rtype: matplotlib.Figure
+        Get the time points for the topomaps of the power spectral density.
+        :return: The time points for the topomaps.
+        :rtype: list of float
         """
-        return self.fig_psd
+        return self.psd_topo_time_points
 
     def get_tfr_channel_selected(self):
         """
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dataset file dialog
+"""
+
+from PyQt5.QtWidgets import QFileDialog, QLabel
+
+from utils.model.file_header import read_file_header, format_file_header
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+class datasetFileDialog(QFileDialog):
+    def __init__(self, parent, caption, name_filter):
+        """
+        Dialog for choosing a dataset to open, displaying a preview of the file selected read from its header.
+        :param parent: The parent widget.
+        :type parent: QWidget
+        :param caption: The title of the dialog.
+        :type caption: str
+        :param name_filter: The filter of the files displayed.
+        :type name_filter: str
+        """
+        super().__init__(parent, caption, "", name_filter)
+        self.setOption(QFileDialog.Option.DontUseNativeDialog)     # The native dialogs can not display the preview
+        self.setFileMode(QFileDialog.FileMode.ExistingFile)
+
+        self.preview_label = QLabel(self)
+        layout = self.layout()
+        layout.addWidget(self.preview_label, layout.rowCount(), 0, 1, -1)
+        self.currentChanged.connect(self.update_preview)
+
+    @staticmethod
+    def get_open_file_name(parent, caption, name_filter):
+        """
+        Display the dialog and get the dataset chosen.
+        :param parent: The parent widget.
+        :type parent: QWidget
+        :param caption: The title of the dialog.
+        :type caption: str
+        :param name_filter: The filter of the files displayed.
+        :type name_filter: str
+        :return: The path to the file. Empty if the dialog has been cancelled.
+        :rtype: str
+        """
+        dialog = datasetFileDialog(parent, caption, name_filter)
+        if dialog.exec():
+            return dialog.selectedFiles()[0]
+        return ''
+
+    """
+    Plots
+    """
+    def update_preview(self, path_to_file):
+        """
+        Display the information of the header of the file selected.
+        :param path_to_file: The path to the file.
+        :type path_to_file: str
+        """
+        try:
+            self.preview_label.setText(format_file_header(read_file_header(path_to_file)))
+        except Exception:   # Directory, or file that is not a dataset
+            self.preview_label.setText("")
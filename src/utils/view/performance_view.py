@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Performance view
+"""
+
+from datetime import datetime
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, \
+    QHeaderView, QLabel
+
+from utils.model.performance_profiler import get_records, clear_records
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_REFRESH_INTERVAL = 1000       # Milliseconds between two refreshes of the table
+CONST_COLUMNS = ["Time", "Runnable", "Step", "Wall time (s)", "CPU time (s)", "Memory at start (MB)", "Memory at end (MB)",
+                  "Status"]
+
+
+class performanceView(QWidget):
+    def __init__(self):
+        """
+        Window displaying the time and memory used by the last computations of the runnables and of their steps, most
+        recent first. The table is refreshed while the window is open.
+        """
+        super().__init__()
+        self.last_update = None     # Number of records and time of the last record displayed
+
+        self.setWindowTitle("Performance")
+        self.resize(900, 500)
+
+        self.vertical_layout = QVBoxLayout()
+        self.setLayout(self.vertical_layout)
+
+        self.table = QTableWidget(0, len(CONST_COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(CONST_COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.summary_label = QLabel(self)
+
+        self.buttons_widget = QWidget()
+        self.buttons_layout = QHBoxLayout()
+        self.buttons_widget.setLayout(self.buttons_layout)
+        self.clear_button = QPushButton("C&lear", self)
+        self.clear_button.clicked.connect(self.clear_trigger)
+        self.close_button = QPushButton("&Close", self)
+        self.close_button.clicked.connect(self.close)
+        self.buttons_layout.addWidget(self.clear_button)
+        self.buttons_layout.addWidget(self.close_button)
+
+        self.vertical_layout.addWidget(self.table)
+        self.vertical_layout.addWidget(self.summary_label)
+        self.vertical_layout.addWidget(self.buttons_widget)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.update_table)
+        self.refresh_timer.start(CONST_REFRESH_INTERVAL)
+        self.update_table()
+
+    """
+    Plots
+    """
+    def update_table(self):
+        """
+        Displays the records of the profiler, if new ones have been added since the last refresh.
+        """
+        records = get_records()
+        last_update = (len(records), records[-1]["time"] if records else None)
+        if last_update == self.last_update:
+            return
+        self.last_update = last_update
+
+        self.table.setRowCount(len(records))
+        for row, record in enumerate(reversed(records)):
+            step = record["step"] if record["parent"] is None else record["parent"] + " > " + record["step"]
+            values = [datetime.fromtimestamp(record["time"]).strftime("%H:%M:%S"), record["runnable"], step,
+                      "{:.3f}".format(record["wall_time"]), "{:.3f}".format(record["cpu_time"]),
+                      "{:.1f}".format(record["start_rss"] / 1024 ** 2), "{:.1f}".format(record["end_rss"] / 1024 ** 2),
+                      record["status"]]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+
+        total_wall_time = sum(record["wall_time"] for record in records if record["parent"] is None)
+        self.summary_label.setText(str(len(records)) + " records, " + "{:.1f}".format(total_wall_time) +
+                                   " s spent in the runnables.")
+
+    """
+    Triggers
+    """
+    def clear_trigger(self):
+        """
+        Removes the records displayed.
+        """
+        clear_records()
+        self.update_table()
+
+    def closeEvent(self, event):
+        """
+        Stops the refresh of the table when the window is closed.
+        :param event: The close event.
+        :type event: QCloseEvent
+        """
+        self.refresh_timer.stop()
+        super().closeEvent(event)
@@ -115,8 +115,8 @@ def plot_connectivity_circle_arrows(con, node_names, psi, indices=None, n_lines=
     If ``facecolor`` is not set via :func:`matplotlib.pyplot.savefig`, the
     figure labels, title, and legend may be cut off in the output figure.
     """
-    import matplotlib.patches as m_patches
     import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
     from mne_connectivity.base import BaseConnectivity
 
     if isinstance(con, BaseConnectivity):
@@ -190,20 +190,19 @@ def plot_connectivity_circle_arrows(con, node_names, psi, indices=None, n_lines=
     # Remove the black axes border which may obscure the labels
     axes.spines['polar'].set_visible(False)
 
-    # Draw lines between connected nodes, only draw the strongest connections
+    # Draw lines between connected nodes, only draw the strongest connections.
+    # argpartition selects them without sorting all the connections.
+    con_abs = np.abs(con)
     if n_lines is not None and len(con) > n_lines:
-        con_thresh = np.sort(np.abs(con).ravel())[-n_lines]
+        con_draw_idx = np.argpartition(con_abs, -n_lines)[-n_lines:]
+        con_thresh = con_abs[con_draw_idx].min()
     else:
+        con_draw_idx = np.arange(len(con))
         con_thresh = 0.
 
-    # get the connections which we are drawing and sort by connection strength
-    # this will allow us to draw the strongest connections first
-    con_abs = np.abs(con)
-    con_draw_idx = np.where(con_abs >= con_thresh)[0]
-
     con = con[con_draw_idx]
     con_abs = con_abs[con_draw_idx]
-    indices = [ind[con_draw_idx] for ind in indices]
+    indices = [np.asarray(ind)[con_draw_idx] for ind in indices]
 
     # now sort them
     sort_idx = np.argsort(con_abs)
@@ -222,10 +221,9 @@ def plot_connectivity_circle_arrows(con, node_names, psi, indices=None, n_lines=
     # edges: We modulate the noise with the number of connections of the
     # node and the connection strength, such that the strongest connections
     # are closer to the node center
-    nodes_n_con = np.zeros((n_nodes), dtype=np.int64)
-    for i, j in zip(indices[0], indices[1]):
-        nodes_n_con[i] += 1
-        nodes_n_con[j] += 1
+    # The connections are seen in order, the start then the end node of each
+    endpoints = np.column_stack((indices[0], indices[1])).ravel()
+    nodes_n_con = np.bincount(endpoints, minlength=n_nodes)
 
     # initialize random number generator so plot is reproducible
     rng = np.random.mtrand.RandomState(0)
@@ -235,43 +233,34 @@ def plot_connectivity_circle_arrows(con, node_names, psi, indices=None, n_lines=
     start_noise = rng.uniform(-noise_max, noise_max, n_con)
     end_noise = rng.uniform(-noise_max, noise_max, n_con)
 
-    nodes_n_con_seen = np.zeros_like(nodes_n_con)
-    for i, (start, end) in enumerate(zip(indices[0], indices[1])):
-        nodes_n_con_seen[start] += 1
-        nodes_n_con_seen[end] += 1
-
-        start_noise[i] *= ((nodes_n_con[start] - nodes_n_con_seen[start]) /
-                           float(nodes_n_con[start]))
-        end_noise[i] *= ((nodes_n_con[end] - nodes_n_con_seen[end]) /
-                         float(nodes_n_con[end]))
+    # Number of times each node has been seen up to each endpoint (included):
+    # rank of the endpoint among the endpoints of the same node, in order.
+    order = np.argsort(endpoints, kind='stable')
+    sorted_endpoints = endpoints[order]
+    group_starts = np.r_[0, np.flatnonzero(np.diff(sorted_endpoints)) + 1]
+    group_sizes = np.diff(np.r_[group_starts, len(sorted_endpoints)])
+    nodes_n_con_seen = np.empty_like(endpoints)
+    nodes_n_con_seen[order] = (np.arange(len(sorted_endpoints)) -
+                               np.repeat(group_starts, group_sizes) + 1)
+    remaining = (nodes_n_con[endpoints] - nodes_n_con_seen) / nodes_n_con[endpoints].astype(float)
+    start_noise *= remaining[0::2]
+    end_noise *= remaining[1::2]
 
     # scale connectivity for colormap (vmin<=>0, vmax<=>1)
     con_val_scaled = (con - vmin) / vrange
 
-    # Finally, we draw the connections
-    for pos, (i, j) in enumerate(zip(indices[0], indices[1])):
-        # Start point
-        t0, r0 = node_angles[i], 10
-
-        # End point
-        t1, r1 = node_angles[j], 10
-
-        # Some noise in start and end point
-        t0 += start_noise[pos]
-        t1 += end_noise[pos]
+    # Finally, we draw the connections, with some noise in start and end point
+    t0 = node_angles[indices[0]] + start_noise
+    t1 = node_angles[indices[1]] + end_noise
+    # Directionality is negative, go the opposite way.
+    backward = np.asarray(psi)[indices[0], indices[1]] < 0
+    t0[backward], t1[backward] = t1[backward], t0[backward].copy()
 
-        color = colormap(con_val_scaled[pos])
-
-        style = m_patches.ArrowStyle(stylename="->", angleA=0.5, angleB=0.5)
-
-        # Actual arrow
-        if psi[i][j] >= 0:  # Directionality is positive, so go the right way.
-            arrow = m_patches.FancyArrowPatch(posA=(t0, r0 - 1), posB=(t1, r1 - 1), arrowstyle=style, color=color,
-                                              linewidth=linewidth, mutation_scale=10)
-        else:   # Directionality is negative, go the opposite way.
-            arrow = m_patches.FancyArrowPatch(posA=(t1, r1 - 1), posB=(t0, r0 - 1), arrowstyle=style, color=color,
-                                              linewidth=linewidth, mutation_scale=10)
-        axes.add_patch(arrow)
+    segments = _arrow_segments(t0, t1, radius=9)
+    colors = np.repeat(colormap(con_val_scaled), 3, axis=0)
+    # The straight line and the two strokes of the head of every arrow, in one collection
+    arrows = LineCollection(segments, colors=colors, linewidths=linewidth)
+    axes.add_collection(arrows)
 
     # Draw ring with colored nodes
     height = np.ones(n_nodes) * 1.0
@@ -316,7 +305,8 @@ def plot_connectivity_circle_arrows(con, node_names, psi, indices=None, n_lines=
     if interactive:
         callback = partial(_plot_connectivity_circle_onpick, fig=fig,
                            axes=axes, indices=indices, n_nodes=n_nodes,
-                           node_angles=node_angles)
+                           node_angles=node_angles, arrows=arrows,
+                           colors=colors)
 
         fig.canvas.mpl_connect('button_press_event', callback)
 
@@ -324,8 +314,37 @@ def plot_connectivity_circle_arrows(con, node_names, psi, indices=None, n_lines=
     return fig, axes
 
 
+def _arrow_segments(t0, t1, radius, head_length=0.3, head_angle=np.pi / 8):
+    """Compute the segments of arrows between points of a circle.
+
+    Each arrow is a straight line from (t0, radius) to (t1, radius), and a
+    head made of two strokes at the end point. The head is computed in
+    cartesian coordinates, then all the points are converted back to polar
+    coordinates. Returns an array of shape (3 * n_arrows, 2, 2).
+    """
+    start = radius * np.column_stack((np.cos(t0), np.sin(t0)))
+    end = radius * np.column_stack((np.cos(t1), np.sin(t1)))
+    direction = end - start
+    norm = np.linalg.norm(direction, axis=1, keepdims=True)
+    direction = direction / np.where(norm == 0, 1, norm)
+
+    cartesian = np.empty((len(t0), 3, 2, 2))
+    cartesian[:, 0, 0] = start
+    cartesian[:, :, 1] = end[:, np.newaxis]
+    for stroke, angle in ((1, head_angle), (2, -head_angle)):
+        rotation = np.array([[np.cos(angle), -np.sin(angle)],
+                             [np.sin(angle), np.cos(angle)]])
+        cartesian[:, stroke, 0] = end - head_length * direction @ rotation.T
+
+    polar = np.empty_like(cartesian)
+    polar[..., 0] = np.arctan2(cartesian[..., 1], cartesian[..., 0])
+    polar[..., 1] = np.hypot(cartesian[..., 0], cartesian[..., 1])
+    return polar.reshape(-1, 2, 2)
+
+
 def _plot_connectivity_circle_onpick(event, fig=None, axes=None, indices=None,
                                      n_nodes=0, node_angles=None,
+                                     arrows=None, colors=None,
                                      ylim=[9, 10]):
     """Isolate connections around a single node when user left clicks a node.
 
@@ -343,12 +362,12 @@ def _plot_connectivity_circle_onpick(event, fig=None, axes=None, indices=None,
         node_angles = node_angles % (np.pi * 2)
         node = np.argmin(np.abs(event.xdata - node_angles))
 
-        patches = event.inaxes.patches
-        for ii, (x, y) in enumerate(zip(indices[0], indices[1])):
-            patches[ii].set_visible(node in [x, y])
+        # Hide the other arrows (3 segments each) with a transparent color
+        visible = np.repeat((indices[0] == node) | (indices[1] == node), 3)
+        new_colors = colors.copy()
+        new_colors[~visible, 3] = 0
+        arrows.set_color(new_colors)
         fig.canvas.draw()
     elif event.button == 3:  # right click
-        patches = event.inaxes.patches
-        for ii in range(np.size(indices, axis=1)):
-            patches[ii].set_visible(True)
+        arrows.set_color(colors)
         fig.canvas.draw()
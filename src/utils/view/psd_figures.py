@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+PSD figures
+"""
+
+from matplotlib import pyplot as plt
+
+from utils.view.topomap_engine import topomapEngine
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+
+def create_psd_figure(psd, channels_selected=None, title=None):
+    """
+    Create the figure of the mean power spectral density of each channel selected.
+    :param psd: The power spectral density.
+    :type psd: powerSpectralDensity
+    :param channels_selected: Channels selected. If None, all the channels are plotted.
+    :type channels_selected: str/list of str
+    :param title: The title of the figure.
+    :type title: str
+    :return: The figure.
+    :rtype: matplotlib.Figure
+    """
+    frequencies = psd.get_frequencies()
+    fig, axes = plt.subplots()
+    axes.plot(frequencies, psd.get_mean_db(channels_selected).T, linewidth=0.5)
+    axes.set_xlabel("Frequency (Hz)")
+    axes.set_ylabel("µV²/Hz (dB)")
+    axes.set_xlim(frequencies[0], frequencies[-1])
+    if title is not None:
+        axes.set_title(title)
+    return fig
+
+
+def create_topographies_figure(psd, topo_frequencies, title=None):
+    """
+    Create the figure of the topographies of the power spectral density at the frequencies given.
+    :param psd: The power spectral density.
+    :type psd: powerSpectralDensity
+    :param topo_frequencies: The frequencies of the topographies.
+    :type topo_frequencies: list of float
+    :param title: The title of the figure.
+    :type title: str
+    :return: The figure.
+    :rtype: matplotlib.Figure
+    """
+    topographies, info = psd.get_topographies(topo_frequencies)
+    titles = [str(frequency) + " Hz" for frequency in topo_frequencies]
+    return topomapEngine(info).plot_topomaps(topographies.T, titles, title, cmap="Reds")
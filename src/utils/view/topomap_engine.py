@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Topomap engine
+"""
+
+import hashlib
+
+import numpy as np
+
+from matplotlib import pyplot as plt
+from matplotlib.animation import FuncAnimation
+from matplotlib.patches import Circle
+from scipy.interpolate import CloughTocher2DInterpolator
+from scipy.spatial.distance import cdist
+
+__author__ = "Lemahieu Antoine"
+__copyright__ = "Copyright 2022"
+__credits__ = ["Lemahieu Antoine"]
+__license__ = "GNU General Public License v3.0"
+__maintainer__ = "Lemahieu Antoine"
+__email__ = "Antoine.Lemahieu@ulb.be"
+__status__ = "Dev"
+
+CONST_RESOLUTION = 64           # Number of pixels of each side of a topography
+CONST_BORDER_POINTS = 32        # Points added around the channels so that the interpolation covers the whole head
+CONST_BORDER_NEIGHBORS = 3      # Channels averaged to get the value of a border point
+CONST_HEAD_MARGIN = 1.1         # Radius of the head relatively to the farthest channel
+
+
+class topomapEngine:
+    # Interpolation matrices already computed, shared by all the engines, by montage
+    interpolation_matrices = {}
+
+    def __init__(self, info, resolution=CONST_RESOLUTION):
+        """
+        Engine plotting topographies of the channels of a montage.
+        The interpolation from the channels to the pixels of the head is linear in the values of the channels, so it is
+        computed once per montage as a matrix and cached. Every topography is then a single matrix-vector product, and
+        several topographies a single matrix product.
+        :param info: MNE information of the channels plotted, which must all have a location.
+        :type info: MNE.Info
+        :param resolution: Number of pixels of each side of a topography.
+        :type resolution: int
+        """
+        self.resolution = resolution
+        self.positions = self.project_locations(np.array([channel["loc"][:3] for channel in info["chs"]]))
+        self.head_radius = np.max(np.linalg.norm(self.positions, axis=1)) * CONST_HEAD_MARGIN
+
+        key = self.make_key(info["ch_names"], self.positions, resolution)
+        if key not in topomapEngine.interpolation_matrices:
+            topomapEngine.interpolation_matrices[key] = self.compute_interpolation_matrix()
+        self.interpolation_matrix = topomapEngine.interpolation_matrices[key]
+
+    """
+    Interpolation
+    """
+    @staticmethod
+    def project_locations(locations):
+        """
+        Projects the 3D locations of the channels on the plane of the topographies (azimuthal equidistant projection,
+        the vertex of the head at the center).
+        :param locations: The 3D locations of the channels, of shape (channels, 3).
+        :type locations: numpy.ndarray
+        :return: The 2D positions of the channels, of shape (channels, 2).
+        :rtype: numpy.ndarray
+        """
+        if np.any(~np.isfinite(locations)) or np.any(np.all(locations == 0, axis=1)):
+            raise ValueError("Some channels do not have a location.")
+        radius = np.linalg.norm(locations, axis=1)
+        polar_angles = np.arccos(np.clip(locations[:, 2] / radius, -1, 1))
+        azimuths = np.arctan2(locations[:, 1], locations[:, 0])
+        return np.column_stack((polar_angles * np.cos(azimuths), polar_angles * np.sin(azimuths)))
+
+    def compute_interpolation_matrix(self):
+        """
+        Computes the matrix interpolating the values of the channels on the pixels of the head.
+        Points are added on a circle around the head, with the mean value of their nearest channels, then the
+        Clough-Tocher interpolation of each channel alone (the identity matrix) gives the columns of the matrix.
+        :return: The interpolation matrix, of shape (pixels, channels). The pixels outside the head are NaN.
+        :rtype: numpy.ndarray
+        """
+        number_of_channels = self.positions.shape[0]
+        angles = np.linspace(0, 2 * np.pi, CONST_BORDER_POINTS, endpoint=False)
+        border_points = 1.2 * self.head_radius * np.column_stack((np.cos(angles), np.sin(angles)))
+        nearest_channels = np.argsort(cdist(border_points, self.positions), axis=1)[:, :CONST_BORDER_NEIGHBORS]
+        border_values = np.zeros((CONST_BORDER_POINTS, number_of_channels))
+        border_values[np.arange(CONST_BORDER_POINTS)[:, np.newaxis], nearest_channels] = 1 / CONST_BORDER_NEIGHBORS
+
+        points = np.vstack((self.positions, border_points))
+        values = np.vstack((np.eye(number_of_channels), border_values))
+        interpolator = CloughTocher2DInterpolator(points, values)
+
+        coordinates = np.linspace(-self.head_radius, self.head_radius, self.resolution)
+        grid_x, grid_y = np.meshgrid(coordinates, coordinates)
+        pixels = np.column_stack((grid_x.ravel(), grid_y.ravel()))
+        interpolation_matrix = interpolator(pixels)
+        interpolation_matrix[np.linalg.norm(pixels, axis=1) > self.head_radius] = np.nan
+        return interpolation_matrix
+
+    def interpolate(self, data):
+        """
+        Interpolates the values of the channels on the head, for any number of topographies at once.
+        :param data: The values of the channels, of shape (channels,) or (channels, topographies).
+        :type data: numpy.ndarray
+        :return: The topographies, of shape (resolution, resolution) or (topographies, resolution, resolution).
+        :rtype: numpy.ndarray
+        """
+        data = np.asarray(data)
+        images = self.interpolation_matrix @ data
+        if data.ndim == 1:
+            return images.reshape(self.resolution, self.resolution)
+        return images.T.reshape(data.shape[1], self.resolution, self.resolution)
+
+    @staticmethod
+    def make_key(channels_names, positions, resolution):
+        """
+        Creates the key of the interpolation matrix of a montage.
+        :param channels_names: The names of the channels.
+        :type channels_names: list of str
+        :param positions: The 2D positions of the channels.
+        :type positions: numpy.ndarray
+        :param resolution: Number of pixels of each side of a topography.
+        :type resolution: int
+        :return: The key.
+        :rtype: str
+        """
+        sha = hashlib.sha1(",".join(channels_names).encode())
+        sha.update(np.round(positions, 6).tobytes())
+        sha.update(str(resolution).encode())
+        return sha.hexdigest()
+
+    """
+    Plots
+    """
+    def draw_topography(self, axes, image, vmin, vmax, cmap):
+        """
+        Draws a topography with the outline of the head and the channels.
+        :param axes: The axes on which the topography is drawn.
+        :type axes: matplotlib.Axes
+        :param image: The topography.
+        :type image: numpy.ndarray
+        :param vmin: The minimum of the colormap.
+        :type vmin: float
+        :param vmax: The maximum of the colormap.
+        :type vmax: float
+        :param cmap: The colormap.
+        :type cmap: str
+        :return: The image drawn.
+        :rtype: matplotlib.AxesImage
+        """
+        extent = (-self.head_radius, self.head_radius, -self.head_radius, self.head_radius)
+        axes_image = axes.imshow(image, origin="lower", extent=extent, vmin=vmin, vmax=vmax, cmap=cmap)
+        axes.add_patch(Circle((0, 0), self.head_radius, fill=False, color="black", linewidth=1))
+        axes.plot(self.positions[:, 0], self.positions[:, 1], "k.", markersize=2)
+        axes.set_axis_off()
+        return axes_image
+
+    def plot_topomaps(self, data, titles, title=None, cmap="RdBu_r"):
+        """
+        Creates the figure of several topographies, side by side, with a shared colormap.
+        :param data: The values of the channels, of shape (channels, topographies).
+        :type data: numpy.ndarray
+        :param titles: The title of each topography.
+        :type titles: list of str
+        :param title: The title of the figure.
+        :type title: str
+        :param cmap: The colormap.
+        :type cmap: str
+        :return: The figure.
+        :rtype: matplotlib.Figure
+        """
+        images = self.interpolate(data)
+        vmin, vmax = self.get_limits(images, cmap)
+        fig, axes = plt.subplots(1, images.shape[0], squeeze=False)
+        for i, image in enumerate(images):
+            axes_image = self.draw_topography(axes[0, i], image, vmin, vmax, cmap)
+            axes[0, i].set_title(titles[i])
+        fig.colorbar(axes_image, ax=axes[0, :].tolist(), shrink=0.6)
+        if title is not None:
+            fig.suptitle(title)
+        return fig
+
+    def animate_topomaps(self, data, titles, frame_rate=2, cmap="RdBu_r"):
+        """
+        Creates the figure of an animation of topographies. All the frames are interpolated at once, then each frame
+        only updates the pixels of the image.
+        :param data: The values of the channels, of shape (channels, frames).
+        :type data: numpy.ndarray
+        :param titles: The title of each frame.
+        :type titles: list of str
+        :param frame_rate: Number of frames per second.
+        :type frame_rate: float
+        :param cmap: The colormap.
+        :type cmap: str
+        :return: The figure. The animation is kept in its "animation" attribute.
+        :rtype: matplotlib.Figure
+        """
+        images = self.interpolate(data)
+        vmin, vmax = self.get_limits(images, cmap)
+        fig, axes = plt.subplots()
+        axes_image = self.draw_topography(axes, images[0], vmin, vmax, cmap)
+        fig.colorbar(axes_image, ax=axes, shrink=0.6)
+
+        def update_frame(frame):
+            axes_image.set_data(images[frame])
+            axes.set_title(titles[frame])
+            return axes_image,
+
+        fig.animation = FuncAnimation(fig, update_frame, frames=images.shape[0], interval=1000 / frame_rate)
+        return fig
+
+    @staticmethod
+    def get_limits(images, cmap):
+        """
+        Gets the limits of the colormap for the topographies, symmetric around 0 for a diverging colormap.
+        :param images: The topographies.
+        :type images: numpy.ndarray
+        :param cmap: The colormap.
+        :type cmap: str
+        :return: The minimum and maximum of the colormap.
+        :rtype: (float, float)
+        """
+        if cmap == "RdBu_r":
+            limit = np.nanmax(np.abs(images))
+            return -limit, limit
+        return np.nanmin(images), np.nanmax(images)